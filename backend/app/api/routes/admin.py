@@ -17,6 +17,15 @@ import pytz
 from backend.app.db.base import get_db
 from backend.app.models import Stock, StockPrice, NewsArticle, Position, Portfolio
 from backend.app.services.scheduler import scheduler_service
+from backend.app.services.price_matrix import price_matrix
+from backend.app.services.price_fetcher import price_fetcher
+from backend.app.services.http_client import http_client
+from backend.app.services.embedding_cache import embedding_cache
+from backend.app.services.sentiment_cache import sentiment_cache
+from backend.app.services.local_sentiment import sentiment_analyzer
+from backend.app.services.near_duplicates import near_duplicate_detector
+from backend.app.services.ticker_matcher import ticker_matcher_cache
+from backend.app.services.keyword_index import keyword_index
 from backend.app.core.config import settings
 
 router = APIRouter()
@@ -51,6 +60,7 @@ def get_collection_stats(db: Session = Depends(get_db)):
         - News article statistics (count, date range, sources)
         - Recent collection activity
         - Database size information
+        - Cache hit rates
     """
     try:
         tz = pytz.timezone(settings.SCHEDULER_TIMEZONE)
@@ -90,6 +100,11 @@ def get_collection_stats(db: Session = Depends(get_db)):
         # News sources count
         sources = db.query(func.count(func.distinct(NewsArticle.source))).scalar()
 
+        # Distinct stories (near-duplicates share a cluster id)
+        story_count = db.query(
+            func.count(func.distinct(func.coalesce(NewsArticle.cluster_id, NewsArticle.id)))
+        ).scalar()
+
         # Average sentiment
         avg_sentiment = db.query(func.avg(NewsArticle.sentiment_score)).filter(
             NewsArticle.sentiment_score.isnot(None)
@@ -114,13 +129,22 @@ def get_collection_stats(db: Session = Depends(get_db)):
                     "latest": article_date_range.max_date.isoformat() if article_date_range.max_date else None
                 },
                 "sources_count": sources,
+                "distinct_stories": story_count,
                 "recent_24_hours": recent_articles,
                 "average_sentiment": float(avg_sentiment) if avg_sentiment else None
             },
             "data_quality": {
                 "stocks_with_prices_percentage": round((stocks_with_prices / total_stocks * 100), 2) if total_stocks > 0 else 0,
                 "avg_prices_per_stock": round(total_prices / stocks_with_prices, 2) if stocks_with_prices > 0 else 0
-            }
+            },
+            "caches": {
+                "embeddings": embedding_cache.stats(),
+                "sentiment": sentiment_cache.stats()
+            },
+            "sentiment_scoring": sentiment_analyzer.stats(),
+            "near_duplicates": near_duplicate_detector.stats(),
+            "ticker_matcher": ticker_matcher_cache.stats(),
+            "keyword_index": keyword_index.stats()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting collection stats: {str(e)}")
@@ -156,6 +180,43 @@ def trigger_job_manually(job_id: str):
         raise HTTPException(status_code=500, detail=f"Error triggering job: {str(e)}")
 
 
+@router.get("/price-matrix/stats", response_model=Dict[str, Any])
+def get_price_matrix_stats():
+    """Get statistics about the in-memory price matrix."""
+    return price_matrix.stats()
+
+
+@router.post("/price-matrix/reload", response_model=Dict[str, Any])
+def reload_price_matrix(db: Session = Depends(get_db)):
+    """
+    Reload the in-memory price matrix from the database.
+
+    Needed after prices are written outside the API process
+    (e.g. by the import or seed scripts).
+    """
+    try:
+        rows = price_matrix.load(db)
+        return {
+            "message": "Price matrix reloaded",
+            "rows_loaded": rows,
+            "stats": price_matrix.stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reloading price matrix: {str(e)}")
+
+
+@router.get("/price-fetcher/stats", response_model=Dict[str, Any])
+def get_price_fetcher_stats():
+    """Get per-provider request, success and latency statistics of the price fetcher."""
+    return price_fetcher.stats()
+
+
+@router.get("/http-client/stats", response_model=Dict[str, Any])
+def get_http_client_stats():
+    """Get pool settings and per-host request, error, retry and latency metrics of the shared HTTP client."""
+    return http_client.stats()
+
+
 @router.post("/reset-data")
 def reset_data(
     keep_stocks: bool = True,
@@ -206,6 +267,7 @@ def reset_data(
             deleted_counts["portfolios"] = portfolios_deleted
 
         db.commit()
+        price_matrix.clear()
 
         return {
             "success": True,
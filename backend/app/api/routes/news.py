@@ -11,12 +11,19 @@ from backend.app.models import NewsArticle, Stock, ArticleStock
 from backend.app.schemas.news_article import NewsArticle as NewsArticleSchema, NewsArticleWithStocks
 from backend.app.services.news_collector import NewsCollectorService
 from backend.app.services.gemini_service import GeminiService
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.vector_store import get_vector_store
+from backend.app.services.embedding_pipeline import EmbeddingPipeline
+from backend.app.services.local_sentiment import sentiment_analyzer
+from backend.app.services.near_duplicates import near_duplicate_detector
+from backend.app.services.news_cursors import news_cursor_service, ALL_TICKERS
+from backend.app.services.article_writer import ArticleWriter
+from backend.app.services.ticker_matcher import ticker_matcher_cache
+from backend.app.services.keyword_index import keyword_index
 
 router = APIRouter()
 news_collector = NewsCollectorService()
 gemini_service = GeminiService()
-vector_store = VectorStoreService()
+vector_store = get_vector_store()
 
 # In-memory job status store (for simplicity; use Redis in production)
 _refresh_jobs: Dict[str, Dict[str, Any]] = {}
@@ -65,14 +72,17 @@ async def _do_refresh_news(job_id: str, portfolio_tickers: set, stock_ids: Dict[
         skipped_count = 0
         already_exists_count = 0
 
-        # Fetch recent articles from ActuallyFreeAPI from last 30 days
+        # Fetch articles newer than the last refresh (first refresh: last 30 days)
+        watermark = news_cursor_service.get_watermarks(db, "actually_free_api", [ALL_TICKERS])[ALL_TICKERS]
+        since = news_cursor_service.since(watermark)
         start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        print(f"[NEWS REFRESH] Fetching articles since {start_date}...")
+        print(f"[NEWS REFRESH] Fetching articles since {since or start_date}...")
 
         articles = await news_collector.fetch_from_actually_free_api(
             ticker=None,  # Get all articles
             limit=100,  # Max per page
-            start_date=start_date  # Only get articles from last 30 days
+            start_date=start_date,  # Only get articles from last 30 days
+            since=since
         )
 
         print(f"[NEWS REFRESH] Fetched {len(articles)} articles from API")
@@ -81,30 +91,25 @@ async def _do_refresh_news(job_id: str, portfolio_tickers: set, stock_ids: Dict[
         _refresh_jobs[job_id]["total_fetched"] = total_articles
         _refresh_jobs[job_id]["message"] = f"Processing {total_articles} articles..."
 
+        # Embeddings are generated and indexed in batches once articles are committed
+        pipeline = EmbeddingPipeline(gemini_service, vector_store, before_flush=db.commit)
+
+        # Pass 1: keep relevant articles that are not stored yet
+        candidates = []
+        matcher = ticker_matcher_cache.get(db)
+        seen_urls = set(news_collector.find_existing_articles(db, [item.get("url") for item in articles]))
         for i, item in enumerate(articles):
             try:
-                # Update progress
-                _refresh_jobs[job_id]["progress"] = int((i / max(total_articles, 1)) * 100)
+                # Update progress (first half: filtering)
+                _refresh_jobs[job_id]["progress"] = int((i / max(total_articles, 1)) * 50)
                 _refresh_jobs[job_id]["processed"] = i
 
-                # Extract tickers from article (handle None case)
-                article_tickers = item.get("tickers") or []
-
-                # Find which tickers are in our portfolio
-                relevant_tickers = []
-                if article_tickers:
-                    relevant_tickers = [t.upper() for t in article_tickers if t.upper() in portfolio_tickers]
-
-                # If no tickers specified, check if title/summary mentions our stocks
-                if not relevant_tickers:
-                    title = item.get("title", "").upper()
-                    summary = item.get("summary", "").upper()
-
-                    # Check if any of our stock symbols appear in title or summary
-                    for ticker in portfolio_tickers:
-                        if ticker in title or ticker in summary:
-                            relevant_tickers.append(ticker)
-                            break
+                # Portfolio tickers the source tagged, else stocks mentioned
+                # in the title/summary (symbols, cashtags, company names)
+                relevant_tickers = [
+                    symbol for symbol in matcher.match_article(item)
+                    if symbol in portfolio_tickers
+                ]
 
                 # Skip only if no relevance found
                 if not relevant_tickers:
@@ -112,79 +117,95 @@ async def _do_refresh_news(job_id: str, portfolio_tickers: set, stock_ids: Dict[
                     continue
 
                 # Check if article already exists by URL
-                existing = db.query(NewsArticle).filter(
-                    NewsArticle.url == item.get("url")
-                ).first()
-
-                if existing:
+                if item.get("url") in seen_urls:
                     already_exists_count += 1
                     continue
 
-                # Use Gemini to analyze sentiment from title and summary
-                sentiment_score = 0.0  # Default neutral
-                title = item.get("title", "")
-                summary = item.get("summary", "")
-
-                if title:
-                    try:
-                        # Analyze sentiment using Gemini
-                        content = f"{title}. {summary}" if summary else title
-                        sentiment_result = gemini_service.analyze_sentiment(content)
-                        sentiment_score = sentiment_result["score"]
-                    except Exception as e:
-                        print(f"Error analyzing sentiment: {e}")
-                        sentiment_score = 0.0
-
-                # Create new article
-                article = NewsArticle(
-                    title=title,
-                    source=item.get("source", "Unknown"),
-                    url=item.get("url"),
-                    published_at=item.get("published_at") or datetime.now(),
-                    summary=item.get("summary", title),
-                    sentiment_score=sentiment_score
-                )
-                db.add(article)
-                db.flush()
-
-                # Link article to all relevant stocks in portfolio
-                for ticker in relevant_tickers:
-                    stock = db.query(Stock).filter(Stock.symbol == ticker).first()
-                    if stock:
-                        article_stock = ArticleStock(
-                            article_id=article.id,
-                            stock_id=stock.id
-                        )
-                        db.add(article_stock)
-
-                # Add to vector store for semantic search
-                try:
-                    embedding = gemini_service.generate_embedding(title)
-                    vector_store.add_article(
-                        article_id=article.id,
-                        content=title,
-                        embedding=embedding,
-                        metadata={
-                            "title": title,
-                            "source": item.get("source", "Unknown"),
-                            "published_at": str(article.published_at),
-                            "sentiment_score": sentiment_score,
-                            "stocks": relevant_tickers
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error adding to vector store: {e}")
-
-                new_count += 1
-                _refresh_jobs[job_id]["new_articles"] = new_count
+                seen_urls.add(item.get("url"))
+                candidates.append((item, relevant_tickers))
 
             except Exception as e:
                 print(f"Error processing article: {e}")
                 continue
 
+        # Group near-duplicates; only one article per new cluster is scored and embedded
+        clusters = near_duplicate_detector.cluster_articles(db, [item for item, _ in candidates])
+        new_clusters = [c for c in clusters if not c.existing]
+        for cluster in new_clusters:
+            cluster.sentiment_score = 0.0  # Default neutral
+
+        # Analyze sentiment from title and summary (locally, Gemini for uncertain articles)
+        _refresh_jobs[job_id]["message"] = f"Analyzing sentiment for {len(new_clusters)} articles..."
+        scored = [
+            (cluster, f"{item['title']}. {item['summary']}" if item.get("summary") else item["title"])
+            for cluster, item in ((c, candidates[c.representative][0]) for c in new_clusters)
+            if item.get("title")
+        ]
+        if scored:
+            try:
+                results = sentiment_analyzer.analyze_batch([content for _, content in scored])
+                for (cluster, _), result in zip(scored, results):
+                    cluster.sentiment_score = result["score"]
+            except Exception as e:
+                print(f"Error analyzing sentiment: {e}")
+
+        # Pass 2: store articles and their stock links, one commit per batch
+        rows = [
+            {
+                "title": item.get("title", ""),
+                "source": item.get("source", "Unknown"),
+                "url": item.get("url"),
+                "published_at": item.get("published_at") or datetime.now(),
+                "summary": item.get("summary", item.get("title", "")),
+                "symbols": relevant_tickers
+            }
+            for item, relevant_tickers in candidates
+        ]
+        writer = ArticleWriter(db, stock_ids)
+        try:
+            for batch in writer.write(rows, clusters):
+                for stored in batch:
+                    if not stored.representative:
+                        continue  # Near-duplicates share the representative's vector
+
+                    row = rows[stored.index]
+                    # Queue for semantic search indexing
+                    pipeline.add(
+                        stored.article_id,
+                        row["title"],
+                        {
+                            "title": row["title"],
+                            "source": row["source"],
+                            "published_at": str(row["published_at"]),
+                            "sentiment_score": stored.cluster.sentiment_score,
+                            "stocks": row["symbols"]
+                        }
+                    )
+
+                db.commit()
+                new_count += len(batch)
+                _refresh_jobs[job_id]["new_articles"] = new_count
+                _refresh_jobs[job_id]["progress"] = 50 + int((new_count / max(len(candidates), 1)) * 50)
+        except Exception as e:
+            print(f"Error storing articles: {e}")
+            db.rollback()
+            pipeline.discard()
+        else:
+            # Everything fetched is stored - move the feed watermark past it
+            # (after a failed write, or when paging stopped early, the next
+            # refresh fetches the same window)
+            news_cursor_service.advance(db, "actually_free_api", {ALL_TICKERS: articles})
         db.commit()
+        pipeline.flush()
+
+        # Make the new articles searchable by keyword
+        try:
+            keyword_index.update(db)
+        except Exception as e:
+            print(f"[NEWS REFRESH] Keyword index update failed: {e}")
 
-        print(f"[NEWS REFRESH] Completed - New: {new_count}, Already exists: {already_exists_count}, Skipped (not relevant): {skipped_count}")
+        duplicate_count = len(candidates) - len(new_clusters)
+        print(f"[NEWS REFRESH] Completed - New: {new_count} ({duplicate_count} near-duplicates), Already exists: {already_exists_count}, Skipped (not relevant): {skipped_count}")
 
         _refresh_jobs[job_id]["status"] = "completed"
         _refresh_jobs[job_id]["progress"] = 100
@@ -193,6 +214,7 @@ async def _do_refresh_news(job_id: str, portfolio_tickers: set, stock_ids: Dict[
         _refresh_jobs[job_id]["updated_articles"] = updated_count
         _refresh_jobs[job_id]["skipped"] = skipped_count
         _refresh_jobs[job_id]["already_exists"] = already_exists_count
+        _refresh_jobs[job_id]["near_duplicates"] = duplicate_count
         _refresh_jobs[job_id]["message"] = f"Found {new_count} new articles ({already_exists_count} already in database)"
         _refresh_jobs[job_id]["completed_at"] = datetime.now().isoformat()
 
@@ -233,7 +255,7 @@ async def refresh_news(background_tasks: BackgroundTasks, db: Session = Depends(
 
     Returns immediately with a job_id that can be used to poll for status.
     """
-    stocks = db.query(Stock).all()
+    stocks = db.query(Stock).filter(Stock.is_benchmark.is_(False)).all()
 
     if not stocks:
         raise HTTPException(
@@ -3,8 +3,9 @@ from sqlalchemy.orm import Session
 import logging
 
 from backend.app.db.base import get_db
-from backend.app.models import Portfolio, Position, StockPrice
+from backend.app.models import Portfolio, Position
 from backend.app.schemas.portfolio import PortfolioWithStats
+from backend.app.services.price_queries import get_latest_closes
 
 logger = logging.getLogger(__name__)
 
@@ -62,17 +63,16 @@ def calculate_portfolio_stats(db: Session, portfolio_id: int) -> dict:
     total_value = 0.0
     total_cost = 0.0
 
-    for position in positions:
-        # Get latest stock price
-        latest_price = db.query(StockPrice).filter(
-            StockPrice.stock_id == position.stock_id
-        ).order_by(StockPrice.date.desc()).first()
+    # Latest stock prices for all positions in one query
+    latest_closes = get_latest_closes(db, [p.stock_id for p in positions], depth=1)
 
+    for position in positions:
         position_cost = position.shares * position.average_cost
         total_cost += position_cost
 
-        if latest_price:
-            position_value = position.shares * latest_price.close
+        latest = latest_closes.get(position.stock_id)
+        if latest:
+            position_value = position.shares * latest["current_price"]
             total_value += position_value
 
     total_gain_loss = total_value - total_cost
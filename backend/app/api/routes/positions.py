@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Dict
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Dict, Optional, Any
 import logging
 import csv
 import io
@@ -18,11 +18,14 @@ from backend.app.schemas.position import (
 )
 from backend.app.schemas.stock import Stock as StockSchema
 from backend.app.services.alpha_vantage import AlphaVantageService
-from backend.app.services.yahoo_finance import YahooFinanceService
 from backend.app.services.custom_stock_api import CustomStockAPIService
 from backend.app.services.gemini_service import GeminiService
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.vector_store import get_vector_store
+from backend.app.services.embedding_pipeline import EmbeddingPipeline
 from backend.app.services.background_jobs import background_job_service, JobStatus
+from backend.app.services.price_ingestion import price_ingestion
+from backend.app.services.price_fetcher import price_fetcher
+from backend.app.services.price_queries import get_latest_closes
 from backend.app.core.config import settings
 from datetime import datetime, timedelta
 
@@ -30,10 +33,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 alpha_vantage = AlphaVantageService(settings.ALPHA_VANTAGE_API_KEY)
-yahoo_finance = YahooFinanceService()
 custom_api = CustomStockAPIService()
 gemini_service = GeminiService()
-vector_store = VectorStoreService()
+vector_store = get_vector_store()
 
 # Trading 212 ticker symbol mapping to standard US tickers
 TRADING212_SYMBOL_MAP = {
@@ -71,36 +73,16 @@ async def fetch_prices_and_news_background(stock_id: int, stock_symbol: str, job
         try:
             logger.info(f"[{job_id}] Fetching price data for {stock_symbol}")
 
-            # Try Yahoo Finance first
-            prices = yahoo_finance.get_daily_prices(stock_symbol, days=100)
-
-            if not prices:
-                # Fallback to Alpha Vantage
-                logger.info(f"[{job_id}] Yahoo Finance failed, trying Alpha Vantage")
-                prices = alpha_vantage.get_daily_prices(stock_symbol, outputsize="compact")
+            # Providers are tried in configured order with rate limiting and hedging
+            prices = await price_fetcher.fetch(stock_symbol, days=100)
 
             if prices:
-                for price_data in prices:
-                    # Check if price already exists
-                    existing = db.query(StockPrice).filter(
-                        StockPrice.stock_id == stock_id,
-                        StockPrice.date == price_data["date"]
-                    ).first()
-
-                    if not existing:
-                        db_price = StockPrice(
-                            stock_id=stock_id,
-                            date=price_data["date"],
-                            open=price_data["open"],
-                            close=price_data["close"],
-                            high=price_data["high"],
-                            low=price_data["low"],
-                            volume=price_data["volume"]
-                        )
-                        db.add(db_price)
-                        prices_count += 1
-
-                db.commit()
+                result = price_ingestion.upsert_prices(
+                    db,
+                    [{**p, "stock_id": stock_id} for p in prices],
+                    symbols={stock_id: stock_symbol}
+                )
+                prices_count = result["inserted"]
                 logger.info(f"[{job_id}] Added {prices_count} price records for {stock_symbol}")
         except Exception as e:
             logger.error(f"[{job_id}] Error fetching prices for {stock_symbol}: {e}")
@@ -118,6 +100,8 @@ async def fetch_prices_and_news_background(stock_id: int, stock_symbol: str, job
                 limit=50
             )
 
+            pipeline = EmbeddingPipeline(gemini_service, vector_store, before_flush=db.commit)
+
             for item in news_items:
                 # Check if article already exists
                 existing = db.query(NewsArticle).filter(
@@ -143,28 +127,23 @@ async def fetch_prices_and_news_background(stock_id: int, stock_symbol: str, job
                     )
                     db.add(article_stock)
 
-                    # Generate embedding
-                    try:
-                        content = f"{item['title']}. {item['summary']}"
-                        embedding = gemini_service.generate_embedding(content)
-                        vector_store.add_article(
-                            article_id=article.id,
-                            content=content,
-                            embedding=embedding,
-                            metadata={
-                                "title": item["title"],
-                                "source": item["source"],
-                                "published_at": str(item["published_at"]),
-                                "sentiment_score": item["overall_sentiment_score"],
-                                "stocks": [stock_symbol]
-                            }
-                        )
-                    except Exception as e:
-                        logger.warning(f"[{job_id}] Could not add article to vector store: {e}")
+                    # Queue for batched embedding
+                    pipeline.add(
+                        article.id,
+                        f"{item['title']}. {item['summary']}",
+                        {
+                            "title": item["title"],
+                            "source": item["source"],
+                            "published_at": str(item["published_at"]),
+                            "sentiment_score": item["overall_sentiment_score"],
+                            "stocks": [stock_symbol]
+                        }
+                    )
 
                     news_count += 1
 
             db.commit()
+            pipeline.flush()
             logger.info(f"[{job_id}] Added {news_count} news articles for {stock_symbol}")
         except Exception as e:
             logger.error(f"[{job_id}] Error fetching news for {stock_symbol}: {e}")
@@ -204,18 +183,24 @@ def get_positions(portfolio_id: int = None, db: Session = Depends(get_db)):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Portfolio with id {portfolio_id} not found"
             )
-        positions = db.query(Position).filter(Position.portfolio_id == portfolio_id).all()
     else:
         # Get active portfolio's positions
         portfolio = db.query(Portfolio).filter(Portfolio.is_active == True).first()
         if not portfolio:
             return []
-        positions = db.query(Position).filter(Position.portfolio_id == portfolio.id).all()
+
+    # Load positions with their stocks in one query
+    positions = db.query(Position).options(
+        joinedload(Position.stock)
+    ).filter(Position.portfolio_id == portfolio.id).all()
+
+    # Latest and previous close for all positions in one query
+    latest_closes = get_latest_closes(db, [p.stock_id for p in positions])
 
     # Enrich with details
     result = []
     for position in positions:
-        details = get_position_details(db, position)
+        details = get_position_details(db, position, latest_closes)
         result.append(details)
 
     return result
@@ -273,6 +258,9 @@ async def create_position(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Could not find stock: {position_data.stock_symbol}"
             )
+    elif stock.is_benchmark:
+        # Held benchmark index (e.g. SPY) becomes a regular portfolio stock
+        stock.is_benchmark = False
 
     # Check if position already exists
     existing_position = db.query(Position).filter(
@@ -448,22 +436,28 @@ def delete_position(position_id: int, db: Session = Depends(get_db)):
         )
 
 
-def get_position_details(db: Session, position: Position) -> PositionWithDetails:
-    """Enrich position with stock details and calculated metrics."""
-    stock = db.query(Stock).filter(Stock.id == position.stock_id).first()
+def get_position_details(
+    db: Session,
+    position: Position,
+    latest_closes: Optional[Dict[int, Dict[str, Any]]] = None
+) -> PositionWithDetails:
+    """
+    Enrich position with stock details and calculated metrics.
 
-    # Get latest price
-    latest_price_record = db.query(StockPrice).filter(
-        StockPrice.stock_id == position.stock_id
-    ).order_by(StockPrice.date.desc()).first()
+    Args:
+        db: Database session
+        position: Position to enrich
+        latest_closes: Optional prefetched result of get_latest_closes;
+            queried for this position alone if not provided
+    """
+    stock = position.stock
 
-    # Get previous day's price for day change calculation
-    previous_price_record = db.query(StockPrice).filter(
-        StockPrice.stock_id == position.stock_id
-    ).order_by(StockPrice.date.desc()).offset(1).first()
+    if latest_closes is None:
+        latest_closes = get_latest_closes(db, [position.stock_id])
 
-    current_price = latest_price_record.close if latest_price_record else None
-    previous_close = previous_price_record.close if previous_price_record else None
+    latest = latest_closes.get(position.stock_id)
+    current_price = latest["current_price"] if latest else None
+    previous_close = latest["previous_close"] if latest else None
 
     # Calculate metrics
     total_cost = position.shares * position.average_cost
@@ -535,6 +529,7 @@ async def import_positions_from_csv(
         updated_count = 0
         skipped_count = 0
         errors = []
+        stocks_needing_prices: Dict[str, Stock] = {}
 
         logger.info(f"Starting CSV import. CSV headers: {csv_reader.fieldnames}")
 
@@ -608,6 +603,8 @@ async def import_positions_from_csv(
                         db.add(stock)
                         db.flush()
                         is_new_stock = True
+                elif stock.is_benchmark:
+                    stock.is_benchmark = False
 
                 # Check if position already exists
                 existing_position = db.query(Position).filter(
@@ -635,63 +632,33 @@ async def import_positions_from_csv(
 
                 # Fetch price data for new stocks OR stocks without price data
                 existing_price_count = db.query(StockPrice).filter(StockPrice.stock_id == stock.id).count()
-                needs_price_data = is_new_stock or existing_price_count == 0
-
-                if needs_price_data:
-                    prices = []
-
-                    # Try Finnhub first (primary source)
-                    try:
-                        logger.info(f"Fetching price data for stock: {stock.symbol} (new={is_new_stock}, existing_prices={existing_price_count})")
-                        prices = finnhub_service.get_daily_prices(stock.symbol, days=100)
-                        if prices:
-                            logger.info(f"Finnhub: Received {len(prices)} price records for {stock.symbol}")
-                        else:
-                            logger.warning(f"Finnhub returned no data for {stock.symbol}")
-                    except Exception as e:
-                        logger.warning(f"Finnhub failed for {stock.symbol}: {str(e)}")
-
-                        # Fallback to Yahoo Finance if Finnhub fails
-                        logger.info(f"Trying Yahoo Finance fallback for {stock.symbol}")
-                        try:
-                            prices = yahoo_finance.get_daily_prices(stock.symbol, days=100)
-                            if prices:
-                                logger.info(f"Yahoo Finance: Received {len(prices)} price records for {stock.symbol}")
-                            else:
-                                logger.warning(f"Yahoo Finance returned no data for {stock.symbol}")
-                        except Exception as yf_error:
-                            logger.error(f"Yahoo Finance also failed for {stock.symbol}: {str(yf_error)}")
-
-                    # Save price data if we got any
-                    if prices:
-                        try:
-                            price_count = 0
-                            for price_data in prices:
-                                db_price = StockPrice(
-                                    stock_id=stock.id,
-                                    date=price_data["date"],
-                                    open=price_data["open"],
-                                    close=price_data["close"],
-                                    high=price_data["high"],
-                                    low=price_data["low"],
-                                    volume=price_data["volume"]
-                                )
-                                db.add(db_price)
-                                price_count += 1
-
-                            db.commit()
-                            logger.info(f"Successfully committed {price_count} price records for {stock.symbol}")
-                        except Exception as save_error:
-                            logger.error(f"Failed to save price data for {stock.symbol}: {str(save_error)}")
-                            logger.exception(save_error)
-                    else:
-                        logger.warning(f"No price data available for {stock.symbol} from any source")
+                if is_new_stock or existing_price_count == 0:
+                    stocks_needing_prices[stock.symbol] = stock
 
             except Exception as e:
                 logger.error(f"Error processing row {row_num}: {str(e)}")
                 errors.append(f"Row {row_num}: {str(e)}")
                 continue
 
+        # Fetch price history for all stocks that need it concurrently
+        if stocks_needing_prices:
+            logger.info(f"Fetching price data for {len(stocks_needing_prices)} stocks")
+            fetched = await price_fetcher.fetch_many(list(stocks_needing_prices), days=100)
+
+            for symbol, stock in stocks_needing_prices.items():
+                prices = fetched.get(symbol.upper())
+                if not prices:
+                    logger.warning(f"No price data available for {symbol} from any source")
+                    continue
+
+                try:
+                    result = price_ingestion.upsert_stock_prices(db, stock, prices)
+                    price_count = result["inserted"] + result["updated"]
+                    logger.info(f"Successfully committed {price_count} price records for {symbol}")
+                except Exception as save_error:
+                    logger.error(f"Failed to save price data for {symbol}: {str(save_error)}")
+                    logger.exception(save_error)
+
         return {
             "message": "CSV import completed",
             "created": created_count,
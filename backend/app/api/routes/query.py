@@ -5,14 +5,54 @@ from typing import List, Dict, Any
 from datetime import datetime, timedelta
 
 from backend.app.db.base import get_db
-from backend.app.models import NewsArticle, Stock, ArticleStock, StockPrice
+from backend.app.models import NewsArticle, Stock, ArticleStock
 from backend.app.schemas.query import QueryRequest, QueryResponse, PortfolioSummary
 from backend.app.services.gemini_service import GeminiService
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.vector_store import get_vector_store
+from backend.app.services.price_queries import get_latest_closes
+from backend.app.services.hybrid_search import create_retriever
 
 router = APIRouter()
 gemini_service = GeminiService()
-vector_store = VectorStoreService()
+vector_store = get_vector_store()
+retriever = create_retriever(gemini_service, vector_store)
+
+
+def _article_context(db: Session, article_ids: List[int]) -> List[Dict[str, Any]]:
+    """Load articles for the RAG context, in retrieval order."""
+    articles = {
+        article.id: article
+        for article in db.query(NewsArticle).filter(NewsArticle.id.in_(article_ids)).all()
+    }
+
+    context = []
+    for article_id in article_ids:
+        article = articles.get(article_id)
+        if article is None:
+            continue  # Deleted since it was indexed
+        context.append({
+            "id": article.id,
+            "title": article.title,
+            "source": article.source,
+            "published_at": str(article.published_at) if article.published_at else None,
+            "summary": article.summary,
+            "sentiment_score": article.sentiment_score,
+            "stocks": [as_.stock.symbol for as_ in article.stocks],
+            "url": article.url
+        })
+    return context
+
+
+def _sources(context: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Format context articles as response sources."""
+    return [{
+        "id": ctx["id"],
+        "title": ctx["title"],
+        "source": ctx["source"],
+        "url": ctx["url"],
+        "published_at": ctx["published_at"],
+        "stocks": ctx["stocks"]
+    } for ctx in context]
 
 
 @router.post("/ask", response_model=QueryResponse)
@@ -21,51 +61,34 @@ def ask_question(query: QueryRequest, db: Session = Depends(get_db)):
     Answer a natural language question about the portfolio using RAG.
 
     The system will:
-    1. Generate an embedding for the question
-    2. Search for relevant articles in the vector store
+    1. Request an embedding for the question (in the background)
+    2. Search the keyword index and the vector store, fusing both rankings
     3. Retrieve full article details from PostgreSQL
     4. Use Gemini to generate an answer based on the context
     """
     try:
+        # The embedding is generated while the question is checked and keywords are searched
+        embedding = retriever.start_embedding(query.question)
+
         # Check if question is finance-related first
         if not gemini_service.is_finance_related(query.question):
+            embedding.cancel()
             return QueryResponse(
                 answer="I'm sorry, but I can only answer questions related to finance, stocks, investing, and your portfolio. Please ask a question about financial markets, companies, or your investments.",
                 sources=[]
             )
 
-        # Generate query embedding
-        query_embedding = gemini_service.generate_query_embedding(query.question)
+        # Search keyword index and vector store for relevant articles
+        retrieved = retriever.search(query.question, query.context_limit, embedding=embedding)
 
-        # Search vector store for relevant articles
-        similar_articles = vector_store.search_similar(
-            query_embedding=query_embedding,
-            n_results=query.context_limit
-        )
-
-        if not similar_articles:
+        if not retrieved:
             return QueryResponse(
                 answer="I don't have enough information to answer that question. Try refreshing the news data or adding more stocks to your portfolio.",
                 sources=[]
             )
 
         # Retrieve full article details from database
-        article_ids = [article['article_id'] for article in similar_articles]
-        articles = db.query(NewsArticle).filter(NewsArticle.id.in_(article_ids)).all()
-
-        # Build context for Gemini
-        context = []
-        for article in articles:
-            stock_symbols = [as_.stock.symbol for as_ in article.stocks]
-            context.append({
-                "title": article.title,
-                "source": article.source,
-                "published_at": str(article.published_at) if article.published_at else None,
-                "summary": article.summary,
-                "sentiment_score": article.sentiment_score,
-                "stocks": stock_symbols,
-                "url": article.url
-            })
+        context = _article_context(db, [article.article_id for article in retrieved])
 
         # Generate answer using Gemini (with context)
         answer = gemini_service.answer_question(
@@ -73,19 +96,9 @@ def ask_question(query: QueryRequest, db: Session = Depends(get_db)):
             context=context
         )
 
-        # Format sources for response
-        sources = [{
-            "id": article["id"] if isinstance(article, dict) and "id" in article else idx,
-            "title": ctx["title"],
-            "source": ctx["source"],
-            "url": ctx["url"],
-            "published_at": ctx["published_at"],
-            "stocks": ctx["stocks"]
-        } for idx, ctx in enumerate(context)]
-
         return QueryResponse(
             answer=answer,
-            sources=sources,
+            sources=_sources(context),
             confidence=0.85  # Could be calculated based on similarity scores
         )
 
@@ -96,10 +109,32 @@ def ask_question(query: QueryRequest, db: Session = Depends(get_db)):
         )
 
 
+@router.post("/search", response_model=Dict[str, Any])
+def search_sources(query: QueryRequest, db: Session = Depends(get_db)):
+    """
+    Keyword search over stored articles, without embedding or LLM calls.
+
+    Returns the articles an /ask request would most likely cite, so the
+    chat page can show sources while the answer is being generated.
+    """
+    try:
+        retrieved = retriever.keyword_search(query.question, query.context_limit)
+        context = _article_context(db, [article.article_id for article in retrieved])
+        return {
+            "sources": _sources(context),
+            "retrieval": "keyword"
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching articles: {str(e)}"
+        )
+
+
 @router.get("/portfolio-summary", response_model=PortfolioSummary)
 def get_portfolio_summary(db: Session = Depends(get_db)):
     """Get a comprehensive summary of the portfolio."""
-    stocks = db.query(Stock).all()
+    stocks = db.query(Stock).filter(Stock.is_benchmark.is_(False)).all()
 
     if not stocks:
         return PortfolioSummary(
@@ -111,23 +146,23 @@ def get_portfolio_summary(db: Session = Depends(get_db)):
     # Calculate portfolio metrics
     stock_performances = []
 
+    # Latest two closes for all stocks in one query
+    latest_closes = get_latest_closes(db, [s.id for s in stocks])
+
     for stock in stocks:
-        # Get latest two prices
-        latest_prices = db.query(StockPrice).filter(
-            StockPrice.stock_id == stock.id
-        ).order_by(StockPrice.date.desc()).limit(2).all()
+        latest = latest_closes.get(stock.id)
 
-        if len(latest_prices) >= 2:
-            current = latest_prices[0]
-            previous = latest_prices[1]
+        if latest and latest["previous_close"]:
+            current = latest["current_price"]
+            previous = latest["previous_close"]
 
-            change = current.close - previous.close
-            change_percent = (change / previous.close) * 100
+            change = current - previous
+            change_percent = (change / previous) * 100
 
             stock_performances.append({
                 "symbol": stock.symbol,
                 "name": stock.name,
-                "price": current.close,
+                "price": current,
                 "change": round(change, 2),
                 "change_percent": round(change_percent, 2)
             })
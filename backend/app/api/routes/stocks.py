@@ -6,12 +6,15 @@ from datetime import datetime, timedelta
 import os
 
 from backend.app.db.base import get_db
-from backend.app.models import Stock, StockPrice
+from backend.app.models import Stock
 from backend.app.schemas.stock import Stock as StockSchema, StockCreate, StockWithPrice
 from backend.app.services.alpha_vantage import AlphaVantageService
 from backend.app.services.custom_stock_api import CustomStockAPIService
 from backend.app.services.logo_service import logo_service
 from backend.app.services.unified_price_service import unified_price_service
+from backend.app.services.price_matrix import price_matrix
+from backend.app.services.price_ingestion import price_ingestion
+from backend.app.services.price_queries import get_latest_closes
 from backend.app.core.config import settings
 import logging
 
@@ -22,40 +25,34 @@ av_service = AlphaVantageService()
 custom_api = CustomStockAPIService()
 
 
-@router.get("/", response_model=List[StockWithPrice])
-def list_stocks(db: Session = Depends(get_db)):
-    """Get all stocks in portfolio with current prices."""
-    stocks = db.query(Stock).all()
+def _stock_with_price(stock: Stock, latest: Optional[dict]) -> StockWithPrice:
+    """Build a StockWithPrice from a stock and its latest/previous close."""
+    stock_dict = StockSchema.from_orm(stock).dict()
 
-    result = []
-    for stock in stocks:
-        # Get latest price
-        latest_price = db.query(StockPrice).filter(
-            StockPrice.stock_id == stock.id
-        ).order_by(StockPrice.date.desc()).first()
+    # Always add logo URL (will use default if specific logo doesn't exist)
+    stock_dict["logo_url"] = f"/api/stocks/{stock.symbol}/logo/"
 
-        stock_dict = StockSchema.from_orm(stock).dict()
+    if latest:
+        stock_dict["current_price"] = latest["current_price"]
+        previous_close = latest["previous_close"]
+        if previous_close:
+            change = latest["current_price"] - previous_close
+            change_percent = (change / previous_close) * 100
+            stock_dict["price_change"] = round(change, 2)
+            stock_dict["price_change_percent"] = round(change_percent, 2)
 
-        # Always add logo URL (will use default if specific logo doesn't exist)
-        stock_dict["logo_url"] = f"/api/stocks/{stock.symbol}/logo/"
+    return StockWithPrice(**stock_dict)
 
-        if latest_price:
-            # Get previous day's price for comparison
-            prev_price = db.query(StockPrice).filter(
-                StockPrice.stock_id == stock.id,
-                StockPrice.date < latest_price.date
-            ).order_by(StockPrice.date.desc()).first()
 
-            stock_dict["current_price"] = latest_price.close
-            if prev_price:
-                change = latest_price.close - prev_price.close
-                change_percent = (change / prev_price.close) * 100
-                stock_dict["price_change"] = round(change, 2)
-                stock_dict["price_change_percent"] = round(change_percent, 2)
+@router.get("/", response_model=List[StockWithPrice])
+def list_stocks(db: Session = Depends(get_db)):
+    """Get all stocks in portfolio with current prices."""
+    stocks = db.query(Stock).filter(Stock.is_benchmark.is_(False)).all()
 
-        result.append(StockWithPrice(**stock_dict))
+    # Latest and previous close for all stocks in one query
+    latest_closes = get_latest_closes(db, [stock.id for stock in stocks])
 
-    return result
+    return [_stock_with_price(stock, latest_closes.get(stock.id)) for stock in stocks]
 
 
 @router.post("/", response_model=StockSchema, status_code=status.HTTP_201_CREATED)
@@ -63,6 +60,12 @@ def add_stock(stock_data: StockCreate, db: Session = Depends(get_db)):
     """Add a new stock to portfolio."""
     # Check if stock already exists
     existing = db.query(Stock).filter(Stock.symbol == stock_data.symbol.upper()).first()
+    if existing and existing.is_benchmark:
+        # Already tracked as a benchmark index - promote it to a portfolio stock
+        existing.is_benchmark = False
+        db.commit()
+        db.refresh(existing)
+        return existing
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -106,30 +109,9 @@ def get_stock(symbol: str, db: Session = Depends(get_db)):
             detail=f"Stock {symbol} not found"
         )
 
-    # Get latest price
-    latest_price = db.query(StockPrice).filter(
-        StockPrice.stock_id == stock.id
-    ).order_by(StockPrice.date.desc()).first()
-
-    stock_dict = StockSchema.from_orm(stock).dict()
-
-    # Always add logo URL (will use default if specific logo doesn't exist)
-    stock_dict["logo_url"] = f"/api/stocks/{stock.symbol}/logo/"
-
-    if latest_price:
-        prev_price = db.query(StockPrice).filter(
-            StockPrice.stock_id == stock.id,
-            StockPrice.date < latest_price.date
-        ).order_by(StockPrice.date.desc()).first()
-
-        stock_dict["current_price"] = latest_price.close
-        if prev_price:
-            change = latest_price.close - prev_price.close
-            change_percent = (change / prev_price.close) * 100
-            stock_dict["price_change"] = round(change, 2)
-            stock_dict["price_change_percent"] = round(change_percent, 2)
+    latest_closes = get_latest_closes(db, [stock.id])
 
-    return StockWithPrice(**stock_dict)
+    return _stock_with_price(stock, latest_closes.get(stock.id))
 
 
 @router.delete("/{symbol}", status_code=status.HTTP_204_NO_CONTENT)
@@ -144,6 +126,7 @@ def delete_stock(symbol: str, db: Session = Depends(get_db)):
 
     db.delete(stock)
     db.commit()
+    price_matrix.drop_stock(stock.id)
     return None
 
 
@@ -162,32 +145,12 @@ def refresh_stock_data(symbol: str, db: Session = Depends(get_db)):
         prices = av_service.get_daily_prices(symbol, outputsize="compact")
 
         # Update database
-        count = 0
-        for price_data in prices:
-            # Check if price already exists
-            existing = db.query(StockPrice).filter(
-                StockPrice.stock_id == stock.id,
-                StockPrice.date == price_data["date"]
-            ).first()
-
-            if not existing:
-                db_price = StockPrice(
-                    stock_id=stock.id,
-                    date=price_data["date"],
-                    open=price_data["open"],
-                    close=price_data["close"],
-                    high=price_data["high"],
-                    low=price_data["low"],
-                    volume=price_data["volume"]
-                )
-                db.add(db_price)
-                count += 1
-
-        db.commit()
+        result = price_ingestion.upsert_stock_prices(db, stock, prices)
 
         return {
             "message": f"Successfully refreshed data for {symbol}",
-            "new_records": count
+            "new_records": result["inserted"],
+            "updated_records": result["updated"]
         }
     except Exception as e:
         raise HTTPException(
@@ -210,22 +173,19 @@ def get_stock_prices(symbol: str, days: int = 30, db: Session = Depends(get_db))
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
 
-    # Fetch prices from database
-    prices = db.query(StockPrice).filter(
-        StockPrice.stock_id == stock.id,
-        StockPrice.date >= start_date
-    ).order_by(StockPrice.date.asc()).all()
+    # Read prices from the in-memory price matrix
+    series = price_matrix.ensure_loaded(db).series(stock.id, start=start_date.date())
 
     return [
         {
-            "date": price.date.isoformat(),
-            "open": price.open,
-            "close": price.close,
-            "high": price.high,
-            "low": price.low,
-            "volume": price.volume
+            "date": price["date"].isoformat(),
+            "open": price["open"],
+            "close": price["close"],
+            "high": price["high"],
+            "low": price["low"],
+            "volume": price["volume"]
         }
-        for price in prices
+        for price in series.to_records()
     ]
 
 
@@ -376,45 +336,33 @@ def update_current_prices(db: Session = Depends(get_db)):
         if not prices:
             raise HTTPException(status_code=500, detail="Failed to fetch prices from API")
 
-        updated_count = 0
         today = datetime.now().date()
 
-        for ticker, price_eur in prices.items():
-            # Find the stock in database
-            stock = db.query(Stock).filter(Stock.symbol == ticker).first()
-
-            if not stock:
-                logger.debug(f"Stock {ticker} not in database, skipping")
-                continue
-
-            # Check if today's price already exists
-            existing_price = db.query(StockPrice).filter(
-                StockPrice.stock_id == stock.id,
-                StockPrice.date == today
-            ).first()
-
-            if existing_price:
-                # Update existing price
-                existing_price.close = price_eur
-                existing_price.open = price_eur
-                existing_price.high = price_eur
-                existing_price.low = price_eur
-            else:
-                # Create new price record
-                new_price = StockPrice(
-                    stock_id=stock.id,
-                    date=today,
-                    open=price_eur,
-                    high=price_eur,
-                    low=price_eur,
-                    close=price_eur,
-                    volume=0
-                )
-                db.add(new_price)
-
-            updated_count += 1
-
-        db.commit()
+        # Find the stocks in database
+        stocks = db.query(Stock).filter(Stock.symbol.in_(list(prices.keys()))).all()
+        skipped = len(prices) - len(stocks)
+        if skipped:
+            logger.debug(f"{skipped} tickers not in database, skipping")
+
+        # Upsert today's price; an existing row keeps its volume
+        rows = [
+            {
+                "stock_id": stock.id,
+                "date": today,
+                "open": prices[stock.symbol],
+                "high": prices[stock.symbol],
+                "low": prices[stock.symbol],
+                "close": prices[stock.symbol],
+                "volume": 0
+            }
+            for stock in stocks
+        ]
+        price_ingestion.upsert_prices(
+            db, rows,
+            update_columns=("open", "high", "low", "close"),
+            symbols={stock.id: stock.symbol for stock in stocks}
+        )
+        updated_count = len(rows)
 
         logger.info(f"Updated prices for {updated_count} stocks")
 
@@ -5,8 +5,10 @@ import logging
 from backend.app.core.config import settings
 from backend.app.api.routes import stocks, news, query, portfolios, positions, stock_actions, admin, websocket
 from backend.app.api.routes import research, roboadvisor
-from backend.app.db.base import engine, Base
+from backend.app.db.base import engine, Base, SessionLocal
 from backend.app.services.scheduler import scheduler_service
+from backend.app.services.price_matrix import price_matrix
+from backend.app.services.http_client import http_client
 
 # Configure logging
 logging.basicConfig(
@@ -49,7 +51,7 @@ app.include_router(roboadvisor.router, prefix="/api/roboadvisor", tags=["roboadv
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables and start scheduler on startup."""
+    """Initialize database tables, load price matrix and start scheduler on startup."""
     logger.info("Starting up Portfolio Intelligence Dashboard API")
 
     # Create all tables
@@ -59,6 +61,15 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
 
+    # Load price history into the in-memory price matrix
+    db = SessionLocal()
+    try:
+        price_matrix.load(db)
+    except Exception as e:
+        logger.error(f"Error loading price matrix: {e}")
+    finally:
+        db.close()
+
     # Start scheduler
     try:
         scheduler_service.start()
@@ -79,6 +90,10 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error shutting down scheduler: {e}")
 
+    # Close pooled HTTP connections
+    await http_client.aclose()
+    http_client.close()
+
 
 @app.get("/")
 def root():
@@ -9,6 +9,10 @@ from backend.app.models.target_allocation import TargetAllocation
 from backend.app.models.recommendation import Recommendation
 from backend.app.models.risk_score import RiskScore
 from backend.app.models.paper_trade import PaperTrade
+from backend.app.models.embedding_cache import EmbeddingCacheEntry
+from backend.app.models.sentiment_cache import SentimentCacheEntry
+from backend.app.models.news_cursor import NewsCursor
+from backend.app.models.intraday_price import IntradayPrice
 
 __all__ = [
     "Stock",
@@ -21,5 +25,9 @@ __all__ = [
     "TargetAllocation",
     "Recommendation",
     "RiskScore",
-    "PaperTrade"
+    "PaperTrade",
+    "EmbeddingCacheEntry",
+    "SentimentCacheEntry",
+    "NewsCursor",
+    "IntradayPrice"
 ]
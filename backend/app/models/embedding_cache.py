@@ -0,0 +1,31 @@
+"""
+Embedding cache model.
+
+Stores embedding vectors keyed by a hash of the embedded text, model and task
+so identical text is only sent to an embedding API once.
+"""
+
+from sqlalchemy import Column, String, Integer, LargeBinary, DateTime
+from datetime import datetime
+
+from backend.app.db.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """Cached embedding vector for one (text, model, task) combination."""
+
+    __tablename__ = "embedding_cache"
+
+    # sha256 of model + task + normalized text
+    key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    task = Column(String(50), nullable=False)
+    dimension = Column(Integer, nullable=False)
+
+    # float32 vector bytes
+    embedding = Column(LargeBinary, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<EmbeddingCacheEntry(model='{self.model}', task='{self.task}', key='{self.key[:12]}')>"
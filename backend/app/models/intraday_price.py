@@ -0,0 +1,30 @@
+"""
+Intraday price model.
+
+Stores the latest trade price of held stocks at each intraday refresh, so
+the dashboard can draw today's price line without calling a price API.
+Only a few days are kept.
+"""
+
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+
+from backend.app.db.base import Base
+
+
+class IntradayPrice(Base):
+    """One price snapshot of a stock during a trading session."""
+
+    __tablename__ = "intraday_prices"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stock_id = Column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
+    timestamp = Column(DateTime(timezone=True), nullable=False)  # UTC time of the refresh
+    price = Column(Float, nullable=False)
+    volume = Column(Integer, nullable=True)  # Session volume so far
+
+    __table_args__ = (
+        Index('ix_intraday_prices_stock_timestamp', 'stock_id', 'timestamp'),
+    )
+
+    def __repr__(self):
+        return f"<IntradayPrice(stock_id={self.stock_id}, timestamp={self.timestamp}, price={self.price})>"
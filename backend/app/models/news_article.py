@@ -16,6 +16,7 @@ class NewsArticle(Base):
     published_at = Column(DateTime(timezone=True), nullable=True, index=True)
     summary = Column(Text, nullable=True)
     sentiment_score = Column(Float, nullable=True)  # -1.0 (negative) to 1.0 (positive)
+    cluster_id = Column(Integer, nullable=True, index=True)  # id of the cluster's representative article
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -0,0 +1,33 @@
+"""
+News cursor model.
+
+Stores the newest publication time seen per news source and ticker so each
+collection run only asks the source for articles newer than that.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from datetime import datetime
+
+from backend.app.db.base import Base
+
+
+class NewsCursor(Base):
+    """High-water mark for one (source, ticker) news feed."""
+
+    __tablename__ = "news_cursors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(50), nullable=False)  # e.g. "actually_free_api", "alpha_vantage"
+    ticker = Column(String(20), nullable=False)  # "*" for the unfiltered feed
+
+    # Newest published_at seen in this feed (UTC)
+    last_published_at = Column(DateTime(timezone=True), nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('source', 'ticker', name='uix_news_cursor_source_ticker'),
+    )
+
+    def __repr__(self):
+        return f"<NewsCursor(source='{self.source}', ticker='{self.ticker}', last={self.last_published_at})>"
@@ -0,0 +1,33 @@
+"""
+Sentiment cache model.
+
+Stores sentiment results keyed by a hash of the normalized article text so
+syndicated copies of a story are only scored once.
+"""
+
+from sqlalchemy import Column, String, Float, DateTime
+from datetime import datetime
+
+from backend.app.db.base import Base
+
+
+class SentimentCacheEntry(Base):
+    """Cached sentiment result for one normalized title + summary."""
+
+    __tablename__ = "sentiment_cache"
+
+    # sha256 of normalized text
+    key = Column(String(64), primary_key=True)
+
+    score = Column(Float, nullable=False)
+    label = Column(String(20), nullable=False)
+    confidence = Column(Float, nullable=False)
+
+    # Scorer that produced the result, e.g. "gemini:gemini-pro" or "local:lexicon-v1"
+    model_version = Column(String(100), nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SentimentCacheEntry(key='{self.key[:12]}', score={self.score}, model='{self.model_version}')>"
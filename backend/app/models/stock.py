@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Boolean
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, expression
 from backend.app.db.base import Base
 
 
@@ -14,6 +14,7 @@ class Stock(Base):
     name = Column(String(255), nullable=False)
     sector = Column(String(100), nullable=True)
     logo_filename = Column(String(255), nullable=True)  # Filename of logo (e.g., "AAPL.png")
+    is_benchmark = Column(Boolean, nullable=False, default=False, server_default=expression.false(), index=True)  # Index tracked only for beta (e.g., SPY)
     added_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
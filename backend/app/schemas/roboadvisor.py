@@ -80,6 +80,9 @@ class PortfolioRiskResponse(BaseModel):
     total_value: float
     position_count: int
     position_risks: List[StockRiskResponse]
+    portfolio_volatility: Optional[float] = None
+    portfolio_beta: Optional[float] = None
+    correlation: Optional[Dict[str, Dict[str, float]]] = None
     calculated_at: str
 
 
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 import logging
 from backend.app.core.config import settings
 from backend.app.services.currency_converter import currency_converter
+from backend.app.services.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ class AlphaVantageService:
         params["apikey"] = self.api_key
 
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = http_client.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
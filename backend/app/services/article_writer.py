@@ -0,0 +1,202 @@
+"""
+Bulk persistence for collected news articles.
+
+Features:
+- Articles are inserted with one INSERT ... ON CONFLICT (url) DO NOTHING
+  RETURNING id statement per batch; URLs stored concurrently are skipped
+- Stock links are resolved from a preloaded symbol -> id map and inserted
+  with one statement per batch
+- Near-duplicate clusters are written representative first, so the other
+  members carry its id as their cluster id
+- Callers commit once per yielded batch instead of once per article
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Iterator
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from backend.app.models import Stock, NewsArticle, ArticleStock
+from backend.app.services.near_duplicates import ArticleCluster
+
+logger = logging.getLogger(__name__)
+
+
+def load_symbol_ids(db: Session) -> Dict[str, int]:
+    """Map upper-case stock symbols to stock ids."""
+    return {symbol.upper(): stock_id for stock_id, symbol in db.query(Stock.id, Stock.symbol)}
+
+
+@dataclass
+class StoredArticle:
+    """An article inserted by ArticleWriter."""
+    index: int  # position in the list passed to write()
+    article_id: int
+    cluster: ArticleCluster
+    representative: bool  # first stored article of its cluster (to embed)
+
+
+class ArticleWriter:
+    """
+    Writes clustered articles and their stock links in batches.
+
+    Usage:
+        writer = ArticleWriter(db, load_symbol_ids(db))
+        for stored in writer.write(articles, clusters):
+            ...  # queue representatives for embedding
+            db.commit()
+    """
+
+    def __init__(self, db: Session, symbol_ids: Dict[str, int], batch_size: int = 500):
+        """
+        Initialize article writer.
+
+        Args:
+            db: Database session
+            symbol_ids: Upper-case symbol -> stock id (see load_symbol_ids)
+            batch_size: Articles per batch
+        """
+        self.db = db
+        self.symbol_ids = symbol_ids
+        self.batch_size = batch_size
+        self.stats = {"inserted": 0, "conflicts": 0, "links": 0, "batches": 0}
+
+        dialect = db.get_bind().dialect.name
+        self._insert = pg_insert if dialect == "postgresql" else sqlite_insert
+
+    def write(
+        self,
+        articles: List[Dict[str, Any]],
+        clusters: List[ArticleCluster]
+    ) -> Iterator[List[StoredArticle]]:
+        """
+        Insert articles cluster by cluster, one batch at a time.
+
+        Each article dict needs title, url, source, published_at, summary
+        and "symbols" (tickers to link). Articles take their cluster's
+        sentiment_score; a new cluster's cluster_id is set to the id of its
+        first inserted article. Nothing is committed here.
+
+        Args:
+            articles: Article dicts
+            clusters: Clusters over the article indices
+
+        Yields:
+            Articles inserted in each batch (after the batch is flushed)
+        """
+        batch: List[ArticleCluster] = []
+        size = 0
+
+        for cluster in clusters:
+            batch.append(cluster)
+            size += len(cluster.indices)
+            if size >= self.batch_size:
+                yield self._write_batch(articles, batch)
+                batch, size = [], 0
+
+        if batch:
+            yield self._write_batch(articles, batch)
+
+    # ---------- Internals ----------
+
+    def _write_batch(self, articles: List[Dict[str, Any]], clusters: List[ArticleCluster]) -> List[StoredArticle]:
+        """Insert one batch: cluster representatives, then the other members, then links."""
+        stored: List[StoredArticle] = []
+        remaining = {id(c): list(c.indices) for c in clusters}
+
+        # Representatives of new clusters first; if one's URL was stored in
+        # the meantime, the next member takes its place
+        pending = [c for c in clusters if c.cluster_id is None]
+        while pending:
+            heads = {remaining[id(c)].pop(0): c for c in pending if remaining[id(c)]}
+            if not heads:
+                break
+
+            inserted = self._insert_articles(articles, heads)
+            for index, article_id in inserted.items():
+                heads[index].cluster_id = article_id
+                stored.append(StoredArticle(index, article_id, heads[index], representative=True))
+
+            if inserted:
+                self.db.execute(
+                    update(NewsArticle)
+                    .where(NewsArticle.id.in_(list(inserted.values())))
+                    .values(cluster_id=NewsArticle.id)
+                    .execution_options(synchronize_session=False)
+                )
+            pending = [c for c in heads.values() if c.cluster_id is None]
+
+        # Remaining members join their cluster
+        members = {index: c for c in clusters for index in remaining[id(c)]}
+        for index, article_id in self._insert_articles(articles, members).items():
+            stored.append(StoredArticle(index, article_id, members[index], representative=False))
+
+        self._insert_links(articles, stored)
+        self.db.flush()
+
+        self.stats["batches"] += 1
+        self.stats["inserted"] += len(stored)
+        stored.sort(key=lambda s: s.index)
+        return stored
+
+    def _insert_articles(self, articles: List[Dict[str, Any]], members: Dict[int, ArticleCluster]) -> Dict[int, int]:
+        """Insert articles, skipping stored URLs; returns article index -> new id."""
+        rows = []
+        index_by_url: Dict[str, int] = {}
+        for index, cluster in members.items():
+            article = articles[index]
+            url = article.get("url")
+            if not url or url in index_by_url:
+                continue
+            index_by_url[url] = index
+            rows.append(self._row(article, cluster))
+
+        if not rows:
+            return {}
+
+        table = NewsArticle.__table__
+        stmt = self._insert(table).values(rows).on_conflict_do_nothing(
+            index_elements=[table.c.url]
+        ).returning(table.c.id, table.c.url)
+
+        inserted = {index_by_url[url]: article_id for article_id, url in self.db.execute(stmt)}
+        self.stats["conflicts"] += len(rows) - len(inserted)
+        return inserted
+
+    def _insert_links(self, articles: List[Dict[str, Any]], stored: List[StoredArticle]) -> None:
+        """Link inserted articles to their stocks in one statement."""
+        links = set()
+        for s in stored:
+            for symbol in articles[s.index].get("symbols") or []:
+                stock_id = self.symbol_ids.get(symbol.upper())
+                if stock_id is not None:
+                    links.add((s.article_id, stock_id))
+
+        if not links:
+            return
+
+        table = ArticleStock.__table__
+        stmt = self._insert(table).values(
+            [{"article_id": article_id, "stock_id": stock_id} for article_id, stock_id in links]
+        ).on_conflict_do_nothing(index_elements=[table.c.article_id, table.c.stock_id])
+        self.db.execute(stmt)
+        self.stats["links"] += len(links)
+
+    @staticmethod
+    def _row(article: Dict[str, Any], cluster: ArticleCluster) -> Dict[str, Any]:
+        """Build a news_articles row."""
+        title = article.get("title") or ""
+        return {
+            "title": title[:500],
+            "source": article.get("source"),
+            "url": article["url"],
+            "published_at": article.get("published_at") or datetime.now(),
+            "summary": article.get("summary"),
+            "sentiment_score": cluster.sentiment_score,
+            "cluster_id": cluster.cluster_id
+        }
@@ -0,0 +1,250 @@
+"""
+Benchmark index series stored alongside portfolio prices.
+
+Features:
+- Benchmark indices (SPY, QQQ, ^STOXX50E, ... from settings) kept as flagged
+  `Stock` rows with their history in `stock_prices`
+- Collected by the daily price job in the same batch download as portfolio stocks
+- Served from the in-memory price matrix, so beta needs no network call
+- Incremental on-demand refresh (with cooldown) when the stored series is stale
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional, Dict
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models import Stock
+from backend.app.services.batch_price_service import batch_price_service
+from backend.app.services.price_matrix import price_matrix, PriceSeries
+
+logger = logging.getLogger(__name__)
+
+# Display names for well-known indices; other symbols use the symbol itself
+BENCHMARK_NAMES = {
+    "SPY": "SPDR S&P 500 ETF",
+    "QQQ": "Invesco QQQ (Nasdaq-100)",
+    "^STOXX50E": "EURO STOXX 50",
+    "^GSPC": "S&P 500",
+    "^GDAXI": "DAX",
+}
+
+
+class BenchmarkService:
+    """Keeps benchmark index series in the database and serves them from memory."""
+
+    def __init__(self, refresh_cooldown: int = 900):
+        """
+        Initialize benchmark service.
+
+        Args:
+            refresh_cooldown: Minimum seconds between on-demand refreshes of a symbol
+        """
+        self._refresh_cooldown = refresh_cooldown
+        self._last_refresh: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def symbols(self) -> List[str]:
+        """Configured benchmark symbols."""
+        return settings.benchmark_symbols_list
+
+    def ensure_benchmark_stocks(self, db: Session) -> List[Stock]:
+        """
+        Create `Stock` rows for configured benchmarks that do not exist yet.
+
+        Symbols that already exist (e.g. SPY held as a position) are reused
+        as-is, without changing their benchmark flag.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Stock rows for all configured benchmarks
+        """
+        symbols = self.symbols
+        existing = {
+            s.symbol: s
+            for s in db.query(Stock).filter(Stock.symbol.in_(symbols)).all()
+        }
+
+        created = []
+        for symbol in symbols:
+            if symbol not in existing:
+                stock = Stock(
+                    symbol=symbol,
+                    name=BENCHMARK_NAMES.get(symbol, symbol),
+                    sector="Benchmark",
+                    is_benchmark=True
+                )
+                db.add(stock)
+                existing[symbol] = stock
+                created.append(symbol)
+
+        if created:
+            db.commit()
+            logger.info(f"Added benchmark stocks: {', '.join(created)}")
+
+        return [existing[s] for s in symbols]
+
+    def get_series(
+        self,
+        db: Session,
+        symbol: Optional[str] = None,
+        start: Optional[date] = None,
+        refresh: bool = True
+    ) -> PriceSeries:
+        """
+        Get a benchmark's stored price series from the price matrix.
+
+        If the stored series does not reach back to `start` or is behind the
+        latest trading day, an incremental refresh is attempted first (at most
+        once per cooldown period, so offline use stays fast).
+
+        Args:
+            db: Database session
+            symbol: Benchmark symbol (defaults to the beta benchmark)
+            start: Optional first date (inclusive)
+            refresh: Whether a stale series may trigger a network refresh
+
+        Returns:
+            PriceSeries (oldest first), possibly empty
+        """
+        symbol = (symbol or settings.BETA_BENCHMARK_SYMBOL).upper()
+        stock = db.query(Stock).filter(Stock.symbol == symbol).first()
+
+        if stock is None and refresh and symbol in self.symbols:
+            stock = {s.symbol: s for s in self.ensure_benchmark_stocks(db)}[symbol]
+
+        if stock is None:
+            logger.warning(f"Benchmark {symbol} is not tracked")
+            return price_matrix.series(-1)  # Empty series
+
+        price_matrix.ensure_loaded(db)
+        series = price_matrix.series(stock.id, start=start)
+
+        if refresh and self._is_stale(series, start) and self._may_refresh(symbol):
+            self.refresh(db, [stock], start=start)
+            series = price_matrix.series(stock.id, start=start)
+
+        return series
+
+    def get_aligned_closes(
+        self,
+        db: Session,
+        dates: np.ndarray,
+        symbol: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Get benchmark closes aligned to the given dates (NaN where missing).
+
+        Args:
+            db: Database session
+            dates: Sorted `datetime64[D]` dates
+            symbol: Benchmark symbol (defaults to the beta benchmark)
+
+        Returns:
+            Array of closes, or None if the benchmark has no stored prices
+        """
+        start = dates[0].astype(date) if len(dates) else None
+        series = self.get_series(db, symbol, start=start)
+
+        if not len(series):
+            return None
+
+        aligned = np.full(len(dates), np.nan)
+        idx = np.searchsorted(series.dates, dates)
+        idx_clipped = np.minimum(idx, len(series) - 1)
+        hit = series.dates[idx_clipped] == dates
+        aligned[hit] = series.close[idx_clipped[hit]]
+
+        return aligned
+
+    def refresh(
+        self,
+        db: Session,
+        stocks: Optional[List[Stock]] = None,
+        start: Optional[date] = None
+    ) -> Dict[str, int]:
+        """
+        Fetch missing history for benchmark stocks in one batch download.
+
+        Args:
+            db: Database session
+            stocks: Benchmark stocks to refresh (defaults to all configured)
+            start: Optional first date the stored history should reach back to
+
+        Returns:
+            Dict mapping symbol to number of new prices stored
+        """
+        from backend.app.services.price_collector import PriceCollectorService
+
+        if stocks is None:
+            stocks = self.ensure_benchmark_stocks(db)
+        if not stocks:
+            return {}
+
+        price_matrix.ensure_loaded(db)
+
+        # Fetch enough days to cover the largest gap (100 days on first run)
+        today = date.today()
+        days = 5
+        for stock in stocks:
+            series = price_matrix.series(stock.id)
+            if len(series) < 30:
+                days = max(days, 100)
+            else:
+                last = series.dates[-1].astype(date)
+                days = max(days, (today - last).days + 5)
+            if start is not None and (not len(series) or series.dates[0].astype(date) > start):
+                days = max(days, (today - start).days + 5)
+
+        with self._lock:
+            for stock in stocks:
+                self._last_refresh[stock.symbol] = time.monotonic()
+
+        symbols = [s.symbol for s in stocks]
+        try:
+            fetched = batch_price_service.fetch_historical_prices(symbols, days=days)
+        except Exception as e:
+            logger.warning(f"Could not fetch benchmark prices for {symbols}: {e}")
+            return {}
+
+        collector = PriceCollectorService()
+        result = {}
+        for stock in stocks:
+            prices = fetched.get(stock.symbol.upper(), [])
+            if prices:
+                result[stock.symbol] = collector.store_prices(db, stock, prices)["new"]
+
+        logger.info(f"Refreshed benchmarks: {result}")
+        return result
+
+    def _is_stale(self, series: PriceSeries, start: Optional[date]) -> bool:
+        """Check whether a stored series misses the requested start or recent days."""
+        if not len(series):
+            return True
+
+        first = series.dates[0].astype(date)
+        last = series.dates[-1].astype(date)
+
+        if start is not None and first > start + timedelta(days=7):
+            return True
+
+        # Behind by more than a weekend
+        return (date.today() - last).days > 3
+
+    def _may_refresh(self, symbol: str) -> bool:
+        """Check whether the cooldown for an on-demand refresh has passed."""
+        with self._lock:
+            last = self._last_refresh.get(symbol)
+        return last is None or time.monotonic() - last >= self._refresh_cooldown
+
+
+# Global benchmark service instance
+benchmark_service = BenchmarkService(refresh_cooldown=settings.BENCHMARK_REFRESH_COOLDOWN)
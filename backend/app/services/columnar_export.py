@@ -0,0 +1,269 @@
+"""
+Columnar (Parquet / Arrow IPC) writers for the weekly ML dataset.
+
+Features:
+- Hive-partitioned datasets (symbol=AAPL/year=2024/part-0.parquet) that
+  load in one call with pandas.read_parquet or pyarrow.dataset; partition
+  values are decoded as dictionary (categorical) columns
+- Rows are buffered per row group and flushed as they arrive, so memory
+  holds at most one row group per table regardless of export size
+- Parquet files are zstd-compressed with dictionary-encoded pages
+- Arrow IPC files are left uncompressed so they can be memory-mapped and
+  loaded without copying
+- Requires pyarrow (optional); without it the weekly job keeps writing
+  CSV/NDJSON
+"""
+
+import shutil
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"  # pyarrow's hive null fallback
+
+
+def table_schemas() -> Dict[str, "pa.Schema"]:
+    """File schemas of the exported tables (partition columns live in the directory names)."""
+    return {
+        "stock_prices": pa.schema([
+            ("date", pa.date32()),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.int64()),
+        ]),
+        "news_articles": pa.schema([
+            ("id", pa.int64()),
+            ("title", pa.string()),
+            ("source", pa.string()),
+            ("url", pa.string()),
+            ("published_at", pa.timestamp("us", tz="UTC")),
+            ("sentiment_score", pa.float64()),
+            ("summary", pa.string()),
+            ("related_stocks", pa.list_(pa.string())),
+        ]),
+        "article_stocks": pa.schema([
+            ("article_id", pa.int64()),
+            ("published_at", pa.timestamp("us", tz="UTC")),
+        ]),
+    }
+
+
+class PartitionedTableWriter:
+    """
+    Streams rows of one table into a hive-partitioned directory.
+
+    Rows should arrive grouped by partition (the export queries order by
+    the partition keys); a partition that reappears gets another part file.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        schema: "pa.Schema",
+        file_format: str = "parquet",
+        row_group_size: int = 100000
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            root: Table directory
+            schema: Schema of the file columns
+            file_format: parquet or arrow
+            row_group_size: Rows per Parquet row group / Arrow record batch
+        """
+        self.root = Path(root)
+        self.schema = schema
+        self.file_format = file_format
+        self.suffix = COLUMNAR_FORMATS[file_format]
+        self.row_group_size = row_group_size
+        self.records = 0
+        self.files = 0
+
+        self._partition: Optional[Tuple[Tuple[str, Any], ...]] = None
+        self._parts: Dict[Tuple[Tuple[str, Any], ...], int] = {}
+        self._columns: List[list] = [[] for _ in schema]
+        self._writer = None
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def write(self, partition: Sequence[Tuple[str, Any]], row: Sequence[Any]) -> None:
+        """
+        Append one row.
+
+        Args:
+            partition: (key, value) pairs, e.g. (("symbol", "AAPL"), ("year", 2024))
+            row: Values in schema order
+        """
+        partition = tuple(partition)
+        if partition != self._partition:
+            self._close_file()
+            self._partition = partition
+
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self.records += 1
+        if len(self._columns[0]) >= self.row_group_size:
+            self._flush()
+
+    def close(self) -> None:
+        self._close_file()
+
+    def _flush(self) -> None:
+        """Write the buffered rows as one row group / record batch."""
+        if not self._columns[0]:
+            return
+        if self._writer is None:
+            self._open_file()
+
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(self._columns, self.schema)],
+            schema=self.schema
+        )
+        if self.file_format == "parquet":
+            self._writer.write_batch(batch, row_group_size=self.row_group_size)
+        else:
+            self._writer.write_batch(batch)
+        self._columns = [[] for _ in self.schema]
+
+    def _open_file(self) -> None:
+        directory = self.root.joinpath(*(
+            f"{key}={NULL_PARTITION if value is None else value}" for key, value in self._partition
+        ))
+        directory.mkdir(parents=True, exist_ok=True)
+        part = self._parts.get(self._partition, 0)
+        self._parts[self._partition] = part + 1
+        path = directory / f"part-{part}{self.suffix}"
+
+        if self.file_format == "parquet":
+            self._writer = pq.ParquetWriter(path, self.schema, compression="zstd", use_dictionary=True)
+        else:
+            self._writer = pa.ipc.new_file(str(path), self.schema)
+        self.files += 1
+
+    def _close_file(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ColumnarDatasetWriter:
+    """
+    Writes the stock_prices, news_articles and article_stocks tables of one export.
+
+    The export is built in a ".tmp" directory and renamed when complete, so
+    readers never see a partial dataset.
+
+    Usage:
+        with ColumnarDatasetWriter(export_dir / "ml_dataset_2024-01-07", "parquet") as out:
+            out.table("stock_prices").write((("symbol", "AAPL"), ("year", 2024)), row)
+    """
+
+    def __init__(self, path: Path, file_format: str = "parquet", row_group_size: int = 100000):
+        """
+        Initialize writer.
+
+        Args:
+            path: Destination directory (the format is appended, e.g. "_parquet")
+            file_format: parquet or arrow
+            row_group_size: Rows per Parquet row group / Arrow record batch
+        """
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {file_format}")
+        self.file_format = file_format
+        self.path = Path(f"{path}_{file_format}")
+        self.row_group_size = row_group_size
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._schemas = table_schemas()
+        self._tables: Dict[str, PartitionedTableWriter] = {}
+
+    def __enter__(self) -> "ColumnarDatasetWriter":
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+        self._tmp_path.mkdir(parents=True)
+        return self
+
+    def table(self, name: str) -> PartitionedTableWriter:
+        """Writer for one table, created on first use."""
+        if name not in self._tables:
+            self._tables[name] = PartitionedTableWriter(
+                self._tmp_path / name,
+                self._schemas[name],
+                self.file_format,
+                self.row_group_size
+            )
+        return self._tables[name]
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            for writer in self._tables.values():
+                writer.close()
+        except Exception:
+            if exc_type is None:
+                shutil.rmtree(self._tmp_path, ignore_errors=True)
+                raise
+
+        if exc_type is None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._tmp_path.rename(self.path)
+        else:
+            shutil.rmtree(self._tmp_path, ignore_errors=True)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.path.rglob("*") if f.is_file())
+
+    def result(self, **extra: Any) -> Dict[str, Any]:
+        """Success result in the exporter's result-dictionary shape."""
+        return dict(
+            status="success",
+            filename=self.path.name,
+            format=self.file_format,
+            tables={
+                name: {"records": writer.records, "files": writer.files}
+                for name, writer in self._tables.items()
+            },
+            size_bytes=self.size_bytes,
+            **extra
+        )
+
+
+def read_columnar_table(path: Path, table: str, columns: Optional[List[str]] = None, filter=None) -> "pa.Table":
+    """
+    Load one table of a columnar export.
+
+    Arrow IPC files are memory-mapped, so the returned table references the
+    file pages instead of copies. Partition columns (symbol, year) come back
+    as dictionary columns, and filters on them skip whole directories.
+
+    Args:
+        path: Export directory (e.g. exports/ml_dataset_2024-01-07_parquet)
+        table: stock_prices, news_articles or article_stocks
+        columns: Columns to load (all if None)
+        filter: Optional pyarrow.dataset expression, e.g. ds.field("symbol") == "AAPL"
+
+    Returns:
+        pyarrow Table
+    """
+    path = Path(path)
+    file_format = "ipc" if path.name.endswith("_arrow") else "parquet"
+    dataset = ds.dataset(
+        path / table,
+        format=file_format,
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+        filesystem=fs.LocalFileSystem(use_mmap=file_format == "ipc")
+    )
+    return dataset.to_table(columns=columns, filter=filter)
@@ -2,11 +2,11 @@
 Custom Stock API service for fetching prices from actually-free-api.
 """
 
-import requests
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from backend.app.services.currency_converter import currency_converter
+from backend.app.services.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class CustomStockAPIService:
             Dictionary mapping ticker symbols to stock data
         """
         try:
-            response = requests.get(f"{self.base_url}/stocks", timeout=10)
+            response = http_client.get(f"{self.base_url}/stocks", timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -0,0 +1,609 @@
+"""
+Parallel, compressed and verifiable PostgreSQL backups.
+
+Features:
+- pg_dump directory format (-Fd) with BACKUP_JOBS parallel workers and
+  per-table compression (zstd with pg_dump 16+, gzip otherwise)
+- Every backup gets a manifest with a SHA-256 checksum per file and exact
+  row counts, all taken from the same snapshot pg_dump uses; when it will
+  be test-restored (BACKUP_VERIFY_URL), also a content checksum of every
+  table, hashed by BACKUP_JOBS workers while pg_dump runs
+- Optional incremental mode: between full backups only the stock_prices
+  rows added since the previous backup (plus its trailing revision window)
+  are copied, next to a full dump of everything else; tables whose rows
+  are updated in place (news_articles and its links) are always dumped in
+  full
+- An incremental backup falls back to a full one when settled price rows
+  (older than the revision window) changed since the previous backup; one
+  scan of those rows both checks them and fingerprints the next window
+- Verification re-checks the checksums and the dump's table of contents,
+  and can restore the backup chain into a scratch database
+  (BACKUP_VERIFY_URL) and compare row counts (and content checksums, when
+  recorded) with the manifest
+
+Layout:
+    backups/portfolio_db_<ts>/manifest.json
+    backups/portfolio_db_<ts>/dump/            pg_dump -Fd output
+    backups/portfolio_db_<ts>/deltas/*.csv.gz  incremental rows (incremental backups only)
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import shutil
+import hashlib
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+
+# Large, append-only tables backed up as row deltas in incremental mode.
+# Tables updated in place (news_articles: sentiment, cluster ids; its
+# article_stocks links) are dumped in full by every backup instead.
+INCREMENTAL_TABLES = ["stock_prices"]
+
+# Prices are upserted in place when closes are revised, so each delta also
+# re-copies this many trailing days; older rows are "settled" and only
+# checked for changes (see _watermarks)
+PRICE_OVERLAP_DAYS = 7
+
+# Rows of deleted stocks are dropped after deltas are applied, as the
+# foreign key's ON DELETE CASCADE would have done
+ORPHAN_CLEANUP = [
+    "DELETE FROM stock_prices WHERE stock_id NOT IN (SELECT id FROM stocks)",
+]
+
+
+class BackupError(Exception):
+    """A pg_dump / pg_restore step failed."""
+
+
+def connection_args(database_url: str) -> Tuple[List[str], Dict[str, str]]:
+    """
+    pg_dump / pg_restore connection arguments for a SQLAlchemy database URL.
+
+    Returns:
+        (host/port/user/database arguments, environment with PGPASSWORD)
+    """
+    url = make_url(database_url)
+    args = ["-h", url.host or "localhost", "-p", str(url.port or 5432)]
+    if url.username:
+        args += ["-U", url.username]
+    args += ["-d", url.database]
+
+    env = os.environ.copy()
+    if url.password:
+        env["PGPASSWORD"] = str(url.password)
+    return args, env
+
+
+def same_database(url_a: str, url_b: str) -> bool:
+    """Whether two URLs point at the same database (host, port and name)."""
+    a, b = make_url(url_a), make_url(url_b)
+    return (
+        (a.host or "localhost", a.port or 5432, a.database)
+        == (b.host or "localhost", b.port or 5432, b.database)
+    )
+
+
+def pg_dump_major_version() -> int:
+    """Major version of the installed pg_dump (0 if it cannot be determined)."""
+    try:
+        output = subprocess.run(["pg_dump", "--version"], capture_output=True, text=True).stdout
+    except OSError:
+        return 0
+    match = re.search(r"(\d+)(?:\.\d+)?", output)
+    return int(match.group(1)) if match else 0
+
+
+def compression_arg(spec: str, major_version: int) -> str:
+    """
+    pg_dump -Z value for a compression spec.
+
+    Args:
+        spec: "zstd:3", "gzip:6", "lz4" or a bare gzip level such as "6"
+        major_version: pg_dump major version; before 16 only gzip levels
+            are supported, so other methods fall back to gzip
+
+    Returns:
+        Value for pg_dump -Z
+    """
+    method, _, level = spec.partition(":")
+    if method.isdigit():
+        return method
+    if major_version >= 16:
+        return spec
+    if method != "gzip":
+        logger.warning(f"pg_dump {major_version} does not support {method} - compressing with gzip")
+        return "6"
+    return level or "6"
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checksum_files(root: Path, jobs: int = 4) -> Dict[str, Dict[str, Any]]:
+    """SHA-256 and size of every file under root except the manifest, hashed in parallel."""
+    paths = sorted(p for p in root.rglob("*") if p.is_file() and p.name != "manifest.json")
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        digests = list(pool.map(sha256_file, paths))
+    return {
+        str(path.relative_to(root)): {"sha256": digest, "size": path.stat().st_size}
+        for path, digest in zip(paths, digests)
+    }
+
+
+# 60-bit prefix of a row's md5 (over its text form); summed per table it gives
+# an order-independent content checksum computed in one scan, without sorting
+ROW_HASH = "('x' || left(md5(t::text), 15))::bit(60)::bigint"
+
+
+def table_fingerprint(conn, table: str) -> Dict[str, Any]:
+    """Row count and content checksum of a table."""
+    quote = conn.dialect.identifier_preparer.quote
+    rows, checksum = conn.execute(text(
+        f"SELECT count(*), coalesce(sum({ROW_HASH}), 0) FROM {quote(table)} t"
+    )).one()
+    return {"rows": rows, "checksum": str(checksum)}
+
+
+def _run(cmd: List[str], env: Dict[str, str]) -> None:
+    """Run a PostgreSQL client command, raising BackupError on failure."""
+    logger.info(f"Running {' '.join(cmd)}")
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise BackupError(f"{cmd[0]} failed: {result.stderr.strip()}")
+
+
+class DatabaseBackupService:
+    """Creates, lists and verifies database backups."""
+
+    def __init__(
+        self,
+        backup_dir: Optional[str] = None,
+        database_url: Optional[str] = None,
+        jobs: Optional[int] = None,
+        compression: Optional[str] = None
+    ):
+        """
+        Initialize service.
+
+        Args:
+            backup_dir: Backup directory (defaults to BACKUP_DIR)
+            database_url: Database to back up (defaults to DATABASE_URL)
+            jobs: Parallel pg_dump / pg_restore workers (defaults to BACKUP_JOBS)
+            compression: pg_dump compression spec (defaults to BACKUP_COMPRESSION)
+        """
+        self.backup_dir = Path(backup_dir or settings.BACKUP_DIR)
+        self.database_url = database_url or settings.DATABASE_URL
+        self.jobs = jobs or settings.BACKUP_JOBS
+        self.compression = compression or settings.BACKUP_COMPRESSION
+
+    # ------------------------------------------------------------------
+    # Listing
+    # ------------------------------------------------------------------
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """Manifests of all backups, oldest first."""
+        if not self.backup_dir.exists():
+            return []
+        manifests = []
+        for path in self.backup_dir.glob("*/manifest.json"):
+            with open(path, encoding="utf-8") as f:
+                manifests.append(json.load(f))
+        return sorted(manifests, key=lambda m: m["created_at"])
+
+    def chain(self, name: str) -> List[Dict[str, Any]]:
+        """Manifests needed to restore a backup: its full backup, then each incremental up to it."""
+        manifests = {m["name"]: m for m in self.list_backups()}
+        if name not in manifests:
+            raise BackupError(f"Unknown backup: {name}")
+        missing = [member for member in manifests[name]["chain"] if member not in manifests]
+        if missing:
+            raise BackupError(f"Backup {name} depends on missing backups: {', '.join(missing)}")
+        return [manifests[member] for member in manifests[name]["chain"]]
+
+    # ------------------------------------------------------------------
+    # Backup
+    # ------------------------------------------------------------------
+
+    def backup(
+        self,
+        mode: Optional[str] = None,
+        full_every: Optional[int] = None,
+        fingerprints: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a backup.
+
+        In incremental mode a full backup is still taken when there is no
+        previous backup of this database, or when the current chain already
+        has full_every backups.
+
+        Args:
+            mode: full or incremental (defaults to BACKUP_MODE)
+            full_every: Backups per chain in incremental mode (defaults to BACKUP_FULL_EVERY)
+            fingerprints: Record every table's content checksum for verify()
+                (defaults to whether BACKUP_VERIFY_URL is set)
+
+        Returns:
+            Backup result dictionary
+        """
+        mode = (mode or settings.BACKUP_MODE).lower()
+        full_every = full_every or settings.BACKUP_FULL_EVERY
+        if fingerprints is None:
+            fingerprints = bool(settings.BACKUP_VERIFY_URL)
+        started = time.perf_counter()
+
+        database = make_url(self.database_url).database
+        previous = [m for m in self.list_backups() if m["database"] == database]
+        parent = previous[-1] if previous else None
+        incremental = (
+            mode == "incremental"
+            and parent is not None
+            and len(parent["chain"]) < full_every
+        )
+
+        now = datetime.now()
+        name = f"portfolio_db_{now.strftime('%Y-%m-%dT%H%M%S')}"
+        path = self.backup_dir / name
+        path.mkdir(parents=True)
+
+        major_version = pg_dump_major_version()
+        args, env = connection_args(self.database_url)
+        engine = create_engine(self.database_url)
+
+        try:
+            # One REPEATABLE READ transaction exports the snapshot pg_dump runs
+            # in, so counts, watermarks, deltas and the dump all agree
+            with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+                with conn.begin():
+                    snapshot = conn.execute(text("SELECT pg_export_snapshot()")).scalar()
+                    row_counts = self._row_counts(conn)
+                    watermarks, settled_unchanged = self._watermarks(conn, parent if incremental else None)
+
+                    if incremental and not settled_unchanged:
+                        logger.info(f"Settled stock prices changed since {parent['name']} - taking a full backup")
+                        incremental = False
+
+                    deltas = {}
+                    if incremental:
+                        deltas = self._copy_deltas(conn, path / "deltas", parent["watermarks"], watermarks)
+
+                    cmd = [
+                        "pg_dump", *args,
+                        "-Fd", "-j", str(self.jobs),
+                        "-Z", compression_arg(self.compression, major_version),
+                        f"--snapshot={snapshot}",
+                        "-f", str(path / "dump")
+                    ]
+                    if incremental:
+                        cmd += [f"--exclude-table-data={table}" for table in INCREMENTAL_TABLES]
+
+                    # Content checksums are hashed in the same snapshot while pg_dump runs
+                    with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as pool:
+                        pending = {
+                            table: pool.submit(self._fingerprint, engine, table, snapshot)
+                            for table in (row_counts if fingerprints else [])
+                        }
+                        _run(cmd, env)
+                        tables = {table: future.result() for table, future in pending.items()}
+        except Exception:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+        finally:
+            engine.dispose()
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "name": name,
+            "kind": "incremental" if incremental else "full",
+            "created_at": now.isoformat(),
+            "database": database,
+            "pg_dump_version": major_version,
+            "jobs": self.jobs,
+            "compression": self.compression,
+            "chain": (parent["chain"] if incremental else []) + [name],
+            "watermarks": watermarks,
+            "deltas": deltas,
+            "row_counts": row_counts,
+            "tables": tables or None,
+            "files": checksum_files(path, self.jobs)
+        }
+        with open(path / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        size = sum(entry["size"] for entry in manifest["files"].values())
+        duration = round(time.perf_counter() - started, 1)
+        logger.info(f"Database backup created: {name} ({manifest['kind']}, {size} bytes, {duration}s)")
+        return {
+            "status": "success",
+            "filename": name,
+            "kind": manifest["kind"],
+            "size_bytes": size,
+            "files": len(manifest["files"]),
+            "duration_seconds": duration
+        }
+
+    @staticmethod
+    def _row_counts(conn) -> Dict[str, int]:
+        quote = conn.dialect.identifier_preparer.quote
+        return {
+            table: conn.execute(text(f"SELECT count(*) FROM {quote(table)}")).scalar()
+            for table in sorted(inspect(conn).get_table_names())
+        }
+
+    @staticmethod
+    def _fingerprint(engine, table: str, snapshot: Optional[str] = None) -> Dict[str, Any]:
+        """Content fingerprint of one table, on its own connection (in an exported snapshot if given)."""
+        with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+            with conn.begin():
+                if snapshot:
+                    conn.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot}'"))
+                return table_fingerprint(conn, table)
+
+    @staticmethod
+    def _watermarks(conn, parent: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Highest stock_prices id and date, plus the fingerprint of the price
+        rows dated before the next delta's revision window ("settled" rows).
+
+        Deltas only carry new rows and the revision window, so an update or
+        delete of a row the parent backup considered settled (a re-import,
+        a split adjustment) can only be captured by a full backup. The same
+        scan that fingerprints the new settled rows also fingerprints the
+        parent's (those with id <= its watermark, dated before its window).
+
+        Args:
+            conn: Connection in the backup snapshot
+            parent: Manifest of the backup an incremental builds on
+
+        Returns:
+            (watermarks, whether the parent's settled rows are unchanged -
+            always False for a parent from an older manifest version)
+        """
+        max_id, max_date = conn.execute(text("SELECT coalesce(max(id), 0), max(date) FROM stock_prices")).one()
+        watermarks = {"stock_prices": max_id, "stock_prices_date": max_date.isoformat() if max_date else None}
+
+        outdated = parent is not None and parent.get("version", 1) < MANIFEST_VERSION
+        previous = parent["watermarks"].get("stock_prices_settled") if parent and not outdated else None
+        if max_date is None:
+            return watermarks, not outdated and previous is None
+
+        settled_before = (max_date - timedelta(days=PRICE_OVERLAP_DAYS)).isoformat()
+        parent_condition = "false"
+        scan_before = settled_before
+        if previous:
+            parent_condition = f"id <= {int(parent['watermarks']['stock_prices'])} AND date < '{previous['before']}'"
+            scan_before = max(settled_before, previous["before"])
+
+        rows, checksum, parent_rows, parent_checksum = conn.execute(text(
+            f"SELECT count(*) FILTER (WHERE date < '{settled_before}'), "
+            f"coalesce(sum(h) FILTER (WHERE date < '{settled_before}'), 0), "
+            f"count(*) FILTER (WHERE {parent_condition}), "
+            f"coalesce(sum(h) FILTER (WHERE {parent_condition}), 0) "
+            f"FROM (SELECT id, date, {ROW_HASH} AS h FROM stock_prices t WHERE date < '{scan_before}') s"
+        )).one()
+        watermarks["stock_prices_settled"] = {"before": settled_before, "rows": rows, "checksum": str(checksum)}
+
+        unchanged = not outdated and (previous is None or (
+            parent_rows == previous["rows"] and str(parent_checksum) == previous["checksum"]
+        ))
+        return watermarks, unchanged
+
+    @staticmethod
+    def _copy_deltas(conn, directory: Path, previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        COPY the price rows added since the previous watermarks, plus every
+        row of the previous backup's revision window, to a gzipped CSV file.
+
+        Returns:
+            Per-table delta info: rows copied, and the first date of the
+            revision window the delta replaces on restore ("since")
+        """
+        directory.mkdir(parents=True)
+        settled = previous.get("stock_prices_settled")
+        condition = f"id > {int(previous['stock_prices'])}"
+        if settled:
+            condition = f"({condition} OR date >= '{settled['before']}')"
+        query = f"SELECT * FROM stock_prices WHERE {condition} AND id <= {int(current['stock_prices'])} ORDER BY id"
+
+        cursor = conn.connection.cursor()
+        try:
+            with gzip.open(directory / "stock_prices.csv.gz", "wb", compresslevel=6) as f:
+                cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)", f)
+            rows = max(cursor.rowcount, 0)
+        finally:
+            cursor.close()
+        return {"stock_prices": {"rows": rows, "since": settled["before"] if settled else None}}
+
+    # ------------------------------------------------------------------
+    # Verification and restore
+    # ------------------------------------------------------------------
+
+    def verify_checksums(self, name: str) -> Dict[str, Any]:
+        """Re-hash a backup's files and compare them with its manifest."""
+        path = self.backup_dir / name
+        with open(path / "manifest.json", encoding="utf-8") as f:
+            expected = json.load(f)["files"]
+        actual = checksum_files(path, self.jobs)
+
+        missing = sorted(set(expected) - set(actual))
+        corrupted = sorted(f for f in expected if f in actual and actual[f]["sha256"] != expected[f]["sha256"])
+        unexpected = sorted(set(actual) - set(expected))
+        return {
+            "ok": not (missing or corrupted),
+            "files": len(expected),
+            "missing": missing,
+            "corrupted": corrupted,
+            "unexpected": unexpected
+        }
+
+    def verify(self, name: Optional[str] = None, target_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Verify a backup and every backup it depends on.
+
+        Checks the checksums and that pg_restore can read each dump's table
+        of contents. With a target_url (defaults to BACKUP_VERIFY_URL) the
+        chain is also restored there and every table's row count (and
+        content checksum, if the backup recorded them) is compared with the
+        manifest.
+
+        Args:
+            name: Backup to verify (latest if None)
+            target_url: Scratch database - its public schema is replaced
+
+        Returns:
+            Verification result dictionary
+        """
+        backups = self.list_backups()
+        if not backups:
+            return {"status": "error", "error": "no backups found"}
+        name = name or backups[-1]["name"]
+        target_url = target_url if target_url is not None else settings.BACKUP_VERIFY_URL
+
+        try:
+            chain = self.chain(name)
+            result = {"status": "success", "backup": name, "chain": [m["name"] for m in chain]}
+
+            checksums = {m["name"]: self.verify_checksums(m["name"]) for m in chain}
+            result["checksums"] = checksums
+            if not all(c["ok"] for c in checksums.values()):
+                result["status"] = "failed"
+                return result
+
+            for manifest in chain:
+                _run(["pg_restore", "--list", str(self.backup_dir / manifest["name"] / "dump")], os.environ.copy())
+
+            if target_url:
+                started = time.perf_counter()
+                restored = self.restore(name, target_url, fingerprints=bool(chain[-1].get("tables")))
+                expected = chain[-1].get("tables") or {
+                    table: {"rows": count} for table, count in chain[-1]["row_counts"].items()
+                }
+                mismatches = {}
+                for table, fingerprint in expected.items():
+                    actual = {key: restored.get(table, {}).get(key) for key in fingerprint}
+                    if actual != fingerprint:
+                        mismatches[table] = {"expected": fingerprint, "restored": actual}
+                result["restore"] = {
+                    "tables": len(expected),
+                    "mismatches": mismatches,
+                    "duration_seconds": round(time.perf_counter() - started, 1)
+                }
+                if mismatches:
+                    result["status"] = "failed"
+
+            logger.info(f"Backup verification {result['status']}: {name}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Backup verification failed for {name}: {e}")
+            return {"status": "error", "backup": name, "error": str(e)}
+
+    def restore(self, name: str, target_url: str, fingerprints: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Restore a backup chain into a scratch database.
+
+        Args:
+            name: Backup to restore
+            target_url: Target database (must not be DATABASE_URL); its
+                public schema is dropped first
+            fingerprints: Also checksum every restored table's contents
+
+        Returns:
+            Row count (and content checksum) per table after the restore
+        """
+        if same_database(target_url, self.database_url):
+            raise BackupError("Refusing to restore over the live database")
+
+        chain = self.chain(name)
+        full_dump = str(self.backup_dir / chain[0]["name"] / "dump")
+        latest_dump = str(self.backup_dir / chain[-1]["name"] / "dump")
+        args, env = connection_args(target_url)
+        restore = ["pg_restore", *args, "--no-owner", "--no-privileges", "--exit-on-error"]
+
+        engine = create_engine(target_url)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("DROP SCHEMA IF EXISTS public CASCADE"))
+                conn.execute(text("CREATE SCHEMA public"))
+
+            if len(chain) == 1:
+                _run(restore + ["--clean", "--if-exists", "-j", str(self.jobs), full_dump], env)
+            else:
+                # Schema and every other table from the latest backup, prices
+                # from the full backup plus every delta, then indexes and
+                # constraints once all rows are in place
+                _run(restore + ["--clean", "--if-exists", "--section=pre-data", latest_dump], env)
+                _run(restore + ["--section=data", "-j", str(self.jobs), latest_dump], env)
+                _run(restore + ["--data-only", "-j", str(self.jobs)]
+                     + [arg for table in INCREMENTAL_TABLES for arg in ("-t", table)] + [full_dump], env)
+                with engine.begin() as conn:
+                    for manifest in chain[1:]:
+                        self._apply_deltas(conn, self.backup_dir / manifest["name"] / "deltas", manifest["deltas"])
+                    for statement in ORPHAN_CLEANUP:
+                        conn.execute(text(statement))
+                _run(restore + ["--section=post-data", "-j", str(self.jobs), latest_dump], env)
+
+            with engine.connect() as conn:
+                row_counts = self._row_counts(conn)
+            if not fingerprints:
+                return {table: {"rows": count} for table, count in row_counts.items()}
+            with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as pool:
+                return dict(zip(row_counts, pool.map(lambda table: self._fingerprint(engine, table), row_counts)))
+        finally:
+            engine.dispose()
+
+    @staticmethod
+    def _apply_deltas(conn, directory: Path, deltas: Dict[str, Any]) -> None:
+        """
+        Replace rows with one backup's delta rows.
+
+        The delta holds every row of its revision window, so rows dated in
+        the window are deleted first (dropping rows deleted since the
+        previous backup), along with rows whose ids reappear in the delta.
+        Runs before the post-data section, so there is no primary key to
+        upsert against yet - matching rows are deleted, then inserted.
+        """
+        cursor = conn.connection.cursor()
+        try:
+            for table in INCREMENTAL_TABLES:
+                path = directory / f"{table}.csv.gz"
+                since = deltas[table].get("since")
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    columns = f.readline().strip().split(",")
+                column_list = ", ".join(f'"{column.strip(chr(34))}"' for column in columns)
+
+                cursor.execute(f"CREATE TEMP TABLE delta_rows (LIKE {table} INCLUDING DEFAULTS)")
+                with gzip.open(path, "rb") as f:
+                    cursor.copy_expert(f"COPY delta_rows ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER true)", f)
+                if since:
+                    cursor.execute(f"DELETE FROM {table} WHERE date >= %s", (since,))
+                cursor.execute(f"DELETE FROM {table} WHERE id IN (SELECT id FROM delta_rows)")
+                cursor.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM delta_rows")
+                cursor.execute("DROP TABLE delta_rows")
+        finally:
+            cursor.close()
+
+
+# Global database backup service instance
+db_backup_service = DatabaseBackupService()
@@ -0,0 +1,250 @@
+"""
+Embedding cache service.
+
+Features:
+- Keys are sha256(model + task + whitespace-normalized text), so identical
+  titles/summaries from different sources share one vector
+- In-memory LRU in front of the persistent `embedding_cache` table
+- Batch lookups (one query per batch) and batch inserts (ON CONFLICT DO NOTHING)
+- Only cache misses are sent to the embedding API, each unique text once
+- Database errors degrade to memory-only caching instead of failing embeddings
+"""
+
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import List, Dict, Callable, Sequence
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from backend.app.core.config import settings
+from backend.app.db.base import SessionLocal
+from backend.app.models import EmbeddingCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting differences do not miss the cache."""
+    return " ".join(text.split())
+
+
+def cache_key(text: str, model: str, task: str) -> str:
+    """Build the cache key for a text embedded with a model and task type."""
+    payload = f"{model}\x00{task}\x00{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-level (memory LRU + database) cache for embedding vectors."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_memory_entries: int = 10000,
+        persist: bool = True,
+        lookup_batch_size: int = 500
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            enabled: When False, every call goes straight to the embedding function
+            max_memory_entries: Vectors kept in the in-memory LRU
+            persist: Read and write the embedding_cache table
+            lookup_batch_size: Maximum keys per database lookup
+        """
+        self.enabled = enabled
+        self._max_memory_entries = max_memory_entries
+        self._persist = persist
+        self._lookup_batch_size = lookup_batch_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "db_errors": 0}
+
+    def get_or_embed(
+        self,
+        texts: Sequence[str],
+        model: str,
+        task: str,
+        embed: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """
+        Get embeddings for texts, calling `embed` only for uncached ones.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model name
+            task: Task type (e.g. retrieval.passage)
+            embed: Function embedding a list of texts, order-preserving
+
+        Returns:
+            Embedding vectors in the same order as `texts`
+        """
+        if not self.enabled:
+            return embed(list(texts))
+
+        keys = [cache_key(text, model, task) for text in texts]
+        found = self.get_many(keys)
+
+        # Embed each missing text once, even if it appears several times
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = embed(list(missing.values()))
+            if len(vectors) != len(missing):
+                raise ValueError(f"Embedding function returned {len(vectors)} vectors for {len(missing)} texts")
+
+            new_entries = dict(zip(missing.keys(), vectors))
+            self.put_many(new_entries, model, task)
+            found.update(new_entries)
+
+        logger.debug(f"Embedding cache ({model}/{task}): {len(texts) - len(missing)} cached, {len(missing)} embedded")
+        return [found[key] for key in keys]
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dict of key -> vector for keys that are cached
+        """
+        found: Dict[str, List[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            for key in unique_keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+
+        remaining = [key for key in unique_keys if key not in found]
+        stored = self._load(remaining) if remaining and self._persist else {}
+        if stored:
+            self._remember(stored)
+
+        with self._lock:
+            self._stats["memory_hits"] += len(found)
+            self._stats["db_hits"] += len(stored)
+            self._stats["misses"] += len(remaining) - len(stored)
+
+        found.update(stored)
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]], model: str, task: str) -> None:
+        """
+        Store vectors in memory and in the database.
+
+        Args:
+            vectors: Dict of cache key -> vector
+            model: Embedding model name
+            task: Task type
+        """
+        if not vectors:
+            return
+
+        self._remember(vectors)
+
+        if self._persist:
+            self._store(vectors, model, task)
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory LRU (the database cache is kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache hit statistics.
+
+        Returns:
+            Dict with memory/database hits, misses, hit rate and LRU size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 3) if lookups else None
+        return stats
+
+    # ---------- Internals ----------
+
+    def _remember(self, vectors: Dict[str, List[float]]) -> None:
+        """Add vectors to the LRU, evicting the least recently used."""
+        with self._lock:
+            for key, vector in vectors.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self._max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Load vectors from the database."""
+        found = {}
+        db = SessionLocal()
+        try:
+            for i in range(0, len(keys), self._lookup_batch_size):
+                batch = keys[i:i + self._lookup_batch_size]
+                rows = db.query(EmbeddingCacheEntry.key, EmbeddingCacheEntry.embedding).filter(
+                    EmbeddingCacheEntry.key.in_(batch)
+                ).all()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        except Exception as e:
+            self._record_db_error(f"Embedding cache lookup failed: {e}")
+        finally:
+            db.close()
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]], model: str, task: str) -> None:
+        """Insert vectors into the database, ignoring keys already stored."""
+        rows = []
+        for key, vector in vectors.items():
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append({
+                "key": key,
+                "model": model,
+                "task": task,
+                "dimension": int(array.shape[0]),
+                "embedding": array.tobytes()
+            })
+
+        db = SessionLocal()
+        try:
+            dialect = db.get_bind().dialect.name
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            table = EmbeddingCacheEntry.__table__
+
+            for i in range(0, len(rows), self._lookup_batch_size):
+                stmt = insert(table).values(rows[i:i + self._lookup_batch_size])
+                db.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.key]))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._record_db_error(f"Embedding cache write failed: {e}")
+        finally:
+            db.close()
+
+    def _record_db_error(self, message: str) -> None:
+        """Log a database failure; embeddings keep working from memory."""
+        logger.warning(message)
+        with self._lock:
+            self._stats["db_errors"] += 1
+
+
+# Global embedding cache instance
+embedding_cache = EmbeddingCache(
+    enabled=settings.EMBEDDING_CACHE_ENABLED,
+    max_memory_entries=settings.EMBEDDING_CACHE_MEMORY_SIZE
+)
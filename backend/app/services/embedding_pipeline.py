@@ -0,0 +1,136 @@
+"""
+Batched embedding pipeline for news ingestion.
+
+Features:
+- Accumulates (article id, content, metadata) while articles are stored
+- Flushes size/time-bounded batches: one embedding request and one
+  vector store write per batch instead of one of each per article
+- Optional before_flush hook (e.g. db.commit) so vectors are only written
+  for articles that are committed
+- A failed batch is logged and counted without stopping ingestion
+"""
+
+import time
+import logging
+from typing import List, Dict, Any, Callable, Optional
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingPipeline:
+    """
+    Collects articles and embeds them in batches.
+
+    Usage:
+        pipeline = EmbeddingPipeline(gemini_service, vector_store, before_flush=db.commit)
+        for article in articles:
+            ...
+            db.flush()
+            pipeline.add(article.id, content, metadata)
+        pipeline.flush()
+    """
+
+    def __init__(
+        self,
+        embedder,
+        vector_store,
+        batch_size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        before_flush: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize embedding pipeline.
+
+        Args:
+            embedder: Service with generate_embeddings_batch(texts)
+                (GeminiService or JinaEmbeddingService)
+            vector_store: Vector store backend receiving the batches
+            batch_size: Articles per batch (defaults to EMBEDDING_BATCH_SIZE)
+            max_wait: Seconds a partial batch may wait before it is flushed
+                on the next add (defaults to EMBEDDING_BATCH_MAX_WAIT)
+            before_flush: Called before each batch is embedded, e.g. to
+                commit the articles it references
+        """
+        self.embedder = embedder
+        self.vector_store = vector_store
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.max_wait = max_wait if max_wait is not None else settings.EMBEDDING_BATCH_MAX_WAIT
+        self.before_flush = before_flush
+
+        self._pending: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self.stats = {"queued": 0, "embedded": 0, "failed": 0, "batches": 0, "seconds": 0.0}
+
+    def add(self, article_id: int, content: str, metadata: Dict[str, Any]) -> None:
+        """
+        Queue an article for embedding.
+
+        Flushes when the batch is full or the oldest queued article has
+        waited longer than max_wait.
+
+        Args:
+            article_id: Article ID (must already be flushed to the database)
+            content: Text to embed and store
+            metadata: Vector store metadata
+        """
+        if not content or not content.strip():
+            return
+
+        if not self._pending:
+            self._oldest = time.monotonic()
+
+        self._pending.append({"id": article_id, "content": content, "metadata": metadata})
+        self.stats["queued"] += 1
+
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._oldest >= self.max_wait:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Embed and store all queued articles.
+
+        Returns:
+            Number of articles written to the vector store
+        """
+        if not self._pending:
+            return 0
+
+        if self.before_flush:
+            self.before_flush()
+
+        batch, self._pending = self._pending, []
+        self._oldest = None
+        self.stats["batches"] += 1
+        started = time.monotonic()
+
+        try:
+            embeddings = self.embedder.generate_embeddings_batch([a["content"] for a in batch])
+            self.vector_store.add_articles_batch(batch, embeddings)
+        except Exception as e:
+            logger.warning(f"Error embedding batch of {len(batch)} articles: {e}")
+            self.stats["failed"] += len(batch)
+            return 0
+        finally:
+            self.stats["seconds"] += time.monotonic() - started
+
+        self.stats["embedded"] += len(batch)
+        return len(batch)
+
+    def discard(self) -> int:
+        """
+        Drop queued articles (e.g. after their transaction was rolled back).
+
+        Returns:
+            Number of articles dropped
+        """
+        dropped = len(self._pending)
+        self._pending = []
+        self._oldest = None
+        return dropped
+
+    @property
+    def pending(self) -> int:
+        """Number of queued articles not yet flushed."""
+        return len(self._pending)
@@ -0,0 +1,139 @@
+"""
+Incremental writers for data exports.
+
+Features:
+- CSV and NDJSON files written one row at a time, so memory use does not
+  grow with the export size
+- Optional gzip or zstd compression (zstd needs the `zstandard` package;
+  without it gzip is used)
+- Files are written under a temporary name and renamed when complete, so
+  an interrupted export never leaves a truncated file behind
+"""
+
+import io
+import os
+import csv
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def resolve_compression(compression: Optional[str]) -> str:
+    """Validate a compression name, falling back to gzip when zstd is unavailable."""
+    compression = (compression or "none").lower()
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported export compression: {compression}")
+    if compression == "zstd" and not ZSTD_AVAILABLE:
+        logger.warning("zstandard is not installed - compressing exports with gzip instead")
+        return "gzip"
+    return compression
+
+
+class ExportWriter:
+    """
+    Writes one CSV or NDJSON export file incrementally.
+
+    Usage:
+        with ExportWriter(export_dir / "prices_2024-01-07.csv", header=[...], compression="gzip") as out:
+            for row in rows:
+                out.write(row)
+        out.records, out.path, out.size_bytes
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        header: Optional[List[str]] = None,
+        compression: Optional[str] = None
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            path: Destination without compression suffix; ".csv" files are
+                written as CSV, anything else as NDJSON
+            header: CSV column names
+            compression: none, gzip or zstd
+        """
+        self.compression = resolve_compression(compression)
+        self.path = Path(f"{path}{COMPRESSION_SUFFIXES[self.compression]}")
+        self.header = header
+        self.is_csv = Path(path).suffix == ".csv"
+        self.records = 0
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._raw = None
+        self._text = None
+        self._csv = None
+
+    @property
+    def filename(self) -> str:
+        return self.path.name
+
+    @property
+    def size_bytes(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def __enter__(self) -> "ExportWriter":
+        self._raw = open(self._tmp_path, "wb")
+        if self.compression == "gzip":
+            stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            stream = self._raw
+
+        self._text = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=False)
+        if self.is_csv:
+            self._csv = csv.writer(self._text)
+            if self.header:
+                self._csv.writerow(self.header)
+        return self
+
+    def write(self, row: Any) -> None:
+        """Write one CSV row (sequence) or NDJSON record (dict)."""
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._text.write(json.dumps(row, default=str))
+            self._text.write("\n")
+        self.records += 1
+
+    def write_many(self, rows: Iterable[Any]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            # Closing the text wrapper closes the compressor, which writes its trailer
+            self._text.close()
+        finally:
+            if not self._raw.closed:
+                self._raw.close()
+
+        if exc_type is None:
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def result(self, **extra: Any) -> Dict[str, Any]:
+        """Success result in the exporter's result-dictionary shape."""
+        return dict(
+            status="success",
+            filename=self.filename,
+            records=self.records,
+            size_bytes=self.size_bytes,
+            compression=self.compression,
+            **extra
+        )
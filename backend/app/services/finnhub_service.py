@@ -7,6 +7,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 from backend.app.services.currency_converter import currency_converter
+from backend.app.services.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,8 @@ class FinnhubService:
     def __init__(self, api_key: str):
         """Initialize Finnhub client."""
         self.client = finnhub.Client(api_key=api_key)
+        # The SDK keeps its own session (it carries the API token); share our pools
+        http_client.mount(self.client._session)
         logger.info("Finnhub service initialized")
 
     def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
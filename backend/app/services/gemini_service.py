@@ -3,9 +3,44 @@ from typing import List, Dict, Any, Optional
 import logging
 import json
 from backend.app.core.config import settings
+from backend.app.services.embedding_cache import embedding_cache
 
 logger = logging.getLogger(__name__)
 
+# Shared by the single and batched sentiment prompts
+SENTIMENT_GUIDANCE = """IMPORTANT CONTEXT FOR FINANCIAL SENTIMENT:
+- Positive indicators: revenue growth, earnings beat, positive guidance, partnerships, expansion, innovation
+- Negative indicators: revenue miss, layoffs, regulatory issues, lawsuits, debt concerns, competition threats
+- Neutral: routine announcements, balanced reports, forward-looking statements without clear direction
+
+Consider:
+1. **Market impact**: How will this affect stock price?
+2. **Investor confidence**: Will this attract or repel investors?
+3. **Company fundamentals**: Does this strengthen or weaken the business?
+4. **Risk factors**: Are there hidden concerns or opportunities?
+
+EXAMPLES:
+- "Company reports Q3 revenue up 25% YoY, beating analyst expectations" → score: 0.75 (positive)
+- "CEO announces restructuring plan, 500 jobs to be cut" → score: -0.3 (slightly negative, could be seen as cost-cutting)
+- "Company maintains quarterly dividend at $0.50 per share" → score: 0.1 (neutral to slightly positive)
+- "SEC opens investigation into accounting practices" → score: -0.85 (very negative)
+"""
+
+# Rough token estimate used to size sentiment batches
+CHARS_PER_TOKEN = 4
+
+# Returned when a text could not be scored (zero confidence marks it unscored)
+ERROR_SENTIMENT = {
+    "score": 0.0,
+    "label": "neutral",
+    "confidence": 0.0,
+    "reasoning": "Error during analysis"
+}
+
+
+class SentimentAPIError(Exception):
+    """The Gemini call itself failed (quota, network), as opposed to a malformed reply."""
+
 # Lazy import to avoid circular dependency
 _jina_service = None
 
@@ -63,12 +98,7 @@ class GeminiService:
 
         # Fallback to Gemini
         try:
-            result = genai.embed_content(
-                model="models/text-embedding-004",
-                content=text,
-                task_type="retrieval_document"
-            )
-            return result['embedding']
+            return self._gemini_embedding(text, "retrieval_document")
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             raise
@@ -96,16 +126,31 @@ class GeminiService:
 
         # Fallback to Gemini
         try:
-            result = genai.embed_content(
-                model="models/text-embedding-004",
-                content=query,
-                task_type="retrieval_query"
-            )
-            return result['embedding']
+            return self._gemini_embedding(query, "retrieval_query")
         except Exception as e:
             logger.error(f"Error generating query embedding: {e}")
             raise
 
+    def _gemini_embedding(self, text: str, task_type: str) -> List[float]:
+        """Embed one text with Gemini, reusing cached vectors for identical text."""
+        return self._gemini_embeddings([text], task_type)[0]
+
+    def _gemini_embeddings(self, texts: List[str], task_type: str) -> List[List[float]]:
+        """Embed texts with Gemini in batched requests, skipping cached texts."""
+        def embed(missing: List[str]) -> List[List[float]]:
+            # embed_content accepts up to 100 texts per request
+            embeddings = []
+            for i in range(0, len(missing), 100):
+                result = genai.embed_content(
+                    model="models/text-embedding-004",
+                    content=missing[i:i + 100],
+                    task_type=task_type
+                )
+                embeddings.extend(result['embedding'])
+            return embeddings
+
+        return embedding_cache.get_or_embed(texts, "text-embedding-004", task_type, embed)
+
     def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts in batch.
@@ -124,14 +169,14 @@ class GeminiService:
                 try:
                     return jina.generate_embeddings_batch(texts)
                 except Exception as e:
-                    logger.warning(f"Jina batch embedding failed, falling back to sequential: {e}")
+                    logger.warning(f"Jina batch embedding failed, falling back to Gemini: {e}")
 
-        # Fallback to sequential Gemini calls
-        embeddings = []
-        for text in texts:
-            emb = self.generate_embedding(text)
-            embeddings.append(emb)
-        return embeddings
+        # Fallback to batched Gemini calls
+        try:
+            return self._gemini_embeddings(texts, "retrieval_document")
+        except Exception as e:
+            logger.error(f"Error generating batch embeddings: {e}")
+            raise
 
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
@@ -145,23 +190,7 @@ class GeminiService:
         """
         prompt = f"""You are a financial sentiment analysis expert. Analyze the sentiment of the following financial text.
 
-IMPORTANT CONTEXT FOR FINANCIAL SENTIMENT:
-- Positive indicators: revenue growth, earnings beat, positive guidance, partnerships, expansion, innovation
-- Negative indicators: revenue miss, layoffs, regulatory issues, lawsuits, debt concerns, competition threats
-- Neutral: routine announcements, balanced reports, forward-looking statements without clear direction
-
-Consider:
-1. **Market impact**: How will this affect stock price?
-2. **Investor confidence**: Will this attract or repel investors?
-3. **Company fundamentals**: Does this strengthen or weaken the business?
-4. **Risk factors**: Are there hidden concerns or opportunities?
-
-EXAMPLES:
-- "Company reports Q3 revenue up 25% YoY, beating analyst expectations" → score: 0.75 (positive)
-- "CEO announces restructuring plan, 500 jobs to be cut" → score: -0.3 (slightly negative, could be seen as cost-cutting)
-- "Company maintains quarterly dividend at $0.50 per share" → score: 0.1 (neutral to slightly positive)
-- "SEC opens investigation into accounting practices" → score: -0.85 (very negative)
-
+{SENTIMENT_GUIDANCE}
 Provide a sentiment score from -1.0 (very negative for investors) to 1.0 (very positive for investors), where 0 is neutral.
 Also provide a label (positive, neutral, or negative), confidence score (0 to 1), and brief reasoning.
 
@@ -174,57 +203,152 @@ Text to analyze:
 
         try:
             response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-
-            # Parse JSON response
-            import json
-            # Remove markdown code blocks if present
-            if result_text.startswith("```"):
-                result_text = result_text.split("```")[1]
-                if result_text.startswith("json"):
-                    result_text = result_text[4:]
-                result_text = result_text.strip()
-
-            sentiment = json.loads(result_text)
-
-            # Validate and normalize
-            score = max(-1.0, min(1.0, float(sentiment.get("score", 0))))
-            label = sentiment.get("label", "neutral").lower()
-            confidence = max(0.0, min(1.0, float(sentiment.get("confidence", 0.5))))
-            reasoning = sentiment.get("reasoning", "")
-
-            return {
-                "score": score,
-                "label": label,
-                "confidence": confidence,
-                "reasoning": reasoning
-            }
+            sentiment = self._parse_json_response(response.text)
+            return self._normalize_sentiment(sentiment)
         except Exception as e:
             logger.error(f"Error analyzing sentiment: {e}")
             # Return neutral sentiment on error
-            return {
-                "score": 0.0,
-                "label": "neutral",
-                "confidence": 0.0,
-                "reasoning": "Error during analysis"
-            }
+            return dict(ERROR_SENTIMENT)
 
-    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+    def analyze_sentiment_batch(
+        self,
+        texts: List[str],
+        max_items: Optional[int] = None,
+        token_budget: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Analyze sentiment for multiple texts in batch.
+        Analyze sentiment for multiple texts with few LLM calls.
+
+        Texts are packed into batches (bounded by item count and an approximate
+        prompt token budget) and each batch is scored by one prompt returning a
+        JSON array keyed by item id. Items that come back missing or malformed
+        are split into halves and retried; a single item that still fails is
+        scored with analyze_sentiment. If the API call itself fails (quota,
+        network) nothing is retried: the remaining texts are returned with
+        zero confidence so callers can try them again later.
 
         Args:
             texts: List of texts to analyze
+            max_items: Maximum texts per prompt (defaults to SENTIMENT_BATCH_MAX_ITEMS)
+            token_budget: Approximate input tokens per prompt
+                (defaults to SENTIMENT_BATCH_TOKEN_BUDGET)
 
         Returns:
-            List of sentiment dictionaries
+            List of sentiment dictionaries in the same order as texts
         """
-        results = []
-        for text in texts:
-            result = self.analyze_sentiment(text)
-            results.append(result)
+        max_items = max_items or settings.SENTIMENT_BATCH_MAX_ITEMS
+        token_budget = token_budget or settings.SENTIMENT_BATCH_TOKEN_BUDGET
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        batch_tokens = 0
+
+        for i, text in enumerate(texts):
+            tokens = len(text) // CHARS_PER_TOKEN + 1
+            if batch and (len(batch) >= max_items or batch_tokens + tokens > token_budget):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(i)
+            batch_tokens += tokens
+
+        if batch:
+            batches.append(batch)
+
+        try:
+            for batch in batches:
+                self._score_sentiment_batch(texts, batch, results)
+        except SentimentAPIError as e:
+            unscored = sum(1 for r in results if r is None)
+            logger.error(f"Batch sentiment aborted, {unscored}/{len(texts)} texts left unscored: {e}")
+            results = [r if r is not None else dict(ERROR_SENTIMENT) for r in results]
+
         return results
 
+    def _score_sentiment_batch(
+        self,
+        texts: List[str],
+        indices: List[int],
+        results: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        """
+        Score one batch into results, splitting and retrying malformed items.
+
+        Raises:
+            SentimentAPIError: If the Gemini call fails
+        """
+        if len(indices) == 1:
+            results[indices[0]] = self.analyze_sentiment(texts[indices[0]])
+            return
+
+        items = "\n\n".join(f"[{n}] {texts[i]}" for n, i in enumerate(indices))
+        prompt = f"""You are a financial sentiment analysis expert. Analyze the sentiment of each of the following {len(indices)} financial texts independently.
+
+{SENTIMENT_GUIDANCE}
+For each text provide a sentiment score from -1.0 (very negative for investors) to 1.0 (very positive for investors), where 0 is neutral,
+a label (positive, neutral, or negative), a confidence score (0 to 1), and brief reasoning.
+
+Respond ONLY with a JSON array containing one object per text, in this exact format:
+[{{"id": <text number>, "score": <float between -1 and 1>, "label": "<positive/neutral/negative>", "confidence": <float between 0 and 1>, "reasoning": "<brief explanation>"}}]
+
+Texts to analyze:
+{items}
+"""
+
+        try:
+            response = self.model.generate_content(prompt)
+        except Exception as e:
+            raise SentimentAPIError(str(e)) from e
+
+        scored = {}
+        try:
+            # .text raises for blocked replies; splitting isolates the offending text
+            parsed = self._parse_json_response(response.text)
+            if not isinstance(parsed, list):
+                raise ValueError("Expected a JSON array")
+
+            for entry in parsed:
+                try:
+                    n = int(entry["id"])
+                    if 0 <= n < len(indices) and "score" in entry:
+                        scored[n] = self._normalize_sentiment(entry)
+                except (KeyError, TypeError, ValueError):
+                    continue
+        except Exception as e:
+            logger.warning(f"Malformed batch sentiment for {len(indices)} texts: {e}")
+
+        for n, sentiment in scored.items():
+            results[indices[n]] = sentiment
+
+        failed = [i for n, i in enumerate(indices) if n not in scored]
+        if failed:
+            logger.debug(f"Retrying {len(failed)}/{len(indices)} texts from malformed sentiment batch")
+            middle = len(failed) // 2 or 1
+            for half in (failed[:middle], failed[middle:]):
+                if half:
+                    self._score_sentiment_batch(texts, half, results)
+
+    @staticmethod
+    def _parse_json_response(result_text: str) -> Any:
+        """Parse a JSON model response, removing markdown code blocks if present."""
+        result_text = result_text.strip()
+        if result_text.startswith("```"):
+            result_text = result_text.split("```")[1]
+            if result_text.startswith("json"):
+                result_text = result_text[4:]
+            result_text = result_text.strip()
+        return json.loads(result_text)
+
+    @staticmethod
+    def _normalize_sentiment(sentiment: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and clamp a sentiment result."""
+        return {
+            "score": max(-1.0, min(1.0, float(sentiment.get("score", 0)))),
+            "label": str(sentiment.get("label", "neutral")).lower(),
+            "confidence": max(0.0, min(1.0, float(sentiment.get("confidence", 0.5)))),
+            "reasoning": sentiment.get("reasoning", "")
+        }
+
     def is_finance_related(self, question: str) -> bool:
         """
         Check if a question is related to finance, stocks, or investing.
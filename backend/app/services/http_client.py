@@ -0,0 +1,350 @@
+"""
+Shared pooled HTTP client for external service wrappers.
+
+Features:
+- One pooled `requests.Session` (HTTPAdapter pool sizing, keep-alive) for sync callers
+- One `httpx.AsyncClient` per event loop (keep-alive, HTTP/2 when `h2` is installed)
+- Retries on connection errors, timeouts and 429/5xx with jittered exponential
+  backoff (honours Retry-After)
+- Per-host concurrency caps
+- Per-host request, error, retry and latency metrics
+"""
+
+import asyncio
+import random
+import threading
+import time
+import logging
+import weakref
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpMetrics:
+    """Thread-safe per-host request metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, float]] = {}
+
+    def record(
+        self,
+        host: str,
+        latency: float,
+        status: Optional[int] = None,
+        error: bool = False,
+        retry: bool = False
+    ) -> None:
+        """Record one attempt against a host."""
+        with self._lock:
+            m = self._hosts.setdefault(host, {
+                "requests": 0, "errors": 0, "retries": 0,
+                "total_latency": 0.0, "max_latency": 0.0
+            })
+            m["requests"] += 1
+            m["total_latency"] += latency
+            m["max_latency"] = max(m["max_latency"], latency)
+            if error or (status is not None and status >= 400):
+                m["errors"] += 1
+            if retry:
+                m["retries"] += 1
+            if status is not None:
+                key = f"status_{status}"
+                m[key] = m.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get metrics per host with average latency."""
+        with self._lock:
+            result = {}
+            for host, m in self._hosts.items():
+                entry = {k: int(v) for k, v in m.items() if k not in ("total_latency", "max_latency")}
+                entry["avg_latency_ms"] = round(m["total_latency"] / m["requests"] * 1000, 1) if m["requests"] else None
+                entry["max_latency_ms"] = round(m["max_latency"] * 1000, 1)
+                result[host] = entry
+            return result
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self._hosts.clear()
+
+
+class HttpClient:
+    """
+    Pooled sync and async HTTP client with retries, per-host caps and metrics.
+
+    Sync methods raise `requests` exceptions and return `requests.Response`;
+    async methods raise `httpx` exceptions and return `httpx.Response`. After
+    retries are exhausted the last response is returned, so callers keep
+    their own status-code handling.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 20,
+        per_host_limit: int = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        timeout: float = 30.0
+    ):
+        """
+        Initialize HTTP client.
+
+        Args:
+            pool_size: Connections kept alive per host
+            per_host_limit: Maximum concurrent requests per host
+            max_retries: Retries after the first attempt
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum backoff delay in seconds
+            timeout: Default request timeout in seconds
+        """
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.metrics = HttpMetrics()
+
+        # Retries are handled here (with metrics), not by urllib3
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self._session = requests.Session()
+        self.mount(self._session, record_metrics=False)
+
+        self._lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+            weakref.WeakKeyDictionary()
+
+    # ---------- Sync ----------
+
+    @property
+    def session(self) -> requests.Session:
+        """The shared pooled session."""
+        return self._session
+
+    def mount(self, session: requests.Session, record_metrics: bool = True) -> requests.Session:
+        """
+        Make another session (e.g. one owned by an SDK) use the shared pools.
+
+        Args:
+            session: Session to configure
+            record_metrics: Record response metrics via a response hook
+
+        Returns:
+            The same session
+        """
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+
+        if record_metrics:
+            def _record(response, *args, **kwargs):
+                self.metrics.record(
+                    urlsplit(response.url).netloc,
+                    response.elapsed.total_seconds(),
+                    status=response.status_code
+                )
+            session.hooks["response"].append(_record)
+
+        return session
+
+    def request(self, method: str, url: str, retry: bool = True, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            retry: Retry on transient failures (disable for non-idempotent calls)
+            **kwargs: Passed to `requests.Session.request`
+
+        Returns:
+            requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        attempts = self.max_retries + 1 if retry else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            started = time.monotonic()
+
+            with self._host_semaphore(host):
+                try:
+                    response = self._session.request(method, url, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    self.metrics.record(host, time.monotonic() - started, error=True, retry=not last_attempt)
+                    if last_attempt:
+                        raise
+                    time.sleep(self._backoff(attempt))
+                    continue
+
+            retryable = response.status_code in RETRY_STATUSES and not last_attempt
+            self.metrics.record(host, time.monotonic() - started, status=response.status_code, retry=retryable)
+
+            if not retryable:
+                return response
+
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            logger.debug(f"{method} {host} returned {response.status_code}, retrying in {delay:.1f}s")
+            response.close()
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
+
+    # ---------- Async ----------
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Get the pooled async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    http2=HTTP2_AVAILABLE,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size * 4,
+                        max_keepalive_connections=self.pool_size
+                    ),
+                    follow_redirects=True
+                )
+                self._async_clients[loop] = client
+            return client
+
+    async def arequest(self, method: str, url: str, retry: bool = True, **kwargs) -> httpx.Response:
+        """
+        Send a request through the pooled async client.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            retry: Retry on transient failures
+            **kwargs: Passed to `httpx.AsyncClient.request`
+
+        Returns:
+            httpx.Response
+        """
+        client = self.async_client()
+        host = urlsplit(url).netloc
+        semaphore = self._async_host_semaphore(host)
+        attempts = self.max_retries + 1 if retry else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            started = time.monotonic()
+
+            async with semaphore:
+                try:
+                    response = await client.request(method, url, **kwargs)
+                except (httpx.TransportError, httpx.TimeoutException):
+                    self.metrics.record(host, time.monotonic() - started, error=True, retry=not last_attempt)
+                    if last_attempt:
+                        raise
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+
+            retryable = response.status_code in RETRY_STATUSES and not last_attempt
+            self.metrics.record(host, time.monotonic() - started, status=response.status_code, retry=retryable)
+
+            if not retryable:
+                return response
+
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            logger.debug(f"{method} {host} returned {response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        """Send an async GET request."""
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs) -> httpx.Response:
+        """Send an async POST request."""
+        return await self.arequest("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the async client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Close the pooled sync session."""
+        self._session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get client configuration and per-host metrics.
+
+        Returns:
+            Dict with pool settings and metrics by host
+        """
+        return {
+            "pool_size": self.pool_size,
+            "per_host_limit": self.per_host_limit,
+            "max_retries": self.max_retries,
+            "http2": HTTP2_AVAILABLE,
+            "hosts": self.metrics.snapshot()
+        }
+
+    # ---------- Internals ----------
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, or the server's Retry-After if given."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        """Get the sync concurrency cap for a host."""
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_semaphores[host]
+
+    def _async_host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Get the async concurrency cap for a host on the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._async_semaphores.setdefault(loop, {})
+            if host not in semaphores:
+                semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+            return semaphores[host]
+
+
+# Global HTTP client instance
+http_client = HttpClient(
+    pool_size=settings.HTTP_POOL_SIZE,
+    per_host_limit=settings.HTTP_PER_HOST_LIMIT,
+    max_retries=settings.HTTP_MAX_RETRIES
+)
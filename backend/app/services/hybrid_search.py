@@ -0,0 +1,179 @@
+"""
+Hybrid keyword + vector retrieval for RAG queries.
+
+Features:
+- BM25 keyword hits (exact tickers, names, phrases) and embedding
+  similarity hits are combined with reciprocal rank fusion, which needs
+  no score calibration between the two retrievers
+- The query embedding is requested in a worker thread while the keyword
+  index is searched, so keyword results are ready before it returns
+- Falls back to keyword-only results when the embedding call fails or
+  exceeds HYBRID_EMBEDDING_TIMEOUT, and to vector-only results when
+  hybrid search is disabled
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+
+from backend.app.core.config import settings
+from backend.app.services.keyword_index import BM25Index, keyword_index
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query-embedding")
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked id lists: each id scores the sum of 1 / (k + rank) over the lists it appears in.
+
+    Args:
+        rankings: Id lists, best first
+        k: Fusion constant (larger values flatten the rank weights)
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+@dataclass
+class RetrievedArticle:
+    """An article chosen for the RAG context."""
+    article_id: int
+    score: float
+    keyword_rank: Optional[int] = None  # 1-based rank in the keyword results
+    vector_rank: Optional[int] = None  # 1-based rank in the vector results
+
+
+class HybridRetriever:
+    """Retrieves articles for a question from the keyword index and the vector store."""
+
+    def __init__(
+        self,
+        embedder,
+        vector_store,
+        index: BM25Index = keyword_index,
+        enabled: bool = True,
+        rrf_k: int = 60,
+        embedding_timeout: float = 10.0
+    ):
+        """
+        Initialize retriever.
+
+        Args:
+            embedder: Service with generate_query_embedding(text)
+            vector_store: Vector store backend
+            index: Keyword index
+            enabled: When False only the vector store is used
+            rrf_k: Reciprocal rank fusion constant
+            embedding_timeout: Seconds to wait for the query embedding
+        """
+        self.embedder = embedder
+        self.vector_store = vector_store
+        self.index = index
+        self.enabled = enabled
+        self.rrf_k = rrf_k
+        self.embedding_timeout = embedding_timeout
+
+    def start_embedding(self, question: str) -> Future:
+        """Request the query embedding in the background."""
+        return _executor.submit(self.embedder.generate_query_embedding, question)
+
+    def keyword_search(self, question: str, n_results: int) -> List[RetrievedArticle]:
+        """
+        Keyword-only results, available without an embedding call.
+
+        The index is kept current by the collectors and the scheduled
+        update_keyword_index job; searching never indexes in-line.
+
+        Args:
+            question: User's question
+            n_results: Maximum number of articles
+
+        Returns:
+            Articles ranked by BM25 score
+        """
+        return [
+            RetrievedArticle(article_id, score, keyword_rank=rank)
+            for rank, (article_id, score) in enumerate(self.index.search(question, n_results), start=1)
+        ]
+
+    def search(
+        self,
+        question: str,
+        n_results: int,
+        embedding: Optional[Future] = None
+    ) -> List[RetrievedArticle]:
+        """
+        Retrieve articles for a question.
+
+        Args:
+            question: User's question
+            n_results: Number of articles to return
+            embedding: Embedding request from start_embedding() (started here if None)
+
+        Returns:
+            Articles ranked by fused score, best first
+        """
+        embedding = embedding or self.start_embedding(question)
+        candidates = n_results * 3
+
+        keyword_hits = []
+        if self.enabled:
+            try:
+                keyword_hits = self.keyword_search(question, candidates)
+            except Exception as e:
+                logger.error(f"Keyword search failed: {e}")
+
+        vector_ids = self._vector_search(embedding, candidates)
+        if not self.enabled:
+            return [RetrievedArticle(article_id, 0.0, vector_rank=rank)
+                    for rank, article_id in enumerate(vector_ids[:n_results], start=1)]
+        if not vector_ids:
+            return keyword_hits[:n_results]
+
+        keyword_ids = [hit.article_id for hit in keyword_hits]
+        keyword_ranks = {article_id: rank for rank, article_id in enumerate(keyword_ids, start=1)}
+        vector_ranks = {article_id: rank for rank, article_id in enumerate(vector_ids, start=1)}
+
+        fused = reciprocal_rank_fusion([keyword_ids, vector_ids], k=self.rrf_k)[:n_results]
+        logger.info(
+            f"Hybrid search: {len(keyword_ids)} keyword + {len(vector_ids)} vector candidates, "
+            f"{sum(1 for article_id, _ in fused if article_id in keyword_ranks and article_id in vector_ranks)} in both"
+        )
+        return [
+            RetrievedArticle(article_id, score, keyword_ranks.get(article_id), vector_ranks.get(article_id))
+            for article_id, score in fused
+        ]
+
+    def _vector_search(self, embedding: Future, n_results: int) -> List[int]:
+        """Wait for the query embedding and search the vector store (empty on failure or timeout)."""
+        try:
+            query_embedding = embedding.result(timeout=self.embedding_timeout)
+        except FutureTimeoutError:
+            logger.warning(f"Query embedding took over {self.embedding_timeout}s - using keyword results only")
+            return []
+        except Exception as e:
+            logger.error(f"Query embedding failed - using keyword results only: {e}")
+            return []
+
+        results = self.vector_store.search_similar(query_embedding=query_embedding, n_results=n_results)
+        return list(dict.fromkeys(result["article_id"] for result in results))
+
+
+def create_retriever(embedder, vector_store) -> HybridRetriever:
+    """Hybrid retriever configured from settings."""
+    return HybridRetriever(
+        embedder,
+        vector_store,
+        enabled=settings.HYBRID_SEARCH_ENABLED,
+        rrf_k=settings.HYBRID_RRF_K,
+        embedding_timeout=settings.HYBRID_EMBEDDING_TIMEOUT
+    )
@@ -0,0 +1,293 @@
+"""
+Incremental (base + delta) exports of the ML dataset.
+
+Features:
+- A JSON manifest records a watermark per table (max id, plus max date for
+  prices and max created_at for articles) after every export
+- Weekly runs write the rows added since the previous watermark as a
+  delta. Each delta also re-exports:
+  - the last ID_LOOKBACK ids below each watermark, so a row whose
+    transaction committed after one with a higher id is not skipped
+  - the last EXPORT_PRICE_OVERLAP_DAYS of prices (revised closes)
+  - articles stored in the last EXPORT_ARTICLE_OVERLAP_DAYS before the
+    watermark, whose sentiment and cluster ids are rewritten in place
+- After EXPORT_COMPACT_EVERY deltas the next run writes a fresh base
+  snapshot from the database, starting a new chain (the base also carries
+  edits of older rows, such as bulk sentiment re-scoring, and deletions,
+  which deltas do not)
+- Retention deletes whole chains, and only once a newer chain exists, so
+  every export inside the retention window stays restorable
+
+Layout:
+    exports/incremental/manifest.json
+    exports/incremental/<chain>/base_<ts>_<format>/...
+    exports/incremental/<chain>/delta_<ts>_<format>/...
+
+To restore, load the base and then each delta in order; later rows
+replace earlier ones with the same key (symbol + date for prices, id for
+articles, symbol + article_id for links).
+"""
+
+import os
+import json
+import shutil
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models import StockPrice, NewsArticle, ArticleStock
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+ID_LOOKBACK = 1000  # ids below each watermark re-exported for late commits
+
+
+class IncrementalExportService:
+    """Writes base and delta exports and keeps their manifest."""
+
+    def __init__(
+        self,
+        exporter,
+        compact_every: Optional[int] = None,
+        price_overlap_days: Optional[int] = None,
+        article_overlap_days: Optional[int] = None
+    ):
+        """
+        Initialize service.
+
+        Args:
+            exporter: DataExporterService that writes the datasets
+            compact_every: Deltas per chain before a new base (defaults to EXPORT_COMPACT_EVERY)
+            price_overlap_days: Trailing price days re-exported in each delta
+                (defaults to EXPORT_PRICE_OVERLAP_DAYS)
+            article_overlap_days: Days of recently stored articles re-exported
+                in each delta (defaults to EXPORT_ARTICLE_OVERLAP_DAYS)
+        """
+        self.exporter = exporter
+        self.root = Path(exporter.export_dir) / "incremental"
+        self.manifest_path = self.root / "manifest.json"
+        self.compact_every = compact_every if compact_every is not None else settings.EXPORT_COMPACT_EVERY
+        self.price_overlap_days = (
+            price_overlap_days if price_overlap_days is not None else settings.EXPORT_PRICE_OVERLAP_DAYS
+        )
+        self.article_overlap_days = (
+            article_overlap_days if article_overlap_days is not None else settings.EXPORT_ARTICLE_OVERLAP_DAYS
+        )
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Manifest contents (an empty manifest if none has been written yet)."""
+        if not self.manifest_path.exists():
+            return {"version": MANIFEST_VERSION, "watermarks": None, "chains": []}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def current_watermarks(db: Session) -> Dict[str, Dict[str, Any]]:
+        """Highest ids (plus price date and article created_at) currently stored."""
+        max_price_id, max_price_date = db.query(func.max(StockPrice.id), func.max(StockPrice.date)).one()
+        max_article_id, max_created_at = db.query(func.max(NewsArticle.id), func.max(NewsArticle.created_at)).one()
+        return {
+            "stock_prices": {
+                "max_id": max_price_id or 0,
+                "max_date": max_price_date.isoformat() if max_price_date else None
+            },
+            "news_articles": {
+                "max_id": max_article_id or 0,
+                "max_created_at": max_created_at.isoformat() if max_created_at else None
+            },
+            "article_stocks": {"max_id": db.query(func.max(ArticleStock.id)).scalar() or 0}
+        }
+
+    def export(self, db: Session, file_format: str = "csv", force_base: bool = False) -> Dict[str, Any]:
+        """
+        Write the next export in the chain: a delta, or a base when one is due.
+
+        A base is written when there is no chain yet, the current chain has
+        compact_every deltas, its format differs from file_format, or
+        force_base is set.
+
+        Args:
+            db: Database session
+            file_format: csv, parquet or arrow
+            force_base: Compact now
+
+        Returns:
+            Export result dictionary with "kind" (base or delta)
+        """
+        try:
+            manifest = self.load_manifest()
+            chain = manifest["chains"][-1] if manifest["chains"] else None
+            watermarks = self.current_watermarks(db)
+
+            write_base = (
+                force_base
+                or chain is None
+                or manifest.get("watermarks") is None
+                or chain["format"] != file_format
+                or len(chain["deltas"]) >= self.compact_every
+            )
+            if write_base:
+                ranges = {table: {"until_id": mark["max_id"]} for table, mark in watermarks.items()}
+            else:
+                ranges = self._delta_ranges(manifest["watermarks"], watermarks)
+
+            now = datetime.now()
+            kind = "base" if write_base else "delta"
+            name = f"{kind}_{now.strftime('%Y-%m-%dT%H%M%S')}"
+            chain_name = name if write_base else chain["name"]
+
+            result = self.exporter.write_dataset(db, self.root / chain_name / name, file_format, ranges)
+
+            member = {
+                "name": result["filename"],
+                "created_at": now.isoformat(),
+                "ranges": ranges,
+                "tables": result["tables"]
+            }
+            if write_base:
+                manifest["chains"].append({
+                    "name": chain_name,
+                    "format": file_format,
+                    "created_at": now.isoformat(),
+                    "base": member,
+                    "deltas": []
+                })
+            else:
+                chain["deltas"].append(member)
+            manifest["watermarks"] = watermarks
+            manifest["updated_at"] = now.isoformat()
+            self._save_manifest(manifest)
+
+            logger.info(f"Incremental export: wrote {kind} {chain_name}/{result['filename']} ({result['records']} rows)")
+            return dict(result, kind=kind, chain=chain_name)
+
+        except Exception as e:
+            logger.error(f"Error writing incremental export: {e}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "records": 0
+            }
+
+    def compact(self, db: Session, file_format: str = "csv") -> Dict[str, Any]:
+        """Write a new base snapshot now, starting a new chain."""
+        return self.export(db, file_format, force_base=True)
+
+    def _delta_ranges(
+        self,
+        previous: Dict[str, Dict[str, Any]],
+        current: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Row ranges between two watermarks.
+
+        Rows changed in place or committed late cannot be told apart from
+        already exported ones, so a delta is written even without new ids.
+        """
+        ranges = {
+            table: {
+                "after_id": max(previous[table]["max_id"] - ID_LOOKBACK, 0),
+                "until_id": current[table]["max_id"]
+            }
+            for table in current
+        }
+        last_price_date = previous["stock_prices"].get("max_date")
+        if last_price_date and self.price_overlap_days > 0:
+            ranges["stock_prices"]["from_date"] = (
+                date.fromisoformat(last_price_date) - timedelta(days=self.price_overlap_days)
+            ).isoformat()
+        last_created_at = previous["news_articles"].get("max_created_at")
+        if last_created_at and self.article_overlap_days > 0:
+            ranges["news_articles"]["from_created_at"] = (
+                datetime.fromisoformat(last_created_at) - timedelta(days=self.article_overlap_days)
+            ).isoformat()
+        return ranges
+
+    def restore_chain(self, as_of: Optional[datetime] = None) -> List[Path]:
+        """
+        Directories to load, in order, to rebuild the dataset as of a point in time.
+
+        Args:
+            as_of: Point in time (latest export if None)
+
+        Returns:
+            The chain's base followed by its deltas up to as_of (empty if no
+            export exists at or before as_of)
+        """
+        as_of_str = as_of.isoformat() if as_of else None
+        for chain in reversed(self.load_manifest()["chains"]):
+            if as_of_str and chain["base"]["created_at"] > as_of_str:
+                continue
+            members = [chain["base"]] + [
+                delta for delta in chain["deltas"]
+                if not as_of_str or delta["created_at"] <= as_of_str
+            ]
+            return [self.root / chain["name"] / member["name"] for member in members]
+        return []
+
+    def cleanup(self, cutoff: datetime) -> Dict[str, int]:
+        """
+        Delete chains whose newest export is older than cutoff.
+
+        The latest chain is always kept, and chains are deleted whole, so a
+        delta never outlives its base.
+
+        Args:
+            cutoff: Exports created before this are expired
+
+        Returns:
+            deleted_count (chains) and deleted_size_bytes
+        """
+        manifest = self.load_manifest()
+        cutoff_str = cutoff.isoformat()
+        deleted_count = 0
+        deleted_size = 0
+
+        kept = []
+        for index, chain in enumerate(manifest["chains"]):
+            newest = max([chain["base"]["created_at"]] + [d["created_at"] for d in chain["deltas"]])
+            if index == len(manifest["chains"]) - 1 or newest >= cutoff_str:
+                kept.append(chain)
+                continue
+            deleted_size += self._remove(self.root / chain["name"])
+            deleted_count += 1
+            logger.info(f"Deleted expired export chain: {chain['name']}")
+
+        # Directories of runs that failed before updating the manifest
+        known = {chain["name"] for chain in kept}
+        if self.root.exists():
+            for path in self.root.iterdir():
+                if path.is_dir() and path.name not in known \
+                        and datetime.fromtimestamp(path.stat().st_mtime) < cutoff:
+                    deleted_size += self._remove(path)
+                    deleted_count += 1
+                    logger.info(f"Deleted orphaned export: {path.name}")
+
+        if len(kept) != len(manifest["chains"]):
+            manifest["chains"] = kept
+            self._save_manifest(manifest)
+
+        return {"deleted_count": deleted_count, "deleted_size_bytes": deleted_size}
+
+    @staticmethod
+    def _remove(path: Path) -> int:
+        """Delete a directory tree, returning the bytes freed."""
+        if not path.exists():
+            return 0
+        size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        shutil.rmtree(path)
+        return size
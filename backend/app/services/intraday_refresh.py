@@ -0,0 +1,212 @@
+"""
+Intraday price refresh for stocks held in active portfolios.
+
+Features:
+- Runs every INTRADAY_REFRESH_MINUTES, but only for symbols whose exchange
+  is in session (holiday-aware US and European calendars), plus a short
+  grace period after the close to pick up closing prints
+- One batch request per refresh via BatchPriceService.fetch_current_prices
+- Prices go into the shared PriceCache (kept warm until the next refresh)
+  and the compact intraday_prices table; unchanged prices are not stored
+  again
+- Outside sessions the job reports the next session open so the scheduler
+  sleeps until then; repeated empty fetches back off exponentially
+- Snapshots older than INTRADAY_RETENTION_DAYS are pruned once a day
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.db.base import SessionLocal
+from backend.app.models import Stock, Portfolio, Position, IntradayPrice
+from backend.app.services.batch_price_service import batch_price_service
+from backend.app.services.price_cache import price_cache
+from backend.app.services.market_calendar import (
+    CALENDARS, exchange_for_symbol, next_session_open, open_exchanges
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_STEPS = 3  # empty fetches in a row double the delay, up to 8x the interval
+
+
+class IntradayRefreshService:
+    """Refreshes held stocks' prices during exchange sessions."""
+
+    def __init__(
+        self,
+        interval_minutes: Optional[int] = None,
+        close_grace_minutes: Optional[int] = None,
+        retention_days: Optional[int] = None
+    ):
+        """
+        Initialize service.
+
+        Args:
+            interval_minutes: Refresh cadence (defaults to INTRADAY_REFRESH_MINUTES)
+            close_grace_minutes: Minutes after the close still refreshed
+                (defaults to INTRADAY_CLOSE_GRACE_MINUTES)
+            retention_days: Days of snapshots kept (defaults to INTRADAY_RETENTION_DAYS)
+        """
+        self.interval = timedelta(minutes=interval_minutes or settings.INTRADAY_REFRESH_MINUTES)
+        self.grace = timedelta(minutes=(
+            close_grace_minutes if close_grace_minutes is not None else settings.INTRADAY_CLOSE_GRACE_MINUTES
+        ))
+        self.retention = timedelta(days=retention_days or settings.INTRADAY_RETENTION_DAYS)
+
+        self._last_stored: Dict[int, Tuple[float, Optional[int]]] = {}
+        self._failures = 0
+        self._pruned_on: Optional[date] = None
+        self._stats = {"refreshes": 0, "skipped": 0, "symbols_fetched": 0, "snapshots_stored": 0}
+
+    @staticmethod
+    def held_stocks(db: Session) -> Dict[str, int]:
+        """Symbol -> stock id of every stock held in an active portfolio."""
+        rows = db.query(Stock.symbol, Stock.id).join(
+            Position, Position.stock_id == Stock.id
+        ).join(
+            Portfolio, Portfolio.id == Position.portfolio_id
+        ).filter(
+            Portfolio.is_active.is_(True),
+            Position.shares > 0
+        ).distinct().all()
+        return {symbol.upper(): stock_id for symbol, stock_id in rows}
+
+    def symbols_in_session(self, symbols: List[str], now: datetime) -> List[str]:
+        """
+        Symbols whose exchange is in session (or within the close grace period).
+
+        Symbols on an unknown exchange are refreshed while any known exchange is open.
+        """
+        open_codes = set(open_exchanges(now, self.grace))
+        return [
+            symbol for symbol in symbols
+            if (exchange_for_symbol(symbol) in open_codes)
+            or (exchange_for_symbol(symbol) is None and open_codes)
+        ]
+
+    def refresh(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Refresh prices for held symbols whose market is open.
+
+        Args:
+            now: Timezone-aware time (defaults to now)
+
+        Returns:
+            Result dictionary; "next_run" (ISO time) is set when the next
+            refresh should wait longer than the normal interval
+        """
+        now = now or datetime.now(pytz.utc)
+        db = SessionLocal()
+
+        try:
+            held = self.held_stocks(db)
+            exchanges = {exchange_for_symbol(symbol) for symbol in held}
+            watched = None if not held or None in exchanges else exchanges
+
+            symbols = self.symbols_in_session(list(held), now)
+            if not symbols:
+                self._stats["skipped"] += 1
+                next_open = next_session_open(now, watched)
+                logger.debug(f"Intraday refresh: no held market in session, next open {next_open.isoformat()}")
+                return {
+                    "status": "skipped",
+                    "reason": "no_positions" if not held else "markets_closed",
+                    "next_run": next_open.isoformat()
+                }
+
+            prices = batch_price_service.fetch_current_prices(symbols)
+            if not prices:
+                self._failures = min(self._failures + 1, MAX_BACKOFF_STEPS)
+                delay = self.interval * (2 ** self._failures)
+                logger.warning(f"Intraday refresh: no prices for {len(symbols)} symbols - retrying in {delay}")
+                return {
+                    "status": "error",
+                    "reason": "no_prices",
+                    "symbols": len(symbols),
+                    "next_run": (now + delay).isoformat()
+                }
+            self._failures = 0
+
+            # Keep cached prices until the next refresh replaces them
+            price_cache.set_many(prices, ttl=max(settings.PRICE_CACHE_TTL, int(self.interval.total_seconds()) + 60))
+            stored = self._store(db, prices, held, now)
+            pruned = self._prune(db, now)
+            db.commit()
+
+            self._stats["refreshes"] += 1
+            self._stats["symbols_fetched"] += len(prices)
+            self._stats["snapshots_stored"] += stored
+            logger.info(f"Intraday refresh: {len(prices)}/{len(symbols)} prices, {stored} stored")
+            return {
+                "status": "success",
+                "symbols": len(symbols),
+                "prices": len(prices),
+                "stored": stored,
+                "pruned": pruned
+            }
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Intraday refresh failed: {e}")
+            return {"status": "error", "error": str(e)}
+        finally:
+            db.close()
+
+    def _store(self, db: Session, prices: Dict[str, Dict[str, Any]], held: Dict[str, int], now: datetime) -> int:
+        """Insert a snapshot for every stock whose price or volume changed since its last one."""
+        rows = []
+        for symbol, data in prices.items():
+            stock_id = held.get(symbol)
+            if stock_id is None:
+                continue
+            snapshot = (data["current_price"], data.get("volume"))
+            if self._last_stored.get(stock_id) == snapshot:
+                continue
+            self._last_stored[stock_id] = snapshot
+            rows.append({"stock_id": stock_id, "timestamp": now, "price": snapshot[0], "volume": snapshot[1]})
+
+        if rows:
+            db.execute(insert(IntradayPrice), rows)
+        return len(rows)
+
+    def _prune(self, db: Session, now: datetime) -> int:
+        """Delete expired snapshots (at most once per day)."""
+        if self._pruned_on == now.date():
+            return 0
+        self._pruned_on = now.date()
+        return db.query(IntradayPrice).filter(
+            IntradayPrice.timestamp < now - self.retention
+        ).delete(synchronize_session=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "interval_minutes": int(self.interval.total_seconds() // 60),
+            "open_exchanges": open_exchanges(grace=self.grace),
+            "exchanges": {code: calendar.name for code, calendar in CALENDARS.items()},
+            "consecutive_failures": self._failures
+        }
+
+
+async def refresh_intraday_prices() -> Dict[str, Any]:
+    """
+    Intraday refresh job.
+    Called by the scheduler.
+
+    Returns:
+        Refresh result dictionary
+    """
+    # Database and price API calls block, so they run in a worker thread
+    return await asyncio.to_thread(intraday_refresh_service.refresh)
+
+
+# Global intraday refresh service instance
+intraday_refresh_service = IntradayRefreshService()
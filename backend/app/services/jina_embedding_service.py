@@ -16,6 +16,9 @@ import requests
 from typing import List, Optional
 import logging
 
+from backend.app.services.http_client import http_client
+from backend.app.services.embedding_cache import embedding_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,7 +75,7 @@ class JinaEmbeddingService:
         }
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.base_url,
                 headers=headers,
                 json=payload,
@@ -112,8 +115,7 @@ class JinaEmbeddingService:
         if not text or not text.strip():
             raise ValueError("Empty text cannot be embedded")
 
-        embeddings = self._make_request([text], task="retrieval.passage")
-        return embeddings[0]
+        return self._cached_embeddings([text], task="retrieval.passage")[0]
 
     def generate_query_embedding(self, query: str) -> List[float]:
         """
@@ -130,8 +132,7 @@ class JinaEmbeddingService:
         if not query or not query.strip():
             raise ValueError("Empty query cannot be embedded")
 
-        embeddings = self._make_request([query], task="retrieval.query")
-        return embeddings[0]
+        return self._cached_embeddings([query], task="retrieval.query")[0]
 
     def generate_embeddings_batch(
         self,
@@ -141,7 +142,8 @@ class JinaEmbeddingService:
         """
         Generate embeddings for multiple texts in batch.
 
-        More efficient than individual calls for multiple documents.
+        More efficient than individual calls for multiple documents. Texts
+        already in the embedding cache are not sent to the API.
 
         Args:
             texts: List of texts to embed
@@ -159,12 +161,25 @@ class JinaEmbeddingService:
         if not valid_texts:
             raise ValueError("No valid texts to embed")
 
+        return self._cached_embeddings(valid_texts, task=task)
+
+    def _cached_embeddings(self, texts: List[str], task: str) -> List[List[float]]:
+        """Embed texts through the embedding cache, requesting only misses."""
+        return embedding_cache.get_or_embed(
+            texts,
+            self.model,
+            task,
+            lambda missing: self._request_in_batches(missing, task)
+        )
+
+    def _request_in_batches(self, texts: List[str], task: str) -> List[List[float]]:
+        """Request embeddings in chunks within the API batch limit."""
         # Jina AI has batch limits, process in chunks of 100
         batch_size = 100
         all_embeddings = []
 
-        for i in range(0, len(valid_texts), batch_size):
-            batch = valid_texts[i:i + batch_size]
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
             embeddings = self._make_request(batch, task=task)
             all_embeddings.extend(embeddings)
 
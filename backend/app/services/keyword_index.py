@@ -0,0 +1,464 @@
+"""
+On-disk BM25 keyword index over news articles.
+
+Features:
+- Inverted index over article titles (weighted twice), summaries and the
+  symbols of linked stocks, so exact ticker and keyword matches are found
+  without an embedding call
+- Built incrementally: each update() indexes the articles stored since the
+  last one into a new immutable segment (NumPy arrays in an .npz file);
+  segments are merged once there are too many, dropping deleted articles
+- Updates re-scan the last UPDATE_LOOKBACK ids below the watermark, so an
+  article whose transaction commits after one with a higher id is still
+  picked up
+- Kept current by the news collectors and a periodic scheduler job
+  (update_keyword_index), never inside a search request
+- Postings carry the article's near-duplicate cluster id, so a story
+  republished by several outlets is returned once, under its representative
+- Scoring is vectorized per query term; a query touches only the postings
+  of its own terms
+- Several processes may share the index (the API and the bulk collector
+  script): updates, merges and clears hold an exclusive fcntl lock on
+  `<KEYWORD_INDEX_DIR>.lock`, loads a shared one. Without fcntl (Windows)
+  only one process may write
+"""
+
+import os
+import re
+import json
+import math
+import asyncio
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.db.base import SessionLocal
+from backend.app.models import NewsArticle, ArticleStock, Stock
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+    FILE_LOCK_AVAILABLE = True
+except ImportError:
+    FILE_LOCK_AVAILABLE = False
+
+MAX_SEGMENTS = 8  # more segments than this are merged into one
+UPDATE_BATCH = 5000  # articles read per query while indexing
+UPDATE_LOOKBACK = 1000  # ids below the watermark re-checked for late commits
+MAX_TOKEN_LENGTH = 32
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do does for from had has have
+how i if in into is it its me my no not of on or our out so than that the their them then there these
+they this to up us was we were what when where which who why will with would you your
+""".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-case word tokens without stopwords."""
+    return [
+        token for token in _TOKEN.findall((text or "").lower())
+        if token not in STOPWORDS and len(token) <= MAX_TOKEN_LENGTH
+    ]
+
+
+@dataclass
+class _Segment:
+    """Immutable slice of the index."""
+    name: str
+    terms: np.ndarray  # sorted unique terms
+    offsets: np.ndarray  # postings of terms[i] are docs[offsets[i]:offsets[i + 1]]
+    docs: np.ndarray  # document positions within the segment
+    tfs: np.ndarray  # term frequencies
+    article_ids: np.ndarray
+    cluster_ids: np.ndarray
+    lengths: np.ndarray  # document lengths in tokens
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        i = int(np.searchsorted(self.terms, term))
+        if i < len(self.terms) and self.terms[i] == term:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            return self.docs[start:end], self.tfs[start:end]
+        return self.docs[:0], self.tfs[:0]
+
+
+class BM25Index:
+    """Segmented BM25 index over stored news articles."""
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize index.
+
+        Args:
+            path: Directory holding the segments and manifest
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+        """
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock_depth = 0
+        self._lock_exclusive = False
+        self._loaded = False
+        self._manifest_mtime = None
+        self._segments: List[_Segment] = []
+        self._last_article_id = 0
+        self._next_segment = 1
+
+    def update(self, db: Session) -> int:
+        """
+        Index articles stored since the last update.
+
+        Ids are assigned when a row is inserted but become visible when its
+        transaction commits, so concurrent writers can commit a lower id
+        after a higher one. The last UPDATE_LOOKBACK ids below the watermark
+        are therefore checked again and any that are not indexed yet are
+        added.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of articles indexed
+        """
+        with self._locked(exclusive=True):
+            # Another process may have added segments since the last load
+            self._ensure_loaded()
+            floor = max(self._last_article_id - UPDATE_LOOKBACK, 0)
+            ids = [row[0] for row in db.query(NewsArticle.id).filter(
+                NewsArticle.id > floor
+            ).order_by(NewsArticle.id).all()]
+            indexed_ids = self._indexed_ids(floor)
+            missing = [article_id for article_id in ids if article_id not in indexed_ids]
+            if not missing:
+                return 0
+
+            indexed = 0
+            for start in range(0, len(missing), UPDATE_BATCH):
+                batch = missing[start:start + UPDATE_BATCH]
+                rows = db.query(
+                    NewsArticle.id,
+                    NewsArticle.cluster_id,
+                    NewsArticle.title,
+                    NewsArticle.summary
+                ).filter(NewsArticle.id.in_(batch)).order_by(NewsArticle.id).all()
+                if not rows:
+                    continue
+
+                symbols = self._symbols(db, [row.id for row in rows])
+                documents = [
+                    (
+                        row.id,
+                        row.cluster_id or row.id,
+                        tokenize(row.title) * 2 + tokenize(row.summary) + symbols.get(row.id, [])
+                    )
+                    for row in rows
+                ]
+                self._add_segment(self._build_segment(self._segment_name(), documents))
+                self._last_article_id = max(self._last_article_id, rows[-1].id)
+                indexed += len(rows)
+
+            if len(self._segments) > MAX_SEGMENTS:
+                self._merge(db)
+            self._save_manifest()
+
+            logger.info(f"Keyword index: indexed {indexed} articles ({self.stats()['documents']} total)")
+            return indexed
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        Rank articles by BM25 score.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+
+        Returns:
+            (cluster representative article id, score) pairs, best first;
+            each near-duplicate cluster appears once
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._locked(exclusive=False):
+            self._ensure_loaded()
+            if not terms or not self._segments:
+                return []
+
+            segments = list(self._segments)
+
+        total_docs = sum(len(s.lengths) for s in segments)
+        avg_length = sum(int(s.lengths.sum()) for s in segments) / max(total_docs, 1)
+
+        postings = {term: [s.postings(term) for s in segments] for term in terms}
+        cluster_scores: Dict[int, float] = {}
+
+        per_segment = [np.zeros(len(s.lengths), dtype=np.float32) for s in segments]
+        for term, term_postings in postings.items():
+            df = sum(len(docs) for docs, _ in term_postings)
+            if df == 0:
+                continue
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for segment, scores, (docs, tfs) in zip(segments, per_segment, term_postings):
+                if len(docs):
+                    tf = tfs.astype(np.float32)
+                    norm = self.k1 * (1 - self.b + self.b * segment.lengths[docs] / avg_length)
+                    scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        for segment, scores in zip(segments, per_segment):
+            hits = np.flatnonzero(scores)
+            if len(hits) > limit * 4:
+                hits = hits[np.argpartition(scores[hits], -limit * 4)[-limit * 4:]]
+            for doc in hits:
+                cluster_id = int(segment.cluster_ids[doc])
+                score = float(scores[doc])
+                if score > cluster_scores.get(cluster_id, 0.0):
+                    cluster_scores[cluster_id] = score
+
+        ranked = sorted(cluster_scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size."""
+        with self._locked(exclusive=False):
+            self._ensure_loaded()
+            return {
+                "documents": sum(len(s.lengths) for s in self._segments),
+                "terms": sum(len(s.terms) for s in self._segments),
+                "segments": len(self._segments),
+                "last_article_id": self._last_article_id
+            }
+
+    def clear(self) -> None:
+        """Drop the index; the next update rebuilds it from the database."""
+        with self._locked(exclusive=True):
+            self._ensure_loaded()
+            for segment in self._segments:
+                (self.path / f"{segment.name}.npz").unlink(missing_ok=True)
+            self._segments = []
+            self._last_article_id = 0
+            self._save_manifest()
+
+    # ---------- Internals ----------
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """
+        Hold the thread lock and the cross-process file lock.
+
+        Re-entrant within a thread (update reports stats); a shared lock
+        cannot be upgraded to an exclusive one.
+        """
+        with self._lock:
+            if self._lock_depth:
+                if exclusive and not self._lock_exclusive:
+                    raise RuntimeError("Cannot upgrade a shared keyword index lock")
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(self._lock_path, "a+b") if FILE_LOCK_AVAILABLE else None
+            try:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                self._lock_depth = 1
+                self._lock_exclusive = exclusive
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+                    self._lock_exclusive = False
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+    def _indexed_ids(self, floor: int) -> set:
+        """Ids above floor that are already in a segment."""
+        return {
+            int(article_id)
+            for segment in self._segments
+            for article_id in segment.article_ids[segment.article_ids > floor]
+        }
+
+    @staticmethod
+    def _symbols(db: Session, article_ids: List[int]) -> Dict[int, List[str]]:
+        """Lower-cased symbols of the stocks linked to each article."""
+        symbols: Dict[int, List[str]] = {}
+        rows = db.query(ArticleStock.article_id, Stock.symbol).join(
+            Stock, Stock.id == ArticleStock.stock_id
+        ).filter(ArticleStock.article_id.in_(article_ids)).all()
+        for article_id, symbol in rows:
+            symbols.setdefault(article_id, []).extend(tokenize(symbol))
+        return symbols
+
+    def _build_segment(self, name: str, documents: List[Tuple[int, int, List[str]]]) -> _Segment:
+        """Invert (article id, cluster id, tokens) documents into a segment."""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc, (_, _, tokens) in enumerate(documents):
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(postings[t]) for t in terms], out=offsets[1:])
+        flat = [p for t in terms for p in postings[t]]
+
+        return _Segment(
+            name=name,
+            terms=np.array(terms, dtype=f"U{MAX_TOKEN_LENGTH}"),
+            offsets=offsets,
+            docs=np.array([doc for doc, _ in flat], dtype=np.int32),
+            tfs=np.array([min(tf, 65535) for _, tf in flat], dtype=np.uint16),
+            article_ids=np.array([d[0] for d in documents], dtype=np.int64),
+            cluster_ids=np.array([d[1] for d in documents], dtype=np.int64),
+            lengths=np.array([len(d[2]) for d in documents], dtype=np.int32)
+        )
+
+    def _merge(self, db: Session) -> None:
+        """Merge all segments into one, dropping articles deleted from the database."""
+        segments = self._segments
+        article_ids = np.concatenate([s.article_ids for s in segments])
+        cluster_ids = np.concatenate([s.cluster_ids for s in segments])
+        lengths = np.concatenate([s.lengths for s in segments])
+
+        # Refresh cluster ids and drop deleted articles
+        current = dict(db.query(NewsArticle.id, func.coalesce(NewsArticle.cluster_id, NewsArticle.id)).filter(
+            NewsArticle.id <= int(article_ids.max())
+        ).all())
+        keep = np.array([int(a) in current for a in article_ids], dtype=bool)
+        cluster_ids = np.array([current.get(int(a), c) for a, c in zip(article_ids, cluster_ids)], dtype=np.int64)
+
+        # Map every segment's terms into the merged vocabulary
+        vocabulary = np.unique(np.concatenate([s.terms for s in segments]))
+        term_ids, docs, tfs = [], [], []
+        base = 0
+        for s in segments:
+            term_ids.append(np.repeat(np.searchsorted(vocabulary, s.terms), np.diff(s.offsets)))
+            docs.append(s.docs.astype(np.int64) + base)
+            tfs.append(s.tfs)
+            base += len(s.lengths)
+        term_ids, docs, tfs = np.concatenate(term_ids), np.concatenate(docs), np.concatenate(tfs)
+
+        # Renumber the surviving documents
+        position = np.cumsum(keep) - 1
+        alive = keep[docs]
+        term_ids, docs, tfs = term_ids[alive], position[docs[alive]], tfs[alive]
+
+        order = np.lexsort((docs, term_ids))
+        term_ids, docs, tfs = term_ids[order], docs[order], tfs[order]
+        used, starts = np.unique(term_ids, return_index=True)
+
+        merged = _Segment(
+            name=self._segment_name(),
+            terms=vocabulary[used],
+            offsets=np.append(starts, len(term_ids)).astype(np.int64),
+            docs=docs.astype(np.int32),
+            tfs=tfs,
+            article_ids=article_ids[keep],
+            cluster_ids=cluster_ids[keep],
+            lengths=lengths[keep]
+        )
+        self._write_segment(merged)
+        old = [s.name for s in segments]
+        self._segments = [merged]
+        self._save_manifest()
+        for name in old:
+            (self.path / f"{name}.npz").unlink(missing_ok=True)
+
+        logger.info(f"Keyword index: merged {len(old)} segments ({len(merged.lengths)} documents)")
+
+    def _segment_name(self) -> str:
+        name = f"segment_{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def _add_segment(self, segment: _Segment) -> None:
+        self._write_segment(segment)
+        self._segments.append(segment)
+
+    def _write_segment(self, segment: _Segment) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path / f"{segment.name}.tmp.npz"
+        np.savez(
+            tmp_path,
+            terms=segment.terms,
+            offsets=segment.offsets,
+            docs=segment.docs,
+            tfs=segment.tfs,
+            article_ids=segment.article_ids,
+            cluster_ids=segment.cluster_ids,
+            lengths=segment.lengths
+        )
+        os.replace(tmp_path, self.path / f"{segment.name}.npz")
+
+    def _save_manifest(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "segments": [s.name for s in self._segments],
+            "last_article_id": self._last_article_id,
+            "next_segment": self._next_segment
+        }
+        tmp_path = self.path / "manifest.json.tmp"
+        tmp_path.write_text(json.dumps(manifest))
+        os.replace(tmp_path, self.path / "manifest.json")
+        self._manifest_mtime = (self.path / "manifest.json").stat().st_mtime_ns
+
+    def _ensure_loaded(self) -> None:
+        """Load the segments listed in the manifest, again if another process changed it."""
+        manifest_path = self.path / "manifest.json"
+        mtime = manifest_path.stat().st_mtime_ns if manifest_path.exists() else None
+        if self._loaded and mtime == self._manifest_mtime:
+            return
+
+        self._segments = []
+        self._last_article_id = 0
+        self._next_segment = 1
+        if mtime is not None:
+            manifest = json.loads(manifest_path.read_text())
+            for name in manifest["segments"]:
+                with np.load(self.path / f"{name}.npz") as data:
+                    self._segments.append(_Segment(name=name, **{key: data[key] for key in data.files}))
+            self._last_article_id = manifest["last_article_id"]
+            self._next_segment = manifest["next_segment"]
+
+        self._manifest_mtime = mtime
+        self._loaded = True
+
+
+async def update_keyword_index() -> int:
+    """
+    Keyword index update job.
+    Called by the scheduler, so search requests never index in-line.
+
+    Returns:
+        Number of articles indexed
+    """
+    def update() -> int:
+        db = SessionLocal()
+        try:
+            return keyword_index.update(db)
+        finally:
+            db.close()
+
+    # Database reads and segment writes block, so they run in a worker thread
+    return await asyncio.to_thread(update)
+
+
+# Global keyword index instance
+keyword_index = BM25Index(settings.KEYWORD_INDEX_DIR)
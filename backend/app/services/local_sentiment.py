@@ -0,0 +1,579 @@
+"""
+Local financial sentiment scoring with LLM escalation.
+
+Features:
+- Finance lexicon scorer (weighted terms and phrases, negation handling)
+- Optional linear model over TF-IDF unigram/bigram features, trained from
+  stored `news_articles.sentiment_score` labels (NumPy only, saved as .npz)
+- Vectorized batch scoring: thousands of articles per second, no network
+- Confidence gate: only low-confidence articles are escalated to Gemini.
+  Model confidence is the calibrated probability that the predicted label
+  is right (from the model margin and its held-out residual spread),
+  raised when the lexicon agrees and halved when it disagrees
+- Results are cached by article content hash and scorer version
+"""
+
+import hashlib
+import math
+import re
+import threading
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.services.sentiment_cache import sentiment_cache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9'&\-]*|\d+(?:\.\d+)?%?")
+
+# Term -> weight (-1 to 1). Phrases are matched as bigrams.
+FINANCE_LEXICON: Dict[str, float] = {
+    # Positive
+    "beat": 0.6, "beats": 0.6, "tops": 0.5, "surpass": 0.6, "surpasses": 0.6, "exceeds": 0.6,
+    "record": 0.4, "growth": 0.4, "grows": 0.4, "grew": 0.4, "gain": 0.4, "gains": 0.4,
+    "surge": 0.7, "surges": 0.7, "soar": 0.7, "soars": 0.7, "jump": 0.5, "jumps": 0.5,
+    "rally": 0.5, "rallies": 0.5, "rise": 0.3, "rises": 0.3, "climb": 0.4, "climbs": 0.4,
+    "upgrade": 0.7, "upgrades": 0.7, "upgraded": 0.7, "outperform": 0.6, "overweight": 0.4,
+    "bullish": 0.7, "profit": 0.3, "profitable": 0.5, "strong": 0.4, "robust": 0.4,
+    "expansion": 0.3, "expands": 0.3, "partnership": 0.3, "approval": 0.5, "approved": 0.5,
+    "buyback": 0.4, "dividend": 0.2, "innovation": 0.3, "breakthrough": 0.6, "optimistic": 0.5,
+    "momentum": 0.3, "boost": 0.5, "boosts": 0.5, "wins": 0.5, "win": 0.4, "raises": 0.3,
+    "raised guidance": 0.8, "raises guidance": 0.8, "beat expectations": 0.8,
+    "better than": 0.5, "all-time high": 0.6, "target raised": 0.6, "strong demand": 0.6,
+    # Negative
+    "miss": -0.6, "misses": -0.6, "missed": -0.6, "loss": -0.5, "losses": -0.5,
+    "decline": -0.4, "declines": -0.4, "fall": -0.4, "falls": -0.4, "fell": -0.4,
+    "drop": -0.4, "drops": -0.4, "plunge": -0.8, "plunges": -0.8, "slump": -0.7, "slumps": -0.7,
+    "tumble": -0.7, "tumbles": -0.7, "sink": -0.5, "sinks": -0.5, "slide": -0.4, "slides": -0.4,
+    "downgrade": -0.7, "downgrades": -0.7, "downgraded": -0.7, "underperform": -0.6,
+    "underweight": -0.4, "bearish": -0.7, "layoffs": -0.5, "layoff": -0.5, "cuts": -0.3,
+    "lawsuit": -0.6, "sued": -0.6, "probe": -0.6, "investigation": -0.6, "fraud": -0.9,
+    "recall": -0.5, "bankruptcy": -0.9, "default": -0.7, "debt": -0.2, "weak": -0.5,
+    "weaker": -0.5, "warning": -0.5, "warns": -0.5, "concern": -0.3, "concerns": -0.3,
+    "risk": -0.2, "risks": -0.2, "volatile": -0.3, "selloff": -0.6, "sell-off": -0.6,
+    "fined": -0.6, "penalty": -0.5, "delay": -0.4, "delayed": -0.4,
+    "shortfall": -0.6, "halt": -0.5, "halts": -0.5, "pessimistic": -0.5, "slowdown": -0.5,
+    "cut guidance": -0.8, "cuts guidance": -0.8, "lowered guidance": -0.8, "missed expectations": -0.8,
+    "worse than": -0.5, "target cut": -0.6, "job cuts": -0.5, "sec investigation": -0.8,
+}
+
+NEGATORS = {"not", "no", "never", "without", "fails", "failed"}
+NEGATION_WINDOW = 3
+
+# Bump when the lexicon or lexicon scoring changes so cached local results are re-scored
+LEXICON_VERSION = "lexicon-v1"
+
+# Scores beyond +/- this are positive / negative (see _label)
+NEUTRAL_BAND = 0.15
+
+# Residual spread (arctanh space) assumed for models saved without calibration
+DEFAULT_RESIDUAL_STD = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word, number and percentage tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _label(score: float) -> str:
+    if score > NEUTRAL_BAND:
+        return "positive"
+    if score < -NEUTRAL_BAND:
+        return "negative"
+    return "neutral"
+
+
+_erf = np.vectorize(math.erf, otypes=[float])
+
+
+def _labels(scores: np.ndarray) -> np.ndarray:
+    """-1 / 0 / 1 labels with the neutral band."""
+    return np.where(scores > NEUTRAL_BAND, 1, np.where(scores < -NEUTRAL_BAND, -1, 0))
+
+
+def _normal_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + _erf(x / math.sqrt(2.0)))
+
+
+class LocalSentimentScorer:
+    """Lexicon + optional TF-IDF linear model sentiment scorer."""
+
+    def __init__(self, model_path: Optional[str] = None):
+        """
+        Initialize local scorer.
+
+        Args:
+            model_path: Trained model file (.npz); loaded if it exists
+        """
+        self.model_path = model_path
+        self._vocab: Dict[str, int] = {}
+        self._idf: Optional[np.ndarray] = None
+        self._weights: Optional[np.ndarray] = None
+        self._bias = 0.0
+        self._residual_std = DEFAULT_RESIDUAL_STD
+        self._version = LEXICON_VERSION
+        self._lock = threading.Lock()
+
+        if model_path and Path(model_path).exists():
+            try:
+                self.load(model_path)
+            except Exception as e:
+                logger.warning(f"Could not load sentiment model from {model_path}: {e}")
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether a TF-IDF model is loaded."""
+        return self._weights is not None
+
+    @property
+    def version(self) -> str:
+        """Identifier of the lexicon and loaded model, used to invalidate cached scores."""
+        return self._version
+
+    def _update_version(self) -> None:
+        digest = hashlib.sha1(
+            self._weights.tobytes() + self._idf.tobytes() + np.float64(self._residual_std).tobytes()
+        ).hexdigest()[:12]
+        self._version = f"{LEXICON_VERSION}+tfidf-{digest}"
+
+    # ---------- Scoring ----------
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """Score one text (see score_batch)."""
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Score texts locally.
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Sentiment dicts (score, label, confidence, reasoning) in the same
+            shape as GeminiService.analyze_sentiment
+        """
+        if not texts:
+            return []
+
+        token_lists = [tokenize(text or "") for text in texts]
+        lex_scores, lex_conf, lex_hits = self._lexicon_scores(token_lists)
+
+        if self.is_trained:
+            model_scores, margins = self._predict(token_lists)
+            model_conf = self._label_probability(margins)
+            # Blend where the lexicon found evidence; trust the model otherwise
+            has_hits = lex_hits > 0
+            scores = np.where(has_hits, 0.5 * (lex_scores + model_scores), model_scores)
+            agree = _labels(lex_scores) == _labels(model_scores)
+            confidence = np.where(
+                has_hits,
+                # Agreeing evidence combines; disagreement halves the model's confidence
+                np.where(agree, 1 - (1 - model_conf) * (1 - lex_conf), model_conf * 0.5),
+                model_conf
+            )
+        else:
+            scores, confidence = lex_scores, lex_conf
+
+        scores = np.clip(scores, -1.0, 1.0)
+        confidence = np.clip(confidence, 0.0, 1.0)
+
+        return [
+            {
+                "score": round(float(score), 4),
+                "label": _label(score),
+                "confidence": round(float(conf), 4),
+                "reasoning": f"Local scorer ({int(hits)} lexicon terms)"
+            }
+            for score, conf, hits in zip(scores, confidence, lex_hits)
+        ]
+
+    def _label_probability(self, margins: np.ndarray) -> np.ndarray:
+        """
+        Probability that the true score has the predicted label.
+
+        Treats the true score (in arctanh space) as normal around the model
+        margin with the residual spread measured on held-out training rows.
+        """
+        edge = math.atanh(NEUTRAL_BAND)
+        lower = np.where(margins > edge, edge, np.where(margins < -edge, -np.inf, -edge))
+        upper = np.where(margins > edge, np.inf, np.where(margins < -edge, -edge, edge))
+        sigma = max(self._residual_std, 1e-6)
+        return _normal_cdf((upper - margins) / sigma) - _normal_cdf((lower - margins) / sigma)
+
+    def _lexicon_scores(self, token_lists: List[List[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Lexicon score, confidence and matched term count per text."""
+        n = len(token_lists)
+        scores = np.zeros(n)
+        confidence = np.zeros(n)
+        hits = np.zeros(n)
+
+        for i, tokens in enumerate(token_lists):
+            total = 0.0
+            magnitude = 0.0
+            count = 0
+            negate_until = -1
+            skip_next = False
+
+            for j, token in enumerate(tokens):
+                if skip_next:
+                    skip_next = False
+                    continue
+                if token in NEGATORS:
+                    negate_until = j + NEGATION_WINDOW
+                    continue
+
+                weight = FINANCE_LEXICON.get(token, 0.0)
+                if j + 1 < len(tokens):
+                    # A matching phrase replaces both of its words
+                    phrase = FINANCE_LEXICON.get(f"{token} {tokens[j + 1]}")
+                    if phrase is not None:
+                        weight = phrase
+                        skip_next = True
+                if not weight:
+                    continue
+
+                if j <= negate_until:
+                    weight = -weight
+                total += weight
+                magnitude += abs(weight)
+                count += 1
+
+            if count:
+                scores[i] = math.tanh(total)
+                # More evidence and more agreement between terms -> higher confidence
+                confidence[i] = (1 - math.exp(-magnitude)) * (abs(total) / magnitude)
+                hits[i] = count
+
+        return scores, confidence, hits
+
+    # ---------- TF-IDF model ----------
+
+    def _ngrams(self, tokens: List[str]) -> List[str]:
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def _features(self, token_lists: List[List[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build L2-normalized TF-IDF rows in CSR form.
+
+        Returns:
+            (indptr, indices, data, coverage) where coverage is the share of
+            n-grams per text that are in the vocabulary
+        """
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        coverage = np.zeros(len(token_lists))
+
+        for i, tokens in enumerate(token_lists):
+            grams = self._ngrams(tokens)
+            counts = Counter(self._vocab[g] for g in grams if g in self._vocab)
+            if grams:
+                coverage[i] = sum(counts.values()) / len(grams)
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(data, dtype=np.float64)
+
+        if len(indices):
+            data = (1 + np.log(data)) * self._idf[indices]
+            row_ids = np.repeat(np.arange(len(token_lists)), np.diff(indptr))
+            norms = np.sqrt(np.bincount(row_ids, weights=data ** 2, minlength=len(token_lists)))
+            data = data / norms[row_ids]
+
+        return indptr, indices, data, coverage
+
+    def _predict(self, token_lists: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Model scores and raw margins (arctanh space) per text."""
+        indptr, indices, data, _ = self._features(token_lists)
+        margins = self._csr_dot(indptr, indices, data, self._weights, len(token_lists)) + self._bias
+        return np.tanh(margins), margins
+
+    @staticmethod
+    def _csr_dot(indptr, indices, data, weights, n_rows) -> np.ndarray:
+        """Multiply CSR rows by a weight vector."""
+        row_ids = np.repeat(np.arange(n_rows), np.diff(indptr))
+        return np.bincount(row_ids, weights=data * weights[indices], minlength=n_rows)
+
+    def train(
+        self,
+        texts: Sequence[str],
+        scores: Sequence[float],
+        max_features: int = 20000,
+        min_df: int = 2,
+        alpha: float = 1e-3,
+        iterations: int = 300,
+        calibration_every: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Fit the TF-IDF ridge model on labelled texts.
+
+        Targets are arctanh of the clipped scores so predictions pass through
+        tanh back into [-1, 1]. Optimized with Nesterov gradient descent on
+        the sparse rows (no SciPy needed). Every calibration_every-th row is
+        first held out of a calibration fit to measure the residual spread
+        used for confidence; the final model is fitted on all rows.
+
+        Args:
+            texts: Training texts
+            scores: Sentiment labels (-1 to 1)
+            max_features: Vocabulary size (most frequent n-grams)
+            min_df: Minimum document frequency of an n-gram
+            alpha: L2 regularization strength
+            iterations: Gradient descent iterations
+            calibration_every: Hold out every n-th row for calibration
+
+        Returns:
+            Dict with sample count, vocabulary size, training MAE and the
+            held-out residual spread
+        """
+        token_lists = [tokenize(text or "") for text in texts]
+        doc_freq = Counter()
+        for tokens in token_lists:
+            doc_freq.update(set(self._ngrams(tokens)))
+
+        vocab = [g for g, df in doc_freq.most_common(max_features) if df >= min_df]
+        n = len(token_lists)
+        y = np.arctanh(np.clip(np.asarray(scores, dtype=np.float64), -0.95, 0.95))
+
+        with self._lock:
+            self._vocab = {g: i for i, g in enumerate(vocab)}
+            self._idf = np.array([math.log((1 + n) / (1 + doc_freq[g])) + 1 for g in vocab])
+
+            # Calibrate confidence on rows the model was not fitted on
+            held_out = list(range(0, n, calibration_every)) if n >= 5 * calibration_every else []
+            residual_std = DEFAULT_RESIDUAL_STD
+            if held_out:
+                held = set(held_out)
+                fit_rows = [i for i in range(n) if i not in held]
+                w, bias = self._fit([token_lists[i] for i in fit_rows], y[fit_rows], alpha, iterations)
+                indptr, indices, data, _ = self._features([token_lists[i] for i in held_out])
+                margins = self._csr_dot(indptr, indices, data, w, len(held_out)) + bias
+                residual_std = float(np.sqrt(np.mean((margins - y[held_out]) ** 2)))
+
+            w, bias = self._fit(token_lists, y, alpha, iterations)
+            self._weights = w
+            self._bias = bias
+            self._residual_std = residual_std
+            self._update_version()
+
+            indptr, indices, data, _ = self._features(token_lists)
+            predicted = np.tanh(self._csr_dot(indptr, indices, data, w, n) + bias)
+
+        return {
+            "samples": n,
+            "vocabulary": len(vocab),
+            "train_mae": round(float(np.mean(np.abs(predicted - np.asarray(scores)))), 4) if n else None,
+            "residual_std": round(residual_std, 4)
+        }
+
+    def _fit(
+        self,
+        token_lists: List[List[str]],
+        y: np.ndarray,
+        alpha: float,
+        iterations: int
+    ) -> Tuple[np.ndarray, float]:
+        """Fit ridge weights and bias on the current vocabulary."""
+        n = len(token_lists)
+        n_features = len(self._vocab)
+        indptr, indices, data, _ = self._features(token_lists)
+        row_ids = np.repeat(np.arange(n), np.diff(indptr))
+
+        bias = float(y.mean())
+        w = np.zeros(n_features)
+        velocity = np.zeros(n_features)
+        # Rows are L2-normalized, so the loss is (1 + alpha)-smooth
+        lr = 1.0 / (1.0 + alpha)
+        momentum = 0.9
+
+        for _ in range(iterations):
+            lookahead = w + momentum * velocity
+            residual = np.bincount(row_ids, weights=data * lookahead[indices], minlength=n) + bias - y
+            grad = np.bincount(indices, weights=data * residual[row_ids], minlength=n_features) / n
+            grad += alpha * lookahead
+            velocity = momentum * velocity - lr * grad
+            w = w + velocity
+            bias -= lr * residual.mean()
+
+        return w, bias
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Save the trained model to an .npz file."""
+        path = path or self.model_path
+        if not self.is_trained:
+            raise ValueError("Sentiment model is not trained")
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        vocab = sorted(self._vocab, key=self._vocab.get)
+        np.savez_compressed(
+            path,
+            vocab=np.array(vocab),
+            idf=self._idf,
+            weights=self._weights,
+            bias=np.array([self._bias]),
+            residual_std=np.array([self._residual_std])
+        )
+        return path
+
+    def load(self, path: str) -> None:
+        """Load a trained model from an .npz file."""
+        with np.load(path, allow_pickle=False) as model:
+            vocab = [str(g) for g in model["vocab"]]
+            with self._lock:
+                self._vocab = {g: i for i, g in enumerate(vocab)}
+                self._idf = model["idf"]
+                self._weights = model["weights"]
+                self._bias = float(model["bias"][0])
+                self._residual_std = (
+                    float(model["residual_std"][0]) if "residual_std" in model.files else DEFAULT_RESIDUAL_STD
+                )
+                self._update_version()
+        logger.info(f"Loaded local sentiment model ({len(vocab)} features) from {path}")
+
+
+class SentimentAnalyzer:
+    """
+    Scores articles locally and escalates low-confidence ones to Gemini.
+
+    Results carry a "source" key ("local" or "gemini") and the
+    "model_version" that produced them. Results are cached by content hash;
+    cached local results are reused only while the local scorer version is
+    unchanged.
+    """
+
+    def __init__(
+        self,
+        scorer: LocalSentimentScorer,
+        threshold: float = 0.6,
+        local_enabled: bool = True
+    ):
+        """
+        Initialize sentiment analyzer.
+
+        Args:
+            scorer: Local scorer
+            threshold: Local confidence below which Gemini is asked
+            local_enabled: When False every text goes to Gemini
+        """
+        self.scorer = scorer
+        self.threshold = threshold
+        self.local_enabled = local_enabled
+        self._gemini = None
+        self._lock = threading.Lock()
+        self._stats = {"local": 0, "escalated": 0, "escalation_failed": 0}
+
+    def _gemini_service(self):
+        """Create the Gemini client on first escalation."""
+        with self._lock:
+            if self._gemini is None:
+                from backend.app.services.gemini_service import GeminiService
+                self._gemini = GeminiService()
+            return self._gemini
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """Analyze one text (see analyze_batch)."""
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze texts, calling Gemini only for ambiguous ones.
+
+        If Gemini fails, the local result is kept so ingestion works offline.
+
+        Args:
+            texts: Texts to analyze
+
+        Returns:
+            Sentiment dicts in the same order as texts
+        """
+        if not texts:
+            return []
+
+        return sentiment_cache.get_or_analyze(texts, self._analyze_uncached, self.accepted_versions())
+
+    def accepted_versions(self) -> set:
+        """Scorer versions whose cached results are still valid."""
+        versions = {self.gemini_version}
+        if self.local_enabled:
+            versions.add(self.local_version)
+        return versions
+
+    @property
+    def local_version(self) -> str:
+        return f"local:{self.scorer.version}"
+
+    @property
+    def gemini_version(self) -> str:
+        return f"gemini:{settings.GEMINI_MODEL}"
+
+    def _analyze_uncached(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score texts locally and escalate uncertain ones to Gemini."""
+        if self.local_enabled:
+            results = [
+                {**r, "source": "local", "model_version": self.local_version}
+                for r in self.scorer.score_batch(texts)
+            ]
+            escalate = [i for i, r in enumerate(results) if r["confidence"] < self.threshold]
+        else:
+            results = [
+                {"score": 0.0, "label": "neutral", "confidence": 0.0, "reasoning": "", "source": "local"}
+                for _ in texts
+            ]
+            escalate = list(range(len(texts)))
+
+        escalation_failed = 0
+        if escalate:
+            try:
+                gemini_results = self._gemini_service().analyze_sentiment_batch([texts[i] for i in escalate])
+            except Exception as e:
+                logger.warning(f"Sentiment escalation failed, keeping local scores: {e}")
+                gemini_results = [None] * len(escalate)
+
+            for i, result in zip(escalate, gemini_results):
+                # analyze_sentiment reports errors as zero confidence
+                if result and result.get("confidence", 0) > 0:
+                    results[i] = {**result, "source": "gemini", "model_version": self.gemini_version}
+                else:
+                    # Not cached, so the article is escalated again next time
+                    results[i].pop("model_version", None)
+                    escalation_failed += 1
+
+        with self._lock:
+            self._stats["local"] += len(texts) - len(escalate)
+            self._stats["escalated"] += len(escalate)
+            self._stats["escalation_failed"] += escalation_failed
+
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get local vs escalated counts.
+
+        Returns:
+            Dict with counts, escalation rate and whether a model is loaded
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats["local"] + stats["escalated"]
+        stats["escalation_rate"] = round(stats["escalated"] / total, 3) if total else None
+        stats["model_trained"] = self.scorer.is_trained
+        stats["local_version"] = self.scorer.version
+        return stats
+
+
+# Global local scorer and sentiment analyzer instances
+local_sentiment_scorer = LocalSentimentScorer(settings.SENTIMENT_MODEL_PATH)
+sentiment_analyzer = SentimentAnalyzer(
+    local_sentiment_scorer,
+    threshold=settings.SENTIMENT_ESCALATION_THRESHOLD,
+    local_enabled=settings.LOCAL_SENTIMENT_ENABLED
+)
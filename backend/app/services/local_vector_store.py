@@ -0,0 +1,716 @@
+"""
+In-process vector index for news article embeddings (VECTOR_BACKEND=local).
+
+Features:
+- Embeddings live in a memory-mapped matrix on disk, stored as float32 or
+  quantized to float16 / int8 (per-row scale) to cut memory 2-4x; the OS
+  page cache keeps the hot part resident
+- IVF index: spherical k-means centroids partition the rows and a query
+  only scans the VECTOR_INDEX_NPROBE nearest lists. Rows are laid out list
+  by list, so each probed list is one contiguous slice of the matrix.
+  Small stores and highly selective filters are scanned exactly
+- Stock, date and sentiment filters become boolean masks: one packed
+  bitmap per stock symbol, plus vectorized comparisons over the date and
+  sentiment columns
+- Writes append rows; replaced and deleted articles are tombstoned and the
+  store is compacted and re-clustered as it grows
+- A store written by another process (a script) is reloaded on the next search
+- Several processes may share a store: writes (add, delete, rebuild, clear)
+  hold an exclusive fcntl lock on `<VECTOR_INDEX_DIR>.lock`, searches and
+  reloads a shared one. Without fcntl (Windows) only one process may write
+
+Files in VECTOR_INDEX_DIR: index.json (header), one raw column file per
+field (vectors, scales, ids, published, sentiment, alive, lists),
+centroids.npy and metadata.jsonl (content + metadata, one line per row).
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.services.vector_store import (
+    VectorBackend, VectorFilter, clean_metadata, parse_published_at
+)
+from backend.app.services.news_cursors import as_utc
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+    FILE_LOCK_AVAILABLE = True
+except ImportError:
+    FILE_LOCK_AVAILABLE = False
+
+UNKNOWN_TIME = np.iinfo(np.int64).min  # published column value for articles without a date
+INITIAL_CAPACITY = 1024
+SCORE_CHUNK_ROWS = 65536  # rows scored per matrix product
+KMEANS_SAMPLE = 50000
+KMEANS_ITERATIONS = 10
+EXACT_SCAN_FRACTION = 0.05  # filters keeping fewer rows than this are scanned exactly
+RETRAIN_GROWTH = 0.5  # rows added since clustering, relative to clustered rows
+COMPACT_DELETED = 0.2  # tombstoned share of rows that triggers compaction
+
+VECTOR_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+# name -> (dtype, fill value for new rows)
+_COLUMNS = {
+    "ids": (np.int64, 0),
+    "published": (np.int64, UNKNOWN_TIME),
+    "sentiment": (np.float32, np.nan),
+    "alive": (np.uint8, 0),
+    "lists": (np.int32, -1),
+    "scales": (np.float32, 1.0),
+}
+
+
+class LocalVectorStore(VectorBackend):
+    """Memory-mapped embedding matrix with an IVF index and metadata bitmaps."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dtype: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        min_rows: Optional[int] = None
+    ):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: Directory of the store (defaults to VECTOR_INDEX_DIR)
+            dtype: float32, float16 or int8 for new stores (defaults to
+                VECTOR_INDEX_DTYPE; an existing store keeps its own)
+            nprobe: IVF lists scanned per query (defaults to VECTOR_INDEX_NPROBE)
+            min_rows: Stores smaller than this are scanned exactly
+                (defaults to VECTOR_INDEX_MIN_ROWS)
+        """
+        self.path = Path(path or settings.VECTOR_INDEX_DIR)
+        self.nprobe = nprobe or settings.VECTOR_INDEX_NPROBE
+        self.min_rows = min_rows if min_rows is not None else settings.VECTOR_INDEX_MIN_ROWS
+        self._default_dtype = dtype or settings.VECTOR_INDEX_DTYPE
+        if self._default_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {self._default_dtype}")
+
+        self._lock = threading.RLock()
+        # Outside the store directory, which rebuild() swaps out
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock_depth = 0
+        self._lock_exclusive = False
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._locked(exclusive=True):
+            self._load()
+
+    # ---------- VectorBackend ----------
+
+    def add_articles_batch(self, articles: List[Dict[str, Any]], embeddings: List[List[float]]) -> None:
+        """
+        Add articles, replacing stored versions of the same ids.
+
+        Args:
+            articles: List of article dicts with id, content, and metadata
+            embeddings: List of embedding vectors
+        """
+        if len(articles) != len(embeddings):
+            raise ValueError("Number of articles must match number of embeddings")
+        if not articles:
+            return
+
+        with self._locked(exclusive=True):
+            self._reload_if_changed()
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match the store ({self._dim})")
+
+            # Later duplicates in the same batch win, like an upsert
+            last = {int(a["id"]): i for i, a in enumerate(articles)}
+            order = sorted(last.values())
+            self._tombstone([int(articles[i]["id"]) for i in order])
+
+            start = self._count
+            end = start + len(order)
+            self._reserve(end)
+
+            rows = self._normalize(vectors[order])
+            self._write_vectors(start, rows)
+            self._columns["lists"][start:end] = self._assign(rows) if self._centroids is not None else -1
+
+            with open(self.path / "metadata.jsonl", "ab") as f:
+                for offset, i in enumerate(order, start):
+                    article = articles[i]
+                    metadata = clean_metadata(article.get("metadata") or {})
+                    self._set_row(offset, int(article["id"]), metadata)
+                    self._offsets.append(self._metadata_bytes)
+                    line = json.dumps({"content": article.get("content", ""), "metadata": metadata}).encode("utf-8") + b"\n"
+                    f.write(line)
+                    self._metadata_bytes += len(line)
+
+            self._count = end
+            self._csr = None
+            self._save_header()
+
+            if self._needs_rebuild():
+                self.rebuild()
+
+        logger.info(f"Added {len(order)} articles to local vector index")
+
+    def search_similar(self,
+                      query_embedding: List[float],
+                      n_results: int = 5,
+                      filter_metadata: Optional[Dict[str, Any]] = None,
+                      filters: Optional[VectorFilter] = None) -> List[Dict[str, Any]]:
+        """
+        Search for similar articles by cosine similarity.
+
+        Args:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            filter_metadata: Unused (Chroma where clause); use filters
+            filters: Optional stock/date/sentiment filter
+
+        Returns:
+            List of similar articles with metadata and scores
+        """
+        try:
+            with self._locked(exclusive=False):
+                self._reload_if_changed()
+                if not self._count or n_results <= 0:
+                    return []
+
+                query = self._normalize(np.asarray([query_embedding], dtype=np.float32))[0]
+                mask = self._mask(filters)
+                selected = int(np.count_nonzero(mask))
+                if selected == 0:
+                    return []
+
+                exact = (
+                    self._centroids is None
+                    or selected <= max(self.min_rows, EXACT_SCAN_FRACTION * self._count)
+                )
+                rows, scores = self._search_exact(query, mask, n_results) if exact \
+                    else self._search_ivf(query, mask, n_results)
+
+                return [self._result(int(row), float(score)) for row, score in zip(rows, scores)]
+        except Exception as e:
+            logger.error(f"Error searching local vector index: {e}")
+            return []
+
+    def delete_articles_batch(self, article_ids: List[int]) -> None:
+        """Delete many articles (their rows are dropped at the next compaction)."""
+        if not article_ids:
+            return
+
+        with self._locked(exclusive=True):
+            self._reload_if_changed()
+            deleted = self._tombstone([int(a) for a in article_ids])
+            self._save_header()
+            if self._needs_rebuild():
+                self.rebuild()
+
+        logger.info(f"Deleted {deleted} articles from local vector index")
+
+    def get_article_count(self) -> int:
+        """Get total number of articles in the store."""
+        with self._locked(exclusive=False):
+            self._reload_if_changed()
+            return len(self._rows)
+
+    def clear_all(self) -> None:
+        """Delete all articles and index files."""
+        with self._locked(exclusive=True):
+            self._close()
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._load()
+        logger.info("Cleared local vector index")
+
+    # ---------- Maintenance ----------
+
+    def rebuild(self) -> None:
+        """
+        Compact the store and re-cluster it.
+
+        Drops tombstoned rows, trains IVF centroids (when the store has at
+        least min_rows articles) and rewrites the rows list by list.
+        """
+        with self._locked(exclusive=True):
+            self._reload_if_changed()
+            started = time.perf_counter()
+            alive = np.flatnonzero(self._columns["alive"][:self._count])
+            n = len(alive)
+
+            centroids = None
+            order = alive
+            if n >= self.min_rows:
+                centroids = self._train(alive)
+                assignment = np.concatenate([
+                    self._assign(self._dequantize(alive[i:i + SCORE_CHUNK_ROWS]), centroids)
+                    for i in range(0, n, SCORE_CHUNK_ROWS)
+                ])
+                permutation = np.argsort(assignment, kind="stable")
+                order = alive[permutation]
+                lists = assignment[permutation]
+            else:
+                lists = np.full(n, -1, dtype=np.int32)
+
+            self._rewrite(order, lists, centroids)
+            logger.info(
+                f"Rebuilt local vector index: {n} articles, "
+                f"{len(centroids) if centroids is not None else 0} lists in {time.perf_counter() - started:.1f}s"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and layout of the store."""
+        with self._lock:
+            return {
+                "articles": len(self._rows),
+                "rows": self._count,
+                "dtype": self._dtype_name,
+                "dimension": self._dim,
+                "lists": len(self._centroids) if self._centroids is not None else 0,
+                "clustered_rows": self._clustered,
+                "symbols": len(self._bitmaps)
+            }
+
+    # ---------- Locking ----------
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """
+        Hold the thread lock and the cross-process file lock.
+
+        Re-entrant within a thread (add_articles_batch may call rebuild);
+        a shared lock cannot be upgraded to an exclusive one.
+        """
+        with self._lock:
+            if self._lock_depth:
+                if exclusive and not self._lock_exclusive:
+                    raise RuntimeError("Cannot upgrade a shared vector index lock")
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            lock_file = open(self._lock_path, "a+b") if FILE_LOCK_AVAILABLE else None
+            try:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                self._lock_depth = 1
+                self._lock_exclusive = exclusive
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+                    self._lock_exclusive = False
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+    # ---------- Search internals ----------
+
+    def _mask(self, filters: Optional[VectorFilter]) -> np.ndarray:
+        """Rows that are alive and pass the filter."""
+        n = self._count
+        mask = self._columns["alive"][:n].astype(bool)
+        if filters is None:
+            return mask
+
+        if filters.symbols:
+            symbol_mask = np.zeros(n, dtype=bool)
+            for symbol in filters.symbols:
+                bitmap = self._bitmaps.get(symbol.upper())
+                if bitmap is not None:
+                    symbol_mask |= np.unpackbits(bitmap, count=n).view(bool)
+            mask &= symbol_mask
+
+        if filters.start or filters.end:
+            published = self._columns["published"][:n]
+            mask &= published != UNKNOWN_TIME
+            if filters.start:
+                mask &= published >= int(as_utc(filters.start).timestamp())
+            if filters.end:
+                mask &= published <= int(as_utc(filters.end).timestamp())
+
+        sentiment = self._columns["sentiment"][:n]
+        if filters.min_sentiment is not None:
+            mask &= sentiment >= filters.min_sentiment
+        if filters.max_sentiment is not None:
+            mask &= sentiment <= filters.max_sentiment
+
+        return mask
+
+    def _search_exact(self, query: np.ndarray, mask: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every selected row."""
+        best = _TopK(k)
+        if mask.all():
+            for start in range(0, self._count, SCORE_CHUNK_ROWS):
+                end = min(start + SCORE_CHUNK_ROWS, self._count)
+                best.push(np.arange(start, end), self._score_slice(query, start, end))
+        else:
+            rows = np.flatnonzero(mask)
+            for i in range(0, len(rows), SCORE_CHUNK_ROWS):
+                chunk = rows[i:i + SCORE_CHUNK_ROWS]
+                best.push(chunk, self._dequantize(chunk) @ query)
+        return best.result()
+
+    def _search_ivf(self, query: np.ndarray, mask: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score the rows of the nprobe lists nearest to the query."""
+        offsets, tail_rows, tail_offsets = self._list_layout()
+        probe = np.argsort(self._centroids @ query)[::-1][:self.nprobe]
+        best = _TopK(k)
+
+        for list_id in probe:
+            # Clustered rows of the list are one contiguous slice
+            start, end = int(offsets[list_id]), int(offsets[list_id + 1])
+            if end > start:
+                keep = mask[start:end]
+                if keep.all():
+                    best.push(np.arange(start, end), self._score_slice(query, start, end))
+                elif keep.any():
+                    rows = np.arange(start, end)[keep]
+                    best.push(rows, self._dequantize(rows) @ query)
+
+            # Rows added since the last rebuild
+            rows = tail_rows[tail_offsets[list_id]:tail_offsets[list_id + 1]]
+            rows = rows[mask[rows]]
+            if len(rows):
+                best.push(rows, self._dequantize(rows) @ query)
+
+        return best.result()
+
+    def _list_layout(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Offsets of each list in the clustered segment, plus the unclustered tail grouped by list."""
+        if self._csr is None:
+            nlist = len(self._centroids)
+            clustered = self._columns["lists"][:self._clustered]
+            offsets = np.zeros(nlist + 1, dtype=np.int64)
+            np.cumsum(np.bincount(clustered, minlength=nlist), out=offsets[1:])
+
+            tail_lists = self._columns["lists"][self._clustered:self._count]
+            tail_rows = self._clustered + np.argsort(tail_lists, kind="stable")
+            tail_offsets = np.zeros(nlist + 1, dtype=np.int64)
+            np.cumsum(np.bincount(tail_lists, minlength=nlist), out=tail_offsets[1:])
+            self._csr = (offsets, tail_rows, tail_offsets)
+        return self._csr
+
+    def _score_slice(self, query: np.ndarray, start: int, end: int) -> np.ndarray:
+        vectors = self._vectors[start:end]
+        if self._dtype_name == "float32":
+            return np.asarray(vectors @ query)
+        scores = vectors.astype(np.float32) @ query
+        if self._dtype_name == "int8":
+            scores *= self._columns["scales"][start:end]
+        return scores
+
+    def _dequantize(self, rows: np.ndarray) -> np.ndarray:
+        """Rows of the matrix as float32."""
+        vectors = self._vectors[rows].astype(np.float32, copy=False)
+        if self._dtype_name == "int8":
+            vectors *= self._columns["scales"][rows][:, None]
+        return vectors
+
+    def _result(self, row: int, score: float) -> Dict[str, Any]:
+        """Search result in the shape VectorStoreService returns."""
+        self._metadata_file.seek(self._offsets[row])
+        record = json.loads(self._metadata_file.readline())
+        metadata = record["metadata"]
+        if isinstance(metadata.get("stocks"), str):
+            metadata["stocks"] = metadata["stocks"].split(",")
+        return {
+            "article_id": int(self._columns["ids"][row]),
+            "content": record["content"],
+            "metadata": metadata,
+            "similarity_score": score
+        }
+
+    # ---------- Write internals ----------
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _write_vectors(self, start: int, rows: np.ndarray) -> None:
+        end = start + len(rows)
+        if self._dtype_name == "int8":
+            scales = np.maximum(np.abs(rows).max(axis=1), 1e-12) / 127.0
+            self._vectors[start:end] = np.round(rows / scales[:, None]).astype(np.int8)
+            self._columns["scales"][start:end] = scales
+        else:
+            self._vectors[start:end] = rows
+
+    def _set_row(self, row: int, article_id: int, metadata: Dict[str, Any]) -> None:
+        """Fill the filter columns and bitmaps of a row."""
+        self._columns["ids"][row] = article_id
+        self._columns["alive"][row] = 1
+        self._rows[article_id] = row
+
+        published_at = parse_published_at(metadata.get("published_at"))
+        self._columns["published"][row] = int(as_utc(published_at).timestamp()) if published_at else UNKNOWN_TIME
+
+        sentiment = metadata.get("sentiment_score")
+        self._columns["sentiment"][row] = sentiment if isinstance(sentiment, (int, float)) else np.nan
+
+        for symbol in str(metadata.get("stocks") or "").split(","):
+            symbol = symbol.strip().upper()
+            if symbol:
+                bitmap = self._bitmaps.get(symbol)
+                if bitmap is None:
+                    bitmap = self._bitmaps[symbol] = np.zeros(self._capacity // 8, dtype=np.uint8)
+                bitmap[row >> 3] |= np.uint8(0x80 >> (row & 7))
+
+    def _tombstone(self, article_ids: List[int]) -> int:
+        """Mark the rows of stored articles as deleted."""
+        deleted = 0
+        for article_id in article_ids:
+            row = self._rows.pop(article_id, None)
+            if row is not None:
+                self._columns["alive"][row] = 0
+                deleted += 1
+        return deleted
+
+    def _needs_rebuild(self) -> bool:
+        alive = len(self._rows)
+        if self._count - alive > COMPACT_DELETED * max(self._count, self.min_rows):
+            return True
+        if self._centroids is None:
+            return alive >= self.min_rows
+        return self._count - self._clustered > RETRAIN_GROWTH * self._clustered
+
+    def _train(self, rows: np.ndarray) -> np.ndarray:
+        """Spherical k-means over a sample of rows."""
+        rng = np.random.default_rng(0)
+        sample = self._dequantize(np.sort(rng.choice(rows, min(len(rows), KMEANS_SAMPLE), replace=False)))
+        nlist = int(min(np.clip(np.sqrt(len(rows)), 16, 4096), len(sample)))
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = self._assign(sample, centroids)
+            order = np.argsort(assignment, kind="stable")
+            sorted_assignment = assignment[order]
+            starts = np.flatnonzero(np.r_[True, sorted_assignment[1:] != sorted_assignment[:-1]])
+
+            # Re-seed empty lists with random sample points
+            sums = sample[rng.choice(len(sample), nlist)]
+            sums[sorted_assignment[starts]] = np.add.reduceat(sample[order], starts)
+            centroids = self._normalize(sums)
+
+        return centroids.astype(np.float32)
+
+    def _assign(self, vectors: np.ndarray, centroids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Nearest centroid of each vector."""
+        centroids = self._centroids if centroids is None else centroids
+        return np.concatenate([
+            np.argmax(vectors[i:i + 8192] @ centroids.T, axis=1).astype(np.int32)
+            for i in range(0, len(vectors), 8192)
+        ]) if len(vectors) else np.empty(0, dtype=np.int32)
+
+    def _rewrite(self, order: np.ndarray, lists: np.ndarray, centroids: Optional[np.ndarray]) -> None:
+        """Write the given rows, in order, to a fresh store and swap it in."""
+        staging = self.path.with_name(self.path.name + ".rebuild")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        n = len(order)
+        capacity = _round_capacity(n)
+        with open(staging / "vectors.bin", "wb") as f:
+            for i in range(0, n, SCORE_CHUNK_ROWS):
+                f.write(np.ascontiguousarray(self._vectors[order[i:i + SCORE_CHUNK_ROWS]]).tobytes())
+            f.truncate(capacity * self._dim * np.dtype(VECTOR_DTYPES[self._dtype_name]).itemsize)
+
+        for name, (dtype, fill) in _COLUMNS.items():
+            column = np.full(capacity, fill, dtype=dtype)
+            column[:n] = lists if name == "lists" else self._columns[name][order]
+            column.tofile(staging / f"{name}.bin")
+
+        metadata_bytes = 0
+        with open(staging / "metadata.jsonl", "wb") as f:
+            for row in order:
+                self._metadata_file.seek(self._offsets[row])
+                line = self._metadata_file.readline()
+                f.write(line)
+                metadata_bytes += len(line)
+
+        if centroids is not None:
+            np.save(staging / "centroids.npy", centroids)
+
+        header = {
+            "dtype": self._dtype_name,
+            "dimension": self._dim,
+            "count": n,
+            "capacity": capacity,
+            "clustered": n if centroids is not None else 0,
+            "metadata_bytes": metadata_bytes
+        }
+        (staging / "index.json").write_text(json.dumps(header))
+
+        self._close()
+        previous = self.path.with_name(self.path.name + ".old")
+        shutil.rmtree(previous, ignore_errors=True)
+        os.replace(self.path, previous)
+        os.replace(staging, self.path)
+        shutil.rmtree(previous, ignore_errors=True)
+        self._load()
+
+    # ---------- Storage ----------
+
+    def _load(self) -> None:
+        """Open the store's files and rebuild the in-memory lookups."""
+        header_path = self.path / "index.json"
+        header = json.loads(header_path.read_text()) if header_path.exists() else {}
+
+        self._dtype_name = header.get("dtype", self._default_dtype)
+        self._dim = header.get("dimension")
+        self._count = header.get("count", 0)
+        self._capacity = header.get("capacity", 0)
+        self._clustered = header.get("clustered", 0)
+        self._metadata_bytes = header.get("metadata_bytes", 0)
+        self._header_mtime = header_path.stat().st_mtime_ns if header_path.exists() else None
+
+        centroids_path = self.path / "centroids.npy"
+        self._centroids = np.load(centroids_path) if self._clustered and centroids_path.exists() else None
+        self._csr = None
+
+        self._vectors = None
+        self._columns: Dict[str, np.ndarray] = {}
+        if self._capacity:
+            self._map_columns()
+
+        # Drop a metadata tail written by an interrupted batch
+        metadata_path = self.path / "metadata.jsonl"
+        with open(metadata_path, "ab") as f:
+            f.truncate(self._metadata_bytes)
+        self._metadata_file = open(metadata_path, "rb")
+
+        self._rows: Dict[int, int] = {}
+        self._offsets: List[int] = []
+        self._bitmaps: Dict[str, np.ndarray] = {}
+        offset = 0
+        for row in range(self._count):
+            line = self._metadata_file.readline()
+            self._offsets.append(offset)
+            offset += len(line)
+            if self._columns["alive"][row]:
+                self._set_row(row, int(self._columns["ids"][row]), json.loads(line)["metadata"])
+
+    def _map_columns(self) -> None:
+        """Memory-map the column files at the current capacity."""
+        dtype = VECTOR_DTYPES[self._dtype_name]
+        self._vectors = np.memmap(self.path / "vectors.bin", dtype=dtype, mode="r+", shape=(self._capacity, self._dim))
+        for name, (column_dtype, _) in _COLUMNS.items():
+            self._columns[name] = np.memmap(self.path / f"{name}.bin", dtype=column_dtype, mode="r+", shape=(self._capacity,))
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the column files to hold at least `rows` rows."""
+        if rows <= self._capacity:
+            return
+
+        capacity = _round_capacity(max(rows, 2 * self._capacity))
+        self._flush()
+        self._vectors = None
+        self._columns = {}
+
+        itemsize = np.dtype(VECTOR_DTYPES[self._dtype_name]).itemsize
+        with open(self.path / "vectors.bin", "ab") as f:
+            f.truncate(capacity * self._dim * itemsize)
+        for name, (dtype, fill) in _COLUMNS.items():
+            with open(self.path / f"{name}.bin", "ab") as f:
+                f.write(np.full(capacity - self._capacity, fill, dtype=dtype).tobytes())
+
+        for symbol, bitmap in self._bitmaps.items():
+            self._bitmaps[symbol] = np.concatenate([bitmap, np.zeros((capacity - self._capacity) // 8, dtype=np.uint8)])
+
+        self._capacity = capacity
+        self._map_columns()
+
+    def _flush(self) -> None:
+        if self._vectors is not None:
+            self._vectors.flush()
+        for column in self._columns.values():
+            column.flush()
+
+    def _save_header(self) -> None:
+        """Flush the columns, then publish the new row count."""
+        self._flush()
+        header = {
+            "dtype": self._dtype_name,
+            "dimension": self._dim,
+            "count": self._count,
+            "capacity": self._capacity,
+            "clustered": self._clustered,
+            "metadata_bytes": self._metadata_bytes
+        }
+        header_path = self.path / "index.json"
+        tmp_path = header_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(header))
+        os.replace(tmp_path, header_path)
+        self._header_mtime = header_path.stat().st_mtime_ns
+
+    def _reload_if_changed(self) -> None:
+        """Pick up writes made by another process."""
+        header_path = self.path / "index.json"
+        mtime = header_path.stat().st_mtime_ns if header_path.exists() else None
+        if mtime != self._header_mtime:
+            logger.info("Local vector index changed on disk - reloading")
+            self._close()
+            self._load()
+
+    def _close(self) -> None:
+        self._flush()
+        self._vectors = None
+        self._columns = {}
+        self._metadata_file.close()
+
+
+class _TopK:
+    """Running top-k over scored row chunks."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.rows = np.empty(0, dtype=np.int64)
+        self.scores = np.empty(0, dtype=np.float32)
+
+    def push(self, rows: np.ndarray, scores: np.ndarray) -> None:
+        if len(scores) > self.k:
+            top = np.argpartition(scores, -self.k)[-self.k:]
+            rows, scores = rows[top], scores[top]
+        self.rows = np.concatenate([self.rows, rows])
+        self.scores = np.concatenate([self.scores, scores.astype(np.float32, copy=False)])
+        if len(self.scores) > 4 * self.k:
+            top = np.argpartition(self.scores, -self.k)[-self.k:]
+            self.rows, self.scores = self.rows[top], self.scores[top]
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(-self.scores, kind="stable")[:self.k]
+        return self.rows[order], self.scores[order]
+
+
+def _round_capacity(rows: int) -> int:
+    """Capacity for `rows` rows: at least INITIAL_CAPACITY and a multiple of 8 (whole bitmap bytes)."""
+    return max(INITIAL_CAPACITY, (rows + 7) // 8 * 8)
+
+
+_store: Optional[LocalVectorStore] = None
+_store_lock = threading.Lock()
+
+
+def local_vector_store() -> LocalVectorStore:
+    """Get the process-wide local vector store, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LocalVectorStore()
+        return _store
@@ -0,0 +1,276 @@
+"""
+Holiday-aware exchange calendars for the US and European listings we hold.
+
+Features:
+- Regular sessions, full-day holidays and early closes for NYSE/Nasdaq,
+  Xetra, Euronext and the London Stock Exchange, computed per year from
+  fixed dates, weekday rules and Easter (no calendar data files needed)
+- Symbols are mapped to their exchange by Yahoo Finance suffix
+  (AAPL -> US, SAP.DE -> XETRA, ASML.AS -> EURONEXT, SHEL.L -> LSE)
+- Session queries (is the market open now, when does it next open) in
+  each exchange's own timezone
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Yahoo Finance symbol suffix -> exchange code ("" = no suffix, a US listing)
+SUFFIX_EXCHANGES = {
+    "": "US",
+    ".DE": "XETRA",
+    ".F": "XETRA",
+    ".PA": "EURONEXT",
+    ".AS": "EURONEXT",
+    ".BR": "EURONEXT",
+    ".LS": "EURONEXT",
+    ".IR": "EURONEXT",
+    ".L": "LSE",
+}
+
+# One-off changes to the rule-based calendars (national days of mourning,
+# royal events, moved bank holidays)
+ADHOC_CLOSURES = {
+    "US": [date(2018, 12, 5), date(2025, 1, 9)],
+    "LSE": [date(2020, 5, 8), date(2022, 6, 2), date(2022, 6, 3), date(2022, 9, 19), date(2023, 5, 8)],
+}
+ADHOC_OPENINGS = {
+    "LSE": [date(2020, 5, 4), date(2022, 5, 30)],
+}
+
+
+def easter_sunday(year: int) -> date:
+    """Western (Gregorian) Easter Sunday, by the anonymous Gregorian algorithm."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday (0 = Monday) of a month; n = -1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed_us(day: date) -> Optional[date]:
+    """NYSE observance: Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        # NYSE does not close on Friday Dec 31 for a Saturday New Year's Day
+        return None if (day.month, day.day) == (1, 1) else day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def observed_uk(days: List[date]) -> List[date]:
+    """UK substitute days: weekend holidays move to the next free weekday."""
+    observed = []
+    for day in sorted(days):
+        while day.weekday() >= 5 or day in observed:
+            day += timedelta(days=1)
+        observed.append(day)
+    return observed
+
+
+def _us_calendar(year: int) -> Tuple[List[date], Dict[date, time]]:
+    easter = easter_sunday(year)
+    holidays = [
+        observed_us(date(year, 1, 1)),
+        nth_weekday(year, 1, 0, 3),   # Martin Luther King Jr. Day
+        nth_weekday(year, 2, 0, 3),   # Presidents' Day
+        easter - timedelta(days=2),   # Good Friday
+        nth_weekday(year, 5, 0, -1),  # Memorial Day
+        observed_us(date(year, 7, 4)),
+        nth_weekday(year, 9, 0, 1),   # Labor Day
+        nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        observed_us(date(year, 12, 25)),
+    ]
+    if year >= 2022:
+        holidays.append(observed_us(date(year, 6, 19)))  # Juneteenth
+    holidays = [day for day in holidays if day is not None]
+
+    early_close = time(13, 0)
+    early = {nth_weekday(year, 11, 3, 4) + timedelta(days=1): early_close}  # Day after Thanksgiving
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        if day.weekday() < 5 and day not in holidays:
+            early[day] = early_close
+    return holidays, early
+
+
+def _xetra_calendar(year: int) -> Tuple[List[date], Dict[date, time]]:
+    easter = easter_sunday(year)
+    holidays = [
+        date(year, 1, 1),
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        date(year, 5, 1),
+        date(year, 12, 24),
+        date(year, 12, 25),
+        date(year, 12, 26),
+        date(year, 12, 31),
+    ]
+    return holidays, {}
+
+
+def _euronext_calendar(year: int) -> Tuple[List[date], Dict[date, time]]:
+    easter = easter_sunday(year)
+    holidays = [
+        date(year, 1, 1),
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        date(year, 5, 1),
+        date(year, 12, 25),
+        date(year, 12, 26),
+    ]
+    early_close = time(14, 5)
+    early = {day: early_close for day in (date(year, 12, 24), date(year, 12, 31)) if day.weekday() < 5}
+    return holidays, early
+
+
+def _lse_calendar(year: int) -> Tuple[List[date], Dict[date, time]]:
+    easter = easter_sunday(year)
+    holidays = observed_uk([date(year, 1, 1)]) + [
+        easter - timedelta(days=2),   # Good Friday
+        easter + timedelta(days=1),   # Easter Monday
+        nth_weekday(year, 5, 0, 1),   # Early May bank holiday
+        nth_weekday(year, 5, 0, -1),  # Spring bank holiday
+        nth_weekday(year, 8, 0, -1),  # Summer bank holiday
+    ] + observed_uk([date(year, 12, 25), date(year, 12, 26)])
+
+    early_close = time(12, 30)
+    early = {
+        day: early_close for day in (date(year, 12, 24), date(year, 12, 31))
+        if day.weekday() < 5 and day not in holidays
+    }
+    return holidays, early
+
+
+@dataclass
+class ExchangeCalendar:
+    """Trading sessions of one exchange."""
+    code: str
+    name: str
+    timezone: str
+    open_time: time
+    close_time: time
+    rules: Callable[[int], Tuple[List[date], Dict[date, time]]] = field(repr=False)
+
+    @property
+    def tz(self):
+        return pytz.timezone(self.timezone)
+
+    def _year(self, year: int) -> Tuple[frozenset, Dict[date, time]]:
+        return _calendar_year(self.code, year)
+
+    def holidays(self, year: int) -> List[date]:
+        """Weekday full-day closures of a year."""
+        return sorted(day for day in self._year(year)[0] if day.weekday() < 5)
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self._year(day.year)[0]
+
+    def session(self, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """Timezone-aware (open, close) of a day's session, or None if the exchange is closed."""
+        if not self.is_trading_day(day):
+            return None
+        close_time = self._year(day.year)[1].get(day, self.close_time)
+        tz = self.tz
+        return (
+            tz.localize(datetime.combine(day, self.open_time)),
+            tz.localize(datetime.combine(day, close_time))
+        )
+
+    def is_open(self, now: Optional[datetime] = None, grace: timedelta = timedelta(0)) -> bool:
+        """
+        Whether a session is in progress.
+
+        Args:
+            now: Timezone-aware time (defaults to now)
+            grace: Also count this long after the close as open (to pick up closing prints)
+        """
+        now = now or datetime.now(pytz.utc)
+        session = self.session(now.astimezone(self.tz).date())
+        return session is not None and session[0] <= now <= session[1] + grace
+
+    def next_open(self, now: Optional[datetime] = None) -> datetime:
+        """Start of the next session that opens after now."""
+        now = now or datetime.now(pytz.utc)
+        day = now.astimezone(self.tz).date()
+        for _ in range(15):
+            session = self.session(day)
+            if session is not None and session[0] > now:
+                return session[0]
+            day += timedelta(days=1)
+        raise ValueError(f"No {self.code} session found in the two weeks after {now}")
+
+
+CALENDARS: Dict[str, ExchangeCalendar] = {
+    calendar.code: calendar for calendar in [
+        ExchangeCalendar("US", "NYSE / Nasdaq", "America/New_York", time(9, 30), time(16, 0), _us_calendar),
+        ExchangeCalendar("XETRA", "Xetra (Frankfurt)", "Europe/Berlin", time(9, 0), time(17, 30), _xetra_calendar),
+        ExchangeCalendar("EURONEXT", "Euronext", "Europe/Paris", time(9, 0), time(17, 30), _euronext_calendar),
+        ExchangeCalendar("LSE", "London Stock Exchange", "Europe/London", time(8, 0), time(16, 30), _lse_calendar),
+    ]
+}
+
+
+@lru_cache(maxsize=64)
+def _calendar_year(code: str, year: int) -> Tuple[frozenset, Dict[date, time]]:
+    """Holidays and early closes of one exchange-year (computed once)."""
+    holidays, early = CALENDARS[code].rules(year)
+    holidays = set(holidays) | {day for day in ADHOC_CLOSURES.get(code, []) if day.year == year}
+    holidays -= set(ADHOC_OPENINGS.get(code, []))
+    return frozenset(holidays), early
+
+
+def exchange_for_symbol(symbol: str) -> Optional[str]:
+    """
+    Exchange code for a Yahoo Finance symbol.
+
+    Returns:
+        Exchange code, or None for indices and unknown suffixes
+    """
+    symbol = symbol.upper()
+    if symbol.startswith("^"):
+        return None
+    suffix = symbol[symbol.rfind("."):] if "." in symbol else ""
+    if suffix not in SUFFIX_EXCHANGES and len(suffix) == 2:
+        suffix = ""  # share class such as BRK.B, a US listing
+    return SUFFIX_EXCHANGES.get(suffix)
+
+
+def calendar_for_symbol(symbol: str) -> Optional[ExchangeCalendar]:
+    code = exchange_for_symbol(symbol)
+    return CALENDARS[code] if code else None
+
+
+def open_exchanges(now: Optional[datetime] = None, grace: timedelta = timedelta(0)) -> List[str]:
+    """Codes of the exchanges in session at a point in time."""
+    return [code for code, calendar in CALENDARS.items() if calendar.is_open(now, grace)]
+
+
+def is_trading_day(day: date, exchanges: Optional[Iterable[str]] = None) -> bool:
+    """Whether any of the given exchanges (all known ones if None) trades on a date."""
+    return any(CALENDARS[code].is_trading_day(day) for code in (exchanges or CALENDARS))
+
+
+def next_session_open(now: Optional[datetime] = None, exchanges: Optional[Iterable[str]] = None) -> datetime:
+    """Earliest next session start among the given exchanges (all known ones if None)."""
+    return min(CALENDARS[code].next_open(now) for code in (exchanges or CALENDARS))
@@ -0,0 +1,278 @@
+"""
+Near-duplicate news detection.
+
+Features:
+- MinHash signatures (64 hashes) over word 3-shingles of title + summary,
+  so the same wire story republished by several outlets (a source suffix,
+  light edits) is recognised while follow-ups with different facts are not
+- LSH banding (16 bands of 4 hashes): a lookup only compares signatures
+  that share a band, keeping it well under a millisecond
+- Incoming articles are clustered against each other and against stored
+  articles published in the last few days; the cluster id is the id of
+  the cluster's representative (first stored) article
+- Only one representative per cluster needs sentiment scoring and an
+  embedding; the other members reuse its sentiment score
+"""
+
+import hashlib
+import re
+import time
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models import NewsArticle
+
+logger = logging.getLogger(__name__)
+
+NUM_HASHES = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 3
+MIN_TOKENS = 6  # shorter texts are too generic to cluster reliably
+
+# Fixed seed: signatures must be reproducible across processes
+_rng = np.random.default_rng(1_000_003)
+_HASH_A = _rng.integers(1, 2 ** 63, NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 2 ** 63, NUM_HASHES, dtype=np.uint64)
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SOURCE_SUFFIX = re.compile(r"\s+[-|\u2013\u2014]\s+[^-|\u2013\u2014]{1,40}$")  # "... - Reuters"
+
+
+def article_text(title: Optional[str], summary: Optional[str]) -> str:
+    """Text an article is compared on (title without a trailing outlet name + summary)."""
+    return f"{_SOURCE_SUFFIX.sub('', title or '')} {summary or ''}"
+
+
+def shingles(text: str) -> Set[str]:
+    """Word 3-shingles of a text (empty when it has fewer than MIN_TOKENS words)."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < MIN_TOKENS:
+        return set()
+    return {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text: Text to sign
+
+    Returns:
+        uint32 array of NUM_HASHES values, or None for texts too short to compare
+    """
+    shingle_set = shingles(text)
+    if not shingle_set:
+        return None
+
+    base = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+            for s in shingle_set
+        ),
+        dtype=np.uint64,
+        count=len(shingle_set)
+    )
+    # Multiply-shift hashing; uint64 arithmetic wraps, the high 32 bits are kept
+    permuted = (base[:, None] * _HASH_A + _HASH_B) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_HASHES
+
+
+class MinHashIndex:
+    """LSH index over MinHash signatures."""
+
+    def __init__(self, threshold: float = 0.7):
+        """
+        Initialize index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a match
+        """
+        self.threshold = threshold
+        self._rows = NUM_HASHES // NUM_BANDS
+        self._buckets: List[Dict[bytes, List[Tuple[np.ndarray, Any]]]] = [{} for _ in range(NUM_BANDS)]
+        self._size = 0
+
+    def add(self, signature: np.ndarray, value: Any) -> None:
+        """Add a signature with an associated value."""
+        for band, buckets in enumerate(self._buckets):
+            buckets.setdefault(self._band_key(signature, band), []).append((signature, value))
+        self._size += 1
+
+    def find(self, signature: np.ndarray) -> Optional[Any]:
+        """
+        Find the most similar indexed signature above the threshold.
+
+        Args:
+            signature: Signature to look up
+
+        Returns:
+            Value of the best match, or None
+        """
+        best_value = None
+        best_similarity = self.threshold
+        compared = set()
+
+        for band, buckets in enumerate(self._buckets):
+            for candidate, value in buckets.get(self._band_key(signature, band), ()):
+                if id(candidate) in compared:
+                    continue
+                compared.add(id(candidate))
+
+                score = similarity(signature, candidate)
+                if score >= best_similarity:
+                    best_value, best_similarity = value, score
+
+        return best_value
+
+    def _band_key(self, signature: np.ndarray, band: int) -> bytes:
+        return signature[band * self._rows:(band + 1) * self._rows].tobytes()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+@dataclass
+class ArticleCluster:
+    """Incoming articles that are near-duplicates of each other."""
+    indices: List[int] = field(default_factory=list)  # positions in the incoming article list
+    cluster_id: Optional[int] = None  # representative article id, once stored
+    sentiment_score: Optional[float] = None  # representative's score, once known
+    existing: bool = False  # representative was already stored
+
+    @property
+    def representative(self) -> Optional[int]:
+        """Index of the incoming article to score and embed (None when already stored)."""
+        return None if self.existing else self.indices[0]
+
+
+class NearDuplicateDetector:
+    """Clusters incoming news articles by MinHash similarity."""
+
+    def __init__(self, enabled: bool = True, threshold: float = 0.7, window_days: int = 7):
+        """
+        Initialize detector.
+
+        Args:
+            enabled: When False every article becomes its own cluster
+            threshold: Minimum estimated Jaccard similarity for a near-duplicate
+            window_days: Stored articles published this many days back are matched against
+        """
+        self.enabled = enabled
+        self.threshold = threshold
+        self.window_days = window_days
+        self._stats = {"articles": 0, "duplicates": 0, "stored_matches": 0, "lookup_us": 0.0}
+
+    def cluster_articles(self, db: Session, articles: List[Dict[str, Any]]) -> List[ArticleCluster]:
+        """
+        Group articles into near-duplicate clusters.
+
+        Clusters hold article indices and keep the order in which their
+        first article appears. A cluster matching a stored article has
+        existing=True and carries the stored cluster id and sentiment score.
+
+        Args:
+            db: Database session (used to load recent stored articles)
+            articles: Incoming article dictionaries with title and summary
+
+        Returns:
+            List of clusters covering every incoming article exactly once
+        """
+        if not self.enabled:
+            return [ArticleCluster(indices=[i]) for i in range(len(articles))]
+
+        index, stored_count = self._load_recent(db)
+        clusters: List[ArticleCluster] = []
+        started = time.perf_counter()
+
+        for i, article in enumerate(articles):
+            signature = minhash(article_text(article.get("title"), article.get("summary")))
+            cluster = index.find(signature) if signature is not None else None
+
+            if cluster is None:
+                cluster = ArticleCluster()
+                clusters.append(cluster)
+                if signature is not None:
+                    index.add(signature, cluster)
+            else:
+                if cluster.existing and not cluster.indices:
+                    clusters.append(cluster)
+                    self._stats["stored_matches"] += 1
+                self._stats["duplicates"] += 1
+
+            cluster.indices.append(i)
+
+        elapsed = time.perf_counter() - started
+        self._stats["articles"] += len(articles)
+        self._stats["lookup_us"] += elapsed * 1e6
+
+        logger.info(
+            f"Near-duplicates: {len(articles)} articles -> {len(clusters)} clusters "
+            f"({sum(c.existing for c in clusters)} already stored; {stored_count} stored articles indexed; "
+            f"{elapsed * 1e6 / max(len(articles), 1):.0f}us/article)"
+        )
+        return clusters
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get detection statistics.
+
+        Returns:
+            Dict with articles seen, duplicates found, clusters matched to
+            stored articles and the average time per article
+        """
+        stats = dict(self._stats)
+        lookup_us = stats.pop("lookup_us")
+        stats["avg_lookup_us"] = round(lookup_us / stats["articles"], 1) if stats["articles"] else None
+        return stats
+
+    # ---------- Internals ----------
+
+    def _load_recent(self, db: Session) -> Tuple[MinHashIndex, int]:
+        """Index recently published stored articles, one cluster object per stored cluster id."""
+        index = MinHashIndex(self.threshold)
+        cutoff = datetime.now() - timedelta(days=self.window_days)
+
+        rows = db.query(
+            NewsArticle.id,
+            NewsArticle.cluster_id,
+            NewsArticle.sentiment_score,
+            NewsArticle.title,
+            NewsArticle.summary
+        ).filter(NewsArticle.published_at >= cutoff).order_by(NewsArticle.id).all()
+
+        stored: Dict[int, ArticleCluster] = {}
+        for article_id, cluster_id, sentiment_score, title, summary in rows:
+            signature = minhash(article_text(title, summary))
+            if signature is None:
+                continue
+
+            cluster_id = cluster_id or article_id
+            cluster = stored.get(cluster_id)
+            if cluster is None:
+                cluster = stored[cluster_id] = ArticleCluster(
+                    cluster_id=cluster_id,
+                    sentiment_score=sentiment_score,
+                    existing=True
+                )
+            index.add(signature, cluster)
+
+        return index, len(rows)
+
+
+# Global near-duplicate detector instance
+near_duplicate_detector = NearDuplicateDetector(
+    enabled=settings.NEWS_DUPLICATE_DETECTION_ENABLED,
+    threshold=settings.NEWS_DUPLICATE_SIMILARITY,
+    window_days=settings.NEWS_DUPLICATE_WINDOW_DAYS
+)
@@ -6,6 +6,7 @@ Fetches news from multiple sources:
 2. Alpha Vantage News Sentiment (secondary - for additional coverage)
 
 Features:
+- Concurrent per-ticker fetching under shared per-API rate limiters
 - Automatic deduplication by URL
 - Ticker extraction and association
 - Sentiment analysis using Gemini
@@ -14,22 +15,37 @@ Features:
 """
 
 import asyncio
-import aiohttp
+import time
 import requests
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from backend.app.core.config import settings
-from backend.app.models import Stock, NewsArticle, ArticleStock
+from backend.app.models import Stock, NewsArticle
 from backend.app.services.gemini_service import GeminiService
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.vector_store import get_vector_store
 from backend.app.services.alpha_vantage import AlphaVantageService
+from backend.app.services.http_client import http_client
+from backend.app.services.embedding_pipeline import EmbeddingPipeline
+from backend.app.services.local_sentiment import sentiment_analyzer
+from backend.app.services.near_duplicates import near_duplicate_detector, ArticleCluster
+from backend.app.services.price_fetcher import rate_limiter
+from backend.app.services.news_cursors import FeedArticles, news_cursor_service, as_utc
+from backend.app.services.article_writer import ArticleWriter, load_symbol_ids
+from backend.app.services.ticker_matcher import ticker_matcher_cache
+from backend.app.services.keyword_index import keyword_index
 
 logger = logging.getLogger(__name__)
 
+# Shared with every other caller of these APIs in the process
+actually_free_api_limiter = rate_limiter(
+    "actually_free_api", settings.ACTUALLY_FREE_API_RATE_LIMIT_PER_MIN, burst=10
+)
+alpha_vantage_limiter = rate_limiter("alpha_vantage", settings.ALPHA_VANTAGE_RATE_LIMIT_PER_MIN)
+
 
 class NewsCollectorService:
     """Service for collecting news from multiple sources."""
@@ -37,14 +53,15 @@ class NewsCollectorService:
     def __init__(self):
         self.actually_free_api_base = "https://actually-free-api.vercel.app/api"
         self.gemini_service = GeminiService()
-        self.vector_store = VectorStoreService()
+        self.vector_store = get_vector_store()
         self.alpha_vantage = AlphaVantageService()
 
     async def fetch_from_actually_free_api(
         self,
         ticker: Optional[str] = None,
         limit: int = 50,
-        start_date: Optional[str] = None
+        start_date: Optional[str] = None,
+        since: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch news from ActuallyFreeAPI.
@@ -53,11 +70,16 @@ class NewsCollectorService:
             ticker: Stock ticker to filter by
             limit: Number of articles to fetch per page
             start_date: ISO 8601 date string for filtering
+            since: Only return articles published at or after this time
+                (overrides start_date; paging stops once older articles appear)
 
         Returns:
-            List of news articles
+            List of news articles (a FeedArticles list, incomplete when a
+            later page failed or the page cap was reached)
         """
         all_articles = []
+        complete = True
+        since = as_utc(since)
 
         try:
             params = {
@@ -68,61 +90,65 @@ class NewsCollectorService:
             if ticker:
                 params["ticker"] = ticker
 
-            if start_date:
+            if since:
+                params["startDate"] = since.strftime("%Y-%m-%d")
+            elif start_date:
                 params["startDate"] = start_date
 
-            async with aiohttp.ClientSession() as session:
-                # Fetch first page
-                url = f"{self.actually_free_api_base}/news"
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status != 200:
-                        logger.warning(f"ActuallyFreeAPI returned status {response.status}")
-                        return []
-
-                    data = await response.json()
-                    articles = data.get("data", [])
-                    all_articles.extend(articles)
-
-                    logger.info(f"Fetched {len(articles)} articles from ActuallyFreeAPI (page 1)")
-
-                    # Check if there are more pages
-                    pagination = data.get("pagination", {})
-                    has_next = pagination.get("hasNextPage", False)
-                    total_pages = pagination.get("totalPages", 3)
-
-                    # Fetch ALL pages to get complete dataset
-                    page = 2
-                    max_pages = min(total_pages, 50)  # Cap at 50 pages to be safe (5000 articles)
-                    while has_next and page <= max_pages:
-                        params["page"] = page
-                        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as page_response:
-                            if page_response.status == 200:
-                                page_data = await page_response.json()
-                                page_articles = page_data.get("data", [])
-                                all_articles.extend(page_articles)
-
-                                logger.info(f"Fetched {len(page_articles)} articles from ActuallyFreeAPI (page {page})")
-
-                                pagination = page_data.get("pagination", {})
-                                has_next = pagination.get("hasNextPage", False)
-                                page += 1
-
-                                # Small delay to be respectful
-                                await asyncio.sleep(0.5)
-                            else:
-                                break
+            # Fetch first page
+            url = f"{self.actually_free_api_base}/news"
+            await actually_free_api_limiter.acquire()
+            response = await http_client.aget(url, params=params, timeout=30)
+            if response.status_code != 200:
+                logger.warning(f"ActuallyFreeAPI returned status {response.status_code}")
+                return []
+
+            data = response.json()
+            articles = data.get("data", [])
+            all_articles.extend(articles)
+
+            logger.info(f"Fetched {len(articles)} articles from ActuallyFreeAPI (page 1)")
+
+            # Check if there are more pages (the feed is newest first, so
+            # a page reaching past the watermark is the last one needed)
+            pagination = data.get("pagination", {})
+            has_next = pagination.get("hasNextPage", False) and not self._reaches(articles, since)
+            total_pages = pagination.get("totalPages", 3)
+
+            # Fetch ALL pages to get complete dataset
+            page = 2
+            max_pages = min(total_pages, 50)  # Cap at 50 pages to be safe (5000 articles)
+            while has_next and page <= max_pages:
+                params["page"] = page
+                await actually_free_api_limiter.acquire()
+                page_response = await http_client.aget(url, params=params, timeout=30)
+                if page_response.status_code == 200:
+                    page_data = page_response.json()
+                    page_articles = page_data.get("data", [])
+                    all_articles.extend(page_articles)
+
+                    logger.info(f"Fetched {len(page_articles)} articles from ActuallyFreeAPI (page {page})")
+
+                    pagination = page_data.get("pagination", {})
+                    has_next = pagination.get("hasNextPage", False) and not self._reaches(page_articles, since)
+                    page += 1
+                else:
+                    logger.warning(f"ActuallyFreeAPI returned status {page_response.status_code} for page {page}")
+                    complete = False
+                    break
+            if has_next and page > max_pages:
+                logger.warning(f"ActuallyFreeAPI: stopped at the {max_pages}-page cap")
+                complete = False
 
             # Normalize article format
             normalized_articles = []
             for article in all_articles:
                 # Parse publication date safely
-                pub_date = article.get("pub_date")
-                published_at = None
-                if pub_date:
-                    try:
-                        published_at = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
-                    except (ValueError, AttributeError) as e:
-                        logger.warning(f"Invalid date format for article: {pub_date}")
+                published_at = self._parse_pub_date(article.get("pub_date"))
+
+                # Already seen in an earlier run
+                if since and published_at and as_utc(published_at) < since:
+                    continue
 
                 # Parse summary safely
                 summary = article.get("description")
@@ -141,19 +167,46 @@ class NewsCollectorService:
                 })
 
             logger.info(f"ActuallyFreeAPI: Total {len(normalized_articles)} articles fetched")
-            return normalized_articles
+            return FeedArticles(normalized_articles, complete=complete)
 
         except Exception as e:
             logger.error(f"Error fetching from ActuallyFreeAPI: {e}")
             return []
 
-    def fetch_from_alpha_vantage(self, tickers: str, limit: int = 50) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _parse_pub_date(pub_date: Optional[str]) -> Optional[datetime]:
+        """Parse an ActuallyFreeAPI pub_date (ISO 8601), None if missing or invalid."""
+        if not pub_date:
+            return None
+        try:
+            return datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
+        except (ValueError, AttributeError):
+            logger.warning(f"Invalid date format for article: {pub_date}")
+            return None
+
+    def _reaches(self, page_articles: List[Dict[str, Any]], since: Optional[datetime]) -> bool:
+        """Whether a raw page contains an article published before `since`."""
+        if since is None:
+            return False
+        for article in page_articles:
+            published_at = self._parse_pub_date(article.get("pub_date"))
+            if published_at and as_utc(published_at) < since:
+                return True
+        return False
+
+    def fetch_from_alpha_vantage(
+        self,
+        tickers: str,
+        limit: int = 50,
+        since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
         """
         Fetch news from Alpha Vantage News Sentiment API.
 
         Args:
             tickers: Comma-separated list of tickers
             limit: Number of articles
+            since: Only return articles published at or after this time
 
         Returns:
             List of news articles
@@ -161,7 +214,8 @@ class NewsCollectorService:
         try:
             articles = self.alpha_vantage.get_news_sentiment(
                 tickers=tickers,
-                limit=limit
+                limit=limit,
+                time_from=as_utc(since).strftime("%Y%m%dT%H%M") if since else None
             )
 
             # Normalize format
@@ -188,6 +242,89 @@ class NewsCollectorService:
             logger.error(f"Error fetching from Alpha Vantage: {e}")
             return []
 
+    async def fetch_for_stocks(
+        self,
+        symbols: List[str],
+        start_date: Optional[str] = None,
+        per_page: int = 20,
+        watermarks: Optional[Dict[str, Dict[str, Optional[datetime]]]] = None
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetch news for many tickers concurrently.
+
+        ActuallyFreeAPI is queried per ticker (at most NEWS_FETCH_CONCURRENCY
+        at once, paced by its shared rate limiter); Alpha Vantage is queried
+        once for the first 10 tickers in a worker thread, since its client
+        is blocking. Feeds with a watermark only request newer articles.
+
+        Args:
+            symbols: Stock ticker symbols
+            start_date: ISO 8601 date string for feeds without a watermark
+            per_page: ActuallyFreeAPI articles per page
+            watermarks: Dict of source -> ticker -> newest published_at
+                already collected (see NewsCursorService.get_watermarks)
+
+        Returns:
+            Dict of source -> ticker -> fetched articles (Alpha Vantage
+            articles are listed under each ticker of the request)
+        """
+        watermarks = watermarks or {}
+        semaphore = asyncio.Semaphore(settings.NEWS_FETCH_CONCURRENCY)
+
+        def since(source: str, ticker: str) -> Optional[datetime]:
+            return news_cursor_service.since(watermarks.get(source, {}).get(ticker))
+
+        async def fetch_ticker(symbol: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                logger.info(f"Fetching news for {symbol} from ActuallyFreeAPI")
+                return await self.fetch_from_actually_free_api(
+                    ticker=symbol,
+                    limit=per_page,
+                    start_date=start_date,
+                    since=since("actually_free_api", symbol)
+                )
+
+        av_symbols = symbols[:10]  # Max 10 tickers
+
+        async def fetch_alpha_vantage() -> List[Dict[str, Any]]:
+            # One request covers the group, so start from its oldest watermark
+            starts = [since("alpha_vantage", symbol) for symbol in av_symbols]
+            av_since = min(starts) if starts and None not in starts else None
+
+            ticker_list = ",".join(av_symbols)
+            logger.info(f"Fetching news from Alpha Vantage for tickers: {ticker_list}")
+            await alpha_vantage_limiter.acquire()
+            return await asyncio.to_thread(self.fetch_from_alpha_vantage, ticker_list, 50, av_since)
+
+        *af_results, av_articles = await asyncio.gather(
+            *(fetch_ticker(symbol) for symbol in symbols),
+            fetch_alpha_vantage()
+        )
+        return {
+            "actually_free_api": dict(zip(symbols, af_results)),
+            "alpha_vantage": {symbol: av_articles for symbol in av_symbols}
+        }
+
+    @staticmethod
+    def find_existing_articles(db, urls: List[str], batch_size: int = 500) -> Dict[str, NewsArticle]:
+        """
+        Look up stored articles by URL with one query per batch.
+
+        Args:
+            db: Database session
+            urls: Article URLs
+            batch_size: Maximum URLs per query
+
+        Returns:
+            Dict of URL -> stored NewsArticle for URLs already stored
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        existing = {}
+        for i in range(0, len(urls), batch_size):
+            for article in db.query(NewsArticle).filter(NewsArticle.url.in_(urls[i:i + batch_size])):
+                existing[article.url] = article
+        return existing
+
     def deduplicate_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate articles by URL."""
         seen_urls = set()
@@ -204,7 +341,9 @@ class NewsCollectorService:
 
     def process_article_sentiment(self, article: Dict[str, Any]) -> float:
         """
-        Process article sentiment using Gemini if not already present.
+        Process article sentiment if not already present.
+
+        Scored locally; Gemini is only asked when the local score is uncertain.
 
         Args:
             article: Article dictionary
@@ -216,23 +355,64 @@ class NewsCollectorService:
         if article.get("sentiment_score") is not None:
             return float(article["sentiment_score"])
 
-        # Otherwise, generate sentiment using Gemini
+        # Otherwise, generate sentiment
         try:
             content = f"{article.get('title', '')}. {article.get('summary', '')}"
-            sentiment_result = self.gemini_service.analyze_sentiment(content)
+            sentiment_result = sentiment_analyzer.analyze(content)
             return sentiment_result["score"]
         except Exception as e:
             logger.warning(f"Error generating sentiment for article: {e}")
             return 0.0  # Neutral
 
+    def process_articles_sentiment(self, articles: List[Dict[str, Any]]) -> List[float]:
+        """
+        Process sentiment for many articles.
+
+        Articles that already carry a sentiment score keep it. The rest are
+        scored locally and only low-confidence ones are sent to Gemini
+        (in batched prompts).
+
+        Args:
+            articles: Article dictionaries
+
+        Returns:
+            Sentiment scores (-1.0 to 1.0) in the same order as articles
+        """
+        scores = [
+            float(a["sentiment_score"]) if a.get("sentiment_score") is not None else None
+            for a in articles
+        ]
+        pending = [i for i, score in enumerate(scores) if score is None]
+
+        if pending:
+            contents = [
+                f"{articles[i].get('title', '')}. {articles[i].get('summary', '')}"
+                for i in pending
+            ]
+            try:
+                results = sentiment_analyzer.analyze_batch(contents)
+                for i, result in zip(pending, results):
+                    scores[i] = result["score"]
+            except Exception as e:
+                logger.warning(f"Error generating sentiment for {len(pending)} articles: {e}")
+
+        return [score if score is not None else 0.0 for score in scores]
+
 
 async def collect_all_news() -> Dict[str, Any]:
     """
     Main function to collect news for all portfolio stocks.
     Called by the scheduler.
 
+    Runs as a pipeline: fetch (all tickers concurrently, paced by the shared
+    rate limiters) -> dedupe -> score -> persist and embed. The blocking
+    stages run in worker threads so the scheduler's event loop stays free.
+
+    Collection is incremental: each (source, ticker) feed only requests
+    articles newer than its cursor, which advances once the run is stored.
+
     Returns:
-        Dictionary with collection statistics
+        Dictionary with collection statistics, including per-stage timings
     """
     logger.info("=== Starting News Collection ===")
 
@@ -242,8 +422,8 @@ async def collect_all_news() -> Dict[str, Any]:
     db = Session()
 
     try:
-        # Get all stocks in portfolio
-        stocks = db.query(Stock).all()
+        # Get all stocks in portfolio (benchmark indices have no news)
+        stocks = db.query(Stock).filter(Stock.is_benchmark.is_(False)).all()
 
         if not stocks:
             logger.warning("No stocks in portfolio - skipping news collection")
@@ -257,110 +437,72 @@ async def collect_all_news() -> Dict[str, Any]:
         logger.info(f"Collecting news for {len(stocks)} stocks")
 
         collector = NewsCollectorService()
-        all_articles = []
-
-        # Fetch from ActuallyFreeAPI for each stock
-        for stock in stocks:
-            logger.info(f"Fetching news for {stock.symbol} from ActuallyFreeAPI")
-            # Get articles from last 7 days
-            start_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-            articles = await collector.fetch_from_actually_free_api(
-                ticker=stock.symbol,
-                limit=20,
-                start_date=start_date
-            )
-            all_articles.extend(articles)
-
-            # Small delay between requests
-            await asyncio.sleep(0.5)
-
-        # Also fetch from Alpha Vantage for comprehensive coverage
-        ticker_list = ",".join([s.symbol for s in stocks[:10]])  # Max 10 tickers
-        logger.info(f"Fetching news from Alpha Vantage for tickers: {ticker_list}")
-        av_articles = collector.fetch_from_alpha_vantage(ticker_list, limit=50)
-        all_articles.extend(av_articles)
-
-        # Deduplicate
-        unique_articles = collector.deduplicate_articles(all_articles)
-        logger.info(f"Processing {len(unique_articles)} unique articles")
-
-        new_count = 0
-        updated_count = 0
-        error_count = 0
-
-        for article_data in unique_articles:
-            try:
-                # Check if article already exists
-                existing = db.query(NewsArticle).filter(
-                    NewsArticle.url == article_data["url"]
-                ).first()
-
-                # Find related stocks based on tickers
-                related_stocks = []
-                for stock in stocks:
-                    if stock.symbol in article_data.get("tickers", []):
-                        related_stocks.append(stock)
-
-                # Skip if no related stocks
-                if not related_stocks:
-                    continue
-
-                # Process sentiment
-                sentiment_score = collector.process_article_sentiment(article_data)
-
-                if existing:
-                    # Update sentiment if changed
-                    if existing.sentiment_score != sentiment_score:
-                        existing.sentiment_score = sentiment_score
-                        updated_count += 1
-                else:
-                    # Create new article
-                    article = NewsArticle(
-                        title=article_data["title"],
-                        source=article_data["source"],
-                        url=article_data["url"],
-                        published_at=article_data["published_at"],
-                        summary=article_data["summary"],
-                        sentiment_score=sentiment_score
-                    )
-                    db.add(article)
-                    db.flush()  # Get article ID
-
-                    # Link to stocks
-                    for stock in related_stocks:
-                        article_stock = ArticleStock(
-                            article_id=article.id,
-                            stock_id=stock.id
-                        )
-                        db.add(article_stock)
-
-                    # Generate embedding and add to vector store
-                    try:
-                        content = f"{article_data['title']}. {article_data['summary']}"
-                        embedding = collector.gemini_service.generate_embedding(content)
-                        collector.vector_store.add_article(
-                            article_id=article.id,
-                            content=content,
-                            embedding=embedding,
-                            metadata={
-                                "title": article_data["title"],
-                                "source": article_data["source"],
-                                "published_at": str(article_data["published_at"]),
-                                "sentiment_score": sentiment_score,
-                                "stocks": [s.symbol for s in related_stocks]
-                            }
-                        )
-                    except Exception as e:
-                        logger.warning(f"Error adding to vector store: {e}")
-
-                    new_count += 1
+        timings = {}
+        started = stage_started = time.monotonic()
+
+        def end_stage(name: str) -> None:
+            nonlocal stage_started
+            now = time.monotonic()
+            timings[name] = round(now - stage_started, 2)
+            stage_started = now
+
+        # Stage 1: fetch from ActuallyFreeAPI (per ticker) and Alpha Vantage,
+        # newer than each feed's watermark (7 days back for new feeds)
+        symbols = [s.symbol for s in stocks]
+        watermarks = {
+            source: news_cursor_service.get_watermarks(db, source, symbols)
+            for source in ("actually_free_api", "alpha_vantage")
+        }
+        start_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+        fetched = await collector.fetch_for_stocks(
+            symbols,
+            start_date=start_date,
+            watermarks=watermarks
+        )
+        all_articles = [a for articles in fetched["actually_free_api"].values() for a in articles]
+        # Alpha Vantage articles are listed under every requested ticker; take them once
+        all_articles += next(iter(fetched["alpha_vantage"].values()), [])
+        end_stage("fetch")
+
+        # Stage 2: dedupe by URL, keep portfolio articles, cluster near-duplicates
+        unique_articles, relevant, clusters = await asyncio.to_thread(
+            _select_articles, db, collector, stocks, all_articles
+        )
+        end_stage("dedupe")
+
+        # Stage 3: score sentiment once per new cluster, in batched prompts
+        await asyncio.to_thread(_score_clusters, collector, relevant, clusters)
+        end_stage("score")
+
+        # Stage 4: store articles; embeddings are generated and indexed in
+        # batches once the articles they reference are committed
+        pipeline = EmbeddingPipeline(
+            collector.gemini_service,
+            collector.vector_store,
+            before_flush=db.commit
+        )
+        new_count, updated_count, error_count = await asyncio.to_thread(
+            _persist_articles, db, relevant, clusters, pipeline
+        )
+        end_stage("persist")
+
+        # Everything fetched is stored (a failed write raises above, so the
+        # run is repeated next time) - move the feed watermarks forward,
+        # except for feeds whose paging stopped early
+        for source, articles_by_ticker in fetched.items():
+            news_cursor_service.advance(db, source, articles_by_ticker)
+        db.commit()
 
-            except Exception as e:
-                logger.error(f"Error processing article '{article_data.get('title', 'Unknown')}': {e}")
-                error_count += 1
+        # Make the new articles searchable by keyword
+        try:
+            await asyncio.to_thread(keyword_index.update, db)
+        except Exception as e:
+            logger.error(f"Keyword index update failed: {e}")
 
-        # Commit all changes
-        db.commit()
+        # Embedding batches are flushed during the persist stage
+        timings["embed"] = round(pipeline.stats["seconds"], 2)
+        timings["persist"] = round(max(timings["persist"] - timings["embed"], 0.0), 2)
+        timings["total"] = round(time.monotonic() - started, 2)
 
         result = {
             "status": "success",
@@ -368,13 +510,18 @@ async def collect_all_news() -> Dict[str, Any]:
             "stocks_tracked": len(stocks),
             "articles_fetched": len(all_articles),
             "unique_articles": len(unique_articles),
+            "article_clusters": len(clusters),
             "new_articles": new_count,
             "updated_articles": updated_count,
-            "errors": error_count
+            "embedded_articles": pipeline.stats["embedded"],
+            "embedding_batches": pipeline.stats["batches"],
+            "errors": error_count,
+            "timings": timings
         }
 
         logger.info(f"=== News Collection Complete ===")
         logger.info(f"New: {new_count}, Updated: {updated_count}, Errors: {error_count}")
+        logger.info(f"Stage timings (s): {timings}")
 
         return result
 
@@ -389,3 +536,119 @@ async def collect_all_news() -> Dict[str, Any]:
         }
     finally:
         db.close()
+
+
+def _select_articles(
+    db,
+    collector: NewsCollectorService,
+    stocks: List[Stock],
+    all_articles: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], List[Stock]]], List[ArticleCluster]]:
+    """Deduplicate, keep articles related to portfolio stocks and cluster near-duplicates."""
+    unique_articles = collector.deduplicate_articles(all_articles)
+    logger.info(f"Processing {len(unique_articles)} unique articles")
+
+    # Keep articles the source tagged with portfolio tickers
+    matcher = ticker_matcher_cache.get(db)
+    stocks_by_symbol = {stock.symbol.upper(): stock for stock in stocks}
+    relevant = []
+    for article_data in unique_articles:
+        related_stocks = [
+            stocks_by_symbol[symbol]
+            for symbol in matcher.match_tickers(article_data.get("tickers"))
+            if symbol in stocks_by_symbol
+        ]
+        if related_stocks:
+            relevant.append((article_data, related_stocks))
+
+    # Group near-duplicates (the same story from several outlets)
+    clusters = near_duplicate_detector.cluster_articles(db, [a for a, _ in relevant])
+    return unique_articles, relevant, clusters
+
+
+def _score_clusters(
+    collector: NewsCollectorService,
+    relevant: List[Tuple[Dict[str, Any], List[Stock]]],
+    clusters: List[ArticleCluster]
+) -> None:
+    """Set the sentiment score of each new cluster from its representative article."""
+    new_clusters = [c for c in clusters if not c.existing]
+    sentiment_scores = collector.process_articles_sentiment(
+        [relevant[c.representative][0] for c in new_clusters]
+    )
+    for cluster, sentiment_score in zip(new_clusters, sentiment_scores):
+        cluster.sentiment_score = sentiment_score
+
+
+def _persist_articles(
+    db,
+    relevant: List[Tuple[Dict[str, Any], List[Stock]]],
+    clusters: List[ArticleCluster],
+    pipeline: EmbeddingPipeline
+) -> Tuple[int, int, int]:
+    """
+    Update changed sentiment of stored articles, bulk-insert new ones and
+    queue cluster representatives for embedding.
+
+    Returns:
+        Tuple of (new, updated, errors)
+
+    Raises:
+        Exception: If a batch cannot be stored (after rolling it back), so
+            the caller does not advance the feed cursors past it
+    """
+    updated_count = 0
+
+    # One query per batch of URLs instead of one per article
+    stored = NewsCollectorService.find_existing_articles(db, [a["url"] for a, _ in relevant])
+
+    for cluster in clusters:
+        for i in cluster.indices:
+            existing = stored.get(relevant[i][0]["url"])
+            if existing and existing.sentiment_score != cluster.sentiment_score:
+                existing.sentiment_score = cluster.sentiment_score
+                updated_count += 1
+        cluster.indices = [i for i in cluster.indices if relevant[i][0]["url"] not in stored]
+
+    # Insert new articles and their stock links, one commit per batch
+    articles = [
+        dict(article_data, symbols=[s.symbol for s in related_stocks])
+        for article_data, related_stocks in relevant
+    ]
+    pending = sum(len(c.indices) for c in clusters)
+    writer = ArticleWriter(db, load_symbol_ids(db))
+    new_count = 0
+
+    try:
+        for batch in writer.write(articles, [c for c in clusters if c.indices]):
+            for stored_article in batch:
+                if not stored_article.representative:
+                    continue  # Near-duplicates share the representative's vector
+
+                article_data = articles[stored_article.index]
+                # Queue for batched embedding and vector store write
+                pipeline.add(
+                    stored_article.article_id,
+                    f"{article_data['title']}. {article_data['summary']}",
+                    {
+                        "title": article_data["title"],
+                        "source": article_data["source"],
+                        "published_at": str(article_data["published_at"]),
+                        "sentiment_score": stored_article.cluster.sentiment_score,
+                        "stocks": article_data["symbols"]
+                    }
+                )
+
+            db.commit()
+            new_count += len(batch)
+    except Exception as e:
+        logger.error(f"Error storing articles: {e}")
+        db.rollback()
+        pipeline.discard()
+        raise
+
+    # Index the remaining articles
+    db.commit()
+    pipeline.flush()
+
+    return new_count, updated_count, pending - new_count - writer.stats["conflicts"]
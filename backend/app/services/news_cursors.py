@@ -0,0 +1,137 @@
+"""
+Per-feed high-water marks for incremental news collection.
+
+Features:
+- One cursor per (source, ticker) holding the newest published_at seen
+- `since()` turns a watermark into the start of the next request window,
+  with a small overlap for articles indexed late by the source
+- Cursors only move forward and are written in the caller's transaction,
+  so a failed run is simply repeated
+- Feeds whose fetch stopped early (a failed page, the page cap) are not
+  advanced: their feeds are newest first, so the unfetched pages hold
+  articles older than everything fetched
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Any
+
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models import NewsCursor
+
+logger = logging.getLogger(__name__)
+
+ALL_TICKERS = "*"
+
+
+class FeedArticles(list):
+    """Articles fetched from one feed; complete is False when paging stopped early."""
+
+    def __init__(self, articles: Iterable[Dict[str, Any]] = (), complete: bool = True):
+        super().__init__(articles)
+        self.complete = complete
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Make a datetime timezone-aware (naive values are taken as UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class NewsCursorService:
+    """Reads and advances news feed watermarks."""
+
+    def __init__(self, overlap_minutes: int = 60):
+        """
+        Initialize cursor service.
+
+        Args:
+            overlap_minutes: How far before a watermark the next request starts
+        """
+        self.overlap = timedelta(minutes=overlap_minutes)
+
+    def get_watermarks(self, db: Session, source: str, tickers: Iterable[str]) -> Dict[str, Optional[datetime]]:
+        """
+        Get the watermark of each feed.
+
+        Args:
+            db: Database session
+            source: News source name
+            tickers: Tickers (or ALL_TICKERS)
+
+        Returns:
+            Dict of ticker -> newest published_at seen (None for new feeds)
+        """
+        tickers = list(tickers)
+        watermarks: Dict[str, Optional[datetime]] = dict.fromkeys(tickers)
+
+        rows = db.query(NewsCursor.ticker, NewsCursor.last_published_at).filter(
+            NewsCursor.source == source,
+            NewsCursor.ticker.in_(tickers)
+        ).all()
+        for ticker, last_published_at in rows:
+            watermarks[ticker] = as_utc(last_published_at)
+
+        return watermarks
+
+    def since(self, watermark: Optional[datetime]) -> Optional[datetime]:
+        """Start of the next request window for a feed (None when it has no watermark)."""
+        return watermark - self.overlap if watermark is not None else None
+
+    def advance(self, db: Session, source: str, articles_by_ticker: Dict[str, List[Dict[str, Any]]]) -> int:
+        """
+        Move feed watermarks to the newest fetched article.
+
+        Feeds fetched incompletely (a FeedArticles list with complete=False)
+        keep their watermark, so the next run requests the missed window again.
+        Does not commit; call inside the transaction that stores the articles.
+
+        Args:
+            db: Database session
+            source: News source name
+            articles_by_ticker: Fetched articles per ticker (or ALL_TICKERS)
+
+        Returns:
+            Number of cursors moved
+        """
+        latest = {}
+        for ticker, articles in articles_by_ticker.items():
+            if not getattr(articles, "complete", True):
+                logger.warning(f"{source} feed {ticker} was fetched incompletely - keeping its cursor")
+                continue
+            dates = [as_utc(a["published_at"]) for a in articles if a.get("published_at")]
+            if dates:
+                latest[ticker] = max(dates)
+
+        if not latest:
+            return 0
+
+        cursors = {
+            cursor.ticker: cursor
+            for cursor in db.query(NewsCursor).filter(
+                NewsCursor.source == source,
+                NewsCursor.ticker.in_(list(latest))
+            ).all()
+        }
+
+        moved = 0
+        for ticker, published_at in latest.items():
+            cursor = cursors.get(ticker)
+            if cursor is None:
+                db.add(NewsCursor(source=source, ticker=ticker, last_published_at=published_at))
+                moved += 1
+            elif cursor.last_published_at is None or as_utc(cursor.last_published_at) < published_at:
+                cursor.last_published_at = published_at
+                moved += 1
+
+        logger.info(f"Advanced {moved} {source} news cursors")
+        return moved
+
+
+# Global news cursor service instance
+news_cursor_service = NewsCursorService(overlap_minutes=settings.NEWS_CURSOR_OVERLAP_MINUTES)
@@ -2,26 +2,27 @@
 Stock price collection service for automated daily price data gathering.
 
 Features:
-- Multi-source price fetching (Yahoo Finance primary, Alpha Vantage fallback)
+- Multi-source price fetching (concurrent, rate-limited provider fallback)
 - Batch fetching for efficient multi-stock downloads (10x+ speedup)
 - Historical backfill (100 days on first run)
 - Smart weekend/holiday detection
-- Duplicate prevention with unique constraints
+- Bulk upsert on (stock_id, date) via the price ingestion service
 - Comprehensive error handling
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional
 from datetime import datetime, date, timedelta
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import IntegrityError
 
 from backend.app.core.config import settings
 from backend.app.models import Stock, StockPrice
-from backend.app.services.yahoo_finance import YahooFinanceService
-from backend.app.services.alpha_vantage import AlphaVantageService
 from backend.app.services.batch_price_service import batch_price_service
+from backend.app.services.price_fetcher import price_fetcher
+from backend.app.services.price_ingestion import price_ingestion
+from backend.app.services.benchmark_service import benchmark_service
+from backend.app.services import market_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -30,13 +31,12 @@ class PriceCollectorService:
     """Service for collecting stock price data from multiple sources."""
 
     def __init__(self):
-        self.yahoo_service = YahooFinanceService()
-        self.alpha_vantage = AlphaVantageService()
         self.batch_service = batch_price_service
+        self.fetcher = price_fetcher
 
     def fetch_price_data(self, symbol: str, days: int = 100) -> List[Dict[str, Any]]:
         """
-        Fetch price data for a stock, trying Yahoo Finance first then Alpha Vantage.
+        Fetch price data for a stock, trying each configured provider in turn.
 
         Args:
             symbol: Stock ticker symbol
@@ -45,34 +45,15 @@ class PriceCollectorService:
         Returns:
             List of price records with OHLCV data
         """
-        # Try Yahoo Finance first (free, unlimited)
-        logger.info(f"Fetching {days} days of price data for {symbol} from Yahoo Finance")
-        prices = self.yahoo_service.get_daily_prices(symbol, days=days)
-
-        if prices:
-            logger.info(f"Yahoo Finance: Got {len(prices)} price records for {symbol}")
-            return prices
-
-        # Fallback to Alpha Vantage
-        logger.warning(f"Yahoo Finance failed for {symbol}, trying Alpha Vantage")
-        try:
-            outputsize = "full" if days > 100 else "compact"
-            prices = self.alpha_vantage.get_daily_prices(symbol, outputsize=outputsize)
-
-            if prices:
-                # Limit to requested days
-                prices = prices[:days]
-                logger.info(f"Alpha Vantage: Got {len(prices)} price records for {symbol}")
-                return prices
-        except Exception as e:
-            logger.error(f"Alpha Vantage also failed for {symbol}: {e}")
-
-        logger.error(f"All sources failed for {symbol}")
-        return []
+        logger.info(f"Fetching {days} days of price data for {symbol}")
+        return self.fetcher.fetch_many_sync([symbol], days).get(symbol.upper(), [])
 
     def store_prices(self, db, stock: Stock, prices: List[Dict[str, Any]]) -> Dict[str, int]:
         """
-        Store price data in database, handling duplicates gracefully.
+        Store price data in database with a bulk upsert.
+
+        New dates are inserted, existing dates are updated when the values
+        changed and left alone otherwise.
 
         Args:
             db: Database session
@@ -80,58 +61,19 @@ class PriceCollectorService:
             prices: List of price dictionaries
 
         Returns:
-            Dictionary with counts of new and skipped records
+            Dictionary with counts of new, updated, skipped and error records
         """
-        new_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        for price_data in prices:
-            try:
-                # Check if price already exists
-                existing = db.query(StockPrice).filter(
-                    StockPrice.stock_id == stock.id,
-                    StockPrice.date == price_data["date"]
-                ).first()
-
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                # Create new price record
-                price = StockPrice(
-                    stock_id=stock.id,
-                    date=price_data["date"],
-                    open=price_data["open"],
-                    close=price_data["close"],
-                    high=price_data["high"],
-                    low=price_data["low"],
-                    volume=price_data["volume"]
-                )
-                db.add(price)
-                new_count += 1
-
-            except IntegrityError as e:
-                # Duplicate key constraint violation
-                db.rollback()
-                skipped_count += 1
-                logger.debug(f"Duplicate price for {stock.symbol} on {price_data['date']}")
-            except Exception as e:
-                db.rollback()
-                error_count += 1
-                logger.error(f"Error storing price for {stock.symbol} on {price_data['date']}: {e}")
-
-        # Commit all new prices
         try:
-            db.commit()
+            result = price_ingestion.upsert_stock_prices(db, stock, prices)
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error committing prices for {stock.symbol}: {e}")
+            logger.error(f"Error storing prices for {stock.symbol}: {e}")
+            return {"new": 0, "updated": 0, "skipped": 0, "errors": len(prices)}
 
         return {
-            "new": new_count,
-            "skipped": skipped_count,
-            "errors": error_count
+            "new": result["inserted"],
+            "updated": result["updated"],
+            "skipped": result["unchanged"],
+            "errors": result["invalid"]
         }
 
     def needs_backfill(self, db, stock: Stock, days_threshold: int = 30) -> bool:
@@ -154,22 +96,41 @@ class PriceCollectorService:
 
         return count < days_threshold
 
-    def is_trading_day(self, check_date: date = None) -> bool:
+    def price_history(self, db, stocks: List[Stock]) -> Dict[int, tuple]:
         """
-        Check if a given date is a trading day (not weekend).
-        Note: This doesn't check for market holidays.
+        Stored row count and latest date per stock, in one grouped query.
+
+        Args:
+            db: Database session
+            stocks: Stock model instances
+
+        Returns:
+            Dict mapping stock_id to (row count, latest date); stocks without
+            rows are missing
+        """
+        rows = db.query(
+            StockPrice.stock_id, func.count(StockPrice.id), func.max(StockPrice.date)
+        ).filter(
+            StockPrice.stock_id.in_([s.id for s in stocks])
+        ).group_by(StockPrice.stock_id).all()
+
+        return {stock_id: (count, latest) for stock_id, count, latest in rows}
+
+    def is_trading_day(self, check_date: date = None, exchanges: Optional[Iterable[str]] = None) -> bool:
+        """
+        Check if a given date is a trading day (not a weekend or exchange holiday).
 
         Args:
             check_date: Date to check (defaults to today)
+            exchanges: Exchange codes to check (defaults to all known exchanges)
 
         Returns:
-            True if it's a weekday (Mon-Fri)
+            True if at least one of the exchanges is open that day
         """
         if check_date is None:
             check_date = date.today()
 
-        # 0 = Monday, 5 = Saturday, 6 = Sunday
-        return check_date.weekday() < 5
+        return market_calendar.is_trading_day(check_date, exchanges)
 
     def fetch_prices_batch(
         self,
@@ -196,12 +157,9 @@ class PriceCollectorService:
         if result:
             logger.info(f"Batch fetch successful: got data for {len(result)} symbols")
         else:
-            logger.warning("Batch fetch returned no data, falling back to sequential")
-            # Fallback to sequential fetching if batch fails
-            for symbol in symbols:
-                prices = self.fetch_price_data(symbol, days)
-                if prices:
-                    result[symbol.upper()] = prices
+            logger.warning("Batch fetch returned no data, falling back to per-symbol providers")
+            # Fallback to concurrent per-symbol fetching if batch fails
+            result = self.fetcher.fetch_many_sync(symbols, days)
 
         return result
 
@@ -211,7 +169,8 @@ async def collect_all_prices() -> Dict[str, Any]:
     Main function to collect price data for all portfolio stocks.
     Called by the scheduler.
 
-    Uses batch fetching for 10x+ speedup over sequential fetching.
+    Uses batch fetching for 10x+ speedup over sequential fetching. Benchmark
+    indices (settings.BENCHMARK_SYMBOLS) are collected in the same batches.
 
     Returns:
         Dictionary with collection statistics
@@ -224,10 +183,11 @@ async def collect_all_prices() -> Dict[str, Any]:
     db = Session()
 
     try:
-        # Get all stocks in portfolio
+        # Get all stocks in portfolio plus benchmark indices
+        benchmark_service.ensure_benchmark_stocks(db)
         stocks = db.query(Stock).all()
 
-        if not stocks:
+        if all(s.is_benchmark for s in stocks):
             logger.warning("No stocks in portfolio - skipping price collection")
             return {
                 "status": "skipped",
@@ -239,9 +199,10 @@ async def collect_all_prices() -> Dict[str, Any]:
         # Check if today is a trading day
         today = date.today()
         collector = PriceCollectorService()
+        exchanges = {market_calendar.exchange_for_symbol(s.symbol) for s in stocks if not s.is_benchmark}
 
-        if not collector.is_trading_day(today):
-            logger.info(f"Today ({today}) is not a trading day (weekend). Skipping collection.")
+        if not collector.is_trading_day(today, None if None in exchanges else exchanges):
+            logger.info(f"Today ({today}) is not a trading day (weekend/holiday). Skipping collection.")
             return {
                 "status": "skipped",
                 "reason": "not_trading_day",
@@ -250,92 +211,63 @@ async def collect_all_prices() -> Dict[str, Any]:
                 "new_prices": 0
             }
 
-        logger.info(f"Collecting prices for {len(stocks)} stocks using batch mode")
-
-        total_new = 0
-        total_skipped = 0
-        total_errors = 0
-        stocks_updated = 0
-        stocks_failed = 0
-
-        # Separate stocks into backfill needed vs regular update
-        backfill_stocks = []
-        regular_stocks = []
+        benchmark_count = sum(1 for s in stocks if s.is_benchmark)
+        logger.info(
+            f"Collecting prices for {len(stocks) - benchmark_count} stocks "
+            f"and {benchmark_count} benchmarks using batch mode"
+        )
 
-        for stock in stocks:
-            if collector.needs_backfill(db, stock, days_threshold=30):
-                backfill_stocks.append(stock)
-            else:
-                regular_stocks.append(stock)
+        # Backfill status for every stock from one grouped query
+        history = collector.price_history(db, stocks)
+        backfill_stocks = [s for s in stocks if history.get(s.id, (0, None))[0] < 30]
+        regular_stocks = [s for s in stocks if history.get(s.id, (0, None))[0] >= 30]
 
         logger.info(f"Backfill needed: {len(backfill_stocks)}, Regular update: {len(regular_stocks)}")
 
-        # Batch fetch for stocks needing backfill (100 days)
-        if backfill_stocks:
-            backfill_symbols = [s.symbol for s in backfill_stocks]
-            logger.info(f"Batch fetching 100 days for {len(backfill_symbols)} backfill stocks")
-
-            backfill_prices = collector.fetch_prices_batch(backfill_symbols, days=100)
-
-            for stock in backfill_stocks:
-                symbol = stock.symbol.upper()
-                prices = backfill_prices.get(symbol, [])
-
-                if not prices:
-                    logger.warning(f"No prices in batch for {symbol}")
-                    stocks_failed += 1
-                    continue
+        # Batch fetch 100 days for stocks needing backfill, 5 days for the rest
+        fetched: Dict[str, List[Dict[str, Any]]] = {}
+        for group, days in ((backfill_stocks, 100), (regular_stocks, 5)):
+            if group:
+                logger.info(f"Batch fetching {days} days for {len(group)} stocks")
+                fetched.update(collector.fetch_prices_batch([s.symbol for s in group], days=days))
 
-                result = collector.store_prices(db, stock, prices)
-                total_new += result["new"]
-                total_skipped += result["skipped"]
-                total_errors += result["errors"]
-
-                if result["new"] > 0:
-                    stocks_updated += 1
-
-                logger.debug(
-                    f"{symbol}: {result['new']} new, "
-                    f"{result['skipped']} skipped"
-                )
-
-        # Batch fetch for regular updates (5 days)
-        if regular_stocks:
-            regular_symbols = [s.symbol for s in regular_stocks]
-            logger.info(f"Batch fetching 5 days for {len(regular_symbols)} regular stocks")
-
-            regular_prices = collector.fetch_prices_batch(regular_symbols, days=5)
+        # Collect every row, then write them with a single upsert and commit
+        rows = []
+        stocks_updated = 0
+        stocks_failed = 0
 
-            for stock in regular_stocks:
-                symbol = stock.symbol.upper()
-                prices = regular_prices.get(symbol, [])
+        for stock in stocks:
+            symbol = stock.symbol.upper()
+            prices = fetched.get(symbol, [])
 
-                if not prices:
-                    logger.warning(f"No prices in batch for {symbol}")
-                    stocks_failed += 1
-                    continue
+            if not prices:
+                logger.warning(f"No prices in batch for {symbol}")
+                stocks_failed += 1
+                continue
 
-                result = collector.store_prices(db, stock, prices)
-                total_new += result["new"]
-                total_skipped += result["skipped"]
-                total_errors += result["errors"]
+            rows.extend({**p, "stock_id": stock.id} for p in prices)
 
-                if result["new"] > 0:
-                    stocks_updated += 1
+            latest = history.get(stock.id, (0, None))[1]
+            if latest is None or any(p.get("date") and p["date"] > latest for p in prices):
+                stocks_updated += 1
 
-                logger.debug(
-                    f"{symbol}: {result['new']} new, "
-                    f"{result['skipped']} skipped"
-                )
+        written = price_ingestion.upsert_prices(
+            db, rows, symbols={s.id: s.symbol for s in stocks}
+        )
+        total_new = written["inserted"]
+        total_skipped = written["unchanged"]
+        total_errors = written["invalid"]
 
         result = {
             "status": "success",
             "timestamp": datetime.now().isoformat(),
             "date": today.isoformat(),
             "stocks_total": len(stocks),
+            "benchmarks": benchmark_count,
             "stocks_updated": stocks_updated,
             "stocks_failed": stocks_failed,
             "new_prices": total_new,
+            "updated_prices": written["updated"],
             "skipped_prices": total_skipped,
             "errors": total_errors,
             "mode": "batch"
@@ -0,0 +1,451 @@
+"""
+Concurrent multi-provider daily price fetcher.
+
+Features:
+- Fans symbols out concurrently (capped by MAX_CONCURRENT_PRICE_REQUESTS)
+- Per-provider token-bucket rate limiters (e.g. Alpha Vantage 5/min, Finnhub 60/min)
+- Provider fallback in priority order, hedging to the next provider when the
+  current one exceeds a latency budget; the first non-empty result wins
+- Per-provider request, success, failure and latency statistics
+- Blocking provider clients run in worker threads
+"""
+
+import asyncio
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable, Optional
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from any event loop.
+
+    A token is only taken once it is available, so a waiter that is
+    cancelled (e.g. a losing hedge) does not consume one.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate_per_minute: Sustained request rate
+            burst: Maximum tokens stored (defaults to the per-minute rate)
+        """
+        self._rate = rate_per_minute / 60.0
+        self._capacity = float(burst if burst is not None else max(1, int(rate_per_minute)))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self._rate
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter(name: str, rate_per_minute: float, burst: Optional[int] = None) -> TokenBucket:
+    """
+    Get the process-wide token bucket for an upstream API.
+
+    Price and news collection share one bucket per API (e.g. one Alpha
+    Vantage key), so their combined request rate stays within its limit.
+    The bucket is created by the first caller.
+
+    Args:
+        name: API name (e.g. "alpha_vantage")
+        rate_per_minute: Sustained request rate
+        burst: Maximum tokens stored (defaults to the per-minute rate)
+
+    Returns:
+        Shared TokenBucket
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = TokenBucket(rate_per_minute, burst)
+        return _limiters[name]
+
+
+@dataclass
+class PriceProvider:
+    """A daily price source with its rate limit."""
+    name: str
+    fetch: Callable[[str, int], List[Dict[str, Any]]]
+    limiter: TokenBucket
+    stats: Dict[str, float] = field(default_factory=lambda: {
+        "requests": 0,
+        "successes": 0,
+        "empty": 0,
+        "failures": 0,
+        "hedged": 0,
+        "total_latency": 0.0
+    })
+
+
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _client(name: str) -> Any:
+    """Get a shared provider client, created on first use."""
+    with _clients_lock:
+        if name not in _clients:
+            if name == "yahoo":
+                from backend.app.services.yahoo_finance import YahooFinanceService
+                _clients[name] = YahooFinanceService()
+            elif name == "finnhub":
+                from backend.app.services.finnhub_service import FinnhubService
+                _clients[name] = FinnhubService(settings.FINNHUB_API_KEY)
+            elif name == "alpha_vantage":
+                from backend.app.services.alpha_vantage import AlphaVantageService
+                _clients[name] = AlphaVantageService(settings.ALPHA_VANTAGE_API_KEY)
+        return _clients[name]
+
+
+def _yahoo_fetch(symbol: str, days: int) -> List[Dict[str, Any]]:
+    return _client("yahoo").get_daily_prices(symbol, days=days)
+
+
+def _finnhub_fetch(symbol: str, days: int) -> List[Dict[str, Any]]:
+    return _client("finnhub").get_daily_prices(symbol, days=days)
+
+
+def _alpha_vantage_fetch(symbol: str, days: int) -> List[Dict[str, Any]]:
+    outputsize = "full" if days > 100 else "compact"
+    return _client("alpha_vantage").get_daily_prices(symbol, outputsize=outputsize)[:days]
+
+
+# Provider name -> (fetch function, requests per minute)
+DEFAULT_PROVIDERS = {
+    "yahoo": (_yahoo_fetch, settings.YAHOO_RATE_LIMIT_PER_MIN),
+    "finnhub": (_finnhub_fetch, settings.FINNHUB_RATE_LIMIT_PER_MIN),
+    "alpha_vantage": (_alpha_vantage_fetch, settings.ALPHA_VANTAGE_RATE_LIMIT_PER_MIN),
+}
+
+
+class PriceFetcher:
+    """
+    Fetches daily price history for many symbols across several providers.
+
+    Flow per symbol:
+    1. Call the first provider (after taking a token from its limiter)
+    2. If it fails or returns nothing, move to the next provider immediately
+    3. If it is still running `hedge_delay` seconds after it started (time
+       queued for a token or concurrency slot does not count), also start the
+       next provider; whichever returns prices first wins
+    """
+
+    def __init__(
+        self,
+        providers: List[PriceProvider],
+        max_concurrent: int = 10,
+        hedge_delay: float = 3.0
+    ):
+        """
+        Initialize price fetcher.
+
+        Args:
+            providers: Providers in priority order
+            max_concurrent: Maximum provider requests in flight
+            hedge_delay: Seconds before hedging to the next provider
+        """
+        self._providers = providers
+        self._max_concurrent = max_concurrent
+        self._hedge_delay = hedge_delay
+        self._stats_lock = threading.Lock()
+        # Room for hedged calls on top of the concurrency cap
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent * 2,
+            thread_name_prefix="price-fetch"
+        )
+
+    async def fetch_many(
+        self,
+        symbols: List[str],
+        days: int = 100
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch daily prices for many symbols concurrently.
+
+        Args:
+            symbols: Stock ticker symbols
+            days: Number of days of history
+
+        Returns:
+            Dict mapping upper-case symbols to price records (symbols with no
+            data from any provider are omitted)
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        if not symbols:
+            return {}
+
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self._max_concurrent)
+
+        results = await asyncio.gather(
+            *(self._fetch_symbol(symbol, days, semaphore) for symbol in symbols)
+        )
+
+        fetched = {symbol: prices for symbol, prices in zip(symbols, results) if prices}
+        logger.info(
+            f"Fetched prices for {len(fetched)}/{len(symbols)} symbols "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+        return fetched
+
+    async def fetch(self, symbol: str, days: int = 100) -> List[Dict[str, Any]]:
+        """
+        Fetch daily prices for one symbol.
+
+        Args:
+            symbol: Stock ticker symbol
+            days: Number of days of history
+
+        Returns:
+            List of price records (empty if every provider failed)
+        """
+        result = await self.fetch_many([symbol], days)
+        return result.get(symbol.upper(), [])
+
+    def fetch_many_sync(
+        self,
+        symbols: List[str],
+        days: int = 100
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Blocking variant of fetch_many for synchronous callers.
+
+        Runs on a private event loop; when called from inside a running loop
+        the fetch runs in a helper thread instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_many(symbols, days))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.fetch_many(symbols, days)).result()
+
+    async def _fetch_symbol(
+        self,
+        symbol: str,
+        days: int,
+        semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one symbol with provider fallback and latency hedging.
+
+        The hedge deadline of a call starts once it holds its rate-limit
+        token and concurrency slot, so time spent queued is not mistaken
+        for provider latency.
+        """
+        loop = asyncio.get_running_loop()
+        pending: Dict[asyncio.Task, PriceProvider] = {}
+        next_provider = 0
+        newest_in_flight: Optional[asyncio.Event] = None
+        hedge_at: Optional[float] = None
+
+        def start_next(hedged: bool = False) -> bool:
+            nonlocal next_provider, newest_in_flight, hedge_at
+            if next_provider >= len(self._providers):
+                return False
+            provider = self._providers[next_provider]
+            next_provider += 1
+            newest_in_flight = asyncio.Event()
+            hedge_at = None
+            task = asyncio.create_task(
+                self._call_provider(provider, symbol, days, semaphore, newest_in_flight, hedged)
+            )
+            pending[task] = provider
+            return True
+
+        start_next()
+
+        try:
+            while pending:
+                if hedge_at is None and newest_in_flight.is_set():
+                    hedge_at = loop.time() + self._hedge_delay
+
+                in_flight_wait = None
+                if hedge_at is None and next_provider < len(self._providers):
+                    # Newest call still queued - wait for it to start (or any call to finish)
+                    in_flight_wait = asyncio.ensure_future(newest_in_flight.wait())
+                    timeout = None
+                else:
+                    timeout = None if hedge_at is None else max(0.0, hedge_at - loop.time())
+
+                try:
+                    done, _ = await asyncio.wait(
+                        list(pending.keys()) + ([in_flight_wait] if in_flight_wait else []),
+                        timeout=timeout,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    if in_flight_wait is not None and not in_flight_wait.done():
+                        in_flight_wait.cancel()
+
+                if in_flight_wait is not None:
+                    done.discard(in_flight_wait)
+                    if not done:
+                        continue
+
+                if not done:
+                    # Latency budget exceeded - hedge to the next provider
+                    start_next(hedged=True)
+                    continue
+
+                for task in done:
+                    pending.pop(task)
+                    prices = task.result()
+                    if prices:
+                        return prices
+
+                # Failed or empty - fall through to the next provider right away
+                if not pending:
+                    start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        logger.warning(f"All price providers failed for {symbol}")
+        return []
+
+    async def _call_provider(
+        self,
+        provider: PriceProvider,
+        symbol: str,
+        days: int,
+        semaphore: asyncio.Semaphore,
+        in_flight: Optional[asyncio.Event] = None,
+        hedged: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Call one provider under its rate limit and the global concurrency cap.
+
+        The rate-limit token is only taken while holding a concurrency slot,
+        right before the request starts, so a call cancelled while queued
+        (a hedge that lost) uses no quota. in_flight is set once the request
+        starts.
+        """
+        while True:
+            async with semaphore:
+                wait = provider.limiter.try_acquire()
+                if wait <= 0:
+                    if in_flight is not None:
+                        in_flight.set()
+                    if hedged:
+                        self._record(provider, "hedged")
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        self._executor, self._run_provider, provider, symbol, days
+                    )
+            # Rate limited - give the slot back while waiting for a token
+            await asyncio.sleep(wait)
+
+    def _run_provider(
+        self,
+        provider: PriceProvider,
+        symbol: str,
+        days: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a blocking provider call in a worker thread.
+
+        Statistics are recorded here so calls whose awaiting task was
+        cancelled (losing hedges) are still counted when they finish.
+        """
+        started = time.monotonic()
+        self._record(provider, "requests")
+        try:
+            prices = provider.fetch(symbol, days)
+        except Exception as e:
+            logger.warning(f"{provider.name} price fetch failed for {symbol}: {e}")
+            self._record(provider, "failures", time.monotonic() - started)
+            return []
+
+        self._record(provider, "successes" if prices else "empty", time.monotonic() - started)
+        return prices or []
+
+    def _record(self, provider: PriceProvider, key: str, latency: Optional[float] = None) -> None:
+        """Update provider statistics."""
+        with self._stats_lock:
+            provider.stats[key] += 1
+            if latency is not None:
+                provider.stats["total_latency"] += latency
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-provider statistics.
+
+        Returns:
+            Dict mapping provider name to request counts, success rate and
+            average latency
+        """
+        with self._stats_lock:
+            result = {}
+            for provider in self._providers:
+                s = dict(provider.stats)
+                completed = s["successes"] + s["empty"] + s["failures"]
+                result[provider.name] = {
+                    "requests": int(s["requests"]),
+                    "successes": int(s["successes"]),
+                    "empty": int(s["empty"]),
+                    "failures": int(s["failures"]),
+                    "hedged": int(s["hedged"]),
+                    "success_rate": round(s["successes"] / completed, 3) if completed else None,
+                    "avg_latency_ms": round(s["total_latency"] / completed * 1000, 1) if completed else None
+                }
+            return result
+
+
+def _build_providers() -> List[PriceProvider]:
+    """Create providers in the configured priority order."""
+    providers = []
+    for name in settings.PRICE_PROVIDER_ORDER.split(","):
+        name = name.strip()
+        if name not in DEFAULT_PROVIDERS:
+            logger.warning(f"Unknown price provider '{name}' in PRICE_PROVIDER_ORDER")
+            continue
+        fetch, rate = DEFAULT_PROVIDERS[name]
+        providers.append(PriceProvider(name=name, fetch=fetch, limiter=rate_limiter(name, rate)))
+    return providers
+
+
+# Global price fetcher instance
+price_fetcher = PriceFetcher(
+    _build_providers(),
+    max_concurrent=settings.MAX_CONCURRENT_PRICE_REQUESTS,
+    hedge_delay=settings.PRICE_HEDGE_DELAY
+)
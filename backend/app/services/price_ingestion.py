@@ -0,0 +1,255 @@
+"""
+Bulk price ingestion service.
+
+Features:
+- Writes batches of (stock_id, date, OHLCV) rows with
+  INSERT ... ON CONFLICT (stock_id, date) DO UPDATE, one statement per chunk
+- Rows whose values did not change are left untouched and reported as unchanged
+- Reports inserted / updated / unchanged / invalid counts
+- SQLite fallback (one existence query + upsert per chunk) for local runs
+- Applies committed rows to the in-memory price matrix
+"""
+
+import logging
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Optional, Sequence
+
+from sqlalchemy import literal_column, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from backend.app.models import Stock, StockPrice
+from backend.app.services.price_matrix import price_matrix
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class PriceIngestionService:
+    """Single write path for daily price rows."""
+
+    def __init__(self, batch_size: int = 1000):
+        """
+        Initialize price ingestion service.
+
+        Args:
+            batch_size: Maximum rows per INSERT statement
+        """
+        self._batch_size = batch_size
+
+    def upsert_prices(
+        self,
+        db: Session,
+        rows: Iterable[Dict[str, Any]],
+        update_columns: Sequence[str] = PRICE_COLUMNS,
+        symbols: Optional[Dict[int, str]] = None
+    ) -> Dict[str, int]:
+        """
+        Insert or update price rows for any number of stocks and commit.
+
+        Args:
+            db: Database session
+            rows: Price dicts with stock_id, date and OHLCV keys
+            update_columns: Columns overwritten when a row already exists
+                (e.g. leave out "volume" to keep the stored volume)
+            symbols: Optional stock_id -> symbol map (looked up when missing)
+
+        Returns:
+            Dict with inserted, updated, unchanged and invalid counts
+        """
+        records, invalid = self._normalize(rows)
+        result = {"inserted": 0, "updated": 0, "unchanged": 0, "invalid": invalid}
+
+        if not records:
+            return result
+
+        dialect = db.get_bind().dialect.name
+        written: List[Dict[str, Any]] = []
+
+        try:
+            for i in range(0, len(records), self._batch_size):
+                chunk = records[i:i + self._batch_size]
+                if dialect == "postgresql":
+                    counts, chunk_written = self._upsert_postgresql(db, chunk, update_columns)
+                else:
+                    counts, chunk_written = self._upsert_generic(db, chunk, update_columns)
+                for key, value in counts.items():
+                    result[key] += value
+                written.extend(chunk_written)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        self._apply_to_matrix(db, written, symbols)
+
+        logger.debug(
+            f"Price upsert: {result['inserted']} inserted, {result['updated']} updated, "
+            f"{result['unchanged']} unchanged, {result['invalid']} invalid"
+        )
+        return result
+
+    def upsert_stock_prices(
+        self,
+        db: Session,
+        stock: Stock,
+        prices: Iterable[Dict[str, Any]],
+        update_columns: Sequence[str] = PRICE_COLUMNS
+    ) -> Dict[str, int]:
+        """
+        Insert or update price rows for one stock and commit.
+
+        Args:
+            db: Database session
+            stock: Stock model instance
+            prices: Price dicts with date and OHLCV keys
+            update_columns: Columns overwritten when a row already exists
+
+        Returns:
+            Dict with inserted, updated, unchanged and invalid counts
+        """
+        rows = [{**p, "stock_id": stock.id} for p in prices]
+        return self.upsert_prices(db, rows, update_columns, symbols={stock.id: stock.symbol})
+
+    def _normalize(self, rows: Iterable[Dict[str, Any]]) -> tuple:
+        """
+        Validate rows, fill optional fields and drop duplicate keys (last wins).
+
+        Returns (records, invalid count).
+        """
+        by_key: Dict[tuple, Dict[str, Any]] = {}
+        invalid = 0
+
+        for row in rows:
+            close = row.get("close")
+            if row.get("stock_id") is None or row.get("date") is None or close is None:
+                invalid += 1
+                continue
+
+            record = {
+                "stock_id": row["stock_id"],
+                "date": row["date"],
+                "open": row.get("open") if row.get("open") is not None else close,
+                "high": row.get("high") if row.get("high") is not None else close,
+                "low": row.get("low") if row.get("low") is not None else close,
+                "close": close,
+                "volume": int(row.get("volume") or 0)
+            }
+            by_key[(record["stock_id"], record["date"])] = record
+
+        return list(by_key.values()), invalid
+
+    def _upsert_postgresql(
+        self,
+        db: Session,
+        chunk: List[Dict[str, Any]],
+        update_columns: Sequence[str]
+    ) -> tuple:
+        """Upsert one chunk with a single INSERT ... ON CONFLICT ... RETURNING."""
+        table = StockPrice.__table__
+        stmt = pg_insert(table).values(chunk)
+        excluded = stmt.excluded
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.stock_id, table.c.date],
+            set_={col: excluded[col] for col in update_columns},
+            # Skip rows whose values are already stored
+            where=or_(*[table.c[col].is_distinct_from(excluded[col]) for col in update_columns])
+        ).returning(
+            table.c.stock_id, table.c.date,
+            *[table.c[col] for col in PRICE_COLUMNS],
+            literal_column("(xmax = 0)").label("inserted")
+        )
+
+        returned = db.execute(stmt).mappings().all()
+        inserted = sum(1 for r in returned if r["inserted"])
+
+        counts = {
+            "inserted": inserted,
+            "updated": len(returned) - inserted,
+            "unchanged": len(chunk) - len(returned)
+        }
+        written = [{k: r[k] for k in ("stock_id", "date") + PRICE_COLUMNS} for r in returned]
+        return counts, written
+
+    def _upsert_generic(
+        self,
+        db: Session,
+        chunk: List[Dict[str, Any]],
+        update_columns: Sequence[str]
+    ) -> tuple:
+        """Upsert one chunk on SQLite: classify against stored rows, then upsert."""
+        table = StockPrice.__table__
+        keys = [(r["stock_id"], r["date"]) for r in chunk]
+
+        stored = {
+            (row.stock_id, row.date): row
+            for row in db.execute(
+                table.select().where(tuple_(table.c.stock_id, table.c.date).in_(keys))
+            ).all()
+        }
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        to_write = []
+        written = []
+
+        for record in chunk:
+            existing = stored.get((record["stock_id"], record["date"]))
+            if existing is None:
+                counts["inserted"] += 1
+                merged = record
+            else:
+                merged = {
+                    "stock_id": record["stock_id"],
+                    "date": record["date"],
+                    **{col: getattr(existing, col) for col in PRICE_COLUMNS},
+                    **{col: record[col] for col in update_columns}
+                }
+                if all(merged[col] == getattr(existing, col) for col in PRICE_COLUMNS):
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated"] += 1
+
+            to_write.append(record)
+            written.append(merged)
+
+        if to_write:
+            stmt = sqlite_insert(table).values(to_write)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.stock_id, table.c.date],
+                set_={col: stmt.excluded[col] for col in update_columns}
+            )
+            db.execute(stmt)
+
+        return counts, written
+
+    def _apply_to_matrix(
+        self,
+        db: Session,
+        written: List[Dict[str, Any]],
+        symbols: Optional[Dict[int, str]]
+    ) -> None:
+        """Make committed rows visible to in-memory readers."""
+        if not written or not price_matrix.is_loaded:
+            return
+
+        by_stock: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for row in written:
+            by_stock[row["stock_id"]].append(row)
+
+        symbols = dict(symbols or {})
+        missing = [stock_id for stock_id in by_stock if stock_id not in symbols]
+        if missing:
+            symbols.update(
+                db.query(Stock.id, Stock.symbol).filter(Stock.id.in_(missing)).all()
+            )
+
+        for stock_id, stock_rows in by_stock.items():
+            price_matrix.apply(stock_id, symbols.get(stock_id, ""), stock_rows)
+
+
+# Global price ingestion service instance
+price_ingestion = PriceIngestionService()
@@ -0,0 +1,462 @@
+"""
+Columnar in-memory price matrix backing all price-history reads.
+
+Holds daily OHLCV for every tracked stock as date x stock NumPy arrays
+(one contiguous float64/int64 buffer per field). The matrix is loaded from
+`stock_prices` once at startup and kept current by applying the rows that
+price ingestion commits, so "last N days for these stocks" becomes array
+indexing instead of one ORM query per stock.
+"""
+
+import threading
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Any, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from backend.app.models import Stock, StockPrice
+
+logger = logging.getLogger(__name__)
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """Price history for a single stock, oldest first."""
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_records(self, descending: bool = False) -> List[Dict[str, Any]]:
+        """
+        Convert to the list-of-dicts shape used by API responses.
+
+        Args:
+            descending: If True, most recent record first
+
+        Returns:
+            List of OHLCV dicts with `datetime.date` dates
+        """
+        dates = self.dates.astype(object)
+        indices = range(len(dates) - 1, -1, -1) if descending else range(len(dates))
+
+        return [
+            {
+                "date": dates[i],
+                "open": float(self.open[i]),
+                "high": float(self.high[i]),
+                "low": float(self.low[i]),
+                "close": float(self.close[i]),
+                "volume": int(self.volume[i])
+            }
+            for i in indices
+        ]
+
+
+@dataclass(frozen=True)
+class PriceFrame:
+    """
+    Aligned price window for several stocks.
+
+    Rows are dates (oldest first), columns follow `stock_ids`. Cells where a
+    stock has no price for a date are NaN in the float fields.
+    """
+    dates: np.ndarray
+    stock_ids: List[int]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def column(self, stock_id: int) -> int:
+        """Get the column index of a stock in this frame."""
+        return self.stock_ids.index(stock_id)
+
+
+class PriceMatrix:
+    """
+    Thread-safe, process-wide columnar store of daily OHLCV prices.
+
+    Layout:
+    - Dates axis: sorted `datetime64[D]`, grown with spare capacity so daily
+      appends do not reallocate
+    - Stock axis: one column per stock ID
+    - Arrays are Fortran-ordered, so each stock's history is one contiguous
+      block and date-range reads for a stock are zero-copy views
+
+    Writers replace arrays when the layout has to change (capacity growth or
+    back-filled dates), so views handed out earlier stay valid.
+    """
+
+    def __init__(self, initial_capacity: int = 256):
+        """
+        Initialize an empty price matrix.
+
+        Args:
+            initial_capacity: Initial number of date rows to allocate
+        """
+        self._lock = threading.RLock()
+        self._initial_capacity = initial_capacity
+        self._loaded = False
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all data and return to an empty layout."""
+        self._n_dates = 0
+        self._n_cols = 0
+        self._columns: Dict[int, int] = {}
+        self._symbols: Dict[int, str] = {}
+        self._dates = np.empty(self._initial_capacity, dtype="datetime64[D]")
+        self._fields = self._allocate(self._initial_capacity, 16)
+
+    @staticmethod
+    def _allocate(rows: int, cols: int) -> Dict[str, np.ndarray]:
+        """Allocate empty field buffers of the given capacity."""
+        fields = {
+            name: np.full((rows, cols), np.nan, dtype=np.float64, order="F")
+            for name in PRICE_FIELDS
+        }
+        fields["volume"] = np.zeros((rows, cols), dtype=np.int64, order="F")
+        return fields
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the matrix has been populated from the database."""
+        return self._loaded
+
+    def load(self, db: Session) -> int:
+        """
+        (Re)load the full price history from the database.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of price rows loaded
+        """
+        stocks = db.query(Stock.id, Stock.symbol).order_by(Stock.id).all()
+        rows = db.query(
+            StockPrice.stock_id,
+            StockPrice.date,
+            StockPrice.open,
+            StockPrice.high,
+            StockPrice.low,
+            StockPrice.close,
+            StockPrice.volume
+        ).all()
+
+        with self._lock:
+            self._reset()
+
+            for stock_id, symbol in stocks:
+                self._add_column(stock_id, symbol)
+
+            if rows:
+                stock_ids, dates, opens, highs, lows, closes, volumes = zip(*rows)
+                row_dates = np.array(dates, dtype="datetime64[D]")
+                unique_dates = np.unique(row_dates)
+
+                self._reserve(len(unique_dates), self._n_cols)
+                self._dates[:len(unique_dates)] = unique_dates
+                self._n_dates = len(unique_dates)
+
+                row_idx = np.searchsorted(unique_dates, row_dates)
+                col_idx = np.fromiter(
+                    (self._columns[s] for s in stock_ids),
+                    dtype=np.intp,
+                    count=len(stock_ids)
+                )
+
+                for name, values in zip(PRICE_FIELDS, (opens, highs, lows, closes)):
+                    self._fields[name][row_idx, col_idx] = np.array(values, dtype=np.float64)
+                self._fields["volume"][row_idx, col_idx] = np.array(volumes, dtype=np.int64)
+
+            self._loaded = True
+
+        logger.info(
+            f"Price matrix loaded: {len(rows)} rows, "
+            f"{self._n_dates} dates x {self._n_cols} stocks"
+        )
+        return len(rows)
+
+    def ensure_loaded(self, db: Session) -> "PriceMatrix":
+        """
+        Load the matrix on first use if startup did not.
+
+        Args:
+            db: Database session
+
+        Returns:
+            This matrix, for chaining
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.load(db)
+        return self
+
+    def apply(self, stock_id: int, symbol: str, prices: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply committed price rows for a stock (insert or overwrite).
+
+        No-op until the matrix is loaded; the initial load will pick the
+        rows up from the database instead.
+
+        Args:
+            stock_id: Stock ID
+            symbol: Stock ticker symbol
+            prices: Price dicts with date and OHLCV keys
+
+        Returns:
+            Number of rows applied
+        """
+        if not self._loaded:
+            return 0
+
+        prices = [p for p in prices if p.get("close") is not None]
+        if not prices:
+            return 0
+
+        with self._lock:
+            col = self._columns.get(stock_id)
+            if col is None:
+                col = self._add_column(stock_id, symbol)
+
+            row_dates = np.array([p["date"] for p in prices], dtype="datetime64[D]")
+            self._insert_dates(np.unique(row_dates))
+
+            row_idx = np.searchsorted(self._dates[:self._n_dates], row_dates)
+            for name in PRICE_FIELDS:
+                values = [p.get(name) if p.get(name) is not None else p["close"] for p in prices]
+                self._fields[name][row_idx, col] = np.array(values, dtype=np.float64)
+            self._fields["volume"][row_idx, col] = np.array(
+                [p.get("volume") or 0 for p in prices], dtype=np.int64
+            )
+
+        return len(prices)
+
+    def drop_stock(self, stock_id: int) -> bool:
+        """
+        Forget a stock (e.g. after it is deleted).
+
+        Args:
+            stock_id: Stock ID
+
+        Returns:
+            True if the stock was tracked
+        """
+        with self._lock:
+            col = self._columns.pop(stock_id, None)
+            if col is None:
+                return False
+            self._symbols.pop(stock_id, None)
+            for name in PRICE_FIELDS:
+                self._fields[name][:, col] = np.nan
+            self._fields["volume"][:, col] = 0
+            return True
+
+    def clear(self) -> None:
+        """Drop all prices; the next `ensure_loaded` reloads from the database."""
+        with self._lock:
+            self._reset()
+            self._loaded = False
+
+    def series(
+        self,
+        stock_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None
+    ) -> PriceSeries:
+        """
+        Get price history for one stock.
+
+        Returned arrays are views into the matrix when the stock has a price
+        on every date in the window; otherwise the missing dates are dropped.
+
+        Args:
+            stock_id: Stock ID
+            start: Optional first date (inclusive)
+            end: Optional last date (inclusive)
+            limit: Optional maximum number of most recent records
+
+        Returns:
+            PriceSeries ordered oldest first
+        """
+        with self._lock:
+            col = self._columns.get(stock_id)
+            if col is None:
+                return self._empty_series()
+
+            lo, hi = self._row_bounds(start, end)
+            dates = self._dates[lo:hi]
+            fields = {name: buf[lo:hi, col] for name, buf in self._fields.items()}
+
+        valid = ~np.isnan(fields["close"])
+        if not valid.all():
+            dates = dates[valid]
+            fields = {name: values[valid] for name, values in fields.items()}
+
+        if limit is not None and len(dates) > limit:
+            dates = dates[len(dates) - limit:]
+            fields = {name: values[len(values) - limit:] for name, values in fields.items()}
+
+        return PriceSeries(dates=dates, **fields)
+
+    def frame(
+        self,
+        stock_ids: Sequence[int],
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> PriceFrame:
+        """
+        Get an aligned date x stock window for several stocks.
+
+        Stocks not in the matrix get all-NaN columns. The date slice is a
+        view; selecting a subset of stocks gathers their columns.
+
+        Args:
+            stock_ids: Stock IDs, in desired column order
+            start: Optional first date (inclusive)
+            end: Optional last date (inclusive)
+
+        Returns:
+            PriceFrame with dates as rows
+        """
+        stock_ids = list(stock_ids)
+
+        with self._lock:
+            lo, hi = self._row_bounds(start, end)
+            dates = self._dates[lo:hi]
+            cols = np.array([self._columns.get(s, -1) for s in stock_ids], dtype=np.intp)
+            known = cols >= 0
+
+            fields = {}
+            for name, buf in self._fields.items():
+                values = buf[lo:hi].take(np.where(known, cols, 0), axis=1)
+                if not known.all():
+                    values[:, ~known] = np.nan if name != "volume" else 0
+                fields[name] = values
+
+        return PriceFrame(dates=dates, stock_ids=stock_ids, **fields)
+
+    def latest(self, stock_ids: Iterable[int], count: int = 2) -> Dict[int, PriceSeries]:
+        """
+        Get the most recent `count` records for each stock.
+
+        Args:
+            stock_ids: Stock IDs
+            count: Number of most recent records per stock
+
+        Returns:
+            Dict mapping stock_id to its PriceSeries (oldest first)
+        """
+        return {stock_id: self.series(stock_id, limit=count) for stock_id in stock_ids}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get matrix statistics.
+
+        Returns:
+            Dict with dimensions, date range and memory footprint
+        """
+        with self._lock:
+            nbytes = sum(buf.nbytes for buf in self._fields.values()) + self._dates.nbytes
+            return {
+                "loaded": self._loaded,
+                "stocks": len(self._columns),
+                "dates": self._n_dates,
+                "first_date": str(self._dates[0]) if self._n_dates else None,
+                "last_date": str(self._dates[self._n_dates - 1]) if self._n_dates else None,
+                "capacity": list(self._fields["close"].shape),
+                "memory_bytes": int(nbytes)
+            }
+
+    def _empty_series(self) -> PriceSeries:
+        """Return a zero-length series."""
+        empty = np.empty(0, dtype=np.float64)
+        return PriceSeries(
+            dates=np.empty(0, dtype="datetime64[D]"),
+            open=empty, high=empty, low=empty, close=empty,
+            volume=np.empty(0, dtype=np.int64)
+        )
+
+    def _row_bounds(self, start: Optional[date], end: Optional[date]) -> tuple:
+        """Translate an inclusive date range into row slice bounds."""
+        dates = self._dates[:self._n_dates]
+        lo = int(np.searchsorted(dates, np.datetime64(start, "D"), side="left")) if start else 0
+        hi = int(np.searchsorted(dates, np.datetime64(end, "D"), side="right")) if end else self._n_dates
+        return lo, hi
+
+    def _add_column(self, stock_id: int, symbol: str) -> int:
+        """Register a stock and return its column index."""
+        self._reserve(self._n_dates, self._n_cols + 1)
+        col = self._n_cols
+        self._columns[stock_id] = col
+        self._symbols[stock_id] = symbol.upper()
+        self._n_cols += 1
+        return col
+
+    def _reserve(self, rows: int, cols: int) -> None:
+        """Grow buffers (doubling) so they hold at least rows x cols."""
+        cap_rows, cap_cols = self._fields["close"].shape
+        if rows <= cap_rows and cols <= cap_cols:
+            return
+
+        new_rows = max(rows, cap_rows * 2 if rows > cap_rows else cap_rows)
+        new_cols = max(cols, cap_cols * 2 if cols > cap_cols else cap_cols)
+
+        fields = self._allocate(new_rows, new_cols)
+        for name, buf in self._fields.items():
+            fields[name][:self._n_dates, :self._n_cols] = buf[:self._n_dates, :self._n_cols]
+
+        dates = np.empty(new_rows, dtype="datetime64[D]")
+        dates[:self._n_dates] = self._dates[:self._n_dates]
+
+        self._fields = fields
+        self._dates = dates
+
+    def _insert_dates(self, new_dates: np.ndarray) -> None:
+        """Add dates not yet on the date axis, keeping it sorted."""
+        current = self._dates[:self._n_dates]
+        missing = np.setdiff1d(new_dates, current, assume_unique=True)
+        if missing.size == 0:
+            return
+
+        if self._n_dates == 0 or missing[0] > current[-1]:
+            # Common case: new trading days appended at the end
+            self._reserve(self._n_dates + missing.size, self._n_cols)
+            self._dates[self._n_dates:self._n_dates + missing.size] = missing
+            self._n_dates += missing.size
+            return
+
+        # Back-filled dates: rebuild the date axis and re-seat existing rows
+        merged = np.union1d(current, missing)
+        capacity = max(len(merged), self._fields["close"].shape[0])
+        fields = self._allocate(capacity, self._fields["close"].shape[1])
+        positions = np.searchsorted(merged, current)
+
+        for name, buf in self._fields.items():
+            fields[name][positions, :self._n_cols] = buf[:self._n_dates, :self._n_cols]
+
+        dates = np.empty(capacity, dtype="datetime64[D]")
+        dates[:len(merged)] = merged
+
+        self._fields = fields
+        self._dates = dates
+        self._n_dates = len(merged)
+
+
+# Global price matrix instance
+price_matrix = PriceMatrix()
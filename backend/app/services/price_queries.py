@@ -0,0 +1,89 @@
+"""
+Shared price lookup queries for API routes.
+
+Replaces per-stock "latest price" / "previous close" queries with a single
+window-function query over many stocks at once.
+"""
+
+import logging
+from typing import Dict, Any, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.app.models import StockPrice
+
+logger = logging.getLogger(__name__)
+
+
+def get_latest_closes(
+    db: Session,
+    stock_ids: Iterable[int],
+    depth: int = 2
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Get the latest and previous close for many stocks in one query.
+
+    Uses ROW_NUMBER() OVER (PARTITION BY stock_id ORDER BY date DESC) and keeps
+    the first `depth` rows per stock.
+
+    Args:
+        db: Database session
+        stock_ids: Stock IDs to look up
+        depth: Number of most recent closes to fetch per stock
+
+    Returns:
+        Dict mapping stock_id to a dict with current_price, current_date,
+        previous_close and previous_date (previous_* are None when the stock
+        has a single price). Stocks without prices are omitted.
+    """
+    stock_ids = list(set(stock_ids))
+    if not stock_ids:
+        return {}
+
+    ranked = select(
+        StockPrice.stock_id,
+        StockPrice.date,
+        StockPrice.close,
+        func.row_number().over(
+            partition_by=StockPrice.stock_id,
+            order_by=StockPrice.date.desc()
+        ).label("rank")
+    ).where(
+        StockPrice.stock_id.in_(stock_ids)
+    ).subquery()
+
+    rows = db.execute(
+        select(ranked.c.stock_id, ranked.c.date, ranked.c.close, ranked.c.rank)
+        .where(ranked.c.rank <= depth)
+        .order_by(ranked.c.stock_id, ranked.c.rank)
+    ).all()
+
+    result: Dict[int, Dict[str, Any]] = {}
+    for stock_id, price_date, close, rank in rows:
+        if rank == 1:
+            result[stock_id] = {
+                "current_price": close,
+                "current_date": price_date,
+                "previous_close": None,
+                "previous_date": None
+            }
+        elif rank == 2 and stock_id in result:
+            result[stock_id]["previous_close"] = close
+            result[stock_id]["previous_date"] = price_date
+
+    return result
+
+
+def get_latest_close(db: Session, stock_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get the latest and previous close for a single stock.
+
+    Args:
+        db: Database session
+        stock_id: Stock ID
+
+    Returns:
+        Dict as returned by get_latest_closes, or None if the stock has no prices
+    """
+    return get_latest_closes(db, [stock_id]).get(stock_id)
@@ -8,8 +8,9 @@ Provides AI-powered portfolio recommendations including:
 - Paper trading simulation
 """
 
+from backend.app.services.roboadvisor.risk_engine import RiskEngine, RiskMetrics
 from backend.app.services.roboadvisor.risk_analyzer import RiskAnalyzer
 from backend.app.services.roboadvisor.allocation_optimizer import AllocationOptimizer
 from backend.app.services.roboadvisor.signal_generator import SignalGenerator
 
-__all__ = ["RiskAnalyzer", "AllocationOptimizer", "SignalGenerator"]
+__all__ = ["RiskEngine", "RiskMetrics", "RiskAnalyzer", "AllocationOptimizer", "SignalGenerator"]
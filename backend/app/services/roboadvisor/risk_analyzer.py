@@ -6,17 +6,24 @@ Calculates risk scores based on:
 - Beta: Covariance with SPY / Variance of SPY (90 days)
 - Sentiment Risk: Inverse of average news sentiment (7 days)
 
+Price-based components for all holdings are computed together by RiskEngine
+over an aligned close matrix from the shared price matrix. The SPY series is
+read from the stored benchmark history (see benchmark_service).
+
 Overall Risk = (0.4 × Volatility) + (0.3 × Beta Risk) + (0.3 × Sentiment Risk)
 """
 
 import numpy as np
 from typing import Dict, Any, List, Optional
 from datetime import date, timedelta
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 import logging
 
-from backend.app.models import Stock, StockPrice, NewsArticle, Position, RiskScore
-from backend.app.services.batch_price_service import batch_price_service
+from backend.app.models import Stock, NewsArticle, Position, RiskScore
+from backend.app.services.benchmark_service import benchmark_service
+from backend.app.services.price_matrix import price_matrix
+from backend.app.services.roboadvisor.risk_engine import RiskEngine, RiskMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +40,6 @@ class RiskAnalyzer:
 
     def __init__(self, db: Session):
         self.db = db
-        self._spy_returns = None  # Cached SPY returns
 
     def calculate_stock_risk(
         self,
@@ -54,37 +60,35 @@ class RiskAnalyzer:
         Returns:
             Dict with risk scores and components
         """
-        # Get price data
-        prices = self._get_price_history(stock.id, max(days_volatility, days_beta))
-
-        if len(prices) < 10:
-            logger.warning(f"Insufficient price data for {stock.symbol}")
-            return self._default_risk_score(stock.symbol, "Insufficient price data")
+        return self.calculate_stocks_risk(
+            [stock], days_volatility, days_beta, days_sentiment
+        )[stock.id]
 
-        # Calculate components
-        volatility_score = self._calculate_volatility_score(prices[:days_volatility])
-        beta, beta_score = self._calculate_beta(prices[:days_beta], stock.symbol)
-        sentiment_score = self._calculate_sentiment_risk(stock.id, days_sentiment)
+    def calculate_stocks_risk(
+        self,
+        stocks: List[Stock],
+        days_volatility: int = 30,
+        days_beta: int = 90,
+        days_sentiment: int = 7
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate risk scores for many stocks in one vectorized pass.
 
-        # Calculate overall risk (weighted average)
-        overall_risk = (
-            0.4 * volatility_score +
-            0.3 * beta_score +
-            0.3 * sentiment_score
-        )
+        Args:
+            stocks: Stock model instances
+            days_volatility: Days for volatility calculation
+            days_beta: Days for beta calculation
+            days_sentiment: Days for sentiment analysis
 
-        # Normalize to 0-100 scale
-        overall_risk = min(100, max(0, overall_risk))
+        Returns:
+            Dict mapping stock_id to risk data (same shape as calculate_stock_risk)
+        """
+        metrics = self._compute_metrics([s.id for s in stocks], days_volatility, days_beta)
+        sentiment_risks = self._get_sentiment_risks([s.id for s in stocks], days_sentiment)
 
         return {
-            "symbol": stock.symbol,
-            "overall_risk": round(overall_risk, 2),
-            "volatility_score": round(volatility_score, 2),
-            "beta": round(beta, 2),
-            "beta_score": round(beta_score, 2),
-            "sentiment_score": round(sentiment_score, 2),
-            "risk_level": self._get_risk_level(overall_risk),
-            "calculated_at": date.today().isoformat()
+            stock.id: self._stock_risk_from_metrics(stock, metrics, i, sentiment_risks)
+            for i, stock in enumerate(stocks)
         }
 
     def calculate_portfolio_risk(
@@ -95,6 +99,10 @@ class RiskAnalyzer:
         """
         Calculate aggregate risk for entire portfolio.
 
+        Volatility, beta and the return covariance of all holdings are
+        computed together, which also yields portfolio volatility (wᵀΣw) and
+        portfolio beta.
+
         Args:
             portfolio_id: Portfolio ID
             positions: List of position model instances
@@ -117,26 +125,29 @@ class RiskAnalyzer:
             }
 
         # Calculate total portfolio value
-        total_value = sum(
+        position_values = np.array([
             float(p.shares) * float(p.average_cost)
             for p in positions
-        )
+        ])
+        total_value = float(position_values.sum())
 
         if total_value <= 0:
             return self._default_portfolio_risk(portfolio_id, "Invalid portfolio value")
 
+        stocks = [p.stock for p in positions]
+        metrics = self._compute_metrics([s.id for s in stocks], weights=position_values)
+        sentiment_risks = self._get_sentiment_risks([s.id for s in stocks], 7)
+
         # Calculate weighted risk for each position
         position_risks = []
         weighted_risk = 0
 
-        for position in positions:
-            stock = position.stock
-            position_value = float(position.shares) * float(position.average_cost)
-            weight = (position_value / total_value) * 100
+        for i, stock in enumerate(stocks):
+            weight = (position_values[i] / total_value) * 100
 
-            risk_data = self.calculate_stock_risk(stock)
+            risk_data = self._stock_risk_from_metrics(stock, metrics, i, sentiment_risks)
             risk_data["weight"] = round(weight, 2)
-            risk_data["position_value"] = round(position_value, 2)
+            risk_data["position_value"] = round(float(position_values[i]), 2)
 
             position_risks.append(risk_data)
             weighted_risk += risk_data["overall_risk"] * (weight / 100)
@@ -148,6 +159,15 @@ class RiskAnalyzer:
         overall_risk = weighted_risk * (1 + concentration_risk / 100)
         overall_risk = min(100, max(0, overall_risk))
 
+        symbols = [s.symbol for s in stocks]
+        correlation = {
+            symbol: {
+                other: round(float(metrics.correlation[i, j]), 4)
+                for j, other in enumerate(symbols)
+            }
+            for i, symbol in enumerate(symbols)
+        }
+
         return {
             "portfolio_id": portfolio_id,
             "overall_risk": round(overall_risk, 2),
@@ -157,144 +177,98 @@ class RiskAnalyzer:
             "total_value": round(total_value, 2),
             "position_count": len(positions),
             "position_risks": position_risks,
+            "portfolio_volatility": round(metrics.portfolio_volatility, 4),
+            "portfolio_beta": round(metrics.portfolio_beta, 2),
+            "correlation": correlation,
             "calculated_at": date.today().isoformat()
         }
 
-    def _get_price_history(
+    def _compute_metrics(
         self,
-        stock_id: int,
-        days: int
-    ) -> List[Dict[str, Any]]:
-        """Get historical prices from database."""
-        start_date = date.today() - timedelta(days=days + 10)  # Extra buffer
-
-        prices = self.db.query(StockPrice).filter(
-            StockPrice.stock_id == stock_id,
-            StockPrice.date >= start_date
-        ).order_by(StockPrice.date.desc()).all()
-
-        return [
-            {
-                "date": p.date,
-                "close": float(p.close),
-                "volume": p.volume
-            }
-            for p in prices
-        ]
+        stock_ids: List[int],
+        days_volatility: int = 30,
+        days_beta: int = 90,
+        weights: Optional[np.ndarray] = None
+    ) -> RiskMetrics:
+        """Run the risk engine over an aligned close window for the given stocks."""
+        start_date = date.today() - timedelta(days=max(days_volatility, days_beta) + 10)  # Extra buffer
 
-    def _calculate_volatility_score(self, prices: List[Dict]) -> float:
-        """
-        Calculate volatility score based on standard deviation of returns.
+        frame = price_matrix.ensure_loaded(self.db).frame(stock_ids, start=start_date)
+        benchmark = benchmark_service.get_aligned_closes(self.db, frame.dates)
 
-        Returns score 0-100 where higher = more volatile = more risky.
-        """
-        if len(prices) < 5:
-            return 50.0  # Default moderate risk
+        engine = RiskEngine(days_volatility=days_volatility, days_beta=days_beta)
+        return engine.compute(frame.close, benchmark, weights)
 
-        # Calculate daily returns
-        closes = [p["close"] for p in prices]
-        returns = []
+    def _stock_risk_from_metrics(
+        self,
+        stock: Stock,
+        metrics: RiskMetrics,
+        index: int,
+        sentiment_risks: Dict[int, float]
+    ) -> Dict[str, Any]:
+        """Build the per-stock risk dict from one column of engine output."""
+        if metrics.price_count[index] < 10:
+            logger.warning(f"Insufficient price data for {stock.symbol}")
+            return self._default_risk_score(stock.symbol, "Insufficient price data")
 
-        for i in range(1, len(closes)):
-            if closes[i] > 0:
-                daily_return = (closes[i-1] - closes[i]) / closes[i]
-                returns.append(daily_return)
+        volatility_score = float(metrics.volatility_score[index])
+        beta = float(metrics.beta[index])
+        beta_score = float(metrics.beta_score[index])
+        sentiment_score = sentiment_risks.get(stock.id, 50.0)
 
-        if not returns:
-            return 50.0
+        # Calculate overall risk (weighted average)
+        overall_risk = (
+            0.4 * volatility_score +
+            0.3 * beta_score +
+            0.3 * sentiment_score
+        )
 
-        # Calculate annualized volatility
-        daily_vol = np.std(returns)
-        annual_vol = daily_vol * np.sqrt(252)  # Annualize
+        # Normalize to 0-100 scale
+        overall_risk = min(100, max(0, overall_risk))
 
-        # Convert to 0-100 score
-        # Typical range: 10% (low) to 60% (high) annual volatility
-        score = (annual_vol / 0.6) * 100
-        return min(100, max(0, score))
+        return {
+            "symbol": stock.symbol,
+            "overall_risk": round(overall_risk, 2),
+            "volatility_score": round(volatility_score, 2),
+            "beta": round(beta, 2),
+            "beta_score": round(beta_score, 2),
+            "sentiment_score": round(sentiment_score, 2),
+            "risk_level": self._get_risk_level(overall_risk),
+            "calculated_at": date.today().isoformat()
+        }
 
-    def _calculate_beta(
-        self,
-        stock_prices: List[Dict],
-        symbol: str
-    ) -> tuple:
+    def _get_sentiment_risks(self, stock_ids: List[int], days: int) -> Dict[int, float]:
         """
-        Calculate beta relative to SPY (market proxy).
+        Calculate risk scores based on news sentiment for many stocks in one query.
 
-        Returns (beta value, beta risk score 0-100).
+        Negative sentiment = higher risk.
+        Returns dict mapping stock_id to score 0-100 (stocks without news are omitted).
         """
-        if len(stock_prices) < 20:
-            return 1.0, 50.0  # Default market beta
-
-        # Get or cache SPY returns
-        if self._spy_returns is None:
-            self._spy_returns = self._get_spy_returns(len(stock_prices))
-
-        if not self._spy_returns:
-            return 1.0, 50.0
-
-        # Calculate stock returns
-        stock_returns = self._calculate_returns(stock_prices)
+        if not stock_ids:
+            return {}
 
-        if len(stock_returns) < 10 or len(self._spy_returns) < 10:
-            return 1.0, 50.0
-
-        # Align lengths
-        min_len = min(len(stock_returns), len(self._spy_returns))
-        stock_returns = stock_returns[:min_len]
-        spy_returns = self._spy_returns[:min_len]
-
-        # Calculate beta: Cov(stock, market) / Var(market)
-        covariance = np.cov(stock_returns, spy_returns)[0][1]
-        market_variance = np.var(spy_returns)
-
-        if market_variance == 0:
-            return 1.0, 50.0
-
-        beta = covariance / market_variance
-
-        # Convert beta to risk score
-        # Beta < 0.5: low risk, Beta 0.5-1.5: moderate, Beta > 1.5: high
-        if beta < 0:
-            beta_score = 80  # Negative beta is unusual, moderate-high risk
-        elif beta < 0.5:
-            beta_score = beta * 60  # 0-30
-        elif beta <= 1.5:
-            beta_score = 30 + (beta - 0.5) * 40  # 30-70
-        else:
-            beta_score = 70 + min(30, (beta - 1.5) * 20)  # 70-100
-
-        return beta, beta_score
-
-    def _get_spy_returns(self, days: int) -> List[float]:
-        """Fetch SPY returns for beta calculation."""
-        try:
-            # Use batch service to get SPY data
-            spy_data = batch_price_service.fetch_historical_prices(["SPY"], days=days + 10)
-            spy_prices = spy_data.get("SPY", [])
-
-            if not spy_prices:
-                return []
-
-            return self._calculate_returns(spy_prices)
-
-        except Exception as e:
-            logger.warning(f"Could not fetch SPY data for beta: {e}")
-            return []
-
-    def _calculate_returns(self, prices: List[Dict]) -> List[float]:
-        """Calculate daily returns from price list."""
-        if not prices:
-            return []
+        start_date = date.today() - timedelta(days=days)
 
-        returns = []
-        closes = [p["close"] for p in prices]
+        # Average sentiment of articles related to each stock
+        from backend.app.models import ArticleStock
 
-        for i in range(1, len(closes)):
-            if closes[i] > 0:
-                daily_return = (closes[i-1] - closes[i]) / closes[i]
-                returns.append(daily_return)
+        rows = self.db.query(
+            ArticleStock.stock_id,
+            func.avg(NewsArticle.sentiment_score)
+        ).join(
+            NewsArticle,
+            NewsArticle.id == ArticleStock.article_id
+        ).filter(
+            ArticleStock.stock_id.in_(set(stock_ids)),
+            NewsArticle.published_at >= start_date,
+            NewsArticle.sentiment_score.isnot(None)
+        ).group_by(ArticleStock.stock_id).all()
 
-        return returns
+        return {
+            stock_id: self._sentiment_to_risk(float(avg_sentiment))
+            for stock_id, avg_sentiment in rows
+            if avg_sentiment is not None
+        }
 
     def _calculate_sentiment_risk(self, stock_id: int, days: int) -> float:
         """
@@ -303,30 +277,16 @@ class RiskAnalyzer:
         Negative sentiment = higher risk.
         Returns score 0-100.
         """
-        start_date = date.today() - timedelta(days=days)
-
-        # Get articles related to this stock
-        from backend.app.models import ArticleStock
-
-        articles = self.db.query(NewsArticle).join(
-            ArticleStock,
-            NewsArticle.id == ArticleStock.article_id
-        ).filter(
-            ArticleStock.stock_id == stock_id,
-            NewsArticle.published_at >= start_date,
-            NewsArticle.sentiment_score.isnot(None)
-        ).all()
+        return self._get_sentiment_risks([stock_id], days).get(stock_id, 50.0)  # Neutral if no news
 
-        if not articles:
-            return 50.0  # Neutral if no news
-
-        # Calculate average sentiment (-1 to 1)
-        avg_sentiment = sum(float(a.sentiment_score) for a in articles) / len(articles)
+    def _sentiment_to_risk(self, avg_sentiment: float) -> float:
+        """
+        Convert average sentiment (-1 to 1) to a risk score (inverse relationship).
 
-        # Convert to risk score (inverse relationship)
-        # Sentiment 1 (very positive) -> Risk 20
-        # Sentiment 0 (neutral) -> Risk 50
-        # Sentiment -1 (very negative) -> Risk 80
+        Sentiment 1 (very positive) -> Risk 20
+        Sentiment 0 (neutral) -> Risk 50
+        Sentiment -1 (very negative) -> Risk 80
+        """
         risk_score = 50 - (avg_sentiment * 30)
 
         return max(0, min(100, risk_score))
@@ -0,0 +1,264 @@
+"""
+Vectorized risk engine for roboadvisor.
+
+Computes risk metrics for a whole set of holdings in one pass over an aligned
+date x stock close matrix:
+- Volatility: Annualized standard deviation of each stock's last N daily returns
+- Beta: Covariance with the benchmark / Variance of the benchmark, on shared dates
+- Covariance / correlation matrices of daily returns (annualized covariance)
+- Portfolio volatility (sqrt(wᵀΣw)) and portfolio beta (wᵀβ)
+
+All inputs are NumPy arrays with NaN marking a missing close, so stocks that
+trade on different exchange calendars can share one matrix.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+
+@dataclass(frozen=True)
+class RiskMetrics:
+    """
+    Risk metrics for a set of stocks, one entry per input column.
+
+    Per-stock arrays have shape (n,), matrices have shape (n, n).
+    """
+    price_count: np.ndarray
+    volatility: np.ndarray
+    volatility_score: np.ndarray
+    beta: np.ndarray
+    beta_score: np.ndarray
+    covariance: np.ndarray
+    correlation: np.ndarray
+    portfolio_volatility: Optional[float] = None
+    portfolio_beta: Optional[float] = None
+
+
+class RiskEngine:
+    """
+    Computes volatility, beta and covariance for many stocks at once.
+
+    Score semantics match the per-stock calculations in RiskAnalyzer:
+    - Volatility score: annualized volatility / 60% * 100, clamped to 0-100;
+      50 when a stock has fewer than 5 prices
+    - Beta score: piecewise mapping (0-30 below 0.5, 30-70 up to 1.5, 70-100
+      above, 80 for negative beta); beta 1.0 / score 50 when a stock has fewer
+      than 20 prices or fewer than 10 returns shared with the benchmark
+    """
+
+    def __init__(self, days_volatility: int = 30, days_beta: int = 90):
+        """
+        Initialize risk engine.
+
+        Args:
+            days_volatility: Number of most recent prices per stock used for volatility
+            days_beta: Number of most recent prices per stock used for beta and covariance
+        """
+        self.days_volatility = days_volatility
+        self.days_beta = days_beta
+
+    def compute(
+        self,
+        closes: np.ndarray,
+        benchmark: Optional[np.ndarray] = None,
+        weights: Optional[np.ndarray] = None
+    ) -> RiskMetrics:
+        """
+        Compute risk metrics for every column of a close matrix.
+
+        Args:
+            closes: Date x stock close matrix (oldest first, NaN = no price)
+            benchmark: Benchmark closes on the same dates (NaN = no price)
+            weights: Optional portfolio weights per column (normalized internally)
+
+        Returns:
+            RiskMetrics for the columns of `closes`
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        if closes.ndim == 1:
+            closes = closes[:, None]
+        n_stocks = closes.shape[1]
+
+        valid = ~np.isnan(closes)
+        price_count = np.minimum(valid.sum(axis=0), max(self.days_volatility, self.days_beta))
+        returns = self.daily_returns(closes)
+
+        # Volatility over each stock's last `days_volatility` prices
+        vol_mask = self._recent_mask(valid, self.days_volatility - 1) & ~np.isnan(returns)
+        daily_vol = self._masked_std(returns, vol_mask)
+        volatility = daily_vol * np.sqrt(TRADING_DAYS)
+        has_vol = (valid.sum(axis=0) >= 5) & (vol_mask.sum(axis=0) > 0)
+        volatility_score = np.where(has_vol, np.clip(volatility / 0.6 * 100, 0, 100), 50.0)
+
+        beta, beta_score = self._beta(closes, valid, benchmark)
+
+        # Pairwise covariance over each stock's last `days_beta` prices
+        cov_mask = self._recent_mask(valid, self.days_beta - 1) & ~np.isnan(returns)
+        covariance = self._masked_covariance(returns, cov_mask) * TRADING_DAYS
+        std = np.sqrt(np.diag(covariance))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = covariance / np.outer(std, std)
+        correlation = np.nan_to_num(np.clip(correlation, -1.0, 1.0))
+        np.fill_diagonal(correlation, np.where(std > 0, 1.0, 0.0))
+
+        portfolio_volatility = None
+        portfolio_beta = None
+        if weights is not None and n_stocks:
+            w = np.asarray(weights, dtype=np.float64)
+            total = w.sum()
+            if total > 0:
+                w = w / total
+                portfolio_volatility = float(np.sqrt(max(w @ covariance @ w, 0.0)))
+                portfolio_beta = float(w @ beta)
+
+        return RiskMetrics(
+            price_count=price_count,
+            volatility=np.where(has_vol, volatility, np.nan),
+            volatility_score=volatility_score,
+            beta=beta,
+            beta_score=beta_score,
+            covariance=covariance,
+            correlation=correlation,
+            portfolio_volatility=portfolio_volatility,
+            portfolio_beta=portfolio_beta
+        )
+
+    @staticmethod
+    def daily_returns(closes: np.ndarray) -> np.ndarray:
+        """
+        Calculate simple daily returns for each column.
+
+        The return on a date is measured against the column's previous
+        available close, so gaps (holidays, other calendars) do not drop
+        returns. Dates without a close, and closes after a non-positive
+        previous close, yield NaN.
+
+        Args:
+            closes: Date x stock close matrix (oldest first)
+
+        Returns:
+            Matrix of the same shape with daily returns
+        """
+        previous = RiskEngine._forward_fill(closes)
+        previous = np.vstack([np.full((1, closes.shape[1]), np.nan), previous[:-1]])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = closes / previous - 1.0
+
+        returns[~(previous > 0)] = np.nan
+        return returns
+
+    @staticmethod
+    def beta_to_score(beta: np.ndarray) -> np.ndarray:
+        """
+        Convert beta values to 0-100 risk scores.
+
+        Beta < 0.5: low risk, Beta 0.5-1.5: moderate, Beta > 1.5: high.
+        Negative beta is unusual and scored as moderate-high risk.
+        """
+        beta = np.asarray(beta, dtype=np.float64)
+        return np.select(
+            [beta < 0, beta < 0.5, beta <= 1.5],
+            [80.0, beta * 60, 30 + (beta - 0.5) * 40],
+            default=70 + np.minimum(30, (beta - 1.5) * 20)
+        )
+
+    def _beta(
+        self,
+        closes: np.ndarray,
+        valid: np.ndarray,
+        benchmark: Optional[np.ndarray]
+    ) -> tuple:
+        """Calculate beta and beta score per column against the benchmark."""
+        n_stocks = closes.shape[1]
+        beta = np.ones(n_stocks)
+        beta_score = np.full(n_stocks, 50.0)
+
+        if benchmark is None or not n_stocks:
+            return beta, beta_score
+
+        benchmark = np.asarray(benchmark, dtype=np.float64)
+
+        # Restrict both series to dates where stock and benchmark have a close,
+        # so each pair of returns spans the same interval
+        joint = valid & ~np.isnan(benchmark)[:, None]
+        stock_joint = np.where(joint, closes, np.nan)
+        bench_joint = np.where(joint, benchmark[:, None], np.nan)
+
+        stock_returns = self.daily_returns(stock_joint)
+        bench_returns = self.daily_returns(bench_joint)
+
+        mask = (
+            self._recent_mask(valid, self.days_beta - 1)
+            & ~np.isnan(stock_returns)
+            & ~np.isnan(bench_returns)
+        )
+        count = mask.sum(axis=0)
+
+        s = np.where(mask, stock_returns, 0.0)
+        b = np.where(mask, bench_returns, 0.0)
+        safe_count = np.maximum(count, 1)
+        s_centered = np.where(mask, s - s.sum(axis=0) / safe_count, 0.0)
+        b_centered = np.where(mask, b - b.sum(axis=0) / safe_count, 0.0)
+
+        denom = np.maximum(count - 1, 1)
+        covariance = (s_centered * b_centered).sum(axis=0) / denom
+        market_variance = (b_centered ** 2).sum(axis=0) / denom
+
+        usable = (
+            (np.minimum(valid.sum(axis=0), self.days_beta) >= 20)
+            & (count >= 10)
+            & (market_variance > 0)
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw_beta = covariance / market_variance
+
+        beta = np.where(usable, raw_beta, 1.0)
+        beta_score = np.where(usable, self.beta_to_score(beta), 50.0)
+        return beta, beta_score
+
+    @staticmethod
+    def _recent_mask(valid: np.ndarray, count: int) -> np.ndarray:
+        """Mask each column's last `count` available dates."""
+        rank_from_end = np.cumsum(valid[::-1], axis=0)[::-1]
+        return valid & (rank_from_end <= count)
+
+    @staticmethod
+    def _masked_std(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Population standard deviation of each column over masked cells."""
+        count = np.maximum(mask.sum(axis=0), 1)
+        x = np.where(mask, values, 0.0)
+        mean = x.sum(axis=0) / count
+        centered = np.where(mask, values - mean, 0.0)
+        return np.sqrt((centered ** 2).sum(axis=0) / count)
+
+    @staticmethod
+    def _masked_covariance(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Pairwise-complete sample covariance between columns over masked cells."""
+        count = np.maximum(mask.sum(axis=0), 1)
+        mean = np.where(mask, values, 0.0).sum(axis=0) / count
+        centered = np.where(mask, values - mean, 0.0)
+        m = mask.astype(np.float64)
+
+        pair_count = m.T @ m
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = (centered.T @ centered) / (pair_count - 1)
+        covariance[pair_count < 2] = 0.0
+        return covariance
+
+    @staticmethod
+    def _forward_fill(values: np.ndarray) -> np.ndarray:
+        """Forward-fill NaNs down each column."""
+        rows = np.arange(values.shape[0])[:, None]
+        last = np.where(~np.isnan(values), rows, 0)
+        np.maximum.accumulate(last, axis=0, out=last)
+        filled = values[last, np.arange(values.shape[1])]
+        # Leading NaNs stay NaN (index 0 may itself be NaN)
+        return filled
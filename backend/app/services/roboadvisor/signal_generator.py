@@ -20,6 +20,7 @@ from backend.app.models import (
 )
 from backend.app.services.gemini_service import GeminiService
 from backend.app.services.roboadvisor.risk_analyzer import RiskAnalyzer
+from backend.app.services.price_matrix import price_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +39,8 @@ class SignalGenerator:
     def generate_signal(
         self,
         stock: Stock,
-        portfolio_id: int
+        portfolio_id: int,
+        risk_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Generate trading signal for a stock.
@@ -46,12 +48,14 @@ class SignalGenerator:
         Args:
             stock: Stock model instance
             portfolio_id: Portfolio ID for context
+            risk_data: Optional precomputed risk data for the stock
 
         Returns:
             Dict with signal data
         """
         # Gather analysis data
-        risk_data = self.risk_analyzer.calculate_stock_risk(stock)
+        if risk_data is None:
+            risk_data = self.risk_analyzer.calculate_stock_risk(stock)
         sentiment_data = self._get_sentiment_data(stock.id)
         price_trend = self._get_price_trend(stock.id)
         news_context = self._get_recent_news(stock.id)
@@ -92,8 +96,15 @@ class SignalGenerator:
         """
         signals = []
 
+        # Risk for all holdings in one vectorized pass
+        risk_by_stock = self.risk_analyzer.calculate_stocks_risk(
+            [position.stock for position in positions]
+        )
+
         for position in positions:
-            signal = self.generate_signal(position.stock, portfolio.id)
+            signal = self.generate_signal(
+                position.stock, portfolio.id, risk_by_stock.get(position.stock_id)
+            )
             signal["position_id"] = position.id
             signal["quantity"] = float(position.shares)
             signals.append(signal)
@@ -378,18 +389,17 @@ class SignalGenerator:
 
     def _get_price_trend(self, stock_id: int) -> Dict[str, Any]:
         """Calculate price trend metrics."""
-        prices = self.db.query(StockPrice).filter(
-            StockPrice.stock_id == stock_id
-        ).order_by(StockPrice.date.desc()).limit(60).all()
+        series = price_matrix.ensure_loaded(self.db).series(stock_id, limit=60)
 
-        if len(prices) < 7:
+        if len(series) < 7:
             return {
                 "return_7d": 0,
                 "return_30d": 0,
                 "momentum": "unknown"
             }
 
-        closes = [float(p.close) for p in prices]
+        # Most recent first
+        closes = series.close[::-1].tolist()
 
         # Calculate returns
         return_7d = ((closes[0] - closes[min(6, len(closes)-1)]) / closes[min(6, len(closes)-1)]) * 100 if len(closes) > 6 else 0
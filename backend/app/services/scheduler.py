@@ -6,10 +6,13 @@ This service manages all scheduled tasks including:
 - Daily news collection
 - Weekly data exports
 - Monthly database backups
+- Intraday price refreshes for held stocks while their exchanges are open
+- Keyword index updates (first run at startup)
 """
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 from datetime import datetime
 from typing import Dict, List, Any
@@ -20,6 +23,9 @@ from backend.app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# High-frequency jobs whose successful runs are not kept in the job history
+QUIET_JOBS = {'intraday_price_refresh'}
+
 
 class SchedulerService:
     """Service for managing scheduled tasks."""
@@ -35,6 +41,10 @@ class SchedulerService:
 
     def _job_executed(self, event):
         """Log successful job execution."""
+        if event.job_id in QUIET_JOBS:
+            logger.debug(f"Job {event.job_id} executed successfully")
+            return
+
         job_info = {
             "job_id": event.job_id,
             "status": "success",
@@ -136,6 +146,39 @@ class SchedulerService:
         )
         logger.info(f"Registered: Monthly Database Backup (Day {settings.MONTHLY_BACKUP_DAY} at {settings.MONTHLY_BACKUP_TIME} ET)")
 
+        # Job 5: Intraday Price Refresh (every few minutes; sleeps until the next session open when markets are closed)
+        if settings.INTRADAY_REFRESH_ENABLED:
+            self.scheduler.add_job(
+                self._intraday_refresh_job,
+                trigger=IntervalTrigger(
+                    minutes=settings.INTRADAY_REFRESH_MINUTES,
+                    timezone=settings.SCHEDULER_TIMEZONE
+                ),
+                id='intraday_price_refresh',
+                name='Intraday Price Refresh',
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True
+            )
+            logger.info(f"Registered: Intraday Price Refresh (every {settings.INTRADAY_REFRESH_MINUTES} min during sessions)")
+
+        # Job 6: Keyword Index Update (at startup, then every few minutes)
+        if settings.HYBRID_SEARCH_ENABLED:
+            self.scheduler.add_job(
+                self._keyword_index_job,
+                trigger=IntervalTrigger(
+                    minutes=settings.KEYWORD_INDEX_UPDATE_MINUTES,
+                    timezone=settings.SCHEDULER_TIMEZONE
+                ),
+                id='keyword_index_update',
+                name='Keyword Index Update',
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+                next_run_time=datetime.now(pytz.timezone(settings.SCHEDULER_TIMEZONE))
+            )
+            logger.info(f"Registered: Keyword Index Update (at startup, then every {settings.KEYWORD_INDEX_UPDATE_MINUTES} min)")
+
     async def _collect_prices_job(self):
         """Job function for daily price collection."""
         logger.info("Starting daily price collection job...")
@@ -184,6 +227,34 @@ class SchedulerService:
             logger.error(f"Database backup job failed: {e}")
             raise
 
+    async def _intraday_refresh_job(self):
+        """Job function for intraday price refresh."""
+        try:
+            # Import here to avoid circular dependencies
+            from backend.app.services.intraday_refresh import refresh_intraday_prices
+            result = await refresh_intraday_prices()
+            logger.debug(f"Intraday refresh completed: {result}")
+
+            # Outside sessions (or after repeated failures) skip ahead instead of polling
+            if result.get("next_run"):
+                next_run = datetime.fromisoformat(result["next_run"])
+                self.scheduler.modify_job('intraday_price_refresh', next_run_time=next_run)
+                logger.info(f"Intraday refresh paused until {next_run.isoformat()} ({result.get('reason')})")
+        except Exception as e:
+            logger.error(f"Intraday refresh job failed: {e}")
+            raise
+
+    async def _keyword_index_job(self):
+        """Job function for keyword index updates."""
+        try:
+            # Import here to avoid circular dependencies
+            from backend.app.services.keyword_index import update_keyword_index
+            indexed = await update_keyword_index()
+            logger.debug(f"Keyword index update completed: {indexed} articles indexed")
+        except Exception as e:
+            logger.error(f"Keyword index update job failed: {e}")
+            raise
+
     def start(self):
         """Start the scheduler."""
         if not self._is_running:
@@ -0,0 +1,285 @@
+"""
+Sentiment result cache.
+
+Features:
+- Keys are sha256 of the normalized text (lower-case, punctuation and
+  whitespace collapsed), so syndicated copies of a story share one result
+- In-memory LRU in front of the persistent `sentiment_cache` table
+- Each entry records the scorer version that produced it; entries from a
+  scorer version that is no longer current are re-scored
+- Hit / miss / stale counters for the admin collection stats
+"""
+
+import hashlib
+import re
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Iterable, Sequence
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from backend.app.core.config import settings
+from backend.app.db.base import SessionLocal
+from backend.app.models import SentimentCacheEntry
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case and collapse punctuation/whitespace for near-identical matching."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def cache_key(text: str) -> str:
+    """Build the cache key for an article text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """Two-level (memory LRU + database) cache for sentiment results."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_memory_entries: int = 20000,
+        persist: bool = True,
+        batch_size: int = 500
+    ):
+        """
+        Initialize sentiment cache.
+
+        Args:
+            enabled: When False, every call goes straight to the analyze function
+            max_memory_entries: Results kept in the in-memory LRU
+            persist: Read and write the sentiment_cache table
+            batch_size: Maximum keys per database statement
+        """
+        self.enabled = enabled
+        self._max_memory_entries = max_memory_entries
+        self._persist = persist
+        self._batch_size = batch_size
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stale": 0, "db_errors": 0}
+
+    def get_or_analyze(
+        self,
+        texts: Sequence[str],
+        analyze: Callable[[List[str]], List[Dict[str, Any]]],
+        accepted_versions: Iterable[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get sentiment for texts, calling `analyze` only for uncached ones.
+
+        Args:
+            texts: Texts to score
+            analyze: Function scoring a list of texts, order-preserving; each
+                result should carry a "model_version" (results without one
+                are returned but not cached)
+            accepted_versions: Scorer versions whose cached results are reused
+
+        Returns:
+            Sentiment dicts in the same order as texts
+        """
+        if not self.enabled:
+            return analyze(list(texts))
+
+        keys = [cache_key(text) for text in texts]
+        found = self.get_many(keys, set(accepted_versions))
+
+        # Score each missing text once, even if it appears several times
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            results = analyze(list(missing.values()))
+            new_entries = dict(zip(missing.keys(), results))
+            self.put_many({k: r for k, r in new_entries.items() if r.get("model_version")})
+            found.update(new_entries)
+
+        return [dict(found[key]) for key in keys]
+
+    def get_many(self, keys: Sequence[str], accepted_versions: set) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached results produced by an accepted scorer version.
+
+        Args:
+            keys: Cache keys
+            accepted_versions: Scorer versions that are still current
+
+        Returns:
+            Dict of key -> sentiment dict for usable cached results
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        stale = set()
+
+        with self._lock:
+            for key in unique_keys:
+                result = self._memory.get(key)
+                if result is None:
+                    continue
+                if result["model_version"] in accepted_versions:
+                    self._memory.move_to_end(key)
+                    found[key] = result
+                else:
+                    stale.add(key)
+
+        remaining = [key for key in unique_keys if key not in found]
+        stored = {}
+        if remaining and self._persist:
+            for key, result in self._load(remaining).items():
+                if result["model_version"] in accepted_versions:
+                    stored[key] = result
+                else:
+                    stale.add(key)
+            self._remember(stored)
+
+        with self._lock:
+            self._stats["memory_hits"] += len(found)
+            self._stats["db_hits"] += len(stored)
+            self._stats["misses"] += len(remaining) - len(stored)
+            self._stats["stale"] += len(stale)
+
+        found.update(stored)
+        return found
+
+    def put_many(self, results: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Store results in memory and in the database (replacing stale entries).
+
+        Args:
+            results: Dict of cache key -> sentiment dict with model_version
+        """
+        if not results:
+            return
+
+        entries = {
+            key: {
+                "score": float(r["score"]),
+                "label": r.get("label", "neutral"),
+                "confidence": float(r.get("confidence", 0.0)),
+                "source": r.get("source", r["model_version"].split(":")[0]),
+                "model_version": r["model_version"],
+                "reasoning": "Cached result"
+            }
+            for key, r in results.items()
+        }
+        self._remember(entries)
+
+        if self._persist:
+            self._store(entries)
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory LRU (the database cache is kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit statistics.
+
+        Returns:
+            Dict with memory/database hits, misses, stale entries, hit rate and LRU size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 3) if lookups else None
+        return stats
+
+    # ---------- Internals ----------
+
+    def _remember(self, results: Dict[str, Dict[str, Any]]) -> None:
+        """Add results to the LRU, evicting the least recently used."""
+        with self._lock:
+            for key, result in results.items():
+                self._memory[key] = result
+                self._memory.move_to_end(key)
+            while len(self._memory) > self._max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load results from the database."""
+        found = {}
+        db = SessionLocal()
+        try:
+            for i in range(0, len(keys), self._batch_size):
+                rows = db.query(SentimentCacheEntry).filter(
+                    SentimentCacheEntry.key.in_(keys[i:i + self._batch_size])
+                ).all()
+                for row in rows:
+                    found[row.key] = {
+                        "score": row.score,
+                        "label": row.label,
+                        "confidence": row.confidence,
+                        "source": row.model_version.split(":")[0],
+                        "model_version": row.model_version,
+                        "reasoning": "Cached result"
+                    }
+        except Exception as e:
+            self._record_db_error(f"Sentiment cache lookup failed: {e}")
+        finally:
+            db.close()
+        return found
+
+    def _store(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Upsert results into the database."""
+        rows = [
+            {
+                "key": key,
+                "score": r["score"],
+                "label": r["label"],
+                "confidence": r["confidence"],
+                "model_version": r["model_version"]
+            }
+            for key, r in entries.items()
+        ]
+
+        db = SessionLocal()
+        try:
+            dialect = db.get_bind().dialect.name
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            table = SentimentCacheEntry.__table__
+
+            for i in range(0, len(rows), self._batch_size):
+                stmt = insert(table).values(rows[i:i + self._batch_size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c.key],
+                    set_={
+                        **{
+                            col: stmt.excluded[col]
+                            for col in ("score", "label", "confidence", "model_version")
+                        },
+                        "updated_at": datetime.utcnow()
+                    }
+                )
+                db.execute(stmt)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._record_db_error(f"Sentiment cache write failed: {e}")
+        finally:
+            db.close()
+
+    def _record_db_error(self, message: str) -> None:
+        """Log a database failure; scoring keeps working from memory."""
+        logger.warning(message)
+        with self._lock:
+            self._stats["db_errors"] += 1
+
+
+# Global sentiment cache instance
+sentiment_cache = SentimentCache(
+    enabled=settings.SENTIMENT_CACHE_ENABLED,
+    max_memory_entries=settings.SENTIMENT_CACHE_MEMORY_SIZE
+)
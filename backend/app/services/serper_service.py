@@ -15,6 +15,8 @@ import logging
 import time
 from functools import lru_cache
 
+from backend.app.services.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,7 +107,7 @@ class SerperService:
         }
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.base_url}{endpoint}",
                 headers=headers,
                 json=payload,
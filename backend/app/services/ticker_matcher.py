@@ -0,0 +1,326 @@
+"""
+Ticker mention extraction for article-to-stock matching.
+
+Features:
+- One Aho-Corasick automaton over every tracked symbol, company name and
+  name alias ("Apple Inc." -> "Apple"), so scanning an article is linear
+  in its length however many stocks are tracked
+- Feed-provided ticker lists are resolved with a dict lookup
+- Word boundaries on both sides of a match; a bare symbol must appear in
+  upper case, and a cashtag ($AAPL) always counts
+- Symbols that are also words or very short ("A", "ON", "IT") only match
+  as cashtags or with an exchange prefix ("NYSE: ON")
+- One-word names that are also ordinary words ("Target", "Block", "Visa")
+  only match with company context ("Target's", "Target (TGT)", "Target
+  shares") or as the full legal name ("Target Corporation"), so Title Case
+  headlines like "Price Target On Nike" do not match them
+- The automaton is cached and only rebuilt when the stock table changes
+"""
+
+import re
+import string
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.app.models import Stock
+
+logger = logging.getLogger(__name__)
+
+MIN_SYMBOL_LENGTH = 3  # shorter symbols need a cashtag or exchange prefix
+MIN_NAME_LENGTH = 4
+
+# Symbols that read as ordinary words or finance jargon in headlines
+COMMON_WORD_SYMBOLS = frozenset({
+    "ALL", "ALLY", "ARE", "BEST", "BIG", "CAN", "CAR", "CASH", "CEO", "EAT", "EPS",
+    "ETF", "FAST", "FIVE", "FOR", "FUN", "GOOD", "HAS", "HOLD", "IPO", "KEY", "LIFE",
+    "LOVE", "LOW", "NEW", "NICE", "NOW", "ONE", "OPEN", "OUT", "PEAK", "PLAY", "REAL",
+    "SAFE", "SEE", "TECH", "TRUE", "TWO", "USA", "WELL"
+})
+
+# One-word company names that are also ordinary words
+COMMON_WORD_NAMES = frozenset({
+    "ALPHABET", "BALL", "BLOCK", "BOOKING", "CARNIVAL", "DOLLAR", "GLOBE", "MATCH",
+    "MONSTER", "ORACLE", "PROGRESSIVE", "SHELL", "SNAP", "SOUTHERN", "SQUARE",
+    "TARGET", "UNITY", "VISA"
+}) | COMMON_WORD_SYMBOLS
+
+# Upper-case ASCII folding; unlike str.lower() it never changes the length,
+# so match positions map straight back to the original text
+_FOLD = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_EXCHANGE_PREFIX = re.compile(
+    r"(?:NYSE|NASDAQ|Nasdaq|AMEX|NYSEARCA|NYSE American|OTC|TSX|LSE|XETRA|ETR|EPA|AMS)\s*:\s*$"
+)
+_NAME_SUFFIX = re.compile(
+    r"[\s,]+(?:inc|incorporated|corp|corporation|co|company|ltd|limited|plc|llc|lp|"
+    r"s\.?a|s\.?e|ag|n\.?v|holdings?|group|class [a-c])\.?$",
+    re.IGNORECASE
+)
+_NAME_PREFIX = re.compile(r"^the\s+", re.IGNORECASE)
+# What may follow a common-word name for it to count as the company
+_NAME_CONTEXT = re.compile(
+    r"\s*\(|['\u2019]s\b|\s+(?:Inc|Corp|Corporation|Co|shares|stock|stores)\b",
+    re.IGNORECASE
+)
+
+
+def name_aliases(name: Optional[str]) -> List[str]:
+    """
+    Names a company is mentioned by.
+
+    Args:
+        name: Company name as stored ("Apple Inc.")
+
+    Returns:
+        The name and the forms left after stripping legal suffixes and a
+        leading "The" ("Apple Inc.", "Apple")
+    """
+    name = " ".join((name or "").split())
+    aliases = []
+
+    while name:
+        if len(name) >= MIN_NAME_LENGTH and name not in aliases:
+            aliases.append(name)
+        shorter = _NAME_PREFIX.sub("", _NAME_SUFFIX.sub("", name)).strip(" ,")
+        if shorter == name:
+            break
+        name = shorter
+
+    return aliases
+
+
+@dataclass
+class _Pattern:
+    """A string the automaton looks for."""
+    text: str  # as written, used for the case rules
+    symbol: str  # stock it refers to
+    is_symbol: bool  # symbol (True) or company name (False)
+    # Symbol: only matches as a cashtag or after an exchange prefix.
+    # Name: only matches when followed by company context (_NAME_CONTEXT).
+    needs_context: bool = False
+
+
+class TickerMatcher:
+    """Aho-Corasick matcher over the symbols and names of a set of stocks."""
+
+    def __init__(self, stocks: Iterable[Tuple[str, Optional[str]]]):
+        """
+        Build the automaton.
+
+        Args:
+            stocks: (symbol, company name) pairs
+        """
+        self._patterns: List[_Pattern] = []
+        self._symbols: Dict[str, str] = {}
+
+        for symbol, name in stocks:
+            symbol = symbol.upper()
+            self._add_symbol(symbol, symbol)
+
+            # "SAP.DE" is mentioned as "SAP"
+            root = re.split(r"[.:]", symbol)[0]
+            if root and root != symbol and root not in self._symbols:
+                self._add_symbol(root, symbol)
+
+            for alias in name_aliases(name):
+                if alias.upper() != symbol:
+                    needs_context = " " not in alias and alias.upper() in COMMON_WORD_NAMES
+                    self._patterns.append(_Pattern(alias, symbol, is_symbol=False, needs_context=needs_context))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._build()
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols the matcher knows."""
+        return sorted(set(self._symbols.values()))
+
+    def match_tickers(self, tickers: Optional[Iterable[str]]) -> List[str]:
+        """
+        Resolve feed-provided tickers to tracked symbols.
+
+        Args:
+            tickers: Tickers from the news source (any case)
+
+        Returns:
+            Tracked symbols, in order of first appearance
+        """
+        matched: Dict[str, None] = {}
+        for ticker in tickers or []:
+            symbol = self._symbols.get(str(ticker).strip().lstrip("$").upper())
+            if symbol:
+                matched[symbol] = None
+        return list(matched)
+
+    def match_text(self, text: Optional[str]) -> List[str]:
+        """
+        Find tracked stocks mentioned in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Tracked symbols, in order of first mention
+        """
+        if not text:
+            return []
+
+        matched: Dict[str, None] = {}
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self._patterns
+        state = 0
+
+        for end, char in enumerate(text.translate(_FOLD)):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for pattern_id in output[state]:
+                pattern = patterns[pattern_id]
+                if pattern.symbol not in matched and self._accept(text, end + 1 - len(pattern.text), end + 1, pattern):
+                    matched[pattern.symbol] = None
+
+        return list(matched)
+
+    def match_article(self, article: Dict[str, Any], scan_text: bool = True) -> List[str]:
+        """
+        Find the tracked stocks an article is about.
+
+        Feed-provided tickers take precedence; the title and summary are
+        only scanned when none of them is tracked.
+
+        Args:
+            article: Article dict with tickers, title and summary
+            scan_text: Fall back to scanning the title and summary
+
+        Returns:
+            Tracked symbols
+        """
+        symbols = self.match_tickers(article.get("tickers"))
+        if symbols or not scan_text:
+            return symbols
+        return self.match_text(f"{article.get('title') or ''}\n{article.get('summary') or ''}")
+
+    def stats(self) -> Dict[str, int]:
+        """Size of the matcher."""
+        return {
+            "symbols": len(self.symbols),
+            "patterns": len(self._patterns),
+            "states": len(self._goto)
+        }
+
+    # ---------- Internals ----------
+
+    def _add_symbol(self, text: str, symbol: str) -> None:
+        self._symbols[text] = symbol
+        needs_context = len(text) < MIN_SYMBOL_LENGTH or text in COMMON_WORD_SYMBOLS
+        self._patterns.append(_Pattern(text, symbol, is_symbol=True, needs_context=needs_context))
+
+    def _build(self) -> None:
+        """Build the trie, then the failure links breadth first."""
+        for pattern_id, pattern in enumerate(self._patterns):
+            state = 0
+            for char in pattern.text.translate(_FOLD):
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @staticmethod
+    def _accept(text: str, start: int, end: int, pattern: _Pattern) -> bool:
+        """Apply the word-boundary, case and context rules to a raw match."""
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        if end < len(text) and text[end].isalnum():
+            return False
+
+        if not pattern.is_symbol:
+            # "Apple" or "APPLE", but not "apple" (unless the name is written that way)
+            if pattern.text[0].isupper() and not text[start].isupper():
+                return False
+            return not pattern.needs_context or _NAME_CONTEXT.match(text, end) is not None
+
+        if start > 0 and text[start - 1] == "$":
+            return True
+        if text[start:end] != pattern.text:
+            return False
+        if pattern.needs_context:
+            return _EXCHANGE_PREFIX.search(text, max(0, start - 16), start) is not None
+        return True
+
+
+class TickerMatcherCache:
+    """Keeps a matcher for the tracked (non-benchmark) stocks, rebuilt when they change."""
+
+    def __init__(self):
+        self._matcher: Optional[TickerMatcher] = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._builds = 0
+
+    def get(self, db: Session) -> TickerMatcher:
+        """
+        Get the matcher for the current stock table.
+
+        A cheap aggregate query detects added, removed and renamed stocks;
+        the automaton is only rebuilt when it changes.
+
+        Args:
+            db: Database session
+
+        Returns:
+            TickerMatcher over all non-benchmark stocks
+        """
+        tracked = Stock.is_benchmark.is_(False)
+        signature = tuple(db.query(
+            func.count(Stock.id),
+            func.max(Stock.id),
+            func.sum(func.length(Stock.symbol) + func.coalesce(func.length(Stock.name), 0))
+        ).filter(tracked).one())
+
+        with self._lock:
+            if self._matcher is None or signature != self._signature:
+                rows = db.query(Stock.symbol, Stock.name).filter(tracked).all()
+                self._matcher = TickerMatcher(rows)
+                self._signature = signature
+                self._builds += 1
+                logger.info(f"Built ticker matcher: {self._matcher.stats()}")
+            return self._matcher
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next get()."""
+        with self._lock:
+            self._matcher = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Current matcher size and the number of rebuilds."""
+        with self._lock:
+            stats = self._matcher.stats() if self._matcher else {}
+            return dict(stats, builds=self._builds)
+
+
+# Global ticker matcher cache instance
+ticker_matcher_cache = TickerMatcherCache()
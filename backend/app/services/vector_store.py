@@ -1,5 +1,8 @@
 import chromadb
+from abc import ABC, abstractmethod
 from chromadb.config import Settings
+from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Dict, Any, Optional
 import logging
 from backend.app.core.config import settings as app_settings
@@ -7,7 +10,113 @@ from backend.app.core.config import settings as app_settings
 logger = logging.getLogger(__name__)
 
 
-class VectorStoreService:
+def clean_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert metadata values to the scalar types vector stores accept (lists become comma-separated strings)."""
+    clean = {}
+    for key, value in metadata.items():
+        if isinstance(value, (str, int, float, bool)):
+            clean[key] = value
+        elif isinstance(value, list):
+            clean[key] = ",".join(str(v) for v in value)
+        elif value is not None:
+            clean[key] = str(value)
+    return clean
+
+
+def parse_published_at(value: Any) -> Optional[datetime]:
+    """Parse the published_at metadata value (a datetime string) back to a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+@dataclass
+class VectorFilter:
+    """Restricts a similarity search by stock, publication date and sentiment."""
+    symbols: Optional[List[str]] = None  # any of these stocks
+    start: Optional[datetime] = None  # published at or after
+    end: Optional[datetime] = None  # published at or before
+    min_sentiment: Optional[float] = None
+    max_sentiment: Optional[float] = None
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        """Check an article's stored metadata against the filter."""
+        if self.symbols:
+            stocks = metadata.get("stocks") or []
+            if isinstance(stocks, str):
+                stocks = stocks.split(",")
+            if not {s.upper() for s in stocks} & {s.upper() for s in self.symbols}:
+                return False
+
+        if self.start or self.end:
+            published_at = parse_published_at(metadata.get("published_at"))
+            if published_at is None:
+                return False
+            published_at = published_at.replace(tzinfo=None)
+            if self.start and published_at < self.start.replace(tzinfo=None):
+                return False
+            if self.end and published_at > self.end.replace(tzinfo=None):
+                return False
+
+        if self.min_sentiment is not None or self.max_sentiment is not None:
+            sentiment = metadata.get("sentiment_score")
+            if not isinstance(sentiment, (int, float)):
+                return False
+            if self.min_sentiment is not None and sentiment < self.min_sentiment:
+                return False
+            if self.max_sentiment is not None and sentiment > self.max_sentiment:
+                return False
+
+        return True
+
+
+class VectorBackend(ABC):
+    """
+    Interface of vector store backends.
+
+    Implementations: VectorStoreService (Chroma) and LocalVectorStore
+    (in-process IVF index). Use get_vector_store() to get the configured one.
+    """
+
+    def add_article(self, article_id: int, content: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
+        """Add (or replace) one article."""
+        self.add_articles_batch([{"id": article_id, "content": content, "metadata": metadata}], [embedding])
+
+    @abstractmethod
+    def add_articles_batch(self, articles: List[Dict[str, Any]], embeddings: List[List[float]]) -> None:
+        """Add (or replace) articles given as dicts with id, content and metadata."""
+
+    @abstractmethod
+    def search_similar(self,
+                      query_embedding: List[float],
+                      n_results: int = 5,
+                      filter_metadata: Optional[Dict[str, Any]] = None,
+                      filters: Optional[VectorFilter] = None) -> List[Dict[str, Any]]:
+        """Find the articles most similar to an embedding."""
+
+    def delete_article(self, article_id: int) -> None:
+        """Delete one article."""
+        self.delete_articles_batch([article_id])
+
+    @abstractmethod
+    def delete_articles_batch(self, article_ids: List[int]) -> None:
+        """Delete many articles."""
+
+    @abstractmethod
+    def get_article_count(self) -> int:
+        """Number of stored articles."""
+
+    @abstractmethod
+    def clear_all(self) -> None:
+        """Delete all articles."""
+
+
+class VectorStoreService(VectorBackend):
     """Service for managing ChromaDB vector store for news articles."""
 
     def __init__(self):
@@ -42,21 +151,11 @@ class VectorStoreService:
             doc_id = f"article_{article_id}"
 
             # Ensure metadata values are valid types for ChromaDB
-            clean_metadata = {}
-            for key, value in metadata.items():
-                if isinstance(value, (str, int, float, bool)):
-                    clean_metadata[key] = value
-                elif isinstance(value, list):
-                    # Convert lists to comma-separated strings
-                    clean_metadata[key] = ",".join(str(v) for v in value)
-                elif value is not None:
-                    clean_metadata[key] = str(value)
-
             self.collection.add(
                 ids=[doc_id],
                 embeddings=[embedding],
                 documents=[content],
-                metadatas=[clean_metadata]
+                metadatas=[clean_metadata(metadata)]
             )
 
             logger.info(f"Added article {article_id} to vector store")
@@ -80,21 +179,10 @@ class VectorStoreService:
         try:
             ids = [f"article_{article['id']}" for article in articles]
             documents = [article['content'] for article in articles]
-            metadatas = []
-
-            for article in articles:
-                metadata = article.get('metadata', {})
-                clean_metadata = {}
-                for key, value in metadata.items():
-                    if isinstance(value, (str, int, float, bool)):
-                        clean_metadata[key] = value
-                    elif isinstance(value, list):
-                        clean_metadata[key] = ",".join(str(v) for v in value)
-                    elif value is not None:
-                        clean_metadata[key] = str(value)
-                metadatas.append(clean_metadata)
+            metadatas = [clean_metadata(article.get('metadata', {})) for article in articles]
 
-            self.collection.add(
+            # Upsert so a batch is not rejected because one article was already indexed
+            self.collection.upsert(
                 ids=ids,
                 embeddings=embeddings,
                 documents=documents,
@@ -109,14 +197,17 @@ class VectorStoreService:
     def search_similar(self,
                       query_embedding: List[float],
                       n_results: int = 5,
-                      filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+                      filter_metadata: Optional[Dict[str, Any]] = None,
+                      filters: Optional[VectorFilter] = None) -> List[Dict[str, Any]]:
         """
         Search for similar articles using embedding similarity.
 
         Args:
             query_embedding: Query embedding vector
             n_results: Number of results to return
-            filter_metadata: Optional metadata filters
+            filter_metadata: Optional Chroma where clause
+            filters: Optional stock/date/sentiment filter (Chroma cannot
+                express all of it, so results are over-fetched and filtered)
 
         Returns:
             List of similar articles with metadata and scores
@@ -126,7 +217,7 @@ class VectorStoreService:
 
             results = self.collection.query(
                 query_embeddings=[query_embedding],
-                n_results=n_results,
+                n_results=n_results * 5 if filters else n_results,
                 where=where
             )
 
@@ -143,6 +234,9 @@ class VectorStoreService:
                     if 'stocks' in metadata and isinstance(metadata['stocks'], str):
                         metadata['stocks'] = metadata['stocks'].split(',')
 
+                    if filters and not filters.matches(metadata):
+                        continue
+
                     articles.append({
                         'article_id': int(article_id),
                         'content': document,
@@ -150,7 +244,7 @@ class VectorStoreService:
                         'similarity_score': 1 - distance  # Convert distance to similarity
                     })
 
-            return articles
+            return articles[:n_results]
         except Exception as e:
             logger.error(f"Error searching vector store: {e}")
             return []
@@ -165,6 +259,18 @@ class VectorStoreService:
             logger.error(f"Error deleting article from vector store: {e}")
             raise
 
+    def delete_articles_batch(self, article_ids: List[int]) -> None:
+        """Delete many articles from the vector store in one call."""
+        if not article_ids:
+            return
+
+        try:
+            self.collection.delete(ids=[f"article_{article_id}" for article_id in article_ids])
+            logger.info(f"Deleted {len(article_ids)} articles from vector store")
+        except Exception as e:
+            logger.error(f"Error deleting articles from vector store: {e}")
+            raise
+
     def get_article_count(self) -> int:
         """Get total number of articles in the vector store."""
         try:
@@ -186,3 +292,16 @@ class VectorStoreService:
         except Exception as e:
             logger.error(f"Error clearing vector store: {e}")
             raise
+
+
+def get_vector_store() -> VectorBackend:
+    """
+    Get the configured vector store backend (VECTOR_BACKEND).
+
+    The local index is shared by the whole process, since its in-memory
+    state must see every write; Chroma clients are created per caller as before.
+    """
+    if app_settings.VECTOR_BACKEND == "local":
+        from backend.app.services.local_vector_store import local_vector_store
+        return local_vector_store()
+    return VectorStoreService()
@@ -0,0 +1,105 @@
+"""
+Script to add near-duplicate clustering to an existing database.
+
+Changes:
+- news_articles.cluster_id: id of the representative article of the
+  article's near-duplicate cluster (the same story from several outlets)
+- Backfills cluster ids for stored articles, oldest first
+- Optionally removes the vectors of non-representative articles from the
+  vector store (--prune-vectors), so RAG retrieval sees each story once
+
+Run with: python -m backend.scripts.add_article_clusters [--prune-vectors]
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from backend.app.core.config import settings
+
+
+def add_column():
+    """Add the cluster_id column to news_articles if it does not exist."""
+    print("Adding news_articles.cluster_id column...")
+
+    engine = create_engine(settings.DATABASE_URL)
+
+    with engine.connect() as conn:
+        conn.execute(text(
+            "ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS cluster_id INTEGER"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_news_articles_cluster_id ON news_articles (cluster_id)"
+        ))
+        conn.commit()
+
+    print("Column added successfully!")
+
+
+def backfill_clusters(prune_vectors: bool = False, batch_size: int = 1000):
+    """Assign cluster ids to all stored articles and optionally prune duplicate vectors."""
+    from backend.app.models import NewsArticle
+    from backend.app.services.near_duplicates import MinHashIndex, minhash, article_text
+
+    engine = create_engine(settings.DATABASE_URL)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    try:
+        index = MinHashIndex(settings.NEWS_DUPLICATE_SIMILARITY)
+        updates = []
+        duplicate_ids = []
+        total = 0
+
+        rows = db.query(NewsArticle.id, NewsArticle.title, NewsArticle.summary).order_by(
+            NewsArticle.published_at.asc().nullslast(), NewsArticle.id
+        ).yield_per(batch_size)
+
+        for article_id, title, summary in rows:
+            total += 1
+            signature = minhash(article_text(title, summary))
+            cluster_id = index.find(signature) if signature is not None else None
+
+            if cluster_id is None:
+                cluster_id = article_id
+                if signature is not None:
+                    index.add(signature, cluster_id)
+            else:
+                duplicate_ids.append(article_id)
+
+            updates.append({"id": article_id, "cluster_id": cluster_id})
+
+        print(f"Assigning clusters to {total} articles...")
+        for i in range(0, len(updates), batch_size):
+            db.bulk_update_mappings(NewsArticle, updates[i:i + batch_size])
+        db.commit()
+
+        print(f"  ✓ {total - len(duplicate_ids)} distinct stories, {len(duplicate_ids)} near-duplicates")
+
+        if prune_vectors and duplicate_ids:
+            from backend.app.services.vector_store import get_vector_store
+
+            print("Removing near-duplicate vectors...")
+            vector_store = get_vector_store()
+            for i in range(0, len(duplicate_ids), batch_size):
+                vector_store.delete_articles_batch(duplicate_ids[i:i + batch_size])
+            print(f"  ✓ Vector store now holds {vector_store.get_article_count()} articles")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add near-duplicate article clustering")
+    parser.add_argument("--prune-vectors", action="store_true",
+                        help="Delete vectors of non-representative articles")
+
+    args = parser.parse_args()
+
+    add_column()
+    backfill_clusters(prune_vectors=args.prune_vectors)
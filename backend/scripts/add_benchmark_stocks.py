@@ -0,0 +1,75 @@
+"""
+Script to add benchmark index support to an existing database.
+
+Changes:
+- stocks.is_benchmark: flags index rows (SPY, QQQ, ^STOXX50E, ...) that are
+  tracked only for beta calculations
+- Inserts a stock row for each symbol in settings.BENCHMARK_SYMBOLS
+- Optionally backfills their price history (--backfill)
+
+Run with: python -m backend.scripts.add_benchmark_stocks [--backfill]
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from backend.app.core.config import settings
+
+
+def add_column():
+    """Add the is_benchmark column to stocks if it does not exist."""
+    print("Adding stocks.is_benchmark column...")
+
+    engine = create_engine(settings.DATABASE_URL)
+
+    with engine.connect() as conn:
+        conn.execute(text(
+            "ALTER TABLE stocks ADD COLUMN IF NOT EXISTS "
+            "is_benchmark BOOLEAN NOT NULL DEFAULT FALSE"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_stocks_is_benchmark ON stocks (is_benchmark)"
+        ))
+        conn.commit()
+
+    print("Column added successfully!")
+
+
+def add_benchmarks(backfill: bool = False):
+    """Insert configured benchmark stocks and optionally backfill their prices."""
+    from backend.app.services.benchmark_service import benchmark_service
+
+    engine = create_engine(settings.DATABASE_URL)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    try:
+        stocks = benchmark_service.ensure_benchmark_stocks(db)
+        for stock in stocks:
+            status = "benchmark" if stock.is_benchmark else "portfolio stock"
+            print(f"  ✓ {stock.symbol} ({status})")
+
+        if backfill:
+            print("Backfilling benchmark prices...")
+            result = benchmark_service.refresh(db, stocks)
+            for symbol, new_count in result.items():
+                print(f"  {symbol}: {new_count} new prices")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add benchmark index support")
+    parser.add_argument("--backfill", action="store_true", help="Fetch benchmark price history")
+
+    args = parser.parse_args()
+
+    add_column()
+    add_benchmarks(backfill=args.backfill)
@@ -0,0 +1,206 @@
+"""
+Benchmark the weekly export formats.
+
+Fills a temporary SQLite database with synthetic prices, articles and
+article-stock links, then runs every export format against it and
+reports, per format:
+- Write time
+- Size on disk
+- Time to load the exported prices and articles into pandas
+
+Formats: CSV + NDJSON (uncompressed and gzip), partitioned Parquet
+(zstd) and partitioned Arrow IPC. The columnar formats need pyarrow.
+
+Usage:
+    python benchmark_exports.py [--stocks 500] [--days 1260] [--articles 200000]
+"""
+
+import sys
+import json
+import time
+import shutil
+import random
+import logging
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.app.db.base import Base
+from backend.app.models import Stock, StockPrice, NewsArticle, ArticleStock
+from backend.app.services.data_exporter import DataExporterService
+from backend.app.services.columnar_export import PYARROW_AVAILABLE, read_columnar_table
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BASE_DATE = date(2020, 1, 1)
+INSERT_BATCH = 20000
+SOURCES = ["Reuters", "Bloomberg", "CNBC", "MarketWatch", "Yahoo Finance", "Seeking Alpha"]
+
+
+def fill_database(db, stocks: int, days: int, articles: int, seed: int = 7):
+    """Insert synthetic stocks, weekday prices, articles and one to three links per article."""
+    rng = random.Random(seed)
+    db.execute(insert(Stock), [
+        {"symbol": f"S{i:04d}", "name": f"Synthetic Company {i}", "sector": "Technology"}
+        for i in range(stocks)
+    ])
+
+    trading_days = [d for d in (BASE_DATE + timedelta(days=i) for i in range(days * 7 // 5 + 7)) if d.weekday() < 5][:days]
+    rows = []
+    for stock_id in range(1, stocks + 1):
+        close = rng.uniform(20, 500)
+        for day in trading_days:
+            close *= 1 + rng.gauss(0, 0.02)
+            rows.append({
+                "stock_id": stock_id, "date": day, "open": close * 0.99, "high": close * 1.01,
+                "low": close * 0.98, "close": close, "volume": rng.randint(100000, 5000000)
+            })
+            if len(rows) >= INSERT_BATCH:
+                db.execute(insert(StockPrice), rows)
+                rows = []
+    if rows:
+        db.execute(insert(StockPrice), rows)
+
+    start = datetime.combine(BASE_DATE, datetime.min.time())
+    span = (trading_days[-1] - BASE_DATE).total_seconds()
+    for offset in range(0, articles, INSERT_BATCH):
+        batch = range(offset + 1, min(offset + INSERT_BATCH, articles) + 1)
+        db.execute(insert(NewsArticle), [
+            {
+                "id": i,
+                "title": f"Synthetic headline {i} about quarterly results and guidance",
+                "source": rng.choice(SOURCES),
+                "url": f"https://news.example.com/{i}",
+                "published_at": start + timedelta(seconds=rng.uniform(0, span)),
+                "summary": "Synthetic summary text. " * rng.randint(5, 20),
+                "sentiment_score": round(rng.uniform(-1, 1), 3)
+            }
+            for i in batch
+        ])
+        db.execute(insert(ArticleStock), [
+            {"article_id": i, "stock_id": stock_id}
+            for i in batch
+            for stock_id in rng.sample(range(1, stocks + 1), rng.randint(1, min(3, stocks)))
+        ])
+    db.commit()
+    logger.info(f"Database: {stocks} stocks x {len(trading_days)} days, {articles:,} articles")
+
+
+def directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def read_row_based(export_dir: Path) -> int:
+    """Load the CSV prices/articles and the NDJSON dataset into pandas."""
+    rows = 0
+    for path in sorted(export_dir.iterdir()):
+        if ".csv" in path.suffixes:
+            rows += len(pd.read_csv(path))
+        elif ".ndjson" in path.suffixes:
+            rows += len(pd.read_json(path, lines=True))
+    return rows
+
+
+def read_columnar(export_dir: Path) -> int:
+    """Load every table of the columnar dataset into pandas."""
+    dataset = next(export_dir.iterdir())
+    return sum(
+        len(read_columnar_table(dataset, table).to_pandas())
+        for table in ("stock_prices", "news_articles", "article_stocks")
+    )
+
+
+def run_row_based(db, export_dir: Path, compression: str) -> dict:
+    exporter = DataExporterService(compression=compression)
+    exporter.export_dir = export_dir
+    export_dir.mkdir(parents=True)
+
+    started = time.perf_counter()
+    results = [
+        exporter.export_stock_prices_csv(db, "bench"),
+        exporter.export_news_articles_csv(db, "bench"),
+        exporter.export_combined_dataset_json(db, "bench")
+    ]
+    write_s = time.perf_counter() - started
+    failed = [r for r in results if r["status"] != "success"]
+    if failed:
+        raise RuntimeError(failed)
+
+    started = time.perf_counter()
+    read_row_based(export_dir)
+    return {"write_s": write_s, "size_mb": directory_size(export_dir) / 1e6, "read_s": time.perf_counter() - started}
+
+
+def run_columnar(db, export_dir: Path, file_format: str) -> dict:
+    exporter = DataExporterService()
+    exporter.export_dir = export_dir
+    export_dir.mkdir(parents=True)
+
+    started = time.perf_counter()
+    result = exporter.export_columnar_dataset(db, "bench", file_format)
+    write_s = time.perf_counter() - started
+    if result["status"] != "success":
+        raise RuntimeError(result)
+
+    started = time.perf_counter()
+    read_columnar(export_dir)
+    return {"write_s": write_s, "size_mb": directory_size(export_dir) / 1e6, "read_s": time.perf_counter() - started}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark CSV/NDJSON vs Parquet/Arrow exports")
+    parser.add_argument("--stocks", type=int, default=500, help="Synthetic stocks")
+    parser.add_argument("--days", type=int, default=1260, help="Trading days of prices per stock")
+    parser.add_argument("--articles", type=int, default=200000, help="Synthetic news articles")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="export_benchmark_"))
+    engine = create_engine(f"sqlite:///{workdir / 'benchmark.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    runs = [
+        ("csv+ndjson", lambda path: run_row_based(db, path, "none")),
+        ("csv+ndjson gzip", lambda path: run_row_based(db, path, "gzip")),
+    ]
+    if PYARROW_AVAILABLE:
+        runs += [
+            ("parquet (zstd)", lambda path: run_columnar(db, path, "parquet")),
+            ("arrow ipc", lambda path: run_columnar(db, path, "arrow")),
+        ]
+    else:
+        logger.warning("pyarrow is not installed - skipping the Parquet and Arrow runs")
+
+    try:
+        fill_database(db, args.stocks, args.days, args.articles)
+
+        results = {}
+        for name, run in runs:
+            results[name] = run(workdir / name.replace(" ", "_"))
+            logger.info(f"{name}: {json.dumps({k: round(v, 2) for k, v in results[name].items()})}")
+
+        logger.info(f"{'Format':<18}{'Write (s)':>12}{'Size (MB)':>12}{'Read (s)':>12}")
+        for name, result in results.items():
+            logger.info(f"{name:<18}{result['write_s']:>12.2f}{result['size_mb']:>12.1f}{result['read_s']:>12.2f}")
+    finally:
+        db.close()
+        engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark the local sentiment scorer against stored Gemini scores.
+
+Labels are the stored scores that came from Gemini (see
+train_sentiment_model.load_labelled_articles). Holds out every 5th labelled
+article, trains the TF-IDF model on the rest (unless --no-train, which
+benchmarks the lexicon alone) and reports:
+- Throughput of local scoring (articles/second)
+- Agreement with stored scores: label agreement, MAE, correlation
+- Share of articles the confidence gate would escalate to Gemini, and the
+  agreement on the articles it keeps local
+- Optionally (--gemini-sample N) the throughput of batched Gemini scoring
+
+The saved model (settings.SENTIMENT_MODEL_PATH) is never used: it was
+trained on every labelled article, including the held-out ones, so its
+agreement numbers would be inflated.
+
+Usage:
+    python benchmark_sentiment.py [--no-train] [--threshold 0.6] [--gemini-sample 50]
+"""
+
+import sys
+import time
+import logging
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.core.config import settings
+from backend.app.services.local_sentiment import NEUTRAL_BAND, LocalSentimentScorer
+from backend.scripts.train_sentiment_model import load_labelled_articles
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def labels(scores: np.ndarray) -> np.ndarray:
+    """Map scores to -1/0/1 labels with the scorer's neutral band."""
+    return np.where(scores > NEUTRAL_BAND, 1, np.where(scores < -NEUTRAL_BAND, -1, 0))
+
+
+def agreement(predicted: np.ndarray, stored: np.ndarray) -> dict:
+    """Agreement metrics between predicted and stored scores."""
+    if len(stored) == 0:
+        return {"articles": 0}
+    corr = float(np.corrcoef(predicted, stored)[0, 1]) if len(stored) > 1 and predicted.std() > 0 else None
+    return {
+        "articles": int(len(stored)),
+        "label_agreement": round(float(np.mean(labels(predicted) == labels(stored))), 3),
+        "mae": round(float(np.mean(np.abs(predicted - stored))), 3),
+        "correlation": round(corr, 3) if corr is not None else None
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark local sentiment scoring")
+    parser.add_argument("--no-train", action="store_true", help="Benchmark the lexicon only (no model)")
+    parser.add_argument("--threshold", type=float, default=settings.SENTIMENT_ESCALATION_THRESHOLD,
+                        help="Escalation confidence threshold")
+    parser.add_argument("--gemini-sample", type=int, default=0,
+                        help="Also time batched Gemini scoring on N held-out articles")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    try:
+        texts, scores = load_labelled_articles(db)
+    finally:
+        db.close()
+
+    if not texts:
+        logger.error("No labelled articles found")
+        return
+
+    test_idx = list(range(0, len(texts), 5))
+    train_idx = [i for i in range(len(texts)) if i % 5]
+    test_texts = [texts[i] for i in test_idx]
+    stored = np.array([scores[i] for i in test_idx])
+
+    # Fresh scorer trained on the train split only
+    scorer = LocalSentimentScorer()
+    if not args.no_train and train_idx:
+        result = scorer.train([texts[i] for i in train_idx], [scores[i] for i in train_idx])
+        logger.info(f"Trained on {result['samples']} articles ({result['vocabulary']} features, "
+                    f"held-out residual std {result['residual_std']})")
+
+    started = time.perf_counter()
+    results = scorer.score_batch(test_texts)
+    elapsed = time.perf_counter() - started
+
+    predicted = np.array([r["score"] for r in results])
+    confidence = np.array([r["confidence"] for r in results])
+    kept = confidence >= args.threshold
+
+    logger.info("=== Local Sentiment Benchmark ===")
+    logger.info(f"Model: {'lexicon + TF-IDF' if scorer.is_trained else 'lexicon only'}")
+    logger.info(f"Held-out articles: {len(test_texts)}")
+    logger.info(f"Local throughput: {len(test_texts) / max(elapsed, 1e-9):,.0f} articles/s "
+                f"({elapsed * 1e6 / len(test_texts):.1f} µs/article)")
+    logger.info(f"Agreement (all): {agreement(predicted, stored)}")
+    logger.info(f"Escalated at threshold {args.threshold}: {int((~kept).sum())} "
+                f"({(~kept).mean() * 100:.1f}%)")
+    logger.info(f"Agreement (kept local): {agreement(predicted[kept], stored[kept])}")
+
+    if args.gemini_sample:
+        from backend.app.services.gemini_service import GeminiService
+
+        sample = test_texts[:args.gemini_sample]
+        started = time.perf_counter()
+        gemini_results = GeminiService().analyze_sentiment_batch(sample)
+        gemini_elapsed = time.perf_counter() - started
+        gemini_scores = np.array([r["score"] for r in gemini_results])
+
+        logger.info(f"Gemini throughput (batched): {len(sample) / gemini_elapsed:,.1f} articles/s")
+        logger.info(f"Gemini re-score vs stored: {agreement(gemini_scores, stored[:len(sample)])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Benchmark the local vector index against the Chroma path.
+
+Builds both stores from the same synthetic embeddings (clustered like
+real news embeddings, unit-normalised) in a temporary directory and
+reports, per store size:
+- Build time
+- recall@k against exact brute-force search
+- p50/p99 query latency, unfiltered and with a stock + date filter
+
+Chroma is skipped above --chroma-max articles (inserting 1M vectors into
+Chroma takes hours); the local index is run at every size.
+
+Usage:
+    python benchmark_vector_store.py [--sizes 100000 1000000] [--dtype int8] [--k 10]
+"""
+
+import sys
+import time
+import shutil
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.app.core.config import settings
+from backend.app.services.local_vector_store import LocalVectorStore
+from backend.app.services.vector_store import VectorFilter
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "TSLA", "JPM", "V", "XOM"]
+BASE_DATE = datetime(2024, 1, 1)
+BUILD_BATCH = 10000
+
+
+def make_embeddings(n: int, dim: int, topics: int, seed: int) -> np.ndarray:
+    """Unit vectors drawn around `topics` random topic centres."""
+    rng = np.random.default_rng(seed)
+    centres = np.random.default_rng(42).normal(size=(topics, dim)).astype(np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for i in range(0, n, BUILD_BATCH):
+        m = min(BUILD_BATCH, n - i)
+        chunk = centres[rng.integers(0, topics, m)] + rng.normal(size=(m, dim)).astype(np.float32)
+        vectors[i:i + m] = chunk / np.linalg.norm(chunk, axis=1, keepdims=True)
+    return vectors
+
+
+def make_article(i: int) -> dict:
+    """Synthetic article metadata: one or two stocks, one article a minute, a sentiment score."""
+    stocks = [SYMBOLS[i % len(SYMBOLS)]] + ([SYMBOLS[(i // 7) % len(SYMBOLS)]] if i % 3 == 0 else [])
+    return {
+        "id": i + 1,
+        "content": f"Article {i + 1}",
+        "metadata": {
+            "published_at": str(BASE_DATE + timedelta(minutes=i)),
+            "sentiment_score": round(float(np.sin(i)), 3),
+            "stocks": stocks
+        }
+    }
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int, allowed: np.ndarray = None) -> list:
+    """Ground-truth article ids by brute-force cosine similarity."""
+    truth = []
+    for query in queries:
+        scores = vectors @ query
+        if allowed is not None:
+            scores = np.where(allowed, scores, -np.inf)
+        top = np.argpartition(scores, -k)[-k:]
+        truth.append(set((top[np.isfinite(scores[top])] + 1).tolist()))
+    return truth
+
+
+def filter_mask(n: int, symbol: str, start: datetime, end: datetime) -> np.ndarray:
+    """Rows matching the benchmark filter (mirrors make_article)."""
+    i = np.arange(n)
+    has_symbol = (np.array(SYMBOLS)[i % len(SYMBOLS)] == symbol) | (
+        (i % 3 == 0) & (np.array(SYMBOLS)[(i // 7) % len(SYMBOLS)] == symbol)
+    )
+    # Article i is published i minutes after BASE_DATE
+    first = (start - BASE_DATE) // timedelta(minutes=1)
+    last = (end - BASE_DATE) // timedelta(minutes=1)
+    return has_symbol & (i >= first) & (i <= last)
+
+
+def run_queries(search, queries: np.ndarray, truth: list, k: int) -> dict:
+    """recall@k and latency percentiles of a search function."""
+    latencies = []
+    recall = []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        results = search(query.tolist())
+        latencies.append((time.perf_counter() - started) * 1000)
+        if expected:
+            recall.append(len(expected & {r["article_id"] for r in results}) / len(expected))
+
+    return {
+        "recall": round(float(np.mean(recall)), 3) if recall else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2)
+    }
+
+
+def build_local(path: Path, vectors: np.ndarray, dtype: str, nprobe: int) -> LocalVectorStore:
+    store = LocalVectorStore(str(path), dtype=dtype, nprobe=nprobe)
+    for i in range(0, len(vectors), BUILD_BATCH):
+        end = min(i + BUILD_BATCH, len(vectors))
+        store.add_articles_batch([make_article(j) for j in range(i, end)], vectors[i:end])
+    # Cluster everything, as a store of this size would be after its last growth rebuild
+    store.rebuild()
+    return store
+
+
+def build_chroma(path: Path, vectors: np.ndarray):
+    import chromadb
+    from chromadb.config import Settings
+
+    client = chromadb.PersistentClient(path=str(path), settings=Settings(anonymized_telemetry=False))
+    collection = client.get_or_create_collection(name="benchmark", metadata={"hnsw:space": "cosine"})
+    batch = 5000  # stays under Chroma's maximum batch size
+    for i in range(0, len(vectors), batch):
+        end = min(i + batch, len(vectors))
+        articles = [make_article(j) for j in range(i, end)]
+        collection.add(
+            ids=[f"article_{a['id']}" for a in articles],
+            embeddings=vectors[i:end].tolist(),
+            documents=[a["content"] for a in articles],
+            metadatas=[dict(a["metadata"], stocks=",".join(a["metadata"]["stocks"])) for a in articles]
+        )
+    return collection
+
+
+def chroma_search(collection, k: int):
+    def search(query):
+        results = collection.query(query_embeddings=[query], n_results=k)
+        return [{"article_id": int(i.replace("article_", ""))} for i in results["ids"][0]]
+    return search
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark local vector index vs Chroma")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000], help="Store sizes (articles)")
+    parser.add_argument("--dim", type=int, default=settings.EMBEDDING_DIMENSION, help="Embedding dimension")
+    parser.add_argument("--dtype", default=settings.VECTOR_INDEX_DTYPE, choices=["float32", "float16", "int8"])
+    parser.add_argument("--nprobe", type=int, default=settings.VECTOR_INDEX_NPROBE, help="IVF lists per query")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per measurement")
+    parser.add_argument("--topics", type=int, default=2000, help="Topic clusters in the synthetic data")
+    parser.add_argument("--chroma-max", type=int, default=100000, help="Largest size to build in Chroma")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="vector_benchmark_"))
+    filters = VectorFilter(symbols=["NVDA"], start=BASE_DATE + timedelta(days=10), end=BASE_DATE + timedelta(days=40))
+
+    try:
+        for size in args.sizes:
+            logger.info(f"=== {size:,} articles, {args.dim} dimensions ===")
+            vectors = make_embeddings(size, args.dim, args.topics, seed=size)
+            queries = make_embeddings(args.queries, args.dim, args.topics, seed=size + 1)
+            truth = exact_top_k(vectors, queries, args.k)
+            filtered_truth = exact_top_k(
+                vectors, queries, args.k, filter_mask(size, "NVDA", filters.start, filters.end)
+            )
+
+            started = time.perf_counter()
+            store = build_local(workdir / f"local_{size}", vectors, args.dtype, args.nprobe)
+            logger.info(f"Local ({args.dtype}) build: {time.perf_counter() - started:.1f}s  {store.stats()}")
+            logger.info(f"Local unfiltered: {run_queries(lambda q: store.search_similar(q, args.k), queries, truth, args.k)}")
+            logger.info(f"Local filtered:   {run_queries(lambda q: store.search_similar(q, args.k, filters=filters), queries, filtered_truth, args.k)}")
+
+            if size <= args.chroma_max:
+                started = time.perf_counter()
+                collection = build_chroma(workdir / f"chroma_{size}", vectors)
+                logger.info(f"Chroma build: {time.perf_counter() - started:.1f}s")
+                logger.info(f"Chroma unfiltered: {run_queries(chroma_search(collection, args.k), queries, truth, args.k)}")
+            else:
+                logger.info(f"Chroma skipped (size above --chroma-max {args.chroma_max:,})")
+
+            del store
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Script to build the local vector index from the Chroma collection.
+
+Copies every stored embedding, document and metadata record from Chroma
+into VECTOR_INDEX_DIR (no embeddings are regenerated), then clusters the
+index. Set VECTOR_BACKEND=local afterwards to serve queries from it.
+
+Run with: python -m backend.scripts.build_vector_index [--dtype int8] [--batch-size 5000]
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.core.config import settings
+from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.local_vector_store import LocalVectorStore
+
+
+def build_index(dtype: str, batch_size: int = 5000):
+    """Copy the Chroma collection into a fresh local vector index."""
+    chroma = VectorStoreService()
+    total = chroma.get_article_count()
+    print(f"Copying {total} articles from Chroma to {settings.VECTOR_INDEX_DIR} ({dtype})...")
+
+    store = LocalVectorStore(dtype=dtype)
+    store.clear_all()
+
+    copied = 0
+    for offset in range(0, total, batch_size):
+        batch = chroma.collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=batch_size,
+            offset=offset
+        )
+        articles = [
+            {
+                "id": int(doc_id.replace("article_", "")),
+                "content": document,
+                "metadata": metadata or {}
+            }
+            for doc_id, document, metadata in zip(batch["ids"], batch["documents"], batch["metadatas"])
+        ]
+        store.add_articles_batch(articles, batch["embeddings"])
+        copied += len(articles)
+        print(f"  ✓ {copied}/{total}")
+
+    print("Clustering index...")
+    store.rebuild()
+    print(f"Local vector index ready: {store.stats()}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the local vector index from Chroma")
+    parser.add_argument("--dtype", default=settings.VECTOR_INDEX_DTYPE, choices=["float32", "float16", "int8"],
+                        help="Storage type of the embedding matrix")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Articles copied per batch")
+
+    args = parser.parse_args()
+
+    build_index(args.dtype, args.batch_size)
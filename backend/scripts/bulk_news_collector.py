@@ -24,9 +24,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from backend.app.core.config import settings
-from backend.app.models import Stock, NewsArticle, ArticleStock
+from backend.app.models import Stock, NewsArticle
 from backend.app.services.gemini_service import GeminiService
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.news_collector import NewsCollectorService
+from backend.app.services.article_writer import ArticleWriter, load_symbol_ids
+from backend.app.services.vector_store import get_vector_store
+from backend.app.services.embedding_pipeline import EmbeddingPipeline
+from backend.app.services.local_sentiment import sentiment_analyzer
+from backend.app.services.near_duplicates import near_duplicate_detector
+from backend.app.services.ticker_matcher import ticker_matcher_cache
+from backend.app.services.keyword_index import keyword_index
 
 # Configure logging
 logging.basicConfig(
@@ -42,7 +49,7 @@ class BulkNewsCollector:
     def __init__(self):
         self.actually_free_api_base = "https://actually-free-api.vercel.app/api"
         self.gemini_service = GeminiService()
-        self.vector_store = VectorStoreService()
+        self.vector_store = get_vector_store()
         self.seen_urls: Set[str] = set()
 
     async def fetch_bulk_articles(
@@ -224,25 +231,35 @@ class BulkNewsCollector:
         return unique
 
     def process_sentiment(self, article: Dict[str, Any]) -> float:
-        """Generate sentiment score using Gemini."""
+        """Generate sentiment score (locally, Gemini for uncertain articles)."""
         try:
             content = f"{article.get('title', '')}. {article.get('summary', '')}"
             if not content.strip():
                 return 0.0
 
-            sentiment_result = self.gemini_service.analyze_sentiment(content)
+            sentiment_result = sentiment_analyzer.analyze(content)
             return sentiment_result.get("score", 0.0)
         except Exception as e:
             logger.warning(f"Error generating sentiment: {e}")
             return 0.0
 
-    def generate_embedding(self, content: str) -> List[float]:
-        """Generate vector embedding using Gemini."""
+    def process_sentiment_batch(self, articles: List[Dict[str, Any]]) -> List[float]:
+        """Generate sentiment scores for many articles; uncertain ones go to Gemini in batched prompts."""
+        contents = [f"{a.get('title', '')}. {a.get('summary', '')}" for a in articles]
+        scored = [i for i, content in enumerate(contents) if content.strip(". ")]
+        scores = [0.0] * len(articles)
+
+        if not scored:
+            return scores
+
         try:
-            return self.gemini_service.generate_embedding(content)
+            results = sentiment_analyzer.analyze_batch([contents[i] for i in scored])
+            for i, result in zip(scored, results):
+                scores[i] = result.get("score", 0.0)
         except Exception as e:
-            logger.warning(f"Error generating embedding: {e}")
-            return None
+            logger.warning(f"Error generating sentiment: {e}")
+
+        return scores
 
 
 async def main():
@@ -253,6 +270,7 @@ async def main():
     parser.add_argument("--target-count", type=int, default=500, help="Target number of articles")
     parser.add_argument("--max-pages", type=int, default=10, help="Max pages per ticker")
     parser.add_argument("--days-back", type=int, default=30, help="Days to look back")
+    parser.add_argument("--batch-size", type=int, default=500, help="Articles inserted per commit")
     args = parser.parse_args()
 
     logger.info("=== Bulk News Collection Started ===")
@@ -265,7 +283,7 @@ async def main():
 
     try:
         # Get all stocks
-        stocks = db.query(Stock).all()
+        stocks = db.query(Stock).filter(Stock.is_benchmark.is_(False)).all()
 
         if not stocks:
             logger.error("No stocks found in portfolio!")
@@ -299,98 +317,99 @@ async def main():
 
         logger.info("Processing articles...")
 
-        for idx, article_data in enumerate(articles, 1):
-            try:
-                if idx % 50 == 0:
-                    logger.info(f"Progress: {idx}/{len(articles)} articles processed")
-
-                # Check if article exists
-                existing = db.query(NewsArticle).filter(
-                    NewsArticle.url == article_data["url"]
-                ).first()
-
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                # Find related stocks
-                related_stocks = []
-                article_tickers = article_data.get("tickers") or []
-
-                # Only associate articles that have explicit ticker matches
-                for stock in stocks:
-                    if article_tickers and stock.symbol in article_tickers:
-                        related_stocks.append(stock)
-
-                # Skip articles with no related stocks
-                if not related_stocks:
-                    skipped_count += 1
-                    continue
-
-                # Generate sentiment
-                sentiment_score = collector.process_sentiment(article_data)
-
-                # Create article
-                article = NewsArticle(
-                    title=article_data["title"],
-                    source=article_data["source"],
-                    url=article_data["url"],
-                    published_at=article_data["published_at"] or datetime.now(),
-                    summary=article_data["summary"],
-                    sentiment_score=sentiment_score
-                )
-                db.add(article)
-                db.flush()  # Get article ID
-
-                # Link to stocks
-                for stock in related_stocks:
-                    article_stock = ArticleStock(
-                        article_id=article.id,
-                        stock_id=stock.id
-                    )
-                    db.add(article_stock)
+        # Articles are committed and embedded together, one batch at a time
+        pipeline = EmbeddingPipeline(
+            collector.gemini_service,
+            collector.vector_store,
+            before_flush=db.commit
+        )
 
-                # Generate and store embedding
-                try:
-                    content = f"{article_data['title']}. {article_data['summary']}"
-                    embedding = collector.generate_embedding(content)
-
-                    if embedding:
-                        collector.vector_store.add_article(
-                            article_id=article.id,
-                            content=content,
-                            embedding=embedding,
-                            metadata={
-                                "title": article_data["title"],
-                                "source": article_data["source"],
-                                "published_at": str(article_data["published_at"]),
-                                "sentiment_score": sentiment_score,
-                                "stocks": [s.symbol for s in related_stocks]
-                            }
-                        )
-                except Exception as e:
-                    logger.warning(f"Error adding to vector store: {e}")
-
-                new_count += 1
-
-                # Commit in batches
-                if new_count % 50 == 0:
-                    db.commit()
-                    logger.info(f"Committed {new_count} articles so far...")
+        # Keep new articles with explicit ticker matches
+        candidates = []
+        matcher = ticker_matcher_cache.get(db)
+        stocks_by_symbol = {stock.symbol.upper(): stock for stock in stocks}
+        stored_urls = set(NewsCollectorService.find_existing_articles(db, [a["url"] for a in articles]))
+        for article_data in articles:
+            # Check if article exists
+            if article_data["url"] in stored_urls:
+                skipped_count += 1
+                continue
 
-            except Exception as e:
-                logger.error(f"Error processing article '{article_data.get('title', 'Unknown')}': {e}")
-                error_count += 1
-                db.rollback()
+            # Only associate articles that have explicit ticker matches
+            related_stocks = [
+                stocks_by_symbol[symbol]
+                for symbol in matcher.match_tickers(article_data.get("tickers"))
+                if symbol in stocks_by_symbol
+            ]
+
+            # Skip articles with no related stocks
+            if not related_stocks:
+                skipped_count += 1
                 continue
 
+            candidates.append((article_data, related_stocks))
+
+        # Group near-duplicates; one article per new cluster is scored and embedded
+        clusters = near_duplicate_detector.cluster_articles(db, [a for a, _ in candidates])
+        new_clusters = [c for c in clusters if not c.existing]
+        logger.info(f"{len(candidates)} articles in {len(clusters)} clusters ({len(new_clusters)} new stories)")
+
+        # Generate sentiment, many articles per prompt
+        logger.info(f"Analyzing sentiment for {len(new_clusters)} articles...")
+        sentiment_scores = collector.process_sentiment_batch(
+            [candidates[c.representative][0] for c in new_clusters]
+        )
+        for cluster, sentiment_score in zip(new_clusters, sentiment_scores):
+            cluster.sentiment_score = sentiment_score
+
+        # Insert articles and their stock links, one commit per batch
+        rows = [
+            dict(article_data, symbols=[s.symbol for s in related_stocks])
+            for article_data, related_stocks in candidates
+        ]
+        writer = ArticleWriter(db, load_symbol_ids(db), batch_size=args.batch_size)
+
+        try:
+            for batch in writer.write(rows, clusters):
+                for stored in batch:
+                    if not stored.representative:
+                        continue  # Near-duplicates share the representative's vector
+
+                    row = rows[stored.index]
+                    pipeline.add(
+                        stored.article_id,
+                        f"{row['title']}. {row['summary']}",
+                        {
+                            "title": row["title"],
+                            "source": row["source"],
+                            "published_at": str(row["published_at"]),
+                            "sentiment_score": stored.cluster.sentiment_score,
+                            "stocks": row["symbols"]
+                        }
+                    )
+
+                db.commit()
+                new_count += len(batch)
+                logger.info(f"Committed {new_count}/{len(candidates)} articles so far...")
+        except Exception as e:
+            logger.error(f"Error storing articles: {e}")
+            db.rollback()
+            # Articles queued since the last commit were rolled back too
+            pipeline.discard()
+            error_count = len(candidates) - new_count - writer.stats["conflicts"]
+
         # Final commit
         db.commit()
+        pipeline.flush()
+
+        # Make the new articles searchable by keyword
+        logger.info(f"Keyword index: {keyword_index.update(db)} articles indexed")
 
         # Summary
         logger.info("=== Bulk Collection Complete ===")
-        logger.info(f"New articles added: {new_count}")
-        logger.info(f"Skipped (existing/no tickers): {skipped_count}")
+        logger.info(f"New articles added: {new_count} ({len(candidates) - len(new_clusters)} near-duplicates)")
+        logger.info(f"Skipped (existing/no tickers): {skipped_count + writer.stats['conflicts']}")
+        logger.info(f"Embedded: {pipeline.stats['embedded']} in {pipeline.stats['batches']} batches")
         logger.info(f"Errors: {error_count}")
         logger.info(f"Total articles in DB: {db.query(NewsArticle).count()}")
 
@@ -22,7 +22,7 @@ from backend.app.core.config import settings
 from backend.app.models import Stock, NewsArticle, ArticleStock
 from backend.app.services.alpha_vantage import AlphaVantageService
 from backend.app.services.gemini_service import GeminiService
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.vector_store import get_vector_store
 
 # Configure logging
 logging.basicConfig(
@@ -49,7 +49,7 @@ def main():
 
     try:
         # Get all stocks
-        stocks = db.query(Stock).all()
+        stocks = db.query(Stock).filter(Stock.is_benchmark.is_(False)).all()
 
         if not stocks:
             logger.error("No stocks found in portfolio!")
@@ -61,7 +61,7 @@ def main():
         # Initialize services
         alpha_vantage = AlphaVantageService()
         gemini_service = GeminiService()
-        vector_store = VectorStoreService()
+        vector_store = get_vector_store()
 
         # Fetch news for each stock individually to get better coverage
         all_articles = []
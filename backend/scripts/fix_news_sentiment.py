@@ -12,14 +12,14 @@ if os.path.exists('/app/backend'):
     # Running in Docker container
     from backend.app.db.base import SessionLocal
     from backend.app.models import NewsArticle
-    from backend.app.services.gemini_service import GeminiService
+    from backend.app.services.local_sentiment import sentiment_analyzer
 else:
     # Running locally
     backend_dir = Path(__file__).resolve().parent.parent
     sys.path.insert(0, str(backend_dir))
     from app.db.base import SessionLocal
     from app.models import NewsArticle
-    from app.services.gemini_service import GeminiService
+    from app.services.local_sentiment import sentiment_analyzer
 
 import logging
 
@@ -30,7 +30,6 @@ logger = logging.getLogger(__name__)
 def fix_sentiment():
     """Re-analyze sentiment for all news articles."""
     db = SessionLocal()
-    gemini_service = GeminiService()
 
     try:
         # Get all articles with null or zero sentiment
@@ -42,28 +41,31 @@ def fix_sentiment():
 
         processed = 0
         errors = 0
+        chunk_size = 100
 
-        for article in articles:
+        # Analyze sentiment in chunks (locally; uncertain articles go to Gemini in batched prompts)
+        for start in range(0, len(articles), chunk_size):
+            chunk = articles[start:start + chunk_size]
             try:
-                # Analyze sentiment
-                content = f"{article.title}. {article.summary or ''}"
-                sentiment_result = gemini_service.analyze_sentiment(content)
+                contents = [f"{article.title}. {article.summary or ''}" for article in chunk]
+                sentiment_results = sentiment_analyzer.analyze_batch(contents)
 
-                # Update article
-                article.sentiment_score = sentiment_result["score"]
+                for article, sentiment_result in zip(chunk, sentiment_results):
+                    # Update article
+                    article.sentiment_score = sentiment_result["score"]
 
-                logger.info(f"Article {article.id}: '{article.title[:50]}...' -> {sentiment_result['score']} ({sentiment_result['label']})")
+                    logger.info(f"Article {article.id}: '{article.title[:50]}...' -> {sentiment_result['score']} ({sentiment_result['label']})")
 
-                processed += 1
+                    processed += 1
 
-                # Commit every 10 articles
-                if processed % 10 == 0:
-                    db.commit()
-                    logger.info(f"Progress: {processed}/{len(articles)}")
+                # Commit every chunk
+                db.commit()
+                logger.info(f"Progress: {processed}/{len(articles)}")
 
             except Exception as e:
-                logger.error(f"Error processing article {article.id}: {e}")
-                errors += 1
+                logger.error(f"Error processing articles {chunk[0].id}-{chunk[-1].id}: {e}")
+                errors += len(chunk)
+                db.rollback()
                 continue
 
         # Final commit
@@ -11,14 +11,14 @@ if os.path.exists('/app/backend'):
     # Running in Docker container
     from backend.app.db.base import SessionLocal
     from backend.app.models import NewsArticle
-    from backend.app.services.gemini_service import GeminiService
+    from backend.app.services.local_sentiment import sentiment_analyzer
 else:
     # Running locally
     backend_dir = Path(__file__).resolve().parent.parent
     sys.path.insert(0, str(backend_dir))
     from app.db.base import SessionLocal
     from app.models import NewsArticle
-    from app.services.gemini_service import GeminiService
+    from app.services.local_sentiment import sentiment_analyzer
 
 import logging
 
@@ -29,7 +29,6 @@ logger = logging.getLogger(__name__)
 def fix_recent_sentiment():
     """Re-analyze sentiment for the most recent 50 articles to ensure they're visible in UI."""
     db = SessionLocal()
-    gemini_service = GeminiService()
 
     try:
         # Get the most recent 50 articles (these are what shows first in the UI)
@@ -43,18 +42,21 @@ def fix_recent_sentiment():
         errors = 0
         skipped = 0
 
+        to_analyze = []
         for article in articles:
-            try:
-                # Skip if already has sentiment
-                if article.sentiment_score and article.sentiment_score != 0.0:
-                    logger.info(f"Article {article.id}: Already has sentiment {article.sentiment_score}, skipping")
-                    skipped += 1
-                    continue
+            # Skip if already has sentiment
+            if article.sentiment_score and article.sentiment_score != 0.0:
+                logger.info(f"Article {article.id}: Already has sentiment {article.sentiment_score}, skipping")
+                skipped += 1
+                continue
+            to_analyze.append(article)
 
-                # Analyze sentiment
-                content = f"{article.title}. {article.summary or ''}"
-                sentiment_result = gemini_service.analyze_sentiment(content)
+        try:
+            # Analyze sentiment (locally; uncertain articles go to Gemini in batched prompts)
+            contents = [f"{article.title}. {article.summary or ''}" for article in to_analyze]
+            sentiment_results = sentiment_analyzer.analyze_batch(contents)
 
+            for article, sentiment_result in zip(to_analyze, sentiment_results):
                 # Update article
                 article.sentiment_score = sentiment_result["score"]
 
@@ -62,15 +64,9 @@ def fix_recent_sentiment():
 
                 processed += 1
 
-                # Commit every 10 articles
-                if processed % 10 == 0:
-                    db.commit()
-                    logger.info(f"Progress: {processed}/{len(articles)}")
-
-            except Exception as e:
-                logger.error(f"Error processing article {article.id}: {e}")
-                errors += 1
-                continue
+        except Exception as e:
+            logger.error(f"Error analyzing sentiment: {e}")
+            errors += len(to_analyze) - processed
 
         # Final commit
         db.commit()
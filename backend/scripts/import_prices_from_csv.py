@@ -1,91 +1,368 @@
 """
 Script to import stock prices from local CSV files.
+
+Streams the CSV in fixed-size chunks (constant memory regardless of file size):
+- Parses and validates each chunk with vectorized pandas operations
+- PostgreSQL: stages the chunk in a temp table via COPY FROM STDIN and merges
+  it into stock_prices with one INSERT ... ON CONFLICT DO UPDATE
+- Other databases: upserts through the price ingestion service
+- Logs progress per chunk and writes a checkpoint file after each committed
+  chunk, so an interrupted import resumes where it stopped
+
+Supported layouts:
+- Per-symbol files (Nasdaq export: Date, Close/Last, Volume, Open, High, Low)
+- Multi-symbol dumps with an additional Symbol column
+
+Run with:
+    python -m backend.scripts.import_prices_from_csv                  # bundled csvFiles/ set
+    python -m backend.scripts.import_prices_from_csv --file dump.csv  # Symbol column
+    python -m backend.scripts.import_prices_from_csv --file nvda.csv --symbol NVDA
+
+Note: a running server keeps prices in memory; reload them afterwards with
+POST /api/admin/price-matrix/reload.
 """
 
 import sys
 import os
-import csv
+import io
+import json
+import time
 import logging
-from datetime import datetime
+from typing import Dict, Any, Optional
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from sqlalchemy.orm import Session
-from backend.app.db.base import SessionLocal
+import numpy as np
+import pandas as pd
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from backend.app.db.base import SessionLocal, engine
 from backend.app.models import Stock, StockPrice
 from backend.app.services.currency_converter import currency_converter
+from backend.app.services.price_ingestion import price_ingestion
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 200_000
+MAX_VOLUME = 2_147_483_647  # stock_prices.volume is a 32-bit integer
 
-def import_prices_from_csv(db: Session, symbol: str, csv_path: str):
-    """Import prices from a CSV file for a specific stock."""
+# Normalized CSV header -> stock_prices column
+COLUMN_ALIASES = {
+    "date": "date",
+    "close/last": "close",
+    "close": "close",
+    "open": "open",
+    "high": "high",
+    "low": "low",
+    "volume": "volume",
+    "symbol": "symbol",
+    "ticker": "symbol",
+}
+
+STAGING_TABLE_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS price_import_staging (
+    stock_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    open DOUBLE PRECISION NOT NULL,
+    close DOUBLE PRECISION NOT NULL,
+    high DOUBLE PRECISION NOT NULL,
+    low DOUBLE PRECISION NOT NULL,
+    volume BIGINT NOT NULL
+)
+"""
+
+MERGE_SQL = """
+WITH merged AS (
+    INSERT INTO stock_prices (stock_id, date, open, close, high, low, volume)
+    SELECT DISTINCT ON (stock_id, date) stock_id, date, open, close, high, low, volume
+    FROM price_import_staging
+    ORDER BY stock_id, date
+    ON CONFLICT (stock_id, date) DO UPDATE SET
+        open = EXCLUDED.open,
+        close = EXCLUDED.close,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        volume = EXCLUDED.volume
+    WHERE (stock_prices.open, stock_prices.close, stock_prices.high, stock_prices.low, stock_prices.volume)
+        IS DISTINCT FROM (EXCLUDED.open, EXCLUDED.close, EXCLUDED.high, EXCLUDED.low, EXCLUDED.volume)
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT
+    COUNT(*) FILTER (WHERE inserted) AS inserted,
+    COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM merged
+"""
+
+STAGING_COLUMNS = ["stock_id", "date", "open", "close", "high", "low", "volume"]
+
+
+def normalize_chunk(
+    chunk: pd.DataFrame,
+    symbol_ids: Dict[str, int],
+    symbol: Optional[str] = None,
+    usd_to_eur: Optional[float] = None
+) -> tuple:
+    """
+    Validate and normalize a raw CSV chunk into stock_prices rows.
+
+    Args:
+        chunk: Raw chunk (all columns as strings, headers already normalized)
+        symbol_ids: Map of stock symbol to stock ID
+        symbol: Symbol for every row (per-symbol files without a Symbol column)
+        usd_to_eur: Optional rate applied to all prices
+
+    Returns:
+        (DataFrame with STAGING_COLUMNS, number of invalid rows)
+    """
+    total = len(chunk)
+
+    if symbol is not None:
+        stock_ids = pd.Series(symbol_ids.get(symbol.upper()), index=chunk.index, dtype="float64")
+    else:
+        stock_ids = chunk["symbol"].str.strip().str.upper().map(symbol_ids)
 
-    # Find the stock
-    stock = db.query(Stock).filter(Stock.symbol == symbol.upper()).first()
+    # Dates: Nasdaq exports use MM/DD/YYYY, other dumps ISO dates
+    raw_dates = chunk["date"].str.strip()
+    dates = pd.to_datetime(raw_dates, format="%m/%d/%Y", errors="coerce")
+    missing = dates.isna()
+    if missing.any():
+        dates[missing] = pd.to_datetime(raw_dates[missing], format="ISO8601", errors="coerce")
+
+    def to_price(column: str) -> pd.Series:
+        if column not in chunk:
+            return pd.Series(np.nan, index=chunk.index)
+        return pd.to_numeric(chunk[column].str.replace(r"[$,\s]", "", regex=True), errors="coerce")
+
+    close = to_price("close")
+    frame = pd.DataFrame({
+        "stock_id": stock_ids,
+        "date": dates.dt.date,
+        "open": to_price("open").fillna(close),
+        "close": close,
+        "high": to_price("high").fillna(close),
+        "low": to_price("low").fillna(close),
+        "volume": to_price("volume").fillna(0).clip(0, MAX_VOLUME),
+    })
+
+    valid = frame["stock_id"].notna() & dates.notna() & (frame["close"] > 0)
+    frame = frame[valid].copy()
+
+    if usd_to_eur is not None:
+        for column in ("open", "close", "high", "low"):
+            frame[column] = (frame[column] * usd_to_eur).round(2)
+
+    frame = frame.astype({"stock_id": "int64", "volume": "int64"})
+    return frame[STAGING_COLUMNS], int(total - valid.sum())
+
+
+def copy_merge_chunk(raw_conn, frame: pd.DataFrame) -> Dict[str, int]:
+    """Stage a chunk via COPY FROM STDIN and merge it into stock_prices."""
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    with raw_conn.cursor() as cur:
+        cur.execute(STAGING_TABLE_SQL)
+        cur.execute("TRUNCATE price_import_staging")
+        cur.copy_expert(
+            f"COPY price_import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        cur.execute(MERGE_SQL)
+        inserted, updated = cur.fetchone()
+        cur.execute("TRUNCATE price_import_staging")
+
+    raw_conn.commit()
+    return {"inserted": int(inserted), "updated": int(updated)}
+
+
+def new_checkpoint(csv_path: str) -> Dict[str, Any]:
+    """Create an empty checkpoint identifying the CSV file by path, size and mtime."""
+    stat = os.stat(csv_path)
+    return {
+        "csv_path": os.path.abspath(csv_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "rows_done": 0,
+        "inserted": 0,
+        "updated": 0,
+        "invalid": 0,
+    }
+
+
+def load_checkpoint(path: str, csv_path: str) -> Dict[str, Any]:
+    """Load a checkpoint if it belongs to the same, unchanged CSV file."""
+    fresh = new_checkpoint(csv_path)
+
+    if not os.path.exists(path):
+        return fresh
+
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+        return fresh
 
-    if not stock:
+    if (checkpoint.get("csv_path"), checkpoint.get("size"), checkpoint.get("mtime")) != \
+            (fresh["csv_path"], fresh["size"], fresh["mtime"]):
+        logger.warning(f"Checkpoint {path} is for a different or modified file, starting over")
+        return fresh
+
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    """Atomically write the checkpoint file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def stream_prices_from_csv(
+    db_engine: Engine,
+    csv_path: str,
+    symbol: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    convert_to_eur: bool = True,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True
+) -> Dict[str, Any]:
+    """
+    Stream a price CSV into stock_prices.
+
+    Args:
+        db_engine: SQLAlchemy engine
+        csv_path: Path to the CSV file
+        symbol: Symbol for all rows (files without a Symbol column)
+        chunk_size: Rows per chunk
+        convert_to_eur: Convert USD prices to EUR
+        checkpoint_path: Checkpoint file (defaults to <csv_path>.checkpoint.json)
+        resume: Continue from an existing checkpoint
+
+    Returns:
+        Dict with rows processed, inserted, updated and invalid counts
+    """
+    checkpoint_path = checkpoint_path or f"{csv_path}.checkpoint.json"
+    checkpoint = load_checkpoint(checkpoint_path, csv_path) if resume else new_checkpoint(csv_path)
+    if checkpoint["rows_done"]:
+        logger.info(f"Resuming {csv_path} after {checkpoint['rows_done']:,} rows")
+
+    Session = sessionmaker(bind=db_engine)
+    with Session() as db:
+        symbol_ids = dict(db.query(Stock.symbol, Stock.id).all())
+
+    if symbol is not None and symbol.upper() not in symbol_ids:
         logger.error(f"Stock {symbol} not found in database")
-        return False
+        return {"status": "error", "error": f"Stock {symbol} not found"}
+
+    usd_to_eur = currency_converter.get_usd_to_eur_rate() if convert_to_eur else None
+    is_postgres = db_engine.dialect.name == "postgresql"
+
+    reader = pd.read_csv(
+        csv_path,
+        dtype=str,
+        chunksize=chunk_size,
+        skiprows=range(1, checkpoint["rows_done"] + 1) if checkpoint["rows_done"] else None,
+        keep_default_na=False
+    )
 
-    logger.info(f"Found stock: {stock.symbol} (ID: {stock.id})")
+    started = time.monotonic()
+    rows_this_run = 0
+    raw_conn = db_engine.raw_connection() if is_postgres else None
 
-    # Read CSV file
     try:
-        with open(csv_path, 'r') as file:
-            csv_reader = csv.DictReader(file)
-            prices_added = 0
-
-            for row in csv_reader:
-                # Parse date (format: MM/DD/YYYY)
-                date_str = row['Date']
-                date = datetime.strptime(date_str, '%m/%d/%Y').date()
-
-                # Parse prices (remove $ and convert to float, then convert USD to EUR)
-                close_usd = float(row['Close/Last'].replace('$', ''))
-                open_usd = float(row['Open'].replace('$', ''))
-                high_usd = float(row['High'].replace('$', ''))
-                low_usd = float(row['Low'].replace('$', ''))
-                volume = int(row['Volume'])
-
-                # Convert USD prices to EUR
-                close = currency_converter.convert_usd_to_eur(close_usd)
-                open_price = currency_converter.convert_usd_to_eur(open_usd)
-                high = currency_converter.convert_usd_to_eur(high_usd)
-                low = currency_converter.convert_usd_to_eur(low_usd)
-
-                # Check if price already exists
-                existing = db.query(StockPrice).filter(
-                    StockPrice.stock_id == stock.id,
-                    StockPrice.date == date
-                ).first()
-
-                if not existing:
-                    db_price = StockPrice(
-                        stock_id=stock.id,
-                        date=date,
-                        open=open_price,
-                        close=close,
-                        high=high,
-                        low=low,
-                        volume=volume
-                    )
-                    db.add(db_price)
-                    prices_added += 1
-
-            db.commit()
-            logger.info(f"✓ Added {prices_added} price records for {symbol}")
-            return True
+        for chunk in reader:
+            chunk.columns = [COLUMN_ALIASES.get(c.strip().lower(), c.strip().lower()) for c in chunk.columns]
+            if symbol is None and "symbol" not in chunk:
+                raise ValueError(f"{csv_path} has no Symbol column; pass --symbol")
+
+            frame, invalid = normalize_chunk(chunk, symbol_ids, symbol, usd_to_eur)
+
+            if frame.empty:
+                counts = {"inserted": 0, "updated": 0}
+            elif is_postgres:
+                counts = copy_merge_chunk(raw_conn, frame)
+            else:
+                with Session() as db:
+                    counts = price_ingestion.upsert_prices(db, frame.to_dict("records"))
+
+            checkpoint["rows_done"] += len(chunk)
+            checkpoint["inserted"] += counts["inserted"]
+            checkpoint["updated"] += counts["updated"]
+            checkpoint["invalid"] += invalid
+            save_checkpoint(checkpoint_path, checkpoint)
 
+            rows_this_run += len(chunk)
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"{os.path.basename(csv_path)}: {checkpoint['rows_done']:,} rows "
+                f"({rows_this_run / elapsed if elapsed else 0:,.0f} rows/s), "
+                f"{checkpoint['inserted']:,} inserted, {checkpoint['updated']:,} updated, "
+                f"{checkpoint['invalid']:,} invalid"
+            )
+    finally:
+        if raw_conn is not None:
+            raw_conn.close()
+
+    # Completed - the checkpoint is no longer needed
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    return {
+        "status": "success",
+        "rows": checkpoint["rows_done"],
+        "inserted": checkpoint["inserted"],
+        "updated": checkpoint["updated"],
+        "invalid": checkpoint["invalid"],
+        "seconds": round(time.monotonic() - started, 2)
+    }
+
+
+def import_prices_from_csv(db: Session, symbol: str, csv_path: str):
+    """Import prices from a CSV file for a specific stock."""
+    try:
+        result = stream_prices_from_csv(db.get_bind(), csv_path, symbol=symbol)
     except Exception as e:
         logger.error(f"Error importing prices for {symbol}: {e}")
-        db.rollback()
         return False
 
+    if result["status"] != "success":
+        return False
+
+    logger.info(f"✓ Added {result['inserted']} and updated {result['updated']} price records for {symbol}")
+    return True
+
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import stock prices from CSV files")
+    parser.add_argument("--file", help="CSV file to import (default: bundled csvFiles/ set)")
+    parser.add_argument("--symbol", help="Symbol for all rows when the file has no Symbol column")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <file>.checkpoint.json)")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--no-convert", action="store_true", help="Keep prices in USD")
+
+    args = parser.parse_args()
+
+    if args.file:
+        result = stream_prices_from_csv(
+            engine,
+            args.file,
+            symbol=args.symbol,
+            chunk_size=args.chunk_size,
+            convert_to_eur=not args.no_convert,
+            checkpoint_path=args.checkpoint,
+            resume=not args.no_resume
+        )
+        logger.info(f"Import result: {result}")
+        sys.exit(0 if result["status"] == "success" else 1)
+
     db = SessionLocal()
 
     try:
@@ -125,7 +402,7 @@ if __name__ == "__main__":
             csv_path = os.path.join(csv_dir, filename)
             if os.path.exists(csv_path):
                 logger.info(f"\nImporting {symbol} prices from {filename} (USD -> EUR)")
-                import_prices_from_csv(db, symbol, csv_path)
+                stream_prices_from_csv(engine, csv_path, symbol=symbol, resume=False)
             else:
                 logger.warning(f"CSV file not found for {symbol}: {csv_path}")
 
@@ -24,7 +24,7 @@ from tqdm import tqdm
 
 from backend.app.core.config import settings
 from backend.app.models import NewsArticle, ArticleStock
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.vector_store import get_vector_store
 from backend.app.services.jina_embedding_service import JinaEmbeddingService
 
 logging.basicConfig(level=logging.INFO)
@@ -47,7 +47,7 @@ def migrate_embeddings(batch_size: int = 50, dry_run: bool = False):
 
     # Initialize services
     jina = JinaEmbeddingService(settings.JINA_API_KEY)
-    vector_store = VectorStoreService()
+    vector_store = get_vector_store()
 
     # Create database session
     engine = create_engine(settings.DATABASE_URL)
@@ -156,7 +156,7 @@ def migrate_embeddings(batch_size: int = 50, dry_run: bool = False):
 
 def check_embedding_dimension():
     """Check current embedding dimension in ChromaDB."""
-    vector_store = VectorStoreService()
+    vector_store = get_vector_store()
 
     count = vector_store.get_article_count()
     print(f"Vector store article count: {count}")
@@ -36,7 +36,7 @@ from backend.app.models.target_allocation import TargetAllocation
 from backend.app.services.news_collector import NewsCollectorService
 from backend.app.services.yahoo_finance import YahooFinanceService
 from backend.app.services.alpha_vantage import AlphaVantageService
-from backend.app.services.vector_store import VectorStoreService
+from backend.app.services.vector_store import get_vector_store
 from backend.app.services.jina_embedding_service import JinaEmbeddingService
 
 
@@ -181,7 +181,7 @@ def generate_embeddings_for_articles(session):
         print("Embeddings will NOT be generated. Ask AI feature will not work.")
         return 0
 
-    vector_store = VectorStoreService()
+    vector_store = get_vector_store()
 
     # Get all articles
     articles = session.query(NewsArticle).all()
@@ -333,7 +333,7 @@ def delete_all_data():
         # Clear ChromaDB embeddings
         print("Clearing ChromaDB embeddings...")
         try:
-            vector_store = VectorStoreService()
+            vector_store = get_vector_store()
             vector_store.clear_all()
             print("ChromaDB cleared successfully!")
         except Exception as e:
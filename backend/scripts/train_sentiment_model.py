@@ -0,0 +1,116 @@
+"""
+Train the local sentiment model from stored article sentiment scores.
+
+Uses news_articles whose non-zero sentiment_score came from Gemini as
+training data and saves the model to settings.SENTIMENT_MODEL_PATH, where
+LocalSentimentScorer picks it up on startup. Scores produced by the local
+scorer (or copied across a near-duplicate cluster) are left out, so the
+model is never retrained on its own output.
+
+Usage:
+    python train_sentiment_model.py [--max-features 20000] [--min-df 2] [--output PATH]
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.core.config import settings
+from backend.app.models import NewsArticle, SentimentCacheEntry
+from backend.app.services.sentiment_cache import cache_key
+from backend.app.services.local_sentiment import LocalSentimentScorer
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+LABEL_SOURCE = "gemini:"  # model_version prefix of scores used as labels
+KEY_BATCH = 500  # cache keys per lookup query
+
+
+def gemini_scores(db, keys):
+    """Cache key -> score of the sentiment_cache entries Gemini produced."""
+    scores = {}
+    unique_keys = list(dict.fromkeys(keys))
+    for start in range(0, len(unique_keys), KEY_BATCH):
+        rows = db.query(SentimentCacheEntry.key, SentimentCacheEntry.score).filter(
+            SentimentCacheEntry.key.in_(unique_keys[start:start + KEY_BATCH]),
+            SentimentCacheEntry.model_version.startswith(LABEL_SOURCE)
+        ).all()
+        scores.update({key: float(score) for key, score in rows})
+    return scores
+
+
+def load_labelled_articles(db):
+    """
+    Get (text, score) pairs for articles whose stored score came from Gemini.
+
+    An article's score counts as a Gemini label when the sentiment cache
+    holds a Gemini result for the article's own text with the same score.
+    """
+    rows = db.query(NewsArticle.title, NewsArticle.summary, NewsArticle.sentiment_score).filter(
+        NewsArticle.sentiment_score.isnot(None),
+        NewsArticle.sentiment_score != 0.0
+    ).order_by(NewsArticle.id).all()
+
+    texts = [f"{title}. {summary or ''}" for title, summary, _ in rows]
+    keys = [cache_key(text) for text in texts]
+    labels = gemini_scores(db, keys)
+
+    labelled = [
+        (text, float(score))
+        for text, key, (_, _, score) in zip(texts, keys, rows)
+        if key in labels and abs(labels[key] - float(score)) < 1e-6
+    ]
+    logger.info(f"{len(labelled)} of {len(rows)} scored articles carry a Gemini label")
+    return [text for text, _ in labelled], [score for _, score in labelled]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the local sentiment model")
+    parser.add_argument("--max-features", type=int, default=20000, help="Vocabulary size")
+    parser.add_argument("--min-df", type=int, default=2, help="Minimum document frequency")
+    parser.add_argument("--alpha", type=float, default=1e-3, help="L2 regularization")
+    parser.add_argument("--output", default=settings.SENTIMENT_MODEL_PATH, help="Model file (.npz)")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    try:
+        texts, scores = load_labelled_articles(db)
+    finally:
+        db.close()
+
+    if len(texts) < 50:
+        logger.error(f"Only {len(texts)} labelled articles - need at least 50 to train")
+        return
+
+    scorer = LocalSentimentScorer()
+    result = scorer.train(
+        texts,
+        scores,
+        max_features=args.max_features,
+        min_df=args.min_df,
+        alpha=args.alpha
+    )
+    path = scorer.save(args.output)
+
+    logger.info(f"Trained on {result['samples']} articles, {result['vocabulary']} features, "
+                f"train MAE {result['train_mae']}")
+    logger.info(f"Model saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Shared pytest setup.
+
+Run from the project root with:
+    python -m pytest backend/tests
+"""
+
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Settings require API keys; tests never call the real services
+for key in ("ALPHA_VANTAGE_API_KEY", "GEMINI_API_KEY", "FINNHUB_API_KEY"):
+    os.environ.setdefault(key, "test")
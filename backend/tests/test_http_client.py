@@ -0,0 +1,280 @@
+"""
+Tests for the pooled HTTP client against a local stub server.
+
+Covers retries with backoff on 5xx, Retry-After on 429, the per-host
+concurrency cap and connection reuse, for both the sync and async paths.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from backend.app.services import http_client as http_client_module
+from backend.app.services.http_client import HttpClient
+
+
+class StubState:
+    """Request log and counters shared with the stub handler."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.ports = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def hit(self, key: str) -> int:
+        with self.lock:
+            self.hits[key] = self.hits.get(key, 0) + 1
+            return self.hits[key]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        /flaky?key=K&fail=N        503 for the first N requests of K, then 200
+        /limited?key=K&after=S     429 with Retry-After: S the first time, then 200
+        /slow?delay=S              200 after S seconds (tracks concurrency)
+        /ok                        200
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        state: StubState = self.server.state
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        with state.lock:
+            state.ports.append(self.client_address[1])
+
+        if url.path == "/flaky":
+            count = state.hit(query["key"])
+            self._reply(503 if count <= int(query["fail"]) else 200)
+        elif url.path == "/limited":
+            count = state.hit(query["key"])
+            if count == 1:
+                self._reply(429, {"Retry-After": query["after"]})
+            else:
+                self._reply(200)
+        elif url.path == "/slow":
+            with state.lock:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            time.sleep(float(query["delay"]))
+            with state.lock:
+                state.in_flight -= 1
+            self._reply(200)
+        else:
+            self._reply(200)
+
+    do_POST = do_GET
+
+    def _reply(self, status: int, headers=None):
+        body = b'{"ok": true}' if status == 200 else b'{"ok": false}'
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    """Start a stub server on a free localhost port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.state = StubState()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record sync backoff delays instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(http_client_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def make_client(**kwargs) -> HttpClient:
+    kwargs.setdefault("max_retries", 3)
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("timeout", 5.0)
+    return HttpClient(**kwargs)
+
+
+# ---------- Retries ----------
+
+def test_retries_5xx_with_exponential_backoff(stub, sleeps, monkeypatch):
+    # Upper end of the jitter range, so the delays show the exponential cap
+    monkeypatch.setattr(http_client_module.random, "uniform", lambda low, high: high)
+    client = make_client()
+
+    response = client.get(f"{stub.base_url}/flaky?key=a&fail=2")
+
+    assert response.status_code == 200
+    assert stub.state.hits["a"] == 3
+    assert sleeps == [0.01, 0.02]
+
+    host = urlsplit(stub.base_url).netloc
+    metrics = client.stats()["hosts"][host]
+    assert metrics["requests"] == 3
+    assert metrics["retries"] == 2
+    assert metrics["status_503"] == 2
+
+
+def test_returns_last_response_when_retries_exhausted(stub, sleeps):
+    client = make_client(max_retries=2)
+
+    response = client.get(f"{stub.base_url}/flaky?key=b&fail=10")
+
+    assert response.status_code == 503
+    assert stub.state.hits["b"] == 3
+    assert len(sleeps) == 2
+
+
+def test_no_retry_when_disabled(stub, sleeps):
+    client = make_client()
+
+    response = client.post(f"{stub.base_url}/flaky?key=c&fail=1", retry=False)
+
+    assert response.status_code == 503
+    assert stub.state.hits["c"] == 1
+    assert sleeps == []
+
+
+def test_backoff_is_capped(sleeps, monkeypatch):
+    monkeypatch.setattr(http_client_module.random, "uniform", lambda low, high: high)
+    client = make_client(backoff_base=1.0, backoff_max=3.0)
+
+    assert [client._backoff(attempt) for attempt in range(4)] == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_async_retries_5xx(stub):
+    client = make_client()
+
+    async def run():
+        try:
+            return await client.aget(f"{stub.base_url}/flaky?key=d&fail=2")
+        finally:
+            await client.aclose()
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert stub.state.hits["d"] == 3
+
+
+# ---------- Retry-After ----------
+
+def test_honours_retry_after_on_429(stub, sleeps):
+    client = make_client()
+
+    response = client.get(f"{stub.base_url}/limited?key=e&after=2")
+
+    assert response.status_code == 200
+    assert stub.state.hits["e"] == 2
+    assert sleeps == [2.0]
+
+
+def test_retry_after_is_capped_by_backoff_max(stub, sleeps):
+    client = make_client(backoff_max=1.5)
+
+    client.get(f"{stub.base_url}/limited?key=f&after=120")
+
+    assert sleeps == [1.5]
+
+
+def test_async_honours_retry_after(stub):
+    client = make_client()
+
+    async def run():
+        started = time.monotonic()
+        try:
+            response = await client.aget(f"{stub.base_url}/limited?key=g&after=1")
+        finally:
+            await client.aclose()
+        return response, time.monotonic() - started
+
+    response, elapsed = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert stub.state.hits["g"] == 2
+    assert elapsed >= 0.9
+
+
+# ---------- Per-host cap ----------
+
+def test_sync_per_host_limit(stub):
+    client = make_client(per_host_limit=2)
+    url = f"{stub.base_url}/slow?delay=0.2"
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        statuses = list(executor.map(lambda _: client.get(url).status_code, range(6)))
+
+    assert statuses == [200] * 6
+    assert stub.state.max_in_flight == 2
+
+
+def test_async_per_host_limit(stub):
+    client = make_client(per_host_limit=3)
+    url = f"{stub.base_url}/slow?delay=0.2"
+
+    async def run():
+        try:
+            return await asyncio.gather(*(client.aget(url) for _ in range(9)))
+        finally:
+            await client.aclose()
+
+    responses = asyncio.run(run())
+
+    assert [r.status_code for r in responses] == [200] * 9
+    assert stub.state.max_in_flight == 3
+
+
+# ---------- Connection reuse ----------
+
+def test_sync_session_reuses_connection(stub):
+    client = make_client()
+
+    for _ in range(5):
+        assert client.get(f"{stub.base_url}/ok").status_code == 200
+
+    # Every request arrived over the same keep-alive connection
+    assert len(stub.state.ports) == 5
+    assert len(set(stub.state.ports)) == 1
+
+
+def test_async_client_is_pooled_per_loop(stub):
+    client = make_client()
+
+    async def run():
+        first = client.async_client()
+        try:
+            for _ in range(5):
+                assert (await client.aget(f"{stub.base_url}/ok")).status_code == 200
+            return first, client.async_client()
+        finally:
+            await client.aclose()
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert len(set(stub.state.ports)) == 1